@@ -6,6 +6,9 @@
     "license": "LGPL-3",
     "category": "Accounting/Auditing",
     "depends": ["qaco_audit", "qaco_finalisation_phase"],
+    "external_dependencies": {
+        "python": ["pypdf", "reportlab"],
+    },
     "data": [
         "security/ir.model.access.csv",
         "views/deliverables_actions.xml",
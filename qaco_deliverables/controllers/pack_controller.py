@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from odoo import http
+from odoo.http import Response, content_disposition, request
+
+from ..utils import pack_builder
+
+
+class DeliverablesPackController(http.Controller):
+    """Download of the merged deliverables pack."""
+
+    def _get_deliverables(self, deliverables_id):
+        deliverables = (
+            request.env["qaco.deliverables"].browse(deliverables_id).exists()
+        )
+        if deliverables:
+            deliverables.check_access_rights("read")
+            deliverables.check_access_rule("read")
+        return deliverables
+
+    @http.route(
+        "/qaco_deliverables/<int:deliverables_id>/pack",
+        type="http",
+        auth="user",
+        methods=["GET"],
+    )
+    def download_pack(self, deliverables_id, **kwargs):
+        """Stream the cached pack from disk, rebuilding it if its inputs changed."""
+        deliverables = self._get_deliverables(deliverables_id)
+        if not deliverables:
+            return request.not_found()
+        path, filename = deliverables._get_deliverables_pack()
+        return Response(
+            pack_builder.iter_file(path),
+            headers=[
+                ("Content-Type", "application/pdf"),
+                ("Content-Length", str(os.path.getsize(path))),
+                ("Content-Disposition", content_disposition(filename)),
+                ("Cache-Control", "no-store"),
+            ],
+            direct_passthrough=True,
+        )
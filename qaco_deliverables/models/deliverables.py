@@ -2,10 +2,19 @@
 
 # -*- coding: utf-8 -*-
 
+import contextlib
+import functools
+import logging
+import os
 from typing import TYPE_CHECKING, Any, List
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError, ValidationError  # type: ignore[attr-defined]
+from odoo.tools import config
+
+from ..utils import pack_builder
+
+_logger = logging.getLogger(__name__)
 
 SUBTAB_STATUS = [
     ("red", "❌ Incomplete"),
@@ -261,6 +270,22 @@ class Deliverables(models.Model):
     tcwg_topic_uncorrected = fields.Boolean(
         string="Uncorrected misstatements shared", tracking=True
     )
+    sad_currency_id = fields.Many2one(
+        related="finalisation_phase_id.company_currency_id", string="SAD Currency"
+    )
+    sad_uncorrected_total = fields.Monetary(
+        related="finalisation_phase_id.uncorrected_total",
+        string="Uncorrected Misstatements",
+        currency_field="sad_currency_id",
+    )
+    sad_cumulative_effect = fields.Monetary(
+        related="finalisation_phase_id.sad_cumulative_effect",
+        string="Cumulative Profit Effect",
+        currency_field="sad_currency_id",
+    )
+    sad_level = fields.Selection(
+        related="finalisation_phase_id.sad_level", string="Aggregate Materiality Level"
+    )
     tcwg_topic_scope = fields.Boolean(string="Scope & timing discussed", tracking=True)
     tcwg_topic_independence = fields.Boolean(
         string="Independence confirmation given", tracking=True
@@ -316,6 +341,14 @@ class Deliverables(models.Model):
         "attachment_id",
         string="Final Deliverables Pack",
     )
+    pack_cache_key = fields.Char(string="Pack Cache Key", readonly=True, copy=False)
+    pack_generated_on = fields.Datetime(
+        string="Pack Generated On", readonly=True, copy=False
+    )
+    pack_page_count = fields.Integer(string="Pack Pages", readonly=True, copy=False)
+    pack_skipped_note = fields.Text(
+        string="Documents Left Out of Pack", readonly=True, copy=False
+    )
     archive_confirmed = fields.Boolean(
         string="Archive confirmation logged", tracking=True
     )
@@ -686,20 +719,199 @@ class Deliverables(models.Model):
             record.archive_confirmed = True
             record.archive_date = fields.Datetime.now()
 
-    def action_generate_deliverables_pack(self):
+    def _pack_directory(self):
+        directory = os.path.join(
+            config.filestore(self.env.cr.dbname), "qaco_deliverables_packs"
+        )
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    def _pack_attachment_sources(self, section, attachments):
+        """Pack sources for the attachments, read from the filestore.
+
+        Attachments that are not PDFs are kept as skipped sources so the
+        pack lists them instead of dropping them silently.
+        """
+        sources = []
+        for attachment in attachments:
+            if attachment.mimetype != "application/pdf":
+                sources.append(
+                    pack_builder.PackSource(
+                        section,
+                        attachment.name,
+                        checksum=attachment.checksum or "",
+                        skip_reason=_("not a PDF"),
+                    )
+                )
+                continue
+            if attachment.store_fname:
+                path, data = attachment._full_path(attachment.store_fname), None
+            else:
+                path, data = None, attachment.raw
+            sources.append(
+                pack_builder.PackSource(
+                    section,
+                    attachment.name,
+                    path=path,
+                    data=data,
+                    checksum=attachment.checksum or "",
+                )
+            )
+        return sources
+
+    def _pack_sources(self):
+        """Documents of the deliverables pack, in pack order.
+
+        KAM / EOM paragraphs and the dispatch register are rendered only
+        when the pack is built; their checksums come from the field values.
+        """
         self.ensure_one()
-        if not self.deliverable_pack_attachment_ids:
+        reports = self.audit_report_ids
+        dispatches = self.dispatch_log_ids.sorted(
+            lambda line: (line.dispatch_date, line.id)
+        )
+        sources = self._pack_attachment_sources(
+            "report", reports.final_report_attachment_ids
+        )
+        sources += self._pack_attachment_sources(
+            "management_letter", self.management_letter_attachment_ids
+        )
+        sources += self._pack_attachment_sources(
+            "tcwg", self.tcwg_attachment_ids | self.tcwg_ack_attachment_ids
+        )
+
+        eom_types = dict(self.env["qaco.deliverable.eom"]._fields["type"].selection)
+        blocks = []
+        for kam in reports.kam_line_ids:
+            blocks.append(
+                (
+                    _("KAM: %s") % kam.title,
+                    "\n".join(
+                        filter(
+                            None, (kam.description, kam.audit_response, kam.conclusion)
+                        )
+                    ),
+                )
+            )
+        for eom in reports.eom_line_ids.filtered("include_in_report"):
+            heading = eom_types.get(eom.type, "")
+            if eom.trigger:
+                heading = f"{heading}: {eom.trigger}"
+            blocks.append((heading, eom.narrative or ""))
+        if blocks:
+            title = _("Key Audit Matters and Emphasis / Other Matters")
+            sources.append(
+                pack_builder.PackSource(
+                    "kam_eom",
+                    title,
+                    data=functools.partial(
+                        pack_builder.render_text_pages, title, blocks
+                    ),
+                    checksum=pack_builder.content_checksum(
+                        *(value for block in blocks for value in block)
+                    ),
+                )
+            )
+
+        if dispatches:
+            methods = dict(DISPATCH_METHODS)
+            statuses = dict(dispatches._fields["status"].selection)
+            header = [
+                _("Recipient"),
+                _("Role"),
+                _("Method"),
+                _("Dispatched"),
+                _("Status"),
+                _("Tracking Reference"),
+            ]
+            rows = [
+                (
+                    line.recipient_name,
+                    line.recipient_role,
+                    methods.get(line.method, ""),
+                    fields.Datetime.to_string(line.dispatch_date),
+                    statuses.get(line.status, ""),
+                    line.tracking_reference or line.portal_submission_reference,
+                )
+                for line in dispatches
+            ]
+            title = _("Dispatch Register")
+            sources.append(
+                pack_builder.PackSource(
+                    "dispatch",
+                    title,
+                    data=functools.partial(
+                        pack_builder.render_table_pages, title, header, rows
+                    ),
+                    checksum=pack_builder.content_checksum(
+                        *(value for row in rows for value in row)
+                    ),
+                )
+            )
+            sources += self._pack_attachment_sources(
+                "dispatch",
+                dispatches.attachment_ids | dispatches.acknowledgment_attachment_ids,
+            )
+        return sources
+
+    def _get_deliverables_pack(self):
+        """Path and download name of the merged pack, built only on a cache miss.
+
+        The cached PDF is keyed by a hash of the source checksums, so
+        repeated downloads of an unchanged pack are served from disk.
+        """
+        self.ensure_one()
+        sources = self._pack_sources()
+        if not sources:
             raise UserError(
                 _(
-                    "Attach the deliverables pack (signed report, management letter, TCWG minutes) before dispatch."
+                    "Attach the signed report, management letter or TCWG minutes before generating the pack."
                 )
             )
-        first_attachment = self.deliverable_pack_attachment_ids[0]
+        title = self.name or _("Deliverables Pack")
+        subtitle = self.audit_id.display_name or ""
+        key = pack_builder.pack_key(sources, title, subtitle)
+        directory = self._pack_directory()
+        path = os.path.join(directory, f"{key}.pdf")
+        filename = "%s.pdf" % title
+        if os.path.exists(path):
+            return path, filename
+
+        try:
+            result = pack_builder.build_pack(sources, path, title, subtitle)
+        except (RuntimeError, ValueError) as e:
+            raise UserError(
+                _("The deliverables pack could not be built: %s") % e
+            ) from e
+        _logger.info(
+            "Deliverables %s: built pack %s (%s pages, %s documents skipped)",
+            self.id,
+            key,
+            result.page_count,
+            len(result.skipped),
+        )
+        if self.pack_cache_key and self.pack_cache_key != key:
+            with contextlib.suppress(OSError):
+                os.unlink(os.path.join(directory, f"{self.pack_cache_key}.pdf"))
+        # Build bookkeeping only: readers downloading the pack may rebuild it
+        self.sudo().write(
+            {
+                "pack_cache_key": key,
+                "pack_generated_on": fields.Datetime.now(),
+                "pack_page_count": result.page_count,
+                "pack_skipped_note": pack_builder.skipped_note(result.skipped),
+            }
+        )
+        return path, filename
+
+    def action_generate_deliverables_pack(self):
+        self.ensure_one()
+        self._get_deliverables_pack()
         return {
             "type": "ir.actions.act_url",
             "name": _("Deliverables Pack"),
             "target": "new",
-            "url": f"/web/content/{first_attachment.id}?download=true",
+            "url": f"/qaco_deliverables/{self.id}/pack",
         }
 
 
@@ -0,0 +1,341 @@
+"""Merged deliverables pack: one bookmarked PDF with a cover index.
+
+The pack concatenates the signed auditor's report, management letter,
+TCWG communication, KAM / EOM sections and dispatch records in a fixed
+section order. Each source document gets a bookmark under its section and
+a line in the cover index with its first page.
+
+Merging is incremental and disk-backed: sources are read from their
+filestore files by seeking, never loaded whole, and as each document is
+merged its large streams (page images of scans) are moved to a spool file
+and only copied into the output when it is written. Memory stays flat as
+the pack grows. The output is written next to its final path and moved
+into place, so a failed build never leaves a partial pack.
+
+Packs are keyed by :func:`pack_key`, a hash of the source checksums, so an
+unchanged pack is served from disk without re-merging or re-rendering.
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks. pypdf and reportlab are declared in
+the module manifest.
+"""
+
+import hashlib
+import io
+import os
+import re
+import tempfile
+from collections import namedtuple
+from contextlib import ExitStack
+from html import escape, unescape
+
+try:
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.errors import PdfReadError
+    from pypdf.generic import StreamObject
+except ImportError:  # pragma: no cover - optional dependency
+    PdfReader = PdfWriter = None
+    PdfReadError = Exception
+    StreamObject = dict
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+except ImportError:  # pragma: no cover - optional dependency
+    SimpleDocTemplate = None
+
+BLOCK_SIZE = 1024 * 1024
+
+# Bump when the layout changes so cached packs are rebuilt
+PACK_VERSION = "1"
+
+SECTIONS = (
+    ("report", "Signed Auditor's Report"),
+    ("management_letter", "Management Letter"),
+    ("tcwg", "TCWG Communication"),
+    ("kam_eom", "Key Audit Matters / Emphasis of Matter"),
+    ("dispatch", "Dispatch Records"),
+)
+
+PackSource = namedtuple(
+    "PackSource",
+    ["section", "title", "path", "data", "checksum", "skip_reason"],
+    defaults=(None, None, "", ""),
+)
+PackSource.__doc__ = """One document of the pack.
+
+``path`` is a PDF file read from disk; ``data`` holds PDF bytes, or a
+callable rendering them, and is used when ``path`` is empty. ``checksum``
+identifies the content for the cache key: the attachment checksum, or a
+hash of the values a generated document is rendered from (rendered PDFs
+carry timestamps, so their bytes are not stable). Only bytes ``data`` may
+omit it. A source with a ``skip_reason`` (an attachment that is not a PDF)
+is never opened and is listed in the skipped documents with that reason.
+"""
+
+PackResult = namedtuple("PackResult", ["page_count", "index", "skipped"])
+
+# Streams at least this large (page images, scans) are spooled to disk
+SPOOL_THRESHOLD = 64 * 1024
+
+_TAGS = re.compile(r"<[^>]+>")
+
+
+def _require_libraries():
+    if PdfWriter is None or SimpleDocTemplate is None:
+        raise RuntimeError("pypdf and reportlab are required to build the deliverables pack.")
+
+
+def plain_text(html):
+    """Text of an HTML field, safe for a reportlab paragraph."""
+    text = _TAGS.sub(" ", (html or "").replace("</p>", "\n").replace("<br>", "\n"))
+    return escape(re.sub(r"[ \t]+", " ", unescape(text)).strip())
+
+
+def source_checksum(source):
+    if source.checksum:
+        return source.checksum
+    if callable(source.data):
+        raise ValueError(f"Generated pack document '{source.title}' needs a checksum.")
+    return hashlib.sha1(source.data or b"").hexdigest()
+
+
+def content_checksum(*values):
+    """Checksum of the values a generated document is rendered from."""
+    return hashlib.sha1("\x1f".join(str(value or "") for value in values).encode()).hexdigest()
+
+
+def pack_key(sources, title="", subtitle=""):
+    """Cache key of a pack: layout version, cover text and ordered source checksums."""
+    digest = hashlib.sha256(f"{PACK_VERSION}\x1e{title}\x1f{subtitle}".encode())
+    for source in sources:
+        digest.update(
+            f"\x1e{source.section}\x1f{source.title}\x1f{source_checksum(source)}".encode()
+        )
+    return digest.hexdigest()
+
+
+def ordered(sources):
+    """Sources in section order, keeping their order within a section."""
+    rank = {key: position for position, (key, _label) in enumerate(SECTIONS)}
+    return sorted(sources, key=lambda source: rank.get(source.section, len(SECTIONS)))
+
+
+def _document(flowables, title):
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        title=title,
+        leftMargin=18 * mm,
+        rightMargin=18 * mm,
+        topMargin=18 * mm,
+        bottomMargin=18 * mm,
+    )
+    doc.build(flowables)
+    return buffer.getvalue()
+
+
+def render_text_pages(title, blocks):
+    """PDF pages for generated sections; ``blocks`` are (heading, HTML body)."""
+    _require_libraries()
+    styles = getSampleStyleSheet()
+    flowables = [Paragraph(escape(title), styles["Title"])]
+    for heading, body in blocks:
+        flowables.append(Paragraph(escape(heading or ""), styles["Heading3"]))
+        for paragraph in plain_text(body).split("\n"):
+            if paragraph.strip():
+                flowables.append(Paragraph(paragraph, styles["BodyText"]))
+        flowables.append(Spacer(1, 4 * mm))
+    return _document(flowables, title)
+
+
+def render_table_pages(title, header, rows):
+    """PDF pages holding one table (e.g. the dispatch register)."""
+    _require_libraries()
+    styles = getSampleStyleSheet()
+    cell = styles["BodyText"]
+    data = [[Paragraph(f"<b>{escape(str(value))}</b>", cell) for value in header]]
+    data += [[Paragraph(escape(str(value or "")), cell) for value in row] for row in rows]
+    table = Table(data, repeatRows=1)
+    table.setStyle(
+        TableStyle(
+            [
+                ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+                ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]
+        )
+    )
+    return _document([Paragraph(escape(title), styles["Title"]), table], title)
+
+
+def render_cover(title, subtitle, index):
+    """Cover page(s) listing ``index`` rows of (section, document, first page)."""
+    _require_libraries()
+    styles = getSampleStyleSheet()
+    rows = [["Section", "Document", "Page"]]
+    rows += [[section, Paragraph(escape(name), styles["BodyText"]), str(page)]
+             for section, name, page in index]
+    table = Table(rows, colWidths=(55 * mm, 100 * mm, 15 * mm), repeatRows=1)
+    table.setStyle(
+        TableStyle(
+            [
+                ("LINEBELOW", (0, 0), (-1, 0), 0.5, colors.black),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("ALIGN", (2, 0), (2, -1), "RIGHT"),
+            ]
+        )
+    )
+    flowables = [
+        Paragraph(escape(title), styles["Title"]),
+        Paragraph(escape(subtitle or ""), styles["Heading4"]),
+        Spacer(1, 8 * mm),
+        table,
+    ]
+    return _document(flowables, title)
+
+
+class _SpooledStream(StreamObject):
+    """Stream whose (still encoded) data waits in a spool file until written."""
+
+    def __init__(self, original, spool):
+        super().__init__()
+        self.update(original)
+        self.indirect_reference = original.indirect_reference
+        data = original._data
+        spool.seek(0, os.SEEK_END)
+        self._spool, self._offset, self._length = spool, spool.tell(), len(data)
+        spool.write(data)
+
+    @property
+    def _data(self):
+        if getattr(self, "_spool", None) is None:
+            return b""
+        self._spool.seek(self._offset)
+        return self._spool.read(self._length)
+
+    @_data.setter
+    def _data(self, value):
+        if value:
+            raise TypeError("Spooled pack streams are read-only.")
+
+
+def _spool_streams(writer, start, spool):
+    """Move the large streams added since ``start`` out of memory."""
+    objects = writer._objects
+    for position in range(start, len(objects)):
+        obj = objects[position]
+        if isinstance(obj, StreamObject) and len(obj._data) >= SPOOL_THRESHOLD:
+            objects[position] = _SpooledStream(obj, spool)
+
+
+def _open(source, stack):
+    # A file handle (not a path) keeps pypdf seeking in the file instead of
+    # reading it into memory first.
+    if source.path:
+        return PdfReader(stack.enter_context(open(source.path, "rb")))
+    data = source.data() if callable(source.data) else source.data
+    return PdfReader(io.BytesIO(data or b""))
+
+
+def build_pack(sources, output_path, title, subtitle=""):
+    """Merge ``sources`` into ``output_path`` behind a cover index.
+
+    Sources that are not readable PDFs, or carry a ``skip_reason``, are
+    left out and returned in ``skipped`` with the reason. Returns a :class:`PackResult`.
+    """
+    _require_libraries()
+    with ExitStack() as stack:
+        return _build(sources, output_path, title, subtitle, stack)
+
+
+def _build(sources, output_path, title, subtitle, stack):
+    readers = []
+    skipped = []
+    for source in ordered(sources):
+        if source.skip_reason:
+            skipped.append((source, source.skip_reason))
+            continue
+        try:
+            reader = _open(source, stack)
+            pages = len(reader.pages)
+        except (PdfReadError, OSError, ValueError) as e:
+            skipped.append((source, str(e) or type(e).__name__))
+            continue
+        if pages:
+            readers.append((source, reader, pages))
+    if not readers:
+        raise ValueError("None of the pack documents is a readable PDF.")
+
+    labels = dict(SECTIONS)
+    cover_pages = 1
+    while True:
+        index = []
+        page = cover_pages + 1
+        for source, _reader, pages in readers:
+            index.append((labels.get(source.section, source.section), source.title, page))
+            page += pages
+        cover = PdfReader(io.BytesIO(render_cover(title, subtitle, index)))
+        if len(cover.pages) == cover_pages:
+            break
+        cover_pages = len(cover.pages)
+
+    # Each document is merged in turn: its large streams go to a spool file
+    # and the parsed source is dropped, so memory does not grow with the
+    # size of the scans.
+    spool = stack.enter_context(tempfile.TemporaryFile(dir=os.path.dirname(output_path) or None))
+    writer = PdfWriter()
+    writer.append(cover, import_outline=False)
+    writer.add_outline_item("Index", 0)
+    parents = {}
+    for (source, reader, _pages), (label, name, first_page) in zip(readers, index):
+        start = len(writer._objects)
+        writer.append(reader, import_outline=False)
+        _spool_streams(writer, start, spool)
+        reader.resolved_objects.clear()
+        if source.section not in parents:
+            parents[source.section] = writer.add_outline_item(label, first_page - 1)
+        writer.add_outline_item(name, first_page - 1, parent=parents[source.section])
+    writer.add_metadata({"/Title": title})
+    writer.page_mode = "/UseOutlines"
+
+    descriptor, partial = tempfile.mkstemp(
+        dir=os.path.dirname(output_path) or None, suffix=".part"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            writer.write(handle)
+        os.replace(partial, output_path)
+    finally:
+        if os.path.exists(partial):
+            os.unlink(partial)
+        writer.close()
+    return PackResult(page - 1, index, skipped)
+
+
+def skipped_note(skipped):
+    """One line per skipped document: its title and the reason."""
+    return "\n".join(f"{source.title}: {reason}" for source, reason in skipped)
+
+
+def iter_file(path, block_size=BLOCK_SIZE):
+    """Open ``path`` now and return an iterator over its blocks.
+
+    Opening eagerly keeps the download consistent if the cached pack is
+    replaced while it streams.
+    """
+    handle = open(path, "rb")
+
+    def blocks():
+        with handle:
+            while True:
+                block = handle.read(block_size)
+                if not block:
+                    return
+                yield block
+
+    return blocks()
@@ -49,6 +49,11 @@
         "views/hr_employee_no_create.xml",
         "views/email_transfer_request.xml",
         "views/email_transfer_expired.xml",
+        "views/email_transfer_approved.xml",
+        "views/email_transfer_pending.xml",
+        "views/daily_attendance_report_templates.xml",
+        "views/weekly_employee_report_templates.xml",
+        "views/weekly_employee_report_views.xml",
         "views/unallocated_employee_recipient_views.xml",
         "data/designation_data.xml",
         "data/region_data.xml",
@@ -60,6 +65,8 @@
         "data/cron_pending_transfers.xml",
         "data/cron_geofence_reconcile.xml",
         "data/cron_daily_attendance_report.xml",
+        "data/cron_employee_availability.xml",
+        "data/cron_hr_notification_outbox.xml",
         "data/cron_unallocated_expiry_employees.xml",
         "data/cron_email_leave_summary_to_employees.xml",
         "security/menu_restrictions.xml",
@@ -12,18 +12,27 @@ class LeaveAdjustmentApprovalController(http.Controller):
         type="http",
         auth="public",
         website=True,
+        methods=["GET", "POST"],
+        csrf=False,
     )
-    def approve_adjustment(self, token):
-        validator = (
-            request.env["leave.adjustment.approval"]
-            .sudo()
-            .search([("approve_token", "=", token)], limit=1)
+    def approve_adjustment(self, token, **post):
+        validator = request.env["qaco.approval.token"].resolve(
+            token, "leave.adjustment.approval", "approve"
         )
         if not validator or validator.is_validation_status:
             return request.render("qaco_employees.adjustment_invalid_token")
         adjustment = validator.adjustment_id
         if not adjustment or adjustment.state != "submitted":
             return request.render("qaco_employees.adjustment_invalid_token")
+        # GET only asks for confirmation, so link scanners cannot approve
+        if request.httprequest.method == "GET":
+            return request.render(
+                "qaco_employees.adjustment_approve_form",
+                {"token": token, "adjustment": adjustment},
+            )
+        # Use the link before acting, so a concurrent request cannot act twice
+        if not request.env["qaco.approval.token"].revoke(token):
+            return request.render("qaco_employees.adjustment_invalid_token")
         adjustment.sudo().with_user(validator.validating_users_id).action_approve()
         return request.render(
             "qaco_employees.adjustment_approval_success", {"adjustment": adjustment}
@@ -38,10 +47,8 @@ class LeaveAdjustmentApprovalController(http.Controller):
         csrf=False,
     )
     def refuse_adjustment(self, token, **post):
-        validator = (
-            request.env["leave.adjustment.approval"]
-            .sudo()
-            .search([("approve_token", "=", token)], limit=1)
+        validator = request.env["qaco.approval.token"].resolve(
+            token, "leave.adjustment.approval", "refuse"
         )
         if not validator or validator.is_validation_status:
             return request.render("qaco_employees.adjustment_invalid_token")
@@ -69,6 +76,8 @@ class LeaveAdjustmentApprovalController(http.Controller):
                 },
             )
 
+        if not request.env["qaco.approval.token"].revoke(token):
+            return request.render("qaco_employees.adjustment_invalid_token")
         validator.is_validation_status = False
         adjustment.do_reject_with_reason(rejection_reason)
 
@@ -86,10 +95,8 @@ class LeaveAdjustmentApprovalController(http.Controller):
         csrf=False,
     )
     def revert_adjustment(self, token, **post):
-        validator = (
-            request.env["leave.adjustment.approval"]
-            .sudo()
-            .search([("approve_token", "=", token)], limit=1)
+        validator = request.env["qaco.approval.token"].resolve(
+            token, "leave.adjustment.approval", "revert"
         )
         if not validator:
             return request.render("qaco_employees.adjustment_invalid_token")
@@ -98,6 +105,8 @@ class LeaveAdjustmentApprovalController(http.Controller):
             return request.render("qaco_employees.adjustment_invalid_token")
 
         if request.httprequest.method == "POST":
+            if not request.env["qaco.approval.token"].revoke(token):
+                return request.render("qaco_employees.adjustment_invalid_token")
             remark = post.get("remark")
             adjustment.state = "reverted"
             for line in adjustment.approval_ids:
@@ -184,10 +193,8 @@ class LeaveAdjustmentApprovalController(http.Controller):
         csrf=False,
     )
     def transfer_adjustment(self, token, **post):
-        validator = (
-            request.env["leave.adjustment.approval"]
-            .sudo()
-            .search([("approve_token", "=", token)], limit=1)
+        validator = request.env["qaco.approval.token"].resolve(
+            token, "leave.adjustment.approval", "transfer"
         )
         if not validator or validator.is_validation_status:
             return request.render("qaco_employees.adjustment_invalid_token")
@@ -272,6 +279,8 @@ class LeaveAdjustmentApprovalController(http.Controller):
                 },
             )
 
+        if not request.env["qaco.approval.token"].revoke(token):
+            return request.render("qaco_employees.adjustment_invalid_token")
         # Transfer the approval
         old_user = validator.validating_users_id
         validator.validating_users_id = new_user
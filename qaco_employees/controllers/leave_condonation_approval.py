@@ -11,18 +11,27 @@ class LeaveCondonationApprovalController(http.Controller):
         type="http",
         auth="public",
         website=True,
+        methods=["GET", "POST"],
+        csrf=False,
     )
-    def approve_condonation(self, token):
-        validator = (
-            request.env["leave.condonation.approval"]
-            .sudo()
-            .search([("approve_token", "=", token)], limit=1)
+    def approve_condonation(self, token, **post):
+        validator = request.env["qaco.approval.token"].resolve(
+            token, "leave.condonation.approval", "approve"
         )
         if not validator or validator.is_validation_status:
             return request.render("qaco_employees.condonation_invalid_token")
         record = validator.condonation_id
         if not record or record.state != "submitted":
             return request.render("qaco_employees.condonation_invalid_token")
+        # GET only asks for confirmation, so link scanners cannot approve
+        if request.httprequest.method == "GET":
+            return request.render(
+                "qaco_employees.condonation_confirm_form",
+                {"token": token, "record": record, "action": "approve"},
+            )
+        # Use the link before acting, so a concurrent request cannot act twice
+        if not request.env["qaco.approval.token"].revoke(token):
+            return request.render("qaco_employees.condonation_invalid_token")
         record.sudo().with_user(validator.validating_users_id).action_approve()
         return request.render(
             "qaco_employees.condonation_approval_success", {"record": record}
@@ -33,18 +42,25 @@ class LeaveCondonationApprovalController(http.Controller):
         type="http",
         auth="public",
         website=True,
+        methods=["GET", "POST"],
+        csrf=False,
     )
-    def refuse_condonation(self, token):
-        validator = (
-            request.env["leave.condonation.approval"]
-            .sudo()
-            .search([("approve_token", "=", token)], limit=1)
+    def refuse_condonation(self, token, **post):
+        validator = request.env["qaco.approval.token"].resolve(
+            token, "leave.condonation.approval", "refuse"
         )
         if not validator or validator.is_validation_status:
             return request.render("qaco_employees.condonation_invalid_token")
         record = validator.condonation_id
         if not record or record.state != "submitted":
             return request.render("qaco_employees.condonation_invalid_token")
+        if request.httprequest.method == "GET":
+            return request.render(
+                "qaco_employees.condonation_confirm_form",
+                {"token": token, "record": record, "action": "refuse"},
+            )
+        if not request.env["qaco.approval.token"].revoke(token):
+            return request.render("qaco_employees.condonation_invalid_token")
         validator.is_validation_status = False
         record.action_reject()
         record.message_post(
@@ -61,10 +77,8 @@ class LeaveCondonationApprovalController(http.Controller):
         csrf=False,
     )
     def revert_condonation(self, token, **post):
-        validator = (
-            request.env["leave.condonation.approval"]
-            .sudo()
-            .search([("approve_token", "=", token)], limit=1)
+        validator = request.env["qaco.approval.token"].resolve(
+            token, "leave.condonation.approval", "revert"
         )
         if not validator:
             return request.render("qaco_employees.condonation_invalid_token")
@@ -73,6 +87,8 @@ class LeaveCondonationApprovalController(http.Controller):
             return request.render("qaco_employees.condonation_invalid_token")
 
         if request.httprequest.method == "POST":
+            if not request.env["qaco.approval.token"].revoke(token):
+                return request.render("qaco_employees.condonation_invalid_token")
             remark = post.get("remark")
             record.state = "reverted"
             for line in record.approval_ids:
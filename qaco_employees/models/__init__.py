@@ -1,10 +1,12 @@
 from . import employee_designation
 from . import employee_docs
+from . import employee_availability
 from . import employee_experience
 from . import employee_family_reference
 from . import hr_employee_transfer
 from . import hr_employee_public
 from . import hr_leave
+from . import hr_notification_outbox
 from . import hr_public_holiday
 from . import leave_adjustment
 from . import leave_adjustment_approval
@@ -20,4 +22,6 @@ from . import transfer_cc_recipient
 from . import unallocated_employee_notification
 from . import unallocated_employee_recipient
 from . import weekly_employee_report
+from . import approval_token
+from . import working_calendar
 from . import daily_attendance_report
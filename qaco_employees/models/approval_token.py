@@ -0,0 +1,137 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from psycopg2.errors import UniqueViolation
+
+from odoo import api, fields, models
+from odoo.tools import mute_logger
+
+from ..utils import approval_tokens
+
+# Approval line model -> URL prefix of its public approval routes
+ROUTES = {
+    "leave.adjustment.approval": "/leave_adjustment",
+    "leave.condonation.approval": "/leave_condonation",
+}
+
+
+class QacoApprovalToken(models.AbstractModel):
+    _name = "qaco.approval.token"
+    _description = "Signed Approval Link Tokens"
+
+    @api.model
+    def _secret(self):
+        return self.env["ir.config_parameter"].sudo().get_param("database.secret")
+
+    @api.model
+    def _lifetime(self):
+        days = self.env["ir.config_parameter"].sudo().get_param(
+            "qaco_employees.approval_token_days", 14
+        )
+        return timedelta(days=int(days))
+
+    @api.model
+    def issue(self, line, action):
+        """Signed token letting ``line``'s approver perform ``action`` once.
+
+        Empty when the line has no approver, as there is nobody to bind the
+        token to.
+        """
+        if not line.validating_users_id:
+            return ""
+        expires = int(time.time() + self._lifetime().total_seconds())
+        return approval_tokens.sign(
+            self._secret(),
+            approval_tokens.Claims(
+                line._name,
+                line.id,
+                line.validating_users_id.id,
+                action,
+                expires,
+                (line.approve_token or "")[:8],
+            ),
+        )
+
+    @api.model
+    def url(self, line, action):
+        token = self.issue(line, action)
+        if not token:
+            return ""
+        base_url = self.env["ir.config_parameter"].sudo().get_param("web.base.url")
+        return f"{base_url}{ROUTES[line._name]}/{action}/{token}"
+
+    @api.model
+    def resolve(self, token, model, action):
+        """Approval line ``token`` grants ``action`` on, else an empty recordset.
+
+        The signature and expiry are checked first without touching the
+        database; only a valid token costs a primary-key read and an indexed
+        revocation lookup. Links issued before the line's approver changed
+        or its generation was rotated (on revert) no longer resolve.
+        """
+        lines = self.env[model].sudo()
+        claims = approval_tokens.verify(self._secret(), token, time.time())
+        if not claims or claims.model != model or claims.action != action:
+            return lines.browse()
+        line = lines.browse(claims.res_id).exists()
+        if (
+            not line
+            or line.validating_users_id.id != claims.user_id
+            or (line.approve_token or "")[:8] != claims.generation
+        ):
+            return lines.browse()
+        revoked = self.env["qaco.approval.token.revocation"].sudo().search_count(
+            [("fingerprint", "=", approval_tokens.fingerprint(token))], limit=1
+        )
+        return lines.browse() if revoked else line
+
+    @api.model
+    def revoke(self, token):
+        """Make ``token`` single-use; the entry expires with the token.
+
+        Returns whether this call used the token. Handlers revoke before
+        acting: of two concurrent requests with the same link, the second
+        hits the unique fingerprint, is rolled back to a savepoint and gets
+        ``False``, so the action runs at most once.
+        """
+        claims = approval_tokens.verify(self._secret(), token, time.time())
+        if not claims:
+            return False
+        try:
+            with mute_logger("odoo.sql_db"), self.env.cr.savepoint():
+                self.env["qaco.approval.token.revocation"].sudo().create(
+                    {
+                        "fingerprint": approval_tokens.fingerprint(token),
+                        "expires_at": datetime.fromtimestamp(
+                            claims.expires, timezone.utc
+                        ).replace(tzinfo=None),
+                    }
+                )
+        except UniqueViolation:
+            return False
+        return True
+
+
+class QacoApprovalTokenRevocation(models.Model):
+    _name = "qaco.approval.token.revocation"
+    _description = "Used Approval Link Token"
+    _log_access = False
+
+    fingerprint = fields.Char(required=True, readonly=True)
+    expires_at = fields.Datetime(required=True, readonly=True, index=True)
+
+    _sql_constraints = [
+        (
+            "fingerprint_unique",
+            "unique(fingerprint)",
+            "This approval link has already been used.",
+        )
+    ]
+
+    @api.autovacuum
+    def _gc_expired(self):
+        """Expired tokens are rejected anyway: drop their entries in bulk."""
+        self.env.cr.execute(
+            "DELETE FROM qaco_approval_token_revocation WHERE expires_at < %s",
+            [fields.Datetime.now()],
+        )
@@ -0,0 +1,259 @@
+from datetime import datetime, time, timedelta
+
+from odoo import api, fields, models
+
+STATUSES = [
+    ("present", "Present"),
+    ("leave", "On Leave"),
+    ("holiday", "Holiday"),
+    ("unallocated", "Unallocated"),
+    ("absent", "Absent"),
+]
+
+# Statuses shown as "absent today" on the employee
+ABSENT_STATUSES = ("absent", "unallocated")
+
+
+class QacoEmployeeAvailability(models.Model):
+    _name = "qaco.employee.availability"
+    _description = "Daily Employee Availability"
+    _order = "date desc, employee_id"
+    _rec_name = "employee_id"
+
+    employee_id = fields.Many2one(
+        "hr.employee", required=True, ondelete="cascade", index=True
+    )
+    date = fields.Date(required=True, index=True)
+    status = fields.Selection(STATUSES, required=True, index=True)
+
+    _sql_constraints = [
+        (
+            "employee_date_unique",
+            "unique(employee_id, date)",
+            "An employee has only one availability per day.",
+        )
+    ]
+
+    @api.model
+    def _statuses(self, day, employees):
+        """``{employee_id: status}`` for ``day``, in a fixed number of queries.
+
+        Having checked in that day wins over everything, whether or not the
+        employee has checked out since, then validated leave, the employee's
+        non-working days (public holidays of their region and weekends), and
+        finally no current deputation (unallocated) or plain absence.
+        """
+        employees = employees.with_context(active_test=False)
+        start = datetime.combine(day, time.min)
+        present = {
+            employee.id
+            for [employee] in self.env["hr.attendance"]._read_group(
+                [
+                    ("employee_id", "in", employees.ids),
+                    ("check_in", ">=", start),
+                    ("check_in", "<", start + timedelta(days=1)),
+                ],
+                ["employee_id"],
+            )
+        }
+        on_leave = {
+            employee.id
+            for [employee] in self.env["hr.leave"]._read_group(
+                [
+                    ("employee_id", "in", employees.ids),
+                    ("state", "=", "validate"),
+                    ("request_date_from", "<=", day),
+                    ("request_date_to", ">=", day),
+                ],
+                ["employee_id"],
+            )
+        }
+        unallocated_client = self.env["res.partner"].search(
+            [("name", "=", "UNALLOCATED")], limit=1
+        )
+        calendar = self.env["qaco.working.calendar"]
+        statuses = {}
+        for employee in employees.search_fetch(
+            [("id", "in", employees.ids)],
+            ["region_id", "latest_deputation_client_id"],
+        ):
+            if employee.id in present:
+                status = "present"
+            elif employee.id in on_leave:
+                status = "leave"
+            elif not calendar.is_working_day(day, employee.region_id.id):
+                status = "holiday"
+            elif (
+                not employee.latest_deputation_client_id
+                or employee.latest_deputation_client_id == unallocated_client
+            ):
+                status = "unallocated"
+            else:
+                status = "absent"
+            statuses[employee.id] = status
+        return statuses
+
+    @api.model
+    def _refresh(self, employees, day=None):
+        """Bring the snapshot of ``employees`` on ``day`` (today) up to date.
+
+        Rows are created in one batch and updated with one write per status,
+        so the cost does not grow with the number of employees.
+        """
+        day = day or fields.Date.today()
+        if not employees:
+            return self.browse()
+        statuses = self._statuses(day, employees)
+        snapshot = self.sudo().search_fetch(
+            [("date", "=", day), ("employee_id", "in", list(statuses))],
+            ["employee_id", "status"],
+        )
+        changed = {}
+        for row in snapshot:
+            status = statuses.pop(row.employee_id.id)
+            if row.status != status:
+                changed.setdefault(status, self.browse())
+                changed[status] |= row
+        for status, rows in changed.items():
+            rows.write({"status": status})
+        return snapshot | self.sudo().create(
+            [
+                {"employee_id": employee_id, "date": day, "status": status}
+                for employee_id, status in statuses.items()
+            ]
+        )
+
+    @api.model
+    def _cron_refresh_snapshot(self):
+        """Day-start cron: snapshot every active employee for today."""
+        self._refresh(self.env["hr.employee"].search([]))
+
+    @api.model
+    def _today_status(self, employees):
+        """``{employee_id: status}`` for today, read from the snapshot.
+
+        Employees missing from the snapshot (today's cron has not run yet)
+        are computed on the fly.
+        """
+        today = fields.Date.today()
+        statuses = {
+            row.employee_id.id: row.status
+            for row in self.sudo().search_fetch(
+                [("date", "=", today), ("employee_id", "in", employees.ids)],
+                ["employee_id", "status"],
+            )
+        }
+        missing = employees.filtered(lambda employee: employee.id not in statuses)
+        if missing.ids:
+            statuses.update(self._statuses(today, missing))
+        return statuses
+
+    @api.model
+    def _search_today(self, statuses, operator, value):
+        """Employee domain on today's snapshot having one of ``statuses``.
+
+        Nothing is written here: employees without a row yet (today's cron
+        has not run) are computed on the fly, as the fields do, and matched
+        by id next to the indexed snapshot lookup.
+        """
+        if operator not in ("=", "!=") or not isinstance(value, bool):
+            raise NotImplementedError(f"Unsupported search: {operator} {value!r}")
+        today = fields.Date.today()
+        missing = self.env["hr.employee"].sudo().search(
+            [("availability_ids", "not any", [("date", "=", today)])]
+        )
+        computed = [
+            employee_id
+            for employee_id, status in (
+                self._statuses(today, missing) if missing else {}
+            ).items()
+            if status in statuses
+        ]
+        snapshot = [("date", "=", today), ("status", "in", statuses)]
+        if (operator == "=") == value:
+            return [
+                "|",
+                ("availability_ids", "any", snapshot),
+                ("id", "in", computed),
+            ]
+        return [
+            ("availability_ids", "not any", snapshot),
+            ("id", "not in", computed),
+        ]
+
+
+class HrAttendance(models.Model):
+    _inherit = "hr.attendance"
+
+    def _today_employees(self):
+        today = fields.Date.today()
+        return self.filtered(
+            lambda attendance: attendance.check_in
+            and attendance.check_in.date() == today
+        ).employee_id
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        attendances = super().create(vals_list)
+        self.env["qaco.employee.availability"]._refresh(
+            attendances._today_employees()
+        )
+        return attendances
+
+    def write(self, vals):
+        if "check_in" not in vals and "employee_id" not in vals:
+            return super().write(vals)
+        # Check-ins may move off today as well as onto it
+        employees = self._today_employees()
+        result = super().write(vals)
+        self.env["qaco.employee.availability"]._refresh(
+            employees | self._today_employees()
+        )
+        return result
+
+    def unlink(self):
+        employees = self._today_employees()
+        result = super().unlink()
+        self.env["qaco.employee.availability"]._refresh(employees)
+        return result
+
+
+class HrLeave(models.Model):
+    _inherit = "hr.leave"
+
+    _AVAILABILITY_FIELDS = {
+        "state",
+        "employee_id",
+        "request_date_from",
+        "request_date_to",
+    }
+
+    def _today_employees(self):
+        today = fields.Date.today()
+        return self.filtered(
+            lambda leave: leave.request_date_from
+            and leave.request_date_to
+            and leave.request_date_from <= today <= leave.request_date_to
+        ).employee_id
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        leaves = super().create(vals_list)
+        self.env["qaco.employee.availability"]._refresh(leaves._today_employees())
+        return leaves
+
+    def write(self, vals):
+        if not self._AVAILABILITY_FIELDS.intersection(vals):
+            return super().write(vals)
+        employees = self._today_employees()
+        result = super().write(vals)
+        self.env["qaco.employee.availability"]._refresh(
+            employees | self._today_employees()
+        )
+        return result
+
+    def unlink(self):
+        employees = self._today_employees()
+        result = super().unlink()
+        self.env["qaco.employee.availability"]._refresh(employees)
+        return result
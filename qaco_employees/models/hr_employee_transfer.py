@@ -1,8 +1,11 @@
 import logging
 
 from dateutil.relativedelta import relativedelta
-from odoo import _, api, fields, models
+from odoo import Command, _, api, fields, models
 from odoo.exceptions import AccessError, UserError, ValidationError
+from odoo.tools.sql import create_index
+
+from ..utils import geofence_sync
 
 _logger = logging.getLogger(__name__)
 
@@ -61,6 +64,40 @@ class HrEmployeeTransfer(models.Model):
         "BAKERTILLY-STATELIFE",
     ]
 
+    def init(self):
+        # Serves the current-deputation lookup and the expiry cron
+        create_index(
+            self._cr,
+            "hr_employee_transfer_deputation_index",
+            self._table,
+            ["employee_id", "state", "transfer_date_from", "transfer_date_to"],
+        )
+
+    @api.model
+    def _current_deputations(self, employee_ids):
+        """``{employee_id: transfer}``: each employee's current deputation.
+
+        The current deputation is the active approved or returned transfer
+        with the latest start date, resolved for all employees in one query.
+        """
+        if not employee_ids:
+            return {}
+        self.flush_model(["employee_id", "state", "active", "transfer_date_from"])
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT ON (employee_id) employee_id, id
+              FROM hr_employee_transfer
+             WHERE employee_id = ANY(%s)
+               AND state IN ('approved', 'returned')
+               AND active
+             ORDER BY employee_id, transfer_date_from DESC, id DESC
+            """,
+            [list(employee_ids)],
+        )
+        rows = self.env.cr.fetchall()
+        transfers = self.browse([transfer_id for _employee_id, transfer_id in rows])
+        return dict(zip([employee_id for employee_id, _id in rows], transfers))
+
     @api.constrains("transfer_date_from", "transfer_date_to")
     def _check_transfer_date_gap(self):
         """Ensure the date gap does not exceed allowed months.
@@ -105,16 +142,11 @@ class HrEmployeeTransfer(models.Model):
                     "Unallocated client not found. Please create 'UNALLOCATED' in Clients."
                 )
 
-            # ✅ Update employee's latest deputation client and change state to "Returned"
-            record.employee_id.write(
-                {
-                    "latest_deputation_client_id": unallocated_client.id,
-                    # ✅ Ensure latest work location updates to Unallocated
-                    "was_unallocated": True,  # ✅ Track that employee was unallocated
-                }
-            )
+            # ✅ Track that employee was unallocated
+            record.employee_id.write({"was_unallocated": True})
 
-            # ✅ Change the state to "Returned"
+            # ✅ Change the state to "Returned"; the employee's current
+            # deputation then resolves to Unallocated
             record.write({"state": "returned"})
 
     @api.model
@@ -137,46 +169,41 @@ class HrEmployeeTransfer(models.Model):
             )
             return
 
-        # ✅ Get the latest transfer for each employee
-        all_transfers = self.env["hr.employee.transfer"].search(
-            [("state", "in", ["approved", "returned"])], order="transfer_date_to desc"
+        # ✅ Only current deputations that ran out since the last run
+        employees = (
+            self.env["hr.employee"]
+            .with_context(active_test=False)
+            .search(
+                [
+                    ("current_transfer_id.state", "=", "approved"),
+                    ("current_transfer_id.transfer_date_to", "<", today),
+                ]
+            )
         )
-
-        latest_transfer_map = {}
-        for transfer in all_transfers:
-            emp_id = transfer.employee_id.id
-            if emp_id not in latest_transfer_map:
-                latest_transfer_map[emp_id] = transfer
-
-        # ✅ Process only if latest transfer is expired
-        transfers_to_unallocate = []
-        for transfer in latest_transfer_map.values():
-            if transfer.transfer_date_to < today:
-                transfers_to_unallocate.append(transfer)
-
-        for transfer in transfers_to_unallocate:
-            employee = transfer.employee_id
-
-            if employee.latest_deputation_client_id.id != unallocated_client.id:
-                employee.write(
+        expired = employees.current_transfer_id
+        if expired:
+            expired.write({"state": "returned"})
+            employees.write({"was_unallocated": True})
+
+            # ✅ Remove employees from their previous client's geofence
+            removed = {}
+            for transfer in expired:
+                removed.setdefault(transfer.to_client_id.name, []).append(
+                    transfer.employee_id.id
+                )
+            geofences = self.env["hr.attendance.geofence"].search(
+                [("name", "in", list(removed))]
+            )
+            for geofence in geofences:
+                geofence.write(
                     {
-                        "latest_deputation_client_id": unallocated_client.id,
-                        "was_unallocated": True,
+                        "employee_ids": [
+                            Command.unlink(employee_id)
+                            for employee_id in removed[geofence.name]
+                        ]
                     }
                 )
 
-            if transfer.state != "returned":
-                transfer.write({"state": "returned"})
-
-            # ✅ Remove employee from previous client's geofence (if exists)
-            from_client = transfer.to_client_id
-            if from_client:
-                geofence = self.env["hr.attendance.geofence"].search(
-                    [("name", "=", from_client.name)], limit=1
-                )
-                if geofence:
-                    geofence.write({"employee_ids": [(3, employee.id)]})
-
         # ✅ Now notify managers
         self.send_expiry_email_to_manager()
 
@@ -192,32 +219,16 @@ class HrEmployeeTransfer(models.Model):
                 "Unallocated client not found. Please create 'UNALLOCATED' in Clients."
             )
 
-        # ✅ Get all expired + returned transfers with active employees
-        returned_transfers = self.env["hr.employee.transfer"].search(
+        # ✅ Active employees whose current deputation expired and who are
+        # still unallocated
+        employees = self.env["hr.employee"].search(
             [
-                ("state", "=", "returned"),
-                ("transfer_date_to", "<", today),
-                ("employee_id.active", "=", True),  # ✅ Only include active employees
+                ("current_transfer_id.state", "=", "returned"),
+                ("current_transfer_id.transfer_date_to", "<", today),
+                ("latest_deputation_client_id", "=", unallocated_client.id),
             ]
         )
-
-        # ✅ Pick only the latest one per employee
-        latest_transfer_map = {}
-        for transfer in returned_transfers:
-            emp_id = transfer.employee_id.id
-            if (
-                emp_id not in latest_transfer_map
-                or transfer.transfer_date_to
-                > latest_transfer_map[emp_id].transfer_date_to
-            ):
-                latest_transfer_map[emp_id] = transfer
-
-        # ✅ Filter: only if employee is still unallocated
-        unallocated_transfers = [
-            t
-            for t in latest_transfer_map.values()
-            if t.employee_id.latest_deputation_client_id.id == unallocated_client.id
-        ]
+        unallocated_transfers = employees.current_transfer_id
 
         if not unallocated_transfers:
             return  # ✅ Nothing to email
@@ -229,26 +240,16 @@ class HrEmployeeTransfer(models.Model):
                 manager_email = transfer.manager_id.email
                 manager_dict.setdefault(manager_email, []).append(transfer)
 
-        # ✅ Send grouped email to each manager using QWeb template
+        # ✅ Queue one digest per manager; the outbox cron sends it
+        Outbox = self.env["qaco.hr.notification"]
         for manager_email, transfers in manager_dict.items():
-            email_body = self.env["ir.qweb"]._render(
-                "qaco_employees.email_transfer_expired",
-                {
-                    "manager_name": transfers[0].manager_id.name,
-                    "transfers": transfers,
-                },
-                minimal_qcontext=True,
+            Outbox.enqueue(
+                "deputation_expired",
+                transfers,
+                manager_email,
+                transfers[0].manager_id.name,
             )
 
-            mail_values = {
-                "subject": "Deputation Expired - Action Required",
-                "email_to": manager_email,
-                "email_from": self.env.user.email or "admin@company.com",
-                "body_html": email_body,
-            }
-
-            self.env["mail.mail"].sudo().create(mail_values).send()
-
     @api.depends("employee_id", "employee_id.parent_id")
     def _compute_manager(self):
         """Automatically assign manager from the employee's parent_id field"""
@@ -387,10 +388,8 @@ class HrEmployeeTransfer(models.Model):
             from_client = record.from_client_id
             work_from = record.work_from
 
-            # ✅ Update latest deputation client
-            employee.write(
-                {"latest_deputation_client_id": to_client.id, "was_unallocated": False}
-            )
+            # ✅ The approval updates the employee's current deputation
+            employee.write({"was_unallocated": False})
 
             geofence_model = self.env["hr.attendance.geofence"]
 
@@ -428,6 +427,8 @@ class HrEmployeeTransfer(models.Model):
                 if (today - geo.last_employee_removed_date).days >= 60:
                     geo.unlink()
 
+        self.send_email_to_employee()
+
     def action_reject(self):
         """Reject transfer request (Only the assigned manager can reject)"""
         for record in self:
@@ -546,60 +547,26 @@ class HrEmployeeTransfer(models.Model):
 
             reminder_dict[recipients_key].append(transfer)
 
+        # ✅ Queue the reminders; the outbox cron coalesces them per approver
+        Outbox = self.env["qaco.hr.notification"]
         for recipients, transfers in reminder_dict.items():
-            email_body = """
-            <html>
-            <head>
-                <style>
-                    body { font-family: Arial, sans-serif; }
-                    table { width: 100%; border-collapse: collapse; margin-top: 10px; }
-                    th, td { padding: 10px; border: 1px solid #dddddd; text-align: left; }
-                    th { background-color: #004080; color: white; font-weight: bold; }
-                    tr:nth-child(even) { background-color: #f2f2f2; }
-                </style>
-            </head>
-            <body>
-                <p>Dear Approver,</p>
-                <p>The following employee transfer requests are pending for approval:</p>
-                <table>
-                    <tr>
-                        <th>Employee</th>
-                        <th>From Client</th>
-                        <th>To Client</th>
-                        <th>Transfer Date</th>
-                    </tr>
-            """
-
-            for transfer in transfers:
-                email_body += f"""
-                    <tr>
-                        <td>{transfer.employee_id.name}</td>
-                        <td>{transfer.from_client_id.name or 'N/A'}</td>
-                        <td>{transfer.to_client_id.name}</td>
-                        <td>{transfer.transfer_date_from} - {transfer.transfer_date_to}</td>
-                    </tr>
-                """
-
-            email_body += """
-                </table>
-                <p>Please log in to Odoo to approve or reject these requests.</p>
-                <p>Best Regards,</p>
-                <p><strong>Odoo System</strong></p>
-            </body>
-            </html>
-            """
-
-            mail_values = {
-                "subject": f"⚠️ Action Required: {len(transfers)} Employee Transfers Pending Approval",
-                "email_to": recipients,
-                "email_from": self.env.user.email or "admin@company.com",
-                "body_html": email_body,
-            }
-
-            self.env["mail.mail"].sudo().create(mail_values).send()
+            for recipient in recipients.split(","):
+                Outbox.enqueue("transfer_pending", transfers, recipient, "Approver")
 
     def send_email_to_employee(self):
-        """Sends an email notification to the employee when their transfer is approved"""
+        """Notify the employee (and the CC recipients) of the approved transfer.
+
+        The notifications are queued in the HR outbox, so approving never
+        waits on the mail server.
+        """
+        cc_recipients = [
+            (rec.employee_id.work_email, rec.employee_id.name)
+            for rec in self.env["hr.transfer.cc.recipient"].search(
+                [("active", "=", True)]
+            )
+            if rec.employee_id.work_email
+        ]
+        Outbox = self.env["qaco.hr.notification"]
         for record in self:
             if not record.employee_id.work_email:
                 # ✅ If employee has no email, send a message in the Odoo chatter
@@ -608,107 +575,114 @@ class HrEmployeeTransfer(models.Model):
                     f"Please report on {record.transfer_date_from}.",
                     subtype_xmlid="mail.mt_comment",
                 )
-                continue  # ✅ Skip sending email
+            else:
+                Outbox.enqueue(
+                    "transfer_approved",
+                    record,
+                    record.employee_id.work_email,
+                    record.employee_id.name,
+                )
+        for email, name in cc_recipients:
+            Outbox.enqueue("transfer_approved", self, email, name)
 
-            # ✅ Ensure `to_client_id` exists to prevent empty fields
-            new_client = record.to_client_id.name if record.to_client_id else "N/A"
-            approving_manager = (
-                record.manager_id.name if record.manager_id else "HR Department"
-            )
+    @api.model
+    def reconcile_geofences(self):
+        """Monthly job: align client geofences with the current deputations.
 
-            cc_emails = ",".join(
-                rec.employee_id.work_email
-                for rec in self.env["hr.transfer.cc.recipient"].search(
-                    [("active", "=", True)]
-                )
-                if rec.employee_id.work_email
-            )
+        Geofences are loaded once and compared with the employees' current
+        deputation clients, including client geofences nobody is deputed to
+        any more; only the changed memberships are written, new client
+        geofences are created in one batch and geofences left empty for 60
+        days are deleted together. Returns the counts of changes.
+        """
+        geofence_model = self.env["hr.attendance.geofence"].with_context(
+            active_test=False
+        )
 
-            mail_values = {
-                "subject": f"🚀 Transfer Approved - {record.employee_id.name}",
-                "email_to": record.employee_id.work_email,  # Employee's work email
-                "email_cc": cc_emails,
-                "email_from": self.env.user.email or "admin@company.com",
-                "body_html": f"""
-                    <html>
-                    <head>
-                        <style>
-                            body {{ font-family: Arial, sans-serif; }}
-                            table {{ width: 100%; border-collapse: collapse; margin-top: 10px; }}
-                            th, td {{ 
-                                padding: 10px; 
-                                border: 1px solid #dddddd; 
-                                text-align: left; 
-                            }}
-                            th {{ background-color: #004080; color: white; font-weight: bold; }}
-                            tr:nth-child(even) {{ background-color: #f2f2f2; }}
-                        </style>
-                    </head>
-                    <body>
-                        <p>Dear {record.employee_id.name},</p>
-                        <p>Your transfer request has been <strong>approved</strong>. Below are the details:</p>
-                        <table>
-                            <tr>
-                                <th>Field</th>
-                                <th>Details</th>
-                            </tr>
-                            <tr><td><strong>Employee:</strong></td><td>{record.employee_id.name}</td></tr>
-                            <tr><td><strong>From Client:</strong></td><td>{record.from_client_id.name or 'N/A'}</td></tr>
-                            <tr><td><strong>To Client:</strong></td><td>{new_client}</td></tr>
-                            <tr><td><strong>Transfer Date:</strong></td><td>{record.transfer_date_from} - {record.transfer_date_to}</td></tr>
-                            <tr><td><strong>Reason:</strong></td><td>{record.reason}</td></tr>
-                            <tr><td><strong>Approved By:</strong></td><td>{approving_manager}</td></tr>
-                        </table>
-                        <p><strong>Please report to your new client as per the scheduled transfer date.</strong></p>
-                        <p>If you have any questions, please contact HR.</p>
-                        <p>Best Regards,</p>
-                        <p><strong>HR Department</strong></p>
-                    </body>
-                    </html>
-                """,
-            }
+        # ✅ Client name -> employees currently deputed there
+        wanted = {}
+        for employee in self.env["hr.employee"].search_fetch(
+            [
+                ("latest_deputation_client_id", "!=", False),
+                (
+                    "latest_deputation_client_id.name",
+                    "not in",
+                    HrEmployeeTransfer.restricted_clients,
+                ),
+            ],
+            ["latest_deputation_client_id"],
+        ):
+            wanted.setdefault(employee.latest_deputation_client_id.name, set()).add(
+                employee.id
+            )
 
-            # ✅ Send the email
-            self.env["mail.mail"].sudo().create(mail_values).send()
+        # ✅ Every client anyone was ever deputed to: their geofences are
+        # emptied once nobody is deputed there; office geofences are not clients
+        clients = {
+            client.name
+            for [client] in self._read_group([], ["to_client_id"])
+            if client.name not in HrEmployeeTransfer.restricted_clients
+        }
 
-    @api.model
-    def reconcile_geofences(self):
-        """Monthly job: clean up and regenerate geofences based on current deputations."""
-        geofence_model = self.env["hr.attendance.geofence"]
-        employee_model = self.env["hr.employee"]
-
-        # ✅ Map of client name -> list of employee IDs
-        client_map = {}
-        employees = employee_model.search(
-            [("latest_deputation_client_id", "!=", False)]
+        # ✅ Geofence name -> record; on duplicate names the oldest active one
+        # wins, so an archived geofence cannot shadow the live one
+        has_active = "active" in geofence_model._fields
+        geofences = {}
+        for geofence in geofence_model.search_fetch(
+            [],
+            ["name", "employee_ids"] + (["active"] if has_active else []),
+            order="id",
+        ):
+            chosen = geofences.get(geofence.name)
+            if not chosen or (has_active and geofence.active and not chosen.active):
+                geofences[geofence.name] = geofence
+        plan = geofence_sync.plan(
+            {name: set(geo.employee_ids.ids) for name, geo in geofences.items()},
+            wanted,
+            clients,
         )
-        for emp in employees:
-            client = emp.latest_deputation_client_id
-            if client and client.name not in HrEmployeeTransfer.restricted_clients:
-                client_map.setdefault(client.name, []).append(emp.id)
-
-        # ✅ Ensure each client with employees has a geofence with employees assigned
-        for client_name, emp_ids in client_map.items():
-            geofence = geofence_model.search([("name", "=", client_name)], limit=1)
-            if geofence:
-                geofence.write({"employee_ids": [(6, 0, emp_ids)]})  # replace all
-            else:
-                geofence_model.create(
+
+        if plan.create:
+            geofence_model.create(
+                [
                     {
                         "name": client_name,
                         "description": f"Auto-created by cron for {client_name}",
-                        "employee_ids": [(6, 0, emp_ids)],
+                        "employee_ids": [Command.set(emp_ids)],
                     }
-                )
+                    for client_name, emp_ids in plan.create.items()
+                ]
+            )
+        for client_name in set(plan.add) | set(plan.remove):
+            geofences[client_name].write(
+                {
+                    "employee_ids": [
+                        Command.link(emp_id) for emp_id in plan.add.get(client_name, ())
+                    ]
+                    + [
+                        Command.unlink(emp_id)
+                        for emp_id in plan.remove.get(client_name, ())
+                    ]
+                }
+            )
 
-        # ✅ Delete geofences with no employees assigned
-        today = fields.Date.today()
-        empty_geofences = geofence_model.search(
-            [("employee_ids", "=", False), ("last_employee_removed_date", "!=", False)]
+        # ✅ Delete geofences left without employees for 60 days
+        expired = geofence_model.search(
+            [
+                ("employee_ids", "=", False),
+                ("last_employee_removed_date", "!=", False),
+                (
+                    "last_employee_removed_date",
+                    "<=",
+                    fields.Date.today() - relativedelta(days=60),
+                ),
+            ]
         )
-        for geo in empty_geofences:
-            if (today - geo.last_employee_removed_date).days >= 60:
-                geo.unlink()
+        expired.unlink()
+
+        report = dict(geofence_sync.summary(plan), deleted=len(expired))
+        _logger.info("Geofence reconciliation: %s", report)
+        return report
 
     work_from = fields.Selection(
         [
@@ -0,0 +1,188 @@
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.tools import split_every
+
+from ..utils import notification_outbox
+
+_logger = logging.getLogger(__name__)
+
+# Notification kind -> (digest template, subject for one / several transfers)
+KINDS = {
+    "transfer_approved": (
+        "qaco_employees.email_transfer_approved",
+        "🚀 Transfer Approved - {employee}",
+        "🚀 {count} Employee Transfers Approved",
+    ),
+    "deputation_expired": (
+        "qaco_employees.email_transfer_expired",
+        "Deputation Expired - Action Required",
+        "Deputation Expired - Action Required",
+    ),
+    "transfer_pending": (
+        "qaco_employees.email_transfer_pending",
+        "⚠️ Action Required: 1 Employee Transfer Pending Approval",
+        "⚠️ Action Required: {count} Employee Transfers Pending Approval",
+    ),
+}
+
+
+class QacoHrNotification(models.Model):
+    _name = "qaco.hr.notification"
+    _description = "HR Notification Outbox"
+    _order = "id"
+    _rec_name = "email_to"
+
+    kind = fields.Selection(
+        [
+            ("transfer_approved", "Transfer Approved"),
+            ("deputation_expired", "Deputation Expired"),
+            ("transfer_pending", "Transfer Pending Approval"),
+        ],
+        required=True,
+    )
+    email_to = fields.Char(string="Recipient", required=True)
+    recipient_name = fields.Char()
+    transfer_id = fields.Many2one(
+        "hr.employee.transfer", required=True, ondelete="cascade"
+    )
+    state = fields.Selection(
+        [("pending", "Pending"), ("sent", "Sent"), ("failed", "Failed")],
+        default="pending",
+        required=True,
+        index=True,
+    )
+    attempts = fields.Integer(readonly=True)
+    next_attempt = fields.Datetime(readonly=True)
+    mail_id = fields.Many2one("mail.mail", string="Digest", ondelete="set null")
+
+    @api.model
+    def enqueue(self, kind, transfers, email_to, recipient_name=False):
+        """Queue a ``kind`` notification of ``transfers`` for ``email_to``.
+
+        Nothing is rendered or sent here: the flush cron coalesces the
+        queue into one digest per recipient.
+        """
+        return self.sudo().create(
+            [
+                {
+                    "kind": kind,
+                    "email_to": email_to,
+                    "recipient_name": recipient_name,
+                    "transfer_id": transfer.id,
+                }
+                for transfer in transfers
+            ]
+        )
+
+    def _digest_values(self, kind, email_to):
+        template, subject_one, subject_many = KINDS[kind]
+        transfers = self.transfer_id
+        subject = (subject_one if len(transfers) == 1 else subject_many).format(
+            employee=transfers[:1].employee_id.name, count=len(transfers)
+        )
+        recipient_name = self[:1].recipient_name or "Team"
+        return {
+            "subject": subject,
+            "email_to": email_to,
+            # Digests are sent by the cron (root): use the company's address
+            "email_from": self.env.company.email_formatted,
+            "body_html": self.env["ir.qweb"]._render(
+                template,
+                {
+                    "recipient_name": recipient_name,
+                    "manager_name": recipient_name,
+                    "transfers": transfers,
+                },
+                minimal_qcontext=True,
+            ),
+            "auto_delete": True,
+        }
+
+    @api.model
+    def _cron_flush(self, batch_size=100):
+        """Send the queued notifications as digests.
+
+        Digests are created in one batch and sent ``batch_size`` at a time;
+        each ``mail.mail.send()`` call reuses one SMTP connection for its
+        batch. Each digest is rendered in a savepoint, so one that fails to
+        render does not hold back the others. Notifications of digests that
+        failed to render or send count an attempt and are queued again with
+        a backoff.
+        """
+        now = fields.Datetime.now()
+        queued = self.sudo().search(
+            [
+                ("state", "=", "pending"),
+                "|",
+                ("next_attempt", "=", False),
+                ("next_attempt", "<=", now),
+            ]
+        )
+        if not queued:
+            return
+        digests = notification_outbox.digests(
+            notification_outbox.Notification(row.id, row.kind, row.email_to)
+            for row in queued
+        )
+        rows, values = [], []
+        for digest in digests:
+            notifications = self.sudo().browse(digest.ids)
+            try:
+                with self.env.cr.savepoint():
+                    values.append(
+                        notifications._digest_values(digest.kind, digest.email_to)
+                    )
+            except Exception:
+                _logger.exception(
+                    "HR outbox: could not render the %s digest for %s",
+                    digest.kind,
+                    digest.email_to,
+                )
+                continue
+            rows.append(notifications)
+        mails = self.env["mail.mail"].sudo().create(values)
+        for notifications, mail in zip(rows, mails):
+            notifications.write({"mail_id": mail.id})
+        for batch in split_every(batch_size, mails.ids, self.env["mail.mail"].browse):
+            batch.send(raise_exception=False)
+
+        # Auto-deleted mails were sent; the ones left in exception failed
+        failed = mails.exists().filtered(lambda mail: mail.state == "exception")
+        # Notifications whose digest did not render are retried below
+        sent = self.sudo().concat(*rows).filtered(lambda row: row.mail_id not in failed)
+        sent.write({"state": "sent", "next_attempt": False})
+        for row in queued - sent:
+            attempts = row.attempts + 1
+            retry = notification_outbox.retry_at(now, attempts)
+            row.write(
+                {
+                    "attempts": attempts,
+                    "state": "pending" if retry else "failed",
+                    "next_attempt": retry,
+                    "mail_id": False,
+                }
+            )
+        failed.unlink()
+        _logger.info(
+            "HR outbox: %s notifications in %s digests, %s failed",
+            len(queued),
+            len(mails),
+            len(queued - sent),
+        )
+
+    @api.autovacuum
+    def _gc_done(self):
+        """Drop sent and abandoned notifications after a while."""
+        self.sudo().search(
+            [
+                ("state", "in", ("sent", "failed")),
+                (
+                    "write_date",
+                    "<",
+                    fields.Datetime.now()
+                    - timedelta(days=notification_outbox.KEEP_DAYS),
+                ),
+            ]
+        ).unlink()
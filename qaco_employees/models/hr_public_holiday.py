@@ -1,4 +1,4 @@
-from odoo import fields, models
+from odoo import api, fields, models
 
 
 class HrPublicHoliday(models.Model):
@@ -14,6 +14,14 @@ class HrPublicHoliday(models.Model):
         string="Status",
         tracking=True,
     )
+    region_ids = fields.Many2many(
+        "qaco.region",
+        string="Regions",
+        help="Regions observing this holiday. Leave empty for a firm-wide holiday.",
+    )
+
+    # Fields the cached working-day calendar is built from
+    _CALENDAR_FIELDS = {"date", "state", "region_ids"}
 
     def action_approve(self):
         for rec in self:
@@ -22,3 +30,24 @@ class HrPublicHoliday(models.Model):
     def action_reset_to_draft(self):
         for rec in self:
             rec.state = "draft"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        if any(record.state == "approved" for record in records):
+            self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        if self._CALENDAR_FIELDS & set(vals):
+            # Approve/reset and moved holidays change the working-day bitmaps
+            self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        approved = any(record.state == "approved" for record in self)
+        result = super().unlink()
+        if approved:
+            self.env.registry.clear_cache()
+        return result
@@ -217,22 +217,19 @@ class LeaveAdjustment(models.Model):
                 )
 
     def update_leave_summary(self):
-        for record in self:
-            summary = (
-                self.env["leave.summary"]
-                .sudo()
-                .create(
-                    {
-                        "employee_id": record.employee_id.id,
-                        "event_date": record.adjustment_date,
-                        "leave_adjustment": record.adjustment,
-                        "adjustment_ref_id": record.id,
-                        "is_monthly_summary": False,
-                    }
-                )
-            )
-
-            summary._cascade_update_future_months()
+        # Creating the summaries rebuilds the employees' leave ledgers
+        self.env["leave.summary"].sudo().create(
+            [
+                {
+                    "employee_id": record.employee_id.id,
+                    "event_date": record.adjustment_date,
+                    "leave_adjustment": record.adjustment,
+                    "adjustment_ref_id": record.id,
+                    "is_monthly_summary": False,
+                }
+                for record in self
+            ]
+        )
 
     @api.onchange("employee_id")
     def _onchange_employee_set_approvers(self):
@@ -299,8 +296,7 @@ class LeaveAdjustment(models.Model):
         )
         if not validator or not validator.approve_token:
             return ""
-        base_url = self.env["ir.config_parameter"].sudo().get_param("web.base.url")
-        return f"{base_url}/leave_adjustment/approve/{validator.approve_token}"
+        return self.env["qaco.approval.token"].url(validator, "approve")
 
     def get_refusal_url_for(self, user_id):
         self.ensure_one()
@@ -311,8 +307,7 @@ class LeaveAdjustment(models.Model):
         )
         if not validator or not validator.approve_token:
             return ""
-        base_url = self.env["ir.config_parameter"].sudo().get_param("web.base.url")
-        return f"{base_url}/leave_adjustment/refuse/{validator.approve_token}"
+        return self.env["qaco.approval.token"].url(validator, "refuse")
 
     def get_revert_url_for(self, user_id):
         self.ensure_one()
@@ -323,8 +318,7 @@ class LeaveAdjustment(models.Model):
         )
         if not validator or not validator.approve_token:
             return ""
-        base_url = self.env["ir.config_parameter"].sudo().get_param("web.base.url")
-        return f"{base_url}/leave_adjustment/revert/{validator.approve_token}"
+        return self.env["qaco.approval.token"].url(validator, "revert")
 
     def get_transfer_url_for(self, user_id):
         self.ensure_one()
@@ -335,8 +329,7 @@ class LeaveAdjustment(models.Model):
         )
         if not validator or not validator.approve_token:
             return ""
-        base_url = self.env["ir.config_parameter"].sudo().get_param("web.base.url")
-        return f"{base_url}/leave_adjustment/transfer/{validator.approve_token}"
+        return self.env["qaco.approval.token"].url(validator, "transfer")
 
     def get_record_url(self):
         base_url = self.env["ir.config_parameter"].sudo().get_param("web.base.url")
@@ -58,8 +58,9 @@ class LeaveAllowance(models.Model):
             if not record.employee_id or not record.from_date:
                 continue
 
-            # ✅ Create the summary without setting allowed_leaves manually
-            summary = self.env["leave.summary"].create(
+            # ✅ Creating the summary rebuilds the employee's leave ledger,
+            # including allowed leaves from the approved allowances
+            self.env["leave.summary"].create(
                 {
                     "employee_id": record.employee_id.id,
                     "event_date": record.from_date,
@@ -67,13 +68,6 @@ class LeaveAllowance(models.Model):
                 }
             )
 
-            # ✅ Force recompute and store result
-            summary.with_context(force_recompute=True)._compute_allowed_leaves()
-            summary.write({"allowed_leaves": summary.allowed_leaves})
-
-            # ✅ Cascade to future summaries
-            summary._cascade_update_future_months()
-
     def action_reset_to_draft(self):
         if not (
             self.env.user.has_group("qaco_employees.group_qaco_employee_hr_manager")
@@ -88,53 +82,16 @@ class LeaveAllowance(models.Model):
 
         for rec in self:
             rec.state = "draft"
-            summaries = self.env["leave.summary"].search(
+            # Unlinking the allowance's summaries rebuilds the ledger
+            self.env["leave.summary"].search(
                 [
                     ("employee_id", "=", rec.employee_id.id),
                     ("allowance_ref_id", "=", rec.id),
                 ]
-            )
-            summary_dates = summaries.mapped("event_date")
-            summaries.unlink()
-
-            # Recompute future summaries that depended on this allowance
-            if summary_dates:
-                min_date = min(summary_dates)
-                future_summaries = self.env["leave.summary"].search(
-                    [
-                        ("employee_id", "=", rec.employee_id.id),
-                        ("event_date", ">", min_date),
-                    ]
-                )
-                previous = self.env["leave.summary"].search(
-                    [
-                        ("employee_id", "=", rec.employee_id.id),
-                        ("event_date", "<", min_date),
-                    ],
-                    order="event_date desc",
-                    limit=1,
-                )
-
-                for summary in future_summaries:
-                    summary.opening_leaves = (
-                        previous.closing_leaves if previous else 0.0
-                    )
-                    summary.with_context(force_recompute=True)._compute_allowed_leaves()
-                    if summary.is_monthly_summary:
-                        summary._compute_approved_leaves()
-                    summary._compute_absent_days()
-                    summary._compute_closing_leaves()
-                    summary._compute_remaining_leaves()
+            ).unlink()
 
-                    # ✅ Persist the recomputed values with skip_cascade
-                    summary.with_context(skip_cascade=True).write(
-                        {
-                            "opening_leaves": summary.opening_leaves,
-                            "closing_leaves": summary.closing_leaves,
-                            "remaining_leaves": summary.remaining_leaves,
-                        }
-                    )
-                    previous = summary
+        # Allowed leaves change even for employees without a linked summary
+        self.env["leave.summary"]._recompute_leave_ledger(self.employee_id.ids)
 
     @api.constrains("employee_id", "from_date", "to_date")
     def _check_duplicate_period(self):
@@ -335,8 +335,7 @@ class LeaveCondonation(models.Model):
         )
         if not validator or not validator.approve_token:
             return ""
-        base_url = self.env["ir.config_parameter"].sudo().get_param("web.base.url")
-        return f"{base_url}/leave_condonation/approve/{validator.approve_token}"
+        return self.env["qaco.approval.token"].url(validator, "approve")
 
     def get_refusal_url_for(self, user_id):
         self.ensure_one()
@@ -347,8 +346,7 @@ class LeaveCondonation(models.Model):
         )
         if not validator or not validator.approve_token:
             return ""
-        base_url = self.env["ir.config_parameter"].sudo().get_param("web.base.url")
-        return f"{base_url}/leave_condonation/refuse/{validator.approve_token}"
+        return self.env["qaco.approval.token"].url(validator, "refuse")
 
     def get_revert_url_for(self, user_id):
         self.ensure_one()
@@ -359,8 +357,7 @@ class LeaveCondonation(models.Model):
         )
         if not validator or not validator.approve_token:
             return ""
-        base_url = self.env["ir.config_parameter"].sudo().get_param("web.base.url")
-        return f"{base_url}/leave_condonation/revert/{validator.approve_token}"
+        return self.env["qaco.approval.token"].url(validator, "revert")
 
     def get_record_url(self):
         base_url = self.env["ir.config_parameter"].sudo().get_param("web.base.url")
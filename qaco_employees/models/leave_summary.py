@@ -3,10 +3,14 @@ import calendar
 import logging
 from datetime import timedelta
 
+from collections import defaultdict
+
 from dateutil.relativedelta import relativedelta
 from odoo import api, fields, models
 from odoo.tools import format_date
 
+from ..utils import leave_ledger, working_days
+
 _logger = logging.getLogger(__name__)
 
 
@@ -63,192 +67,158 @@ class LeaveSummary(models.Model):
         ),
     ]
 
+    # Fields whose change moves the balances of later summaries
+    _LEDGER_INPUTS = {
+        "employee_id",
+        "event_date",
+        "active",
+        "leave_adjustment",
+        "approved_leaves",
+        "absent_days",
+        "opening_leaves",
+        "allowed_leaves",
+        "closing_leaves",
+        "remaining_leaves",
+    }
+
     def action_archive(self):
         self.write({"active": False})
 
     def action_recompute(self):
         """Manual recompute of key fields for HR/Admin.
-        - Recomputes opening, allowed, approved (if monthly), absences, closing, remaining
-        - Persists values and cascades to future months
+        - Recomputes approved (if monthly) and absences of the selected summaries
+        - Rebuilds the opening, allowed, closing and remaining chain of their employees
         Supports multi-selection (recordset)."""
-        for record in self.sudo():
-            # Opening may change if previous records changed
-            record._set_opening_based_on_previous()
-            # Allowed leaves might change due to allowance updates
-            record._compute_allowed_leaves()
-            # Monthly summaries include approved leave days
-            if record.is_monthly_summary:
-                record._compute_approved_leaves()
-            # Always recompute absences
-            record._compute_absent_days()
-            # Totals
-            record._compute_closing_leaves()
-            record._compute_remaining_leaves()
-
-            # Persist stored values with skip_cascade to avoid duplicate cascading
-            record.with_context(skip_cascade=True).write(
-                {
-                    "opening_leaves": record.opening_leaves,
-                    "closing_leaves": record.closing_leaves,
-                    "remaining_leaves": record.remaining_leaves,
-                }
-            )
+        records = self.sudo().with_context(skip_cascade=True)
+        # Monthly summaries include approved leave days
+        records.filtered("is_monthly_summary")._compute_approved_leaves()
+        # Always recompute absences
+        records._compute_absent_days()
 
+        self._recompute_leave_ledger(self.employee_id.ids)
+
+        for record in records:
             # Optional log for traceability
             try:
                 record.message_post(body="Leave summary recomputed by user")
             except Exception:
                 # In case chatter is not available in some contexts
                 _logger.info("Leave summary %s recomputed", record.id)
-
-        # Propagate recalculations to future months for impacted employees (once at the end)
-        self._cascade_update_future_months()
         return True
 
-    @api.depends("employee_id", "event_date")
-    def _compute_approved_leaves(self):
+    def _month_groups(self):
+        """Monthly summaries with an employee and date, grouped by month start."""
+        groups = defaultdict(lambda: self.browse())
         for record in self:
-            if not record.is_monthly_summary:
-                record.approved_leaves = 0.0
-                continue
+            if record.is_monthly_summary and record.employee_id and record.event_date:
+                groups[record.event_date.replace(day=1)] |= record
+        return groups
 
-            month_start = record.event_date.replace(day=1)
-            month_end = (month_start + relativedelta(months=1)) - timedelta(days=1)
+    @api.model
+    def _month_accounting(self, month_start, employees):
+        """Approved leave and absence days of ``employees`` for one month.
 
-            # Workdays in the month (Mon–Fri)
-            workdays = set(
-                month_start + timedelta(days=i)
-                for i in range((month_end - month_start).days + 1)
-                if (month_start + timedelta(days=i)).weekday() < 5
+        Validated leave overlaps, attendance check-in days and event-level
+        summaries of all employees are loaded in one query each, and the days
+        are counted on the working-day calendar of each employee's region.
+        Returns ``{employee_id: (approved_leaves, absent_days)}``.
+        """
+        month_end = (month_start + relativedelta(months=1)) - timedelta(days=1)
+        employee_ids = employees.ids
+        Calendar = self.env["qaco.working.calendar"]
+        windows = {}
+
+        leave_spans = defaultdict(list)
+        for leave in self.env["hr.leave"].search_fetch(
+            [
+                ("employee_id", "in", employee_ids),
+                ("state", "=", "validate"),
+                ("request_date_from", "<=", month_end),
+                ("request_date_to", ">=", month_start),
+            ],
+            ["employee_id", "request_date_from", "request_date_to"],
+        ):
+            leave_spans[leave.employee_id.id].append(
+                (leave.request_date_from, leave.request_date_to)
             )
-            # Exclude approved public holidays from workdays
-            holiday_dates = {
-                h.date
-                for h in self.env["hr.public.holiday"].search(
-                    [
-                        ("date", ">=", month_start),
-                        ("date", "<=", month_end),
-                        ("state", "=", "approved"),
-                    ]
-                )
-            }
-            workdays = {d for d in workdays if d not in holiday_dates}
 
-            # Expand already counted days from non-monthly leave summaries
-            existing_events = (
-                self.env["leave.summary"]
-                .sudo()
-                .search(
-                    [
-                        ("employee_id", "=", record.employee_id.id),
-                        ("is_monthly_summary", "=", False),
-                        ("event_date", ">=", month_start),
-                        ("event_date", "<=", month_end),
-                        ("approved_leaves", ">", 0),
-                    ]
-                )
-            )
-            already_counted_dates = set()
-            for ev in existing_events:
-                # Expand to working dates starting from the event date, skipping weekends/holidays
-                remaining = int(ev.approved_leaves)
-                cur = ev.event_date
-                while remaining > 0 and cur <= month_end:
-                    if cur in workdays:
-                        already_counted_dates.add(cur)
-                        remaining -= 1
-                    cur += timedelta(days=1)
-
-            leaves = self.env["hr.leave"].search(
+        # Attended days (inclusive of the last day)
+        attendance_days = defaultdict(set)
+        for attendance in self.env["hr.attendance"].search_fetch(
+            [
+                ("employee_id", "in", employee_ids),
+                ("check_in", ">=", month_start),
+                ("check_in", "<", month_end + timedelta(days=1)),
+            ],
+            ["employee_id", "check_in"],
+        ):
+            attendance_days[attendance.employee_id.id].add(attendance.check_in.date())
+
+        # Working days already counted by event-level summaries, which start
+        # at the event date and skip weekends/holidays
+        events = defaultdict(list)
+        for event in (
+            self.env["leave.summary"]
+            .sudo()
+            .search_fetch(
                 [
-                    ("employee_id", "=", record.employee_id.id),
-                    ("state", "=", "validate"),
-                    ("request_date_from", "<=", month_end),
-                    ("request_date_to", ">=", month_start),
-                ]
+                    ("employee_id", "in", employee_ids),
+                    ("is_monthly_summary", "=", False),
+                    ("event_date", ">=", month_start),
+                    ("event_date", "<=", month_end),
+                    ("approved_leaves", ">", 0),
+                ],
+                ["employee_id", "event_date", "approved_leaves"],
+            )
+        ):
+            events[event.employee_id.id].append(
+                (event.event_date, event.approved_leaves)
             )
 
-            total_days = 0.0
-            for leave in leaves:
-                start = max(leave.request_date_from, month_start)
-                end = min(leave.request_date_to, month_end)
-                leave_dates = set(
-                    start + timedelta(days=i) for i in range((end - start).days + 1)
-                )
+        result = {}
+        for employee in employees:
+            region_id = employee.region_id.id
+            if region_id not in windows:
+                windows[region_id] = Calendar.window(month_start, month_end, region_id)
+            window = windows[region_id]
+            counted = 0
+            for event_date, days in events[employee.id]:
+                counted |= window.first_working(event_date, days)
+            on_leave = 0
+            for leave_from, leave_to in leave_spans[employee.id]:
+                on_leave |= window.span(leave_from, leave_to)
+            # Count only working days not already counted by event-level
+            # summaries; a check-in on a working day is never an absence
+            approved = on_leave & window.working & ~counted
+            absent = window.working & ~window.days(attendance_days[employee.id])
+            result[employee.id] = (
+                float(working_days.count(approved)),
+                float(working_days.count(absent & ~on_leave)),
+            )
+        return result
 
-                # Count only working days not already counted by event-level summaries
-                to_count = (leave_dates & workdays) - already_counted_dates
-                total_days += len(to_count)
+    @api.depends("employee_id", "event_date")
+    def _compute_approved_leaves(self):
+        groups = self._month_groups()
+        for record in self - self.browse().union(*groups.values()):
+            record.approved_leaves = 0.0
 
-            record.approved_leaves = total_days
+        for month_start, records in groups.items():
+            accounting = self._month_accounting(month_start, records.employee_id)
+            for record in records:
+                record.approved_leaves = accounting[record.employee_id.id][0]
 
     @api.depends("employee_id", "event_date")
     def _compute_absent_days(self):
-        Attendance = self.env["hr.attendance"]
-        Leave = self.env["hr.leave"]
-
-        for record in self:
-            # ⛔ Skip computing absences unless it's a monthly summary
-            if not record.is_monthly_summary:
-                record.absent_days = 0.0
-                continue
+        groups = self._month_groups()
+        # ⛔ Skip computing absences unless it's a monthly summary
+        for record in self - self.browse().union(*groups.values()):
+            record.absent_days = 0.0
 
-            if not record.employee_id or not record.event_date:
-                record.absent_days = 0.0
-                continue
-
-            start_date = record.event_date.replace(day=1)
-            last_day = calendar.monthrange(start_date.year, start_date.month)[1]
-            end_date = start_date.replace(day=last_day)
-
-            leave_days = set()
-            approved_leaves = Leave.search(
-                [
-                    ("employee_id", "=", record.employee_id.id),
-                    ("state", "=", "validate"),
-                    ("request_date_from", "<=", end_date),
-                    ("request_date_to", ">=", start_date),
-                ]
-            )
-            for leave in approved_leaves:
-                current = max(start_date, leave.request_date_from)
-                while current <= min(end_date, leave.request_date_to):
-                    leave_days.add(current)
-                    current += timedelta(days=1)
-
-            attendance_days = set(
-                att.check_in.date()
-                for att in Attendance.search(
-                    [
-                        ("employee_id", "=", record.employee_id.id),
-                        ("check_in", ">=", start_date),
-                        ("check_in", "<", end_date + timedelta(days=1)),
-                    ]
-                )
-            )
-
-            holiday_dates = {
-                h.date
-                for h in self.env["hr.public.holiday"].search(
-                    [
-                        ("date", ">=", start_date),
-                        ("date", "<=", end_date),
-                        ("state", "=", "approved"),
-                    ]
-                )
-            }
-
-            working_days = {
-                (start_date + timedelta(days=i))
-                for i in range((end_date - start_date).days + 1)
-                if (start_date + timedelta(days=i)).weekday() < 5
-                and (start_date + timedelta(days=i)) not in holiday_dates
-            }
-
-            # If there is a check-in for a working day, never count it as absent
-            # Count exact number of absent working days (no artificial multiplier)
-            actual_absents = working_days - attendance_days - leave_days
-            record.absent_days = float(len(actual_absents))
+        for month_start, records in groups.items():
+            accounting = self._month_accounting(month_start, records.employee_id)
+            for record in records:
+                record.absent_days = accounting[record.employee_id.id][1]
 
     def _compute_closing_leaves(self):
         for record in self:
@@ -286,146 +256,129 @@ class LeaveSummary(models.Model):
     def create_monthly_summaries(self):
         today = fields.Date.context_today(self)
         last_month = today.replace(day=1) - relativedelta(months=1)
-        month_start = last_month
-        month_end = (month_start + relativedelta(months=1)) - timedelta(days=1)
-
-        employees = self.env["hr.employee"].search([])
+        return self._generate_monthly_summaries(last_month)
 
-        for emp in employees:
-            # Check if summary for this employee/month already exists
-            existing = (
-                self.env["leave.summary"]
-                .sudo()
-                .search(
-                    [
-                        ("employee_id", "=", emp.id),
-                        ("is_monthly_summary", "=", True),
-                        ("event_date", ">=", month_start),
-                        ("event_date", "<=", month_end),
-                    ],
-                    limit=1,
-                )
-            )
-
-            if existing:
-                continue
-
-            # Calculate workdays (Mon–Fri)
-            holiday_dates = {
-                h.date
-                for h in self.env["hr.public.holiday"].search(
-                    [
-                        ("date", ">=", month_start),
-                        ("date", "<=", month_end),
-                        ("state", "=", "approved"),
-                    ]
-                )
-            }
-
-            workdays = set(
-                month_start + timedelta(days=i)
-                for i in range((month_end - month_start).days + 1)
-                if (month_start + timedelta(days=i)).weekday() < 5
-                and (month_start + timedelta(days=i)) not in holiday_dates
-            )
-
-            # Attended days (inclusive of the last day)
-            attended_days = set(
-                att.check_in.date()
-                for att in self.env["hr.attendance"].search(
-                    [
-                        ("employee_id", "=", emp.id),
-                        ("check_in", ">=", month_start),
-                        ("check_in", "<", month_end + timedelta(days=1)),
-                    ]
-                )
-            )
-
-            # Approved leave days
-            leave_days = set()
-            approved_leaves = self.env["hr.leave"].search(
-                [
-                    ("employee_id", "=", emp.id),
-                    ("state", "=", "validate"),
-                    ("request_date_from", "<=", month_end),
-                    ("request_date_to", ">=", month_start),
-                ]
-            )
-            for leave in approved_leaves:
-                start = max(leave.request_date_from, month_start)
-                end = min(leave.request_date_to, month_end)
-                leave_days |= set(
-                    start + timedelta(days=i) for i in range((end - start).days + 1)
-                )
-
-            # Calculate absents
-            absent_days = workdays - attended_days - leave_days
-
-            if absent_days:
-                self.env["leave.summary"].sudo().create(
-                    {
-                        "employee_id": emp.id,
-                        "event_date": month_end,
-                        "absent_days": len(absent_days),
-                        "is_monthly_summary": True,
-                    }
-                )
+    @api.model
+    def _generate_monthly_summaries(self, month_start, employees=None):
+        """Create the monthly summaries of ``month_start`` for all employees at once.
 
-    def _cascade_update_future_months(self):
-        """
-        Cascade updates to future leave summaries for the same employee.
-        Optimized to batch process updates and prevent infinite recursion.
+        Employees that already have a summary for the month are skipped, and a
+        summary is only created when the employee has absences. Approved
+        leave and absences come from :meth:`_month_accounting`; the new rows
+        are created in one call, which brings the leave ledger up to date.
         """
-        for record in self:
-            if not record.event_date or not record.employee_id:
-                continue
+        month_end = (month_start + relativedelta(months=1)) - timedelta(days=1)
+        if employees is None:
+            employees = self.env["hr.employee"].search([])
 
-            # Fetch all future summaries at once
-            future_summaries = self.sudo().search(
+        Summary = self.env["leave.summary"].sudo()
+        done = {
+            summary.employee_id.id
+            for summary in Summary.search_fetch(
                 [
-                    ("employee_id", "=", record.employee_id.id),
-                    ("event_date", ">", record.event_date),
+                    ("employee_id", "in", employees.ids),
+                    ("is_monthly_summary", "=", True),
+                    ("event_date", ">=", month_start),
+                    ("event_date", "<=", month_end),
                 ],
-                order="event_date",
+                ["employee_id"],
             )
+        }
+        employees = employees.filtered(lambda employee: employee.id not in done)
+        accounting = self._month_accounting(month_start, employees)
+
+        vals_list = [
+            {
+                "employee_id": employee.id,
+                "event_date": month_end,
+                "approved_leaves": accounting[employee.id][0],
+                "absent_days": accounting[employee.id][1],
+                "is_monthly_summary": True,
+            }
+            for employee in employees
+            if accounting[employee.id][1]
+        ]
+        if not vals_list:
+            return Summary
+        return Summary.with_context(tracking_disable=True).create(vals_list)
 
-            if not future_summaries:
-                continue
-
-            # Process in batches to avoid long-running transactions
-            batch_size = 50  # Process 50 records at a time
-            previous = record
-
-            for i in range(0, len(future_summaries), batch_size):
-                batch = future_summaries[i : i + batch_size]
-
-                for summary in batch:
-                    summary.opening_leaves = previous.closing_leaves
-                    if hasattr(summary, "_compute_allowed_leaves"):
-                        summary._compute_allowed_leaves()
-
-                    if summary.is_monthly_summary:
-                        summary._compute_approved_leaves()
-
-                    summary._compute_absent_days()
-                    summary._compute_closing_leaves()
-                    summary._compute_remaining_leaves()
-
-                    # ✅ Use skip_cascade context to prevent infinite recursion
-                    summary.with_context(skip_cascade=True).write(
-                        {
-                            "opening_leaves": summary.opening_leaves,
-                            "closing_leaves": summary.closing_leaves,
-                            "remaining_leaves": summary.remaining_leaves,
-                        }
-                    )
+    @api.model
+    def _recompute_leave_ledger(self, employee_ids):
+        """Recompute the leave chains of ``employee_ids`` in one pass.
 
-                    previous = summary
+        Reads every active summary of the employees in one query and their
+        approved allowances in another, rebuilds each opening -> closing chain
+        in memory and writes the summaries whose balances changed with a
+        single UPDATE, inside the caller's transaction.
+        """
+        employee_ids = list(set(filter(None, employee_ids)))
+        if not employee_ids:
+            return self.browse()
+        Summary = self.sudo()
+        fnames = list(leave_ledger.BALANCE_FIELDS)
+        summaries = Summary.search_fetch(
+            [("employee_id", "in", employee_ids)],
+            [
+                "employee_id",
+                "leave_adjustment",
+                "approved_leaves",
+                "absent_days",
+            ]
+            + fnames,
+            order="event_date, id",
+        )
+        allowed = {
+            employee.id: total
+            for employee, total in self.env["leave.allowance"]
+            .sudo()
+            ._read_group(
+                [("employee_id", "in", employee_ids), ("state", "=", "approved")],
+                ["employee_id"],
+                ["allowed_leaves:sum"],
+            )
+        }
+        entries = defaultdict(list)
+        for summary in summaries:
+            entries[summary.employee_id.id].append(
+                leave_ledger.Entry(
+                    summary.id,
+                    summary.leave_adjustment,
+                    summary.approved_leaves,
+                    summary.absent_days,
+                    summary.opening_leaves,
+                    summary.allowed_leaves,
+                    summary.closing_leaves,
+                    summary.remaining_leaves,
+                )
+            )
+        changed = leave_ledger.ledger_changes(entries, allowed)
+        if not changed:
+            return self.browse()
 
-                # Commit after each batch (implicit via ORM)
-                self.env.cr.commit()
+        records = Summary.browse([balance.id for balance in changed])
+        records.flush_recordset(fnames)
+        self.env.cr.execute(
+            """
+            UPDATE leave_summary AS s
+               SET opening_leaves = v.opening,
+                   allowed_leaves = v.allowed,
+                   closing_leaves = v.closing,
+                   remaining_leaves = v.remaining,
+                   write_uid = %s,
+                   write_date = (now() at time zone 'UTC')
+              FROM unnest(%s::int[], %s::float8[], %s::float8[], %s::float8[],
+                          %s::float8[]) AS v(id, opening, allowed, closing, remaining)
+             WHERE s.id = v.id
+            """,
+            [self.env.uid, *(list(column) for column in zip(*changed))],
+        )
+        records.invalidate_recordset(fnames + ["write_uid", "write_date"])
+        records.modified(fnames)
+        _logger.debug("Leave ledger: %s summaries updated", len(records))
+        return records
 
     def write(self, vals):
+        employee_ids = self.employee_id.ids if "employee_id" in vals else []
         result = super().write(vals)
 
         for record in self:
@@ -438,8 +391,9 @@ class LeaveSummary(models.Model):
                 # Clean-up action could be added here if desired
                 pass
 
-        if not self.env.context.get("skip_cascade"):
-            self._cascade_update_future_months()
+        moves_ledger = bool(self._LEDGER_INPUTS & set(vals))
+        if moves_ledger and not self.env.context.get("skip_cascade"):
+            self._recompute_leave_ledger(employee_ids + self.employee_id.ids)
 
         return result
 
@@ -452,120 +406,27 @@ class LeaveSummary(models.Model):
                 )
 
         records = super().create(vals_list)
-        for record, vals in zip(records, vals_list):
-            employee_id = vals.get("employee_id")
-            event_date = fields.Date.to_date(vals.get("event_date"))
-
-            record_sudo = record.sudo()
-
-            # 🔁 Step 1: Set initial values
-            record_sudo._set_opening_based_on_previous()
-            record_sudo._compute_allowed_leaves()
-            if record_sudo.is_monthly_summary:
-                record_sudo._compute_approved_leaves()
-            record_sudo._compute_absent_days()
-            record_sudo._compute_closing_leaves()
-            record_sudo._compute_remaining_leaves()
-
-            # ✅ Save the updated values with skip_cascade to prevent duplicate cascading
-            record_sudo.with_context(skip_cascade=True).write(
-                {
-                    "opening_leaves": record_sudo.opening_leaves,
-                    "closing_leaves": record_sudo.closing_leaves,
-                    "remaining_leaves": record_sudo.remaining_leaves,
-                }
-            )
-
-            # 🔁 Step 2: Cascade to future summaries
-            future_summaries = self.sudo().search(
-                [
-                    ("employee_id", "=", employee_id),
-                    ("event_date", ">", event_date),
-                ],
-                order="event_date",
-            )
-
-            previous = record_sudo
-            for summary in future_summaries:
-                summary.opening_leaves = previous.closing_leaves
-                summary._compute_allowed_leaves()
-                if summary.is_monthly_summary:
-                    summary._compute_approved_leaves()
-                summary._compute_absent_days()
-                summary._compute_closing_leaves()
-                summary._compute_remaining_leaves()
-                # ✅ Use skip_cascade to prevent recursive cascading
-                summary.with_context(skip_cascade=True).write(
-                    {
-                        "opening_leaves": summary.opening_leaves,
-                        "closing_leaves": summary.closing_leaves,
-                        "remaining_leaves": summary.remaining_leaves,
-                    }
-                )
-                previous = summary
 
+        # Approved leave of monthly summaries, unless given (absences are a
+        # stored compute and follow the same rule)
+        missing = [
+            record.id
+            for record, vals in zip(records, vals_list)
+            if record.is_monthly_summary and "approved_leaves" not in vals
+        ]
+        if missing:
+            self.sudo().with_context(skip_cascade=True).browse(
+                missing
+            )._compute_approved_leaves()
+        self._recompute_leave_ledger(records.employee_id.ids)
         return records
 
     def unlink(self):
-        affected_employees = {}
-        for record in self:
-            if record.employee_id and record.event_date:
-                affected_employees.setdefault(record.employee_id.id, []).append(
-                    record.event_date
-                )
-
+        employee_ids = self.employee_id.ids
         res = super().unlink()
-
-        for emp_id, event_dates in affected_employees.items():
-            min_date = min(event_dates)
-            future_summaries = (
-                self.env["leave.summary"]
-                .sudo()
-                .search(
-                    [("employee_id", "=", emp_id), ("event_date", ">", min_date)],
-                    order="event_date",
-                )
-            )
-
-            previous = (
-                self.env["leave.summary"]
-                .sudo()
-                .search(
-                    [("employee_id", "=", emp_id), ("event_date", "<", min_date)],
-                    order="event_date desc",
-                    limit=1,
-                )
-            )
-
-            for summary in future_summaries:
-                summary.opening_leaves = previous.closing_leaves if previous else 0.0
-                summary._compute_allowed_leaves()
-                if summary.is_monthly_summary:
-                    summary._compute_approved_leaves()
-                summary._compute_absent_days()
-                summary._compute_closing_leaves()
-                summary._compute_remaining_leaves()
-                previous = summary
-
+        self._recompute_leave_ledger(employee_ids)
         return res
 
-    def _set_opening_based_on_previous(self):
-        for record in self:
-            previous = self.sudo().search(
-                [
-                    ("employee_id", "=", record.employee_id.id),
-                    "|",
-                    ("event_date", "<", record.event_date),
-                    "&",
-                    ("event_date", "=", record.event_date),
-                    ("id", "<", record.id),
-                ],
-                order="event_date desc, id desc",
-                limit=1,
-            )
-
-            record.opening_leaves = previous.closing_leaves if previous else 0.0
-
     @api.model
     def _send_monthly_leave_summary_emails(self):
         today = fields.Date.today()
@@ -701,24 +562,12 @@ class HrLeave(models.Model):
                 _logger.debug("⏳ Skipping old leave: %s", leave.name)
                 continue
 
-            # Compute working leave days (Mon-Fri) excluding public holidays
-            holiday_dates = {
-                h.date
-                for h in self.env["hr.public.holiday"].search(
-                    [
-                        ("date", ">=", leave_start),
-                        ("date", "<=", leave_end),
-                        ("state", "=", "approved"),
-                    ]
-                )
-            }
-            work_leave_days = 0
-            current = leave_start
-            while current <= leave_end:
-                if current.weekday() < 5 and current not in holiday_dates:
-                    work_leave_days += 1
-                current += timedelta(days=1)
-            leave_days = work_leave_days
+            # Compute working leave days excluding the region's public holidays
+            leave_days = working_days.count(
+                self.env["qaco.working.calendar"]
+                .window(leave_start, leave_end, employee.region_id.id)
+                .working
+            )
             if leave_days <= 0:
                 _logger.warning(
                     "❌ Invalid leave duration: %s (%d days)", leave.name, leave_days
@@ -752,32 +601,16 @@ class HrLeave(models.Model):
                 )
                 continue
 
-            # Create event summary
-            summary = (
-                self.env["leave.summary"]
-                .sudo()
-                .create(
-                    {
-                        "employee_id": employee.id,
-                        "event_date": leave_start,
-                        "approved_leaves": leave_days,
-                        "is_monthly_summary": False,
-                    }
-                )
+            # Create event summary (rebuilds the employee's leave ledger)
+            self.env["leave.summary"].sudo().create(
+                {
+                    "employee_id": employee.id,
+                    "event_date": leave_start,
+                    "approved_leaves": leave_days,
+                    "is_monthly_summary": False,
+                }
             )
 
-            summary_sudo = summary.sudo()
-
-            # ✅ Trigger cascade to future summaries
-            summary_sudo._cascade_update_future_months()
-
-            # Continue with recomputes
-            summary_sudo._set_opening_based_on_previous()
-            summary_sudo._compute_allowed_leaves()
-            summary_sudo._compute_absent_days()
-            summary_sudo._compute_closing_leaves()
-            summary_sudo._compute_remaining_leaves()
-
             _logger.info(
                 "✅ Created leave.summary for %s (%d days)", employee.name, leave_days
             )
@@ -786,6 +619,7 @@ class HrLeave(models.Model):
             affected_months = (
                 self.env["leave.summary"]
                 .sudo()
+                .with_context(skip_cascade=True)
                 .search(
                     [
                         ("employee_id", "=", employee.id),
@@ -795,18 +629,18 @@ class HrLeave(models.Model):
                     ]
                 )
             )
+            if not affected_months:
+                continue
+
+            affected_months._compute_absent_days()
+            self.env["leave.summary"]._recompute_leave_ledger(employee.ids)
 
             for summary in affected_months:
                 _logger.info(
-                    "🔄 Updating monthly summary: %s for %s",
+                    "🔄 Updated monthly summary: %s for %s",
                     summary.event_date,
                     employee.name,
                 )
-                summary._compute_absent_days()
-                summary._compute_closing_leaves()
-                summary._compute_remaining_leaves()
-                summary._cascade_update_future_months()
-
                 summary.message_post(
                     body=(
                         f"🟡 Auto-adjusted due to backdated leave "
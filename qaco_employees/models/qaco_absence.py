@@ -1,38 +1,39 @@
-from datetime import date, datetime, time
-
 from odoo import api, fields, models
 
+from .employee_availability import ABSENT_STATUSES
+
 
 class HrEmployee(models.Model):
     _inherit = "hr.employee"
     _description = "HR Employee extensions: absence helpers"
 
-    is_absent_today = fields.Boolean(compute="_compute_absent_today", store=True)
+    # Read from today's availability snapshot (qaco.employee.availability)
+    is_absent_today = fields.Boolean(
+        compute="_compute_absent_today", search="_search_absent_today"
+    )
+    availability_ids = fields.One2many(
+        "qaco.employee.availability", "employee_id", string="Daily Availability"
+    )
     active = fields.Boolean("Active", default=True)
     create_date = fields.Datetime("Created On", readonly=True, index=True)
     write_date = fields.Datetime("Last Updated On", readonly=True)
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        employees = super().create(vals_list)
+        self.env["qaco.employee.availability"]._refresh(employees)
+        return employees
+
     def action_archive(self):
         self.write({"active": False})
 
-    @api.depends(
-        "attendance_ids.check_in",
-        "attendance_ids.check_out",
-        "attendance_ids.employee_id",
-    )
+    @api.depends_context("uid")
     def _compute_absent_today(self):
-        today_start = datetime.combine(date.today(), time.min)
-        today_end = datetime.combine(date.today(), time.max)
+        statuses = self.env["qaco.employee.availability"]._today_status(self)
         for record in self:
-            domain = [
-                ("employee_id", "=", record.id),
-                ("check_in", ">=", today_start),
-                ("check_in", "<=", today_end),
-            ]
-            employee_attendances_today = self.env["hr.attendance"].search(domain)
-            if not employee_attendances_today or all(
-                att.check_out for att in employee_attendances_today
-            ):
-                record.is_absent_today = True
-            else:
-                record.is_absent_today = False
+            record.is_absent_today = statuses.get(record.id) in ABSENT_STATUSES
+
+    def _search_absent_today(self, operator, value):
+        return self.env["qaco.employee.availability"]._search_today(
+            ABSENT_STATUSES, operator, value
+        )
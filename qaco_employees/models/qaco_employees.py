@@ -168,6 +168,13 @@ class HrEmployee(models.Model):
     transfer_ids = fields.One2many(
         "hr.employee.transfer", "employee_id", string="Transfers History"
     )
+    # Current deputation projection, kept up to date from the transfers
+    current_transfer_id = fields.Many2one(
+        "hr.employee.transfer",
+        string="Current Deputation",
+        compute="_compute_latest_deputation_client",
+        store=True,
+    )
     latest_deputation_client_id = fields.Many2one(
         "res.partner",
         string="Current Deputation Client",
@@ -177,29 +184,23 @@ class HrEmployee(models.Model):
 
     @api.depends(
         "transfer_ids",
+        "transfer_ids.active",
         "transfer_ids.state",
         "transfer_ids.transfer_date_from",
         "transfer_ids.transfer_date_to",
         "transfer_ids.to_client_id",
     )
     def _compute_latest_deputation_client(self):
-        transfers = self.env["hr.employee.transfer"].search(
-            [
-                ("employee_id", "in", self.ids),
-                ("state", "in", ["approved", "returned"]),
-            ],
-            order="id desc",
-        )
-        latest_map = {}
-        for tr in transfers:
-            latest_map.setdefault(tr.employee_id.id, tr)
+        Transfer = self.env["hr.employee.transfer"]
+        current = Transfer._current_deputations(self.ids)
 
         unallocated_client = self.env["res.partner"].search(
             [("name", "=", "UNALLOCATED")], limit=1
         )
 
         for employee in self:
-            tr = latest_map.get(employee.id)
+            tr = current.get(employee.id, Transfer)
+            employee.current_transfer_id = tr
             if not tr:
                 employee.latest_deputation_client_id = False
             elif tr.state == "approved":
@@ -210,20 +211,18 @@ class HrEmployee(models.Model):
                 )
 
     on_leave_today = fields.Boolean(
-        string="On Leave Today", compute="_compute_on_leave_today", store=False
+        string="On Leave Today",
+        compute="_compute_on_leave_today",
+        search="_search_on_leave_today",
     )
 
     @api.depends_context("uid")
     def _compute_on_leave_today(self):
-        today = fields.Date.today()
-        leaves = self.env["hr.leave"].search(
-            [
-                ("employee_id", "in", self.ids),
-                ("state", "=", "validate"),
-                ("request_date_from", "<=", today),
-                ("request_date_to", ">=", today),
-            ]
-        )
-        leave_map = {leave.employee_id.id: True for leave in leaves}
+        statuses = self.env["qaco.employee.availability"]._today_status(self)
         for emp in self:
-            emp.on_leave_today = leave_map.get(emp.id, False)
+            emp.on_leave_today = statuses.get(emp.id) == "leave"
+
+    def _search_on_leave_today(self, operator, value):
+        return self.env["qaco.employee.availability"]._search_today(
+            ("leave",), operator, value
+        )
@@ -1,230 +1,140 @@
 import logging
 from datetime import timedelta
 
-import pandas as pd
 from odoo import api, fields, models
 
+from ..utils import weekly_allocation
+
 _logger = logging.getLogger(__name__)  # Logger for debugging
 
 
 class WeeklyEmployeeReport(models.Model):
     _name = "weekly.employee.report"
     _description = "Automated Weekly Employee Allocation Report"
+    _order = "report_date desc"
+    _rec_name = "report_date"
+
+    # Dated snapshot of the report, reused by later views of the same week
+    report_date = fields.Date(
+        string="Report Date", required=True, readonly=True, index=True
+    )
+    staff_count = fields.Integer(string="Employees", readonly=True)
+    client_count = fields.Integer(string="Clients", readonly=True)
+    unallocated_count = fields.Integer(string="Unallocated", readonly=True)
+    body_html = fields.Html(string="Report", sanitize=False, readonly=True)
+
+    _sql_constraints = [
+        (
+            "report_date_unique",
+            "unique(report_date)",
+            "There is already an allocation report for this date.",
+        )
+    ]
 
     @api.model
-    def generate_employee_report(self):
-        """Generate Weekly Employee Allocation Report and Send Email"""
+    def _latest_transfer_clients(self, start_date, today):
+        """Client of each employee's latest effective transfer, in one query.
 
-        # Define date range for the last 7 days
-        today = fields.Date.today()
-        start_date = today - timedelta(days=7)
-
-        # Load Employees & Transfers (Only transfers from the last week)
-        employees = self.env["hr.employee"].search([])
-        transfers = self.env["hr.employee.transfer"].search(
-            [("transfer_date_to", ">=", start_date)]
+        Effective transfers are approved or returned, have started by
+        ``today`` and run to ``start_date`` or later; a returned deputation
+        leaves the employee unallocated.
+        """
+        self.env["hr.employee.transfer"].flush_model(
+            [
+                "employee_id",
+                "to_client_id",
+                "state",
+                "active",
+                "transfer_date_from",
+                "transfer_date_to",
+            ]
         )
-
-
-        # Department Sorting Order (Used for all clients)
-        department_order = {
-            "Audit": 1,
-            "Outsourcing": 2,
-            "BT-Q": 3,
-            "BT-S": 4,
-            "Advisory": 5,
-            "Administration": 6,
-            "Partners": 7,
-            "Other": 8,  # Any other department should be last
-        }
-
-        # Function to get latest client based on transfer history
-        def get_latest_client(employee):
-            employee_transfers = transfers.filtered(
-                lambda t: t.employee_id.id == employee.id
-            )
-            if employee_transfers:
-                latest_transfer = employee_transfers.sorted(
-                    "transfer_date_to", reverse=True
-                )[0]
-                return latest_transfer.to_client_id.name
-            return "UNALLOCATED"
-
-        # Collect Employee Allocations
-        client_mapping = {}
-
-        for emp in employees:
-            latest_client = get_latest_client(emp)
-            department = emp.department_id.name if emp.department_id else "Other"
-
-            # Assign department priority for sorting
-            department_priority = department_order.get(department, 8)
-
-            # Calculate Experience
-            if emp.date_of_joining:
-                experience_years = round((today - emp.date_of_joining).days / 365, 1)
-            elif emp.date_of_articles_registration:
-                experience_years = round(
-                    (today - emp.date_of_articles_registration).days / 365, 1
-                )
-            else:
-                experience_years = 0
-
-            if latest_client not in client_mapping:
-                client_mapping[latest_client] = {
-                    "No. Of Staff Deputed": 0,
-                    "Employees": [],
-                    "Client Sorting Priority": (
-                        2
-                        if latest_client == "UNALLOCATED"
-                        else (
-                            3
-                            if latest_client == "LEAVE"
-                            else (
-                                4
-                                if latest_client == "BAKERTILLY-STATELIFE"
-                                else 5 if latest_client == "BAKERTILLY-RDF" else 1
-                            )
-                        )  # Normal clients first
-                    ),
-                }
-
-            # Store employee details as a dictionary (for sorting by department later)
-            client_mapping[latest_client]["Employees"].append(
-                {
-                    "name": emp.name,
-                    "manager": emp.parent_id.name if emp.parent_id else "N/A",
-                    "department": department,
-                    "department_priority": department_priority,  # Sorting key
-                    "experience": experience_years,
-                }
-            )
-            client_mapping[latest_client]["No. Of Staff Deputed"] += 1  # Increase count
-
-        # Sort employees within each client by department priority
-        for client in client_mapping:
-            client_mapping[client]["Employees"] = sorted(
-                client_mapping[client]["Employees"],
-                key=lambda x: x["department_priority"],
-            )
-
-        # Convert to DataFrame
-        df = pd.DataFrame(client_mapping).T.reset_index()
-        df.rename(columns={"index": "Client Name"}, inplace=True)
-
-        # Ensure Employees column contains lists, not strings
-        df["Employees"] = df["Employees"].apply(
-            lambda x: eval(x) if isinstance(x, str) else x
+        self.env["res.partner"].flush_model(["name"])
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT ON (t.employee_id)
+                   t.employee_id,
+                   CASE WHEN t.state = 'returned' THEN %s ELSE p.name END
+              FROM hr_employee_transfer t
+              LEFT JOIN res_partner p ON p.id = t.to_client_id
+             WHERE t.active
+               AND t.state IN ('approved', 'returned')
+               AND t.transfer_date_from <= %s
+               AND t.transfer_date_to >= %s
+             ORDER BY t.employee_id, t.transfer_date_to DESC, t.id DESC
+            """,
+            [weekly_allocation.UNALLOCATED, today, start_date],
         )
+        return dict(self.env.cr.fetchall())
 
-        # Extract sorted employee data correctly
-        df["Managers"] = df["Employees"].apply(
-            lambda employees: [emp.get("manager", "N/A") for emp in employees]
-        )
-        df["Departments"] = df["Employees"].apply(
-            lambda employees: [emp.get("department", "Other") for emp in employees]
-        )
-        df["Experiences"] = df["Employees"].apply(
-            lambda employees: [emp.get("experience", 0) for emp in employees]
+    @api.model
+    def _allocation_frame(self, today):
+        """Allocation DataFrame of all employees, built column-wise."""
+        start_date = today - timedelta(days=7)
+        employees = self.env["hr.employee"].search_fetch(
+            [],
+            [
+                "name",
+                "parent_id",
+                "department_id",
+                "date_of_joining",
+                "date_of_articles_registration",
+            ],
         )
+        clients = self._latest_transfer_clients(start_date, today)
+        columns = {
+            "name": employees.mapped("name"),
+            "manager": [employee.parent_id.name for employee in employees],
+            "department": [employee.department_id.name for employee in employees],
+            "joined": [employee.date_of_joining or None for employee in employees],
+            "articles": [
+                employee.date_of_articles_registration or None for employee in employees
+            ],
+            "client": [clients.get(employee_id) for employee_id in employees.ids],
+        }
+        return weekly_allocation.frame(columns, today)
 
-        # **Sort all clients (including special ones) by Staff Count and Department Priority**
-        df = df.sort_values(
-            by=["Client Sorting Priority", "No. Of Staff Deputed"],
-            ascending=[True, False],
+    @api.model
+    def _get_snapshot(self, report_date=None):
+        """The report of ``report_date`` (default today), generated only once."""
+        report_date = report_date or fields.Date.context_today(self)
+        snapshot = self.sudo().search([("report_date", "=", report_date)], limit=1)
+        if snapshot:
+            return snapshot
+        df = self._allocation_frame(report_date)
+        body_html = self.env["ir.qweb"]._render(
+            "qaco_employees.weekly_employee_report_email",
+            {"groups": weekly_allocation.groups(df)},
+            minimal_qcontext=True,
         )
-
-        # Drop unnecessary sorting columns
-        df.drop(columns=["Client Sorting Priority"], inplace=True)
-
-        # Generate HTML Table
-        table_html = self._generate_html_table(df)
-
-        # Send Email with HTML Table
-        self.send_email(table_html)
-
-    def _generate_html_table(self, df):
-        """Converts DataFrame to a Beautiful HTML Table for Email with Serial Numbers and alternating row colors per client"""
-        df.reset_index(drop=True, inplace=True)
-        df.insert(0, "S.No", df.index + 1)
-
-        # **Employee Numbering Continuous**
-        employee_counter = 1  # Continuous numbering across all rows
-
-        html = """
-        <html>
-        <head>
-        <style>
-            body { font-family: Arial, sans-serif; }
-            table { width: 100%; border-collapse: collapse; margin-top: 10px; }
-            th, td { padding: 8px; border: 1px solid #dddddd; text-align: left; vertical-align: top; }
-            th { background-color: #004080; color: white; font-weight: bold; }
-            
-            /* ✅ Reduce width of "No. Of Staff Deputed" and "Experience" columns */
-            th:nth-child(3), td:nth-child(3) { width: 8%; }  /* "No. Of Staff Deputed" */
-            th:nth-child(7), td:nth-child(7) { width: 8%; }  /* "Experience (Years)" */
-        </style>
-
-        </head>
-        <body>
-        <p>Dear Team,</p>
-        <p>Please find below the latest Weekly Employee Allocation Report:</p>
-        <table>
-            <tr>
-                <th>S.No</th>
-                <th>Client Name</th>
-                <th>No. Of Staff Deputed</th>
-                <th>Employee Name</th>
-                <th>Manager Name</th>
-                <th>Department</th>
-                <th>Experience (Years)</th>
-            </tr>
-        """
-
-        # Populate table rows with alternate row shading per client
-        current_client = None
-        row_color = "#f9f9f9"
-
-        for _, row in df.iterrows():
-            employee_count = len(row["Employees"])
-
-            for i in range(employee_count):
-                numbered_employee_name = (
-                    f"{employee_counter}. {row['Employees'][i]['name']}"
-                )
-                employee_counter += 1  # Keep numbering continuous
-
-                if i == 0:
-                    if current_client != row["Client Name"]:
-                        row_color = "#e6f2ff" if row_color == "#f9f9f9" else "#f9f9f9"
-                        current_client = row["Client Name"]
-
-                    html += f"""
-                    <tr style="background-color: {row_color};">
-                        <td rowspan="{employee_count}">{row["S.No"]}</td>
-                        <td rowspan="{employee_count}">{row["Client Name"]}</td>
-                        <td rowspan="{employee_count}">{row["No. Of Staff Deputed"]}</td>
-                        <td>{numbered_employee_name}</td>
-                        <td>{row["Managers"][i]}</td>
-                        <td>{row["Departments"][i]}</td>
-                        <td>{row["Experiences"][i]}</td>
-                    </tr>
-                    """
-                else:
-                    html += f"""
-                    <tr style="background-color: {row_color};">
-                        <td>{numbered_employee_name}</td>
-                        <td>{row["Managers"][i]}</td>
-                        <td>{row["Departments"][i]}</td>
-                        <td>{row["Experiences"][i]}</td>
-                    </tr>
-                    """
-
-        html += (
-            "</table><p>Best Regards,<br><strong>Odoo System</strong></p></body></html>"
+        return self.sudo().create(
+            {
+                "report_date": report_date,
+                "body_html": body_html,
+                **weekly_allocation.totals(df),
+            }
         )
 
-        return html
+    @api.model
+    def action_open_current_report(self):
+        """Open this week's snapshot, generating it only if there is none yet."""
+        today = fields.Date.context_today(self)
+        snapshot = self.search(
+            [("report_date", ">", today - timedelta(days=7))], limit=1
+        ) or self._get_snapshot(today)
+        return {
+            "type": "ir.actions.act_window",
+            "res_model": self._name,
+            "res_id": snapshot.id,
+            "view_mode": "form",
+            "target": "current",
+        }
+
+    @api.model
+    def generate_employee_report(self):
+        """Generate Weekly Employee Allocation Report and Send Email"""
+        snapshot = self._get_snapshot(fields.Date.today())
+        self.send_email(snapshot.body_html)
 
     def send_email(self, email_body):
         """Send Weekly Employee Allocation Report to selected designations"""
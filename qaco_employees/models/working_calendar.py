@@ -0,0 +1,51 @@
+from datetime import date
+
+from odoo import api, models, tools
+
+from ..utils import working_days
+
+
+class QacoWorkingCalendar(models.AbstractModel):
+    _name = "qaco.working.calendar"
+    _description = "Working-Day Calendar"
+
+    @api.model
+    @tools.ormcache("year", "region_id")
+    def _year_bitmap(self, year, region_id=False):
+        """Working days of ``year``: weekdays minus approved holidays of the region.
+
+        Holidays without regions apply firm-wide. Cached per process and cleared
+        when a public holiday is approved, reset, moved or deleted.
+        """
+        holidays = (
+            self.env["hr.public.holiday"]
+            .sudo()
+            .search_fetch(
+                [
+                    ("state", "=", "approved"),
+                    ("date", ">=", date(year, 1, 1)),
+                    ("date", "<=", date(year, 12, 31)),
+                ],
+                ["date", "region_ids"],
+            )
+        )
+        return working_days.year_bitmap(
+            year,
+            [
+                holiday.date
+                for holiday in holidays
+                if not holiday.region_ids or region_id in holiday.region_ids.ids
+            ],
+        )
+
+    @api.model
+    def window(self, start, end, region_id=False):
+        """:class:`~..utils.working_days.Window` of working days for ``start``-``end``."""
+        region_id = region_id or False
+        return working_days.Window(
+            start, end, lambda year: self._year_bitmap(year, region_id)
+        )
+
+    @api.model
+    def is_working_day(self, day, region_id=False):
+        return bool(self.window(day, day, region_id).working)
@@ -0,0 +1,5 @@
+from . import test_monthly_leave_summary
+from . import test_employee_availability
+from . import test_current_deputation
+from . import test_hr_notification_outbox
+from . import test_approval_token
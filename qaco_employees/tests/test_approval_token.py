@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from odoo.tests import common
+
+
+class ApprovalTokenTest(common.TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Tokens = self.env["qaco.approval.token"]
+        self.line = self.env["leave.condonation.approval"].create(
+            {"validating_users_id": self.env.user.id}
+        )
+        self.model = "leave.condonation.approval"
+
+    def test_token_resolves_once_for_its_action(self):
+        token = self.Tokens.issue(self.line, "approve")
+        self.assertEqual(self.Tokens.resolve(token, self.model, "approve"), self.line)
+        self.assertFalse(self.Tokens.resolve(token, self.model, "refuse"))
+        self.assertFalse(self.Tokens.resolve(token[:-2], self.model, "approve"))
+
+        self.assertTrue(self.Tokens.revoke(token))
+        self.assertFalse(self.Tokens.resolve(token, self.model, "approve"))
+        # A second use (e.g. a concurrent POST) is refused, not an error
+        self.assertFalse(self.Tokens.revoke(token))
+
+        # Rotating the line's token (on revert) retires every issued link
+        refuse = self.Tokens.issue(self.line, "refuse")
+        self.line.approve_token = "rotated-generation"
+        self.assertFalse(self.Tokens.resolve(refuse, self.model, "refuse"))
+
+        # Lines without an approver get no link at all
+        self.line.validating_users_id = False
+        self.assertEqual(self.Tokens.url(self.line, "approve"), "")
+
+    def test_expired_revocations_are_collected(self):
+        Revocation = self.env["qaco.approval.token.revocation"]
+        now = datetime.now()
+        Revocation.create(
+            [
+                {"fingerprint": "old", "expires_at": now - timedelta(days=1)},
+                {"fingerprint": "new", "expires_at": now + timedelta(days=1)},
+            ]
+        )
+        Revocation._gc_expired()
+        Revocation.invalidate_model()
+        self.assertEqual(
+            Revocation.search([("fingerprint", "in", ["old", "new"])]).mapped(
+                "fingerprint"
+            ),
+            ["new"],
+        )
@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+from odoo.tests import common
+
+
+class CurrentDeputationTest(common.TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Transfer = self.env["hr.employee.transfer"]
+        self.employee = self.env["hr.employee"].create({"name": "Deputed"})
+        self.client_a, self.client_b = self.env["res.partner"].create(
+            [{"name": "Client A"}, {"name": "Client B"}]
+        )
+        self.unallocated = self.env["res.partner"].search(
+            [("name", "=", "UNALLOCATED")], limit=1
+        )
+
+    def _transfer(self, client, start, end, state="approved"):
+        return self.Transfer.create(
+            {
+                "employee_id": self.employee.id,
+                "to_client_id": client.id,
+                "transfer_date_from": start,
+                "transfer_date_to": end,
+                "state": state,
+            }
+        )
+
+    def test_latest_start_date_wins(self):
+        later = self._transfer(self.client_b, date(2024, 3, 1), date(2024, 4, 1))
+        self._transfer(self.client_a, date(2024, 1, 1), date(2024, 2, 1))
+        self._transfer(self.client_a, date(2024, 5, 1), date(2024, 6, 1), "draft")
+        self.assertEqual(self.employee.current_transfer_id, later)
+        self.assertEqual(self.employee.latest_deputation_client_id, self.client_b)
+
+        later.write({"state": "returned"})
+        self.assertEqual(self.employee.latest_deputation_client_id, self.unallocated)
+
+    def test_expiry_cron_only_touches_ended_deputations(self):
+        if "hr.attendance.geofence" not in self.env:
+            self.skipTest("Geofences are not installed")
+        today = date.today()
+        ended = self._transfer(
+            self.client_a, today - timedelta(days=20), today - timedelta(days=1)
+        )
+        other = self.env["hr.employee"].create({"name": "Still Deputed"})
+        running = self.Transfer.create(
+            {
+                "employee_id": other.id,
+                "to_client_id": self.client_b.id,
+                "transfer_date_from": today - timedelta(days=5),
+                "transfer_date_to": today + timedelta(days=5),
+                "state": "approved",
+            }
+        )
+        self.Transfer.auto_set_unallocated()
+        self.assertEqual(ended.state, "returned")
+        self.assertTrue(self.employee.was_unallocated)
+        self.assertEqual(self.employee.latest_deputation_client_id, self.unallocated)
+        self.assertEqual(running.state, "approved")
+        self.assertEqual(other.latest_deputation_client_id, self.client_b)
@@ -0,0 +1,83 @@
+from datetime import date, datetime
+
+from freezegun import freeze_time
+
+from odoo.tests import common
+
+
+@freeze_time("2024-03-04 08:00:00")
+class EmployeeAvailabilityTest(common.TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Availability = self.env["qaco.employee.availability"]
+        self.present, self.away = self.env["hr.employee"].create(
+            [{"name": "Present"}, {"name": "Away"}]
+        )
+        self.env["hr.attendance"].create(
+            {"employee_id": self.present.id, "check_in": datetime(2024, 3, 4, 7, 0)}
+        )
+
+    def test_snapshot_and_incremental_updates(self):
+        self.Availability._cron_refresh_snapshot()
+        snapshot = self.Availability.search(
+            [("date", "=", date(2024, 3, 4)), ("employee_id", "in", self.away.ids)]
+        )
+        self.assertEqual(snapshot.status, "unallocated")
+        self.assertFalse(self.present.is_absent_today)
+        self.assertTrue(self.away.is_absent_today)
+
+        # Checking in updates the existing row
+        self.env["hr.attendance"].create(
+            {"employee_id": self.away.id, "check_in": datetime(2024, 3, 4, 7, 30)}
+        )
+        self.assertEqual(snapshot.status, "present")
+        self.away.invalidate_recordset(["is_absent_today"])
+        self.assertFalse(self.away.is_absent_today)
+
+    def test_filters_read_the_snapshot(self):
+        self.Availability._refresh(self.present | self.away)
+        employees = self.present | self.away
+        self.assertEqual(
+            employees.filtered_domain([("is_absent_today", "=", True)]), self.away
+        )
+        self.assertEqual(
+            self.env["hr.employee"].search(
+                [("id", "in", employees.ids), ("is_absent_today", "!=", True)]
+            ),
+            self.present,
+        )
+        self.assertFalse(
+            self.env["hr.employee"].search(
+                [("id", "in", employees.ids), ("on_leave_today", "=", True)]
+            )
+        )
+
+    def test_filters_cover_employees_missing_from_snapshot(self):
+        # No cron run yet today: the search computes the missing rows
+        employees = self.present | self.away
+        self.Availability.search([("employee_id", "in", employees.ids)]).unlink()
+        self.assertEqual(
+            self.env["hr.employee"].search(
+                [("id", "in", employees.ids), ("is_absent_today", "=", True)]
+            ),
+            self.away,
+        )
+        self.assertEqual(
+            self.env["hr.employee"].search(
+                [("id", "in", employees.ids), ("is_absent_today", "=", False)]
+            ),
+            self.present,
+        )
+        # Searching never writes the snapshot
+        self.assertFalse(
+            self.Availability.search_count(
+                [("date", "=", date(2024, 3, 4)), ("employee_id", "in", employees.ids)]
+            )
+        )
+
+    def test_new_employees_are_snapshotted(self):
+        employee = self.env["hr.employee"].create({"name": "Joiner"})
+        self.assertEqual(
+            self.Availability.search([("employee_id", "=", employee.id)]).status,
+            "unallocated",
+        )
@@ -0,0 +1,97 @@
+from datetime import date, datetime
+from unittest.mock import patch
+
+from odoo.addons.mail.tests.common import MockEmail
+from odoo.tests import common
+
+
+class HrNotificationOutboxTest(common.TransactionCase, MockEmail):
+    def setUp(self):
+        super().setUp()
+        self.Outbox = self.env["qaco.hr.notification"]
+        self.env.company.write({"email": "hr-desk@example.com"})
+        self.ali, self.sara, hr = self.env["hr.employee"].create(
+            [
+                {"name": "Ali", "work_email": "ali@example.com"},
+                {"name": "Sara", "work_email": "sara@example.com"},
+                {"name": "HR", "work_email": "hr@example.com"},
+            ]
+        )
+        self.env["hr.transfer.cc.recipient"].create({"employee_id": hr.id})
+        client = self.env["res.partner"].create({"name": "Client A"})
+        self.transfers = self.env["hr.employee.transfer"].create(
+            [
+                {
+                    "employee_id": employee.id,
+                    "to_client_id": client.id,
+                    "transfer_date_from": date(2024, 3, day),
+                    "transfer_date_to": date(2024, 4, day),
+                    "state": "approved",
+                }
+                for employee, day in [(self.ali, 1), (self.ali, 15), (self.sara, 1)]
+            ]
+        )
+
+    def test_approvals_are_queued_then_sent_as_digests(self):
+        with self.mock_mail_gateway():
+            self.transfers.send_email_to_employee()
+            self.assertFalse(self._mails)
+            queued = self.Outbox.search([("transfer_id", "in", self.transfers.ids)])
+            self.assertEqual(len(queued), 6)
+
+            self.Outbox._cron_flush()
+
+        # One digest each for Ali, Sara and the CC recipient
+        self.assertEqual(
+            sorted(mail["email_to"][0] for mail in self._mails),
+            ["ali@example.com", "hr@example.com", "sara@example.com"],
+        )
+        self.assertEqual(set(queued.mapped("state")), {"sent"})
+        self.assertIn("hr-desk@example.com", self._mails[0]["email_from"])
+
+    def test_failed_digests_are_retried_later(self):
+        self.Outbox.enqueue("transfer_approved", self.transfers[:1], "ali@example.com")
+
+        def fail(mails, **kwargs):
+            mails.write({"state": "exception"})
+
+        with patch.object(type(self.env["mail.mail"]), "send", fail):
+            self.Outbox._cron_flush()
+        notification = self.Outbox.search([("email_to", "=", "ali@example.com")])
+        self.assertEqual(notification.state, "pending")
+        self.assertEqual(notification.attempts, 1)
+        self.assertTrue(notification.next_attempt)
+
+    def test_render_failures_do_not_block_other_digests(self):
+        self.Outbox.enqueue("transfer_approved", self.transfers[:1], "ali@example.com")
+        self.Outbox.enqueue("transfer_pending", self.transfers[2:], "sara@example.com")
+        digest_values = type(self.Outbox)._digest_values
+
+        def render(notifications, kind, email_to):
+            if kind == "transfer_pending":
+                raise ValueError("broken template")
+            return digest_values(notifications, kind, email_to)
+
+        with self.mock_mail_gateway(), patch.object(
+            type(self.Outbox), "_digest_values", render
+        ):
+            self.Outbox._cron_flush()
+
+        self.assertEqual([mail["email_to"][0] for mail in self._mails], ["ali@example.com"])
+        sent = self.Outbox.search([("email_to", "=", "ali@example.com")])
+        broken = self.Outbox.search([("email_to", "=", "sara@example.com")])
+        self.assertEqual(sent.state, "sent")
+        self.assertEqual((broken.state, broken.attempts), ("pending", 1))
+        self.assertTrue(broken.next_attempt)
+
+    def test_old_sent_and_failed_notifications_are_collected(self):
+        rows = self.Outbox.enqueue("transfer_approved", self.transfers, "ali@example.com")
+        rows[0].state = "sent"
+        rows[1].state = "failed"
+        self.env.flush_all()
+        self.env.cr.execute(
+            "UPDATE qaco_hr_notification SET write_date = %s WHERE id IN %s",
+            [datetime(2020, 1, 1), tuple(rows.ids)],
+        )
+        self.Outbox._gc_done()
+        self.assertEqual(self.Outbox.search([("id", "in", rows.ids)]), rows[2])
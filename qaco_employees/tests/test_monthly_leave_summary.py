@@ -0,0 +1,75 @@
+from datetime import date, datetime
+
+from odoo.tests import common
+
+
+class MonthlyLeaveSummaryTest(common.TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Summary = self.env["leave.summary"]
+        self.employees = self.env["hr.employee"].create(
+            [{"name": f"Employee {number}"} for number in range(30)]
+        )
+        # Everyone checks in on Monday 4 March 2024
+        self.env["hr.attendance"].create(
+            [
+                {
+                    "employee_id": employee.id,
+                    "check_in": datetime(2024, 3, 4, 9, 0),
+                    "check_out": datetime(2024, 3, 4, 17, 0),
+                }
+                for employee in self.employees
+            ]
+        )
+
+    def _count_queries(self, function, *args):
+        self.env.flush_all()
+        self.env.invalidate_all()
+        before = self.cr.sql_log_count
+        result = function(*args)
+        self.env.flush_all()
+        return self.cr.sql_log_count - before, result
+
+    def test_month_accounting_follows_working_days(self):
+        # March 2024 has 21 weekdays; one attended
+        summaries = self.Summary._generate_monthly_summaries(
+            date(2024, 3, 1), self.employees[:2]
+        )
+        self.assertEqual(summaries.mapped("absent_days"), [20.0, 20.0])
+        self.assertEqual(summaries.mapped("event_date"), [date(2024, 3, 31)] * 2)
+        self.assertEqual(summaries.mapped("closing_leaves"), [20.0, 20.0])
+
+        # Already generated employees are skipped
+        again = self.Summary._generate_monthly_summaries(
+            date(2024, 3, 1), self.employees[:2]
+        )
+        self.assertFalse(again)
+
+        # An approved holiday invalidates the cached calendar
+        self.env["hr.public.holiday"].create(
+            {"name": "Holiday", "date": date(2024, 3, 11)}
+        ).action_approve()
+        summaries.action_recompute()
+        self.assertEqual(summaries.mapped("absent_days"), [19.0, 19.0])
+
+    def test_generation_queries_do_not_grow_with_headcount(self):
+        next_sequence = self.env["ir.sequence"].next_by_code
+        next_sequence("leave.summary.seq")
+        per_summary, _number = self._count_queries(next_sequence, "leave.summary.seq")
+
+        few, few_summaries = self._count_queries(
+            self.Summary._generate_monthly_summaries,
+            date(2024, 3, 1),
+            self.employees[:3],
+        )
+        many, many_summaries = self._count_queries(
+            self.Summary._generate_monthly_summaries,
+            date(2024, 4, 1),
+            self.employees,
+        )
+
+        self.assertEqual(len(few_summaries), 3)
+        self.assertEqual(len(many_summaries), 30)
+        # Only the sequence numbers are drawn per summary; the leave,
+        # attendance and event reads, the insert and the ledger are shared
+        self.assertLessEqual(many - few, (30 - 3) * per_summary)
@@ -0,0 +1,247 @@
+"""Daily attendance report built from grouped attendance data.
+
+The model loads the day's inputs in a handful of grouped queries and hands
+them over as plain values:
+
+- employees as :class:`Employee` tuples (deputation client included)
+- local check-in datetimes of the last 30 days per employee id
+- ids of employees on validated leave today
+- the latest leave balances per employee id
+
+:func:`build` turns them into rows grouped by manager, the manager-wise
+summary and the headline totals in one pass over the employees. The same
+:class:`Report` feeds the QWeb e-mail and the CSV/XLSX attachments sent to
+large offices.
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks.
+"""
+
+import csv
+import io
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+try:
+    import xlsxwriter
+except ImportError:  # pragma: no cover - optional dependency
+    xlsxwriter = None
+
+LATE_AFTER = time(10, 0)
+APPROVED_LEAVE = "Approved Leave"
+UNAUTHORIZED_LEAVE = "Unauthorized Leave"
+UNALLOCATED = "UNALLOCATED"
+NONE = "N/A"
+
+Employee = namedtuple("Employee", ["id", "name", "client", "department", "manager"])
+
+Balance = namedtuple("Balance", ["allowed", "availed", "remaining"])
+NO_BALANCE = Balance(0, 0, 0)
+
+Row = namedtuple(
+    "Row",
+    [
+        "number",
+        "name",
+        "client",
+        "department",
+        "manager",
+        "today_checkin",
+        "checkin_raw",
+        "late",
+        "avg_checkin",
+        "allowed_leaves",
+        "availed_leaves",
+        "remaining_leaves",
+    ],
+)
+
+ManagerSummary = namedtuple(
+    "ManagerSummary", ["manager", "late", "approved", "unauthorized", "total"]
+)
+
+Report = namedtuple(
+    "Report",
+    [
+        "groups",
+        "managers",
+        "total_employees",
+        "present_employees",
+        "approved_leaves",
+        "unauthorized_leaves",
+        "late_checkins",
+    ],
+)
+Report.__doc__ = """``groups`` is a list of ``(manager, rows)``; ``managers`` the summary rows."""
+
+COLUMNS = [
+    ("number", "S.No"),
+    ("name", "Employee Name"),
+    ("client", "Client"),
+    ("department", "Department"),
+    ("manager", "Manager"),
+    ("today_checkin", "Today's Check-in"),
+    ("avg_checkin", "Avg. Check-in (30 Days)"),
+    ("allowed_leaves", "Allowed Leaves"),
+    ("availed_leaves", "Availed Leaves"),
+    ("remaining_leaves", "Remaining Leaves"),
+]
+
+
+def _average(times):
+    if not times:
+        return None
+    seconds = sum(t.hour * 3600 + t.minute * 60 for t in times) / len(times)
+    return (datetime.min + timedelta(seconds=seconds)).time()
+
+
+def build(today, employees, checkins, on_leave, balances):
+    """Build the :class:`Report` for ``today``.
+
+    :param checkins: ``{employee_id: [local datetime]}``
+    :param on_leave: set of employee ids on validated leave today
+    :param balances: ``{employee_id: Balance}``
+    """
+    grouped, order = {}, []
+    counts = {}
+    for employee in employees:
+        today_checkin, earlier = None, []
+        for check_in in checkins.get(employee.id, ()):
+            if check_in.date() == today:
+                if today_checkin is None or check_in < today_checkin:
+                    today_checkin = check_in
+            else:
+                earlier.append(check_in.time())
+        average = _average(earlier)
+
+        manager = employee.manager or NONE
+        if manager not in grouped:
+            grouped[manager] = []
+            order.append(manager)
+            counts[manager] = {"late": 0, "approved": 0, "unauthorized": 0}
+        late = False
+        if today_checkin is None:
+            checkin_raw = None
+            if employee.id in on_leave:
+                status = APPROVED_LEAVE
+                counts[manager]["approved"] += 1
+            else:
+                status = UNAUTHORIZED_LEAVE
+                counts[manager]["unauthorized"] += 1
+        else:
+            checkin_raw = today_checkin.time()
+            status = today_checkin.strftime("%I:%M %p")
+            late = checkin_raw > LATE_AFTER
+            counts[manager]["late"] += late
+
+        balance = balances.get(employee.id, NO_BALANCE)
+        grouped[manager].append(
+            (
+                average or time.min,
+                Row(
+                    0,
+                    employee.name,
+                    employee.client or UNALLOCATED,
+                    employee.department or NONE,
+                    manager,
+                    status,
+                    checkin_raw,
+                    late,
+                    average.strftime("%I:%M %p") if average else NONE,
+                    balance.allowed,
+                    balance.availed,
+                    balance.remaining,
+                ),
+            )
+        )
+
+    groups, number = [], 0
+    for manager in order:
+        rows = []
+        for _average_time, row in sorted(
+            grouped[manager], key=lambda item: item[0], reverse=True
+        ):
+            number += 1
+            rows.append(row._replace(number=number))
+        groups.append((manager, rows))
+
+    managers = sorted(
+        (
+            ManagerSummary(
+                manager,
+                counts[manager]["late"],
+                counts[manager]["approved"],
+                counts[manager]["unauthorized"],
+                len(grouped[manager]),
+            )
+            for manager in order
+            if any(counts[manager].values())
+        ),
+        key=lambda summary: (-summary.late, -summary.unauthorized),
+    )
+    rows = [row for _manager, group in groups for row in group]
+    return Report(
+        groups=groups,
+        managers=managers,
+        total_employees=len(rows),
+        present_employees=sum(1 for row in rows if row.checkin_raw is not None),
+        approved_leaves=sum(1 for row in rows if row.today_checkin == APPROVED_LEAVE),
+        unauthorized_leaves=sum(
+            1 for row in rows if row.today_checkin == UNAUTHORIZED_LEAVE
+        ),
+        late_checkins=sum(1 for row in rows if row.late),
+    )
+
+
+def _records(report):
+    for _manager, rows in report.groups:
+        for row in rows:
+            yield [getattr(row, key) for key, _label in COLUMNS]
+
+
+def to_csv(report):
+    """Detail rows of ``report`` as UTF-8 CSV bytes."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow([label for _key, label in COLUMNS])
+    writer.writerows(_records(report))
+    return output.getvalue().encode("utf-8")
+
+
+def to_xlsx(report, title="Daily Attendance"):
+    """Detail and manager summary of ``report`` as an XLSX workbook (bytes)."""
+    if xlsxwriter is None:
+        raise RuntimeError("xlsxwriter is required for XLSX attendance reports.")
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {"in_memory": True})
+    header = workbook.add_format(
+        {"bold": True, "bg_color": "#004080", "font_color": "white"}
+    )
+    late = workbook.add_format({"font_color": "red", "bold": True})
+
+    sheet = workbook.add_worksheet(title[:31])
+    sheet.write_row(0, 0, [label for _key, label in COLUMNS], header)
+    late_column = [key for key, _label in COLUMNS].index("today_checkin")
+    row_index = 0
+    for _manager, rows in report.groups:
+        for row in rows:
+            row_index += 1
+            values = [getattr(row, key) for key, _label in COLUMNS]
+            sheet.write_row(row_index, 0, values)
+            if row.late:
+                sheet.write(row_index, late_column, row.today_checkin, late)
+    sheet.autofilter(0, 0, row_index, len(COLUMNS) - 1)
+    sheet.freeze_panes(1, 0)
+
+    summary = workbook.add_worksheet("Managers")
+    summary.write_row(
+        0,
+        0,
+        ["Manager Name", "Late Check-ins", "Approved Leaves", "Unauthorized Leaves",
+         "Total Employees Managed"],
+        header,
+    )
+    for index, manager in enumerate(report.managers, start=1):
+        summary.write_row(index, 0, list(manager))
+    workbook.close()
+    return output.getvalue()
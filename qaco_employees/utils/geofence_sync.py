@@ -0,0 +1,56 @@
+"""Membership diff between client geofences and current deputations.
+
+The geofence reconciler compares, per client name, the employees each
+geofence holds with the employees currently deputed to that client.
+:func:`plan` works out the smallest set of changes:
+
+- geofences to create for clients that have none yet
+- employees to add to or remove from existing geofences, including client
+  geofences nobody is deputed to any more
+
+Geofences that already match are left out entirely, so reconciling an
+unchanged roster writes nothing (and tracks nothing).
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks.
+"""
+
+from collections import namedtuple
+
+Plan = namedtuple("Plan", ["create", "add", "remove"])
+Plan.__doc__ = """``{name: sorted employee ids}`` per kind of change."""
+
+
+def plan(current, wanted, clients=()):
+    """:class:`Plan` turning ``current`` into ``wanted`` memberships.
+
+    :param current: ``{geofence name: set of employee ids}`` of the
+        existing geofences
+    :param wanted: ``{client name: set of employee ids}`` from the current
+        deputations
+    :param clients: names of every client geofence; those nobody is deputed
+        to any more are emptied. Other geofences (offices) are left alone.
+    """
+    wanted = dict(dict.fromkeys(set(clients) & set(current), set()), **wanted)
+    create, add, remove = {}, {}, {}
+    for name, members in wanted.items():
+        if name not in current:
+            create[name] = sorted(members)
+            continue
+        added = members - current[name]
+        removed = current[name] - members
+        if added:
+            add[name] = sorted(added)
+        if removed:
+            remove[name] = sorted(removed)
+    return Plan(create, add, remove)
+
+
+def summary(result):
+    """Counts of a :class:`Plan` for logging and the job's report."""
+    return {
+        "created": len(result.create),
+        "updated": len(set(result.add) | set(result.remove)),
+        "added": sum(map(len, result.add.values())),
+        "removed": sum(map(len, result.remove.values())),
+    }
@@ -0,0 +1,73 @@
+"""Single-pass leave ledger over an employee's leave summaries.
+
+Leave summaries form one chain per employee, in ``event_date, id`` order:
+
+- opening = closing of the previous summary (0 for the first)
+- closing = opening + adjustment + approved + absences
+- remaining = allowed - closing
+
+A change anywhere in the chain (a back-dated adjustment, an allowance, a
+deleted event) moves every later balance. Rather than rewriting each later
+summary on its own, :func:`changes` walks the chain once from its first
+summary and yields only the summaries whose stored balances differ from
+the recomputed ones, so the caller can persist them in one batched write.
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks.
+"""
+
+import math
+from collections import namedtuple
+
+BALANCE_FIELDS = ("opening_leaves", "allowed_leaves", "closing_leaves", "remaining_leaves")
+
+Entry = namedtuple(
+    "Entry",
+    [
+        "id",
+        "adjustment",
+        "approved",
+        "absent",
+        "opening",
+        "allowed",
+        "closing",
+        "remaining",
+    ],
+)
+Entry.__doc__ = """One stored summary: its movements followed by its stored balances."""
+
+Balance = namedtuple("Balance", ["id", "opening", "allowed", "closing", "remaining"])
+
+
+def chain(entries, allowed):
+    """Recompute the balances of one employee's chronologically ordered ``entries``."""
+    closing = 0.0
+    for entry in entries:
+        opening = closing
+        closing = opening + (entry.adjustment or 0.0) + (entry.approved or 0.0)
+        closing += entry.absent or 0.0
+        yield Balance(entry.id, opening, allowed, closing, allowed - closing)
+
+
+def _same(stored, value):
+    return math.isclose(stored or 0.0, value, rel_tol=0.0, abs_tol=1e-9)
+
+
+def changes(entries, allowed):
+    """Balances from :func:`chain` that differ from what ``entries`` store."""
+    for entry, balance in zip(entries, chain(entries, allowed)):
+        if not (
+            _same(entry.opening, balance.opening)
+            and _same(entry.allowed, balance.allowed)
+            and _same(entry.closing, balance.closing)
+            and _same(entry.remaining, balance.remaining)
+        ):
+            yield balance
+
+
+def ledger_changes(entries_by_employee, allowed_by_employee):
+    """Changed balances across employees (``{employee: entries}``), as one list."""
+    result = []
+    for employee, entries in entries_by_employee.items():
+        result.extend(changes(entries, allowed_by_employee.get(employee, 0.0)))
+    return result
@@ -0,0 +1,48 @@
+"""Coalescing and retry schedule of the HR notification outbox.
+
+Business actions (transfer approval, deputation expiry, pending approval
+reminders) only queue one notification per recipient and transfer. The
+flush cron then:
+
+- coalesces the queued notifications of each ``(kind, recipient)`` pair
+  into one digest, in queue order (:func:`digests`)
+- sends the digests in batches sharing one SMTP connection
+- puts notifications whose digest failed to render or send back in the
+  queue with an exponential backoff, giving up after :data:`MAX_ATTEMPTS`
+  (:func:`retry_at`)
+
+Sent and abandoned notifications are kept for :data:`KEEP_DAYS`.
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks.
+"""
+
+from collections import namedtuple
+from datetime import timedelta
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = timedelta(minutes=5)
+MAX_RETRY_DELAY = timedelta(hours=6)
+KEEP_DAYS = 30
+
+Notification = namedtuple("Notification", ["id", "kind", "email_to"])
+
+Digest = namedtuple("Digest", ["kind", "email_to", "ids"])
+
+
+def digests(notifications):
+    """One :class:`Digest` per ``(kind, email_to)``, in first-queued order."""
+    grouped = {}
+    for notification in notifications:
+        key = (notification.kind, notification.email_to.strip().lower())
+        if key not in grouped:
+            grouped[key] = Digest(notification.kind, notification.email_to.strip(), [])
+        grouped[key].ids.append(notification.id)
+    return list(grouped.values())
+
+
+def retry_at(now, attempts):
+    """When to retry after ``attempts`` failed sends, or None to give up."""
+    if attempts >= MAX_ATTEMPTS:
+        return None
+    return now + min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
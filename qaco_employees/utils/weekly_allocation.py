@@ -0,0 +1,120 @@
+"""Weekly employee allocation report as a column-wise DataFrame.
+
+The model reads the employees and each one's latest effective transfer
+(one window query) and passes them as columns. :func:`frame` builds the
+DataFrame from those columns in one go and derives everything with
+vectorised operations:
+
+- department and client sorting priorities through ``map``
+- experience in years from the joining or articles registration date
+- staff deputed per client through a grouped ``transform``
+
+:func:`groups` then walks the sorted frame once, client by client, for the
+e-mail and the stored snapshot.
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks. pandas is declared in the module
+manifest.
+"""
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover - optional dependency
+    pd = None
+
+UNALLOCATED = "UNALLOCATED"
+OTHER = "Other"
+
+# Department Sorting Order (Used for all clients)
+DEPARTMENT_ORDER = {
+    "Audit": 1,
+    "Outsourcing": 2,
+    "BT-Q": 3,
+    "BT-S": 4,
+    "Advisory": 5,
+    "Administration": 6,
+    "Partners": 7,
+    OTHER: 8,  # Any other department should be last
+}
+
+# Normal clients first (1), then these
+CLIENT_PRIORITY = {
+    UNALLOCATED: 2,
+    "LEAVE": 3,
+    "BAKERTILLY-STATELIFE": 4,
+    "BAKERTILLY-RDF": 5,
+}
+
+COLUMNS = ("name", "manager", "department", "joined", "articles", "client")
+
+
+def _require_pandas():
+    if pd is None:
+        raise RuntimeError("pandas is required for the weekly employee report.")
+
+
+def _fill(series, default):
+    # Empty values arrive as None, False (Odoo) or ""
+    return series.where(series.notna() & series.astype(bool), default)
+
+
+def frame(columns, today):
+    """Sorted allocation frame from ``columns`` (a dict of equal-length lists).
+
+    ``columns`` holds :data:`COLUMNS`; ``client`` is the latest effective
+    transfer client name (empty when unallocated).
+    """
+    _require_pandas()
+    df = pd.DataFrame({name: columns[name] for name in COLUMNS})
+    df["client"] = _fill(df["client"], UNALLOCATED)
+    df["manager"] = _fill(df["manager"], "N/A")
+    df["department"] = _fill(df["department"], OTHER)
+
+    df["department_priority"] = (
+        df["department"].map(DEPARTMENT_ORDER).fillna(DEPARTMENT_ORDER[OTHER])
+    )
+    df["client_priority"] = df["client"].map(CLIENT_PRIORITY).fillna(1)
+
+    # Experience from joining, else articles registration
+    start = pd.to_datetime(df["joined"]).fillna(pd.to_datetime(df["articles"]))
+    days = (pd.Timestamp(today) - start).dt.days
+    df["experience"] = (days / 365).round(1).fillna(0)
+
+    df["staff"] = df.groupby("client")["name"].transform("size")
+    # Clients by priority and staff count; employees by department, keeping
+    # their original order within a department
+    return df.sort_values(
+        ["client_priority", "staff", "client", "department_priority"],
+        ascending=[True, False, True, True],
+        kind="mergesort",
+    ).reset_index(drop=True)
+
+
+def groups(df):
+    """``[(number, client, staff, rows)]`` in report order.
+
+    ``rows`` are dicts with a continuous employee ``number`` across clients.
+    """
+    result = []
+    if df.empty:
+        return result
+    records = df[["client", "name", "manager", "department", "experience"]].to_dict(
+        "records"
+    )
+    boundaries = (df["client"] != df["client"].shift()).to_numpy().nonzero()[0].tolist()
+    boundaries.append(len(records))
+    for number, (first, last) in enumerate(zip(boundaries, boundaries[1:]), start=1):
+        rows = records[first:last]
+        for offset, row in enumerate(rows):
+            row["number"] = first + offset + 1
+        result.append((number, rows[0]["client"], len(rows), rows))
+    return result
+
+
+def totals(df):
+    """Headline counts of the allocation frame."""
+    return {
+        "staff_count": int(len(df)),
+        "client_count": int(df["client"].nunique()) if len(df) else 0,
+        "unallocated_count": int((df["client"] == UNALLOCATED).sum()),
+    }
@@ -6,6 +6,9 @@
     "license": "LGPL-3",
     "category": "Accounting/Auditing",
     "depends": ["qaco_audit", "qaco_planning_phase", "account"],
+    "external_dependencies": {
+        "python": ["numpy", "pandas"],
+    },
     "data": [
         "security/ir.model.access.csv",
         "views/execution_phase_actions.xml",
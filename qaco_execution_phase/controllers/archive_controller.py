@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import http
+from odoo.http import Response, content_disposition, request
+
+from ..utils import archive
+
+_logger = logging.getLogger(__name__)
+
+
+class ExecutionArchiveController(http.Controller):
+    """Engagement-file downloads for the execution phase."""
+
+    def _get_phase(self, phase_id):
+        phase = request.env["qaco.execution.phase"].browse(phase_id).exists()
+        if phase:
+            phase.check_access_rights("read")
+            phase.check_access_rule("read")
+        return phase
+
+    @staticmethod
+    def _record_export(env, phase_id, manifest, attachment_count):
+        """Callback recording a completed export in its own transaction.
+
+        It runs after the response has been sent, when the request cursor
+        is already closed.
+        """
+
+        def record():
+            try:
+                with env.registry.cursor() as cr:
+                    phase = env(cr=cr)["qaco.execution.phase"].browse(phase_id)
+                    phase._record_archive_export(manifest, attachment_count)
+            except Exception:
+                _logger.exception(
+                    "Execution phase %s: could not record the completed export", phase_id
+                )
+
+        return record
+
+    @http.route(
+        "/qaco_execution/<int:phase_id>/archive",
+        type="http",
+        auth="user",
+        methods=["GET"],
+    )
+    def download_archive(self, phase_id, incremental=None, **kwargs):
+        """Stream the engagement file as a ZIP straight from the filestore.
+
+        The request itself changes nothing: the incremental baseline is
+        moved from the end of the stream, so an aborted download is simply
+        included again in the next incremental export.
+        """
+        phase = self._get_phase(phase_id)
+        if not phase or not phase.execution_complete:
+            return request.not_found()
+        entries, manifest, filename = phase._prepare_archive(incremental=bool(incremental))
+        _logger.info(
+            "Execution phase %s: streaming %s archive with %s entries",
+            phase.id,
+            manifest["mode"],
+            len(entries),
+        )
+        attachment_count = sum(1 for e in entries if e.source.startswith("ir.attachment"))
+        return Response(
+            archive.stream_zip(
+                entries,
+                manifest,
+                on_complete=self._record_export(
+                    request.env, phase.id, manifest, attachment_count
+                ),
+            ),
+            headers=[
+                ("Content-Type", "application/zip"),
+                ("Content-Disposition", content_disposition(filename)),
+                ("Cache-Control", "no-store"),
+            ],
+            direct_passthrough=True,
+        )
+
+    @http.route(
+        "/qaco_execution/<int:phase_id>/certificate",
+        type="http",
+        auth="user",
+        methods=["GET"],
+    )
+    def download_certificate(self, phase_id, **kwargs):
+        phase = self._get_phase(phase_id)
+        if not phase or not phase.phase_completion_certificate:
+            return request.not_found()
+        filename = "%s - completion certificate.html" % archive.safe_name(phase.name)
+        return request.make_response(
+            phase._render_phase_certificate(),
+            headers=[
+                ("Content-Type", "text/html; charset=utf-8"),
+                ("Content-Disposition", content_disposition(filename)),
+            ],
+        )
@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
 
+import base64
+import json
+import re
+import secrets
+from collections import defaultdict
 from datetime import date
 from typing import TYPE_CHECKING, Any
 
 from odoo import api, fields, models  # type: ignore
-from odoo.exceptions import UserError  # type: ignore[attr-defined]
+from odoo.exceptions import UserError, ValidationError  # type: ignore[attr-defined]
+from odoo.tools import html_escape  # type: ignore
 
 try:  # pragma: no cover - fallback for type checking environments
     from odoo import _  # type: ignore
@@ -13,6 +19,8 @@ except Exception:  # pragma: no cover
     def _(message: str, *args: Any, **kwargs: Any) -> str:  # type: ignore
         return message
 
+from ..utils import archive, sampling
+
 
 SUBTAB_STATUS = [
     ("red", "Incomplete"),
@@ -54,6 +62,8 @@ SAMPLING_METHODS = [
     ("random", "Random"),
     ("systematic", "Systematic"),
     ("mus", "Monetary Unit Sampling"),
+    ("stratified", "Stratified (Value Bands)"),
+    ("attribute", "Attribute (Controls)"),
     ("haphazard", "Haphazard (Documented)"),
 ]
 
@@ -217,6 +227,13 @@ class QacoExecutionPhase(models.Model):
     phase_completion_certificate = fields.Boolean(
         string="Phase Completion Certificate Generated", tracking=True, copy=False
     )
+    archive_exported_on = fields.Datetime(
+        string="Engagement File Exported On",
+        copy=False,
+        readonly=True,
+        help="Start of the last engagement-file export; incremental exports "
+        "include items changed after this time",
+    )
     can_finalize_execution = fields.Boolean(
         string="Can Finalize Execution", compute="_compute_can_finalize", store=True
     )
@@ -237,28 +254,54 @@ class QacoExecutionPhase(models.Model):
 
     @api.depends("audit_id")
     def _compute_planning_phase(self):
-        planning_model = self.env["qaco.planning.phase"]
+        # One search for the whole batch; the first planning phase per audit
+        # (in the planning model's order) wins, as with a limit=1 search.
+        planning_by_audit = {}
+        if self.audit_id:
+            for planning in self.env["qaco.planning.phase"].search(
+                [("audit_id", "in", self.audit_id.ids)]
+            ):
+                planning_by_audit.setdefault(planning.audit_id.id, planning.id)
         for record in self:
-            planning = False
-            if record.audit_id:
-                planning = planning_model.search(
-                    [("audit_id", "=", record.audit_id.id)], limit=1
-                )
-            record.planning_phase_id = planning.id if planning else False
+            record.planning_phase_id = planning_by_audit.get(record.audit_id.id, False)
 
     @api.depends(
         "execution_risk_line_ids.is_fully_addressed",
         "execution_risk_line_ids.is_significant",
     )
     def _compute_risk_metrics(self):
+        """Coverage % and open significant risks from one grouped count.
+
+        Records being edited in a form are computed from their in-memory
+        lines so unsaved changes are reflected.
+        """
+        stored = self.filtered(lambda r: isinstance(r.id, int))
+        counts = defaultdict(lambda: [0, 0, 0])  # total, addressed, open significant
+        if stored:
+            groups = self.env["qaco.exec.risk.coverage"]._read_group(
+                [("execution_phase_id", "in", stored.ids)],
+                ["execution_phase_id", "is_significant", "is_fully_addressed"],
+                ["__count"],
+            )
+            for phase, significant, addressed, count in groups:
+                totals = counts[phase.id]
+                totals[0] += count
+                if addressed:
+                    totals[1] += count
+                elif significant:
+                    totals[2] += count
+        for record in self - stored:
+            totals = counts[record.id]
+            for line in record.execution_risk_line_ids:
+                totals[0] += 1
+                if line.is_fully_addressed:
+                    totals[1] += 1
+                elif line.is_significant:
+                    totals[2] += 1
         for record in self:
-            lines = record.execution_risk_line_ids
-            total = len(lines)
-            addressed = len(lines.filtered(lambda line: line.is_fully_addressed))
+            total, addressed, open_significant = counts[record.id]
             record.risk_coverage_percent = (addressed / total * 100.0) if total else 0.0
-            record.open_critical_risk_count = len(
-                lines.filtered(lambda line: line.is_significant and not line.is_fully_addressed)
-            )
+            record.open_critical_risk_count = open_significant
 
     @api.depends(
         "control_status",
@@ -387,25 +430,44 @@ class QacoExecutionPhase(models.Model):
         return res
 
     def _ensure_risk_matrix_alignment(self):
-        risk_line_model = self.env["qaco.exec.risk.coverage"]
-        for record in self:
-            if not record.planning_phase_id or not record.audit_id:
-                continue
-            planning_risks = record.planning_phase_id.risk_register_line_ids
-            existing_links = record.execution_risk_line_ids.mapped("planning_risk_id")
-            for planning_risk in planning_risks:
-                if planning_risk in existing_links:
-                    continue
-                risk_line_model.create(
-                    {
-                        "execution_phase_id": record.id,
-                        "planning_risk_id": planning_risk.id,
-                        "risk_description": planning_risk.risk_description,
-                        "risk_rating": planning_risk.risk_rating,
-                        "assertion_type": planning_risk.assertion_type or "existence",
-                        "is_significant": planning_risk.is_significant_risk,
-                    }
-                )
+        """Mirror planning risk register lines as coverage rows.
+
+        Planning risks and existing coverage links are read once for all
+        records; the missing coverage rows are created in a single batch.
+        """
+        phases = self.filtered(lambda r: r.planning_phase_id and r.audit_id)
+        if not phases:
+            return
+        coverage_model = self.env["qaco.exec.risk.coverage"]
+        risks_by_planning = (
+            self.env["qaco.risk.register.line"]
+            .search([("planning_phase_id", "in", phases.planning_phase_id.ids)])
+            .grouped("planning_phase_id")
+        )
+        linked = {
+            (line.execution_phase_id.id, line.planning_risk_id.id)
+            for line in coverage_model.search(
+                [
+                    ("execution_phase_id", "in", phases.ids),
+                    ("planning_risk_id", "!=", False),
+                ]
+            )
+        }
+        vals_list = [
+            {
+                "execution_phase_id": record.id,
+                "planning_risk_id": planning_risk.id,
+                "risk_description": planning_risk.risk_description,
+                "risk_rating": planning_risk.risk_rating,
+                "assertion_type": planning_risk.assertion_type or "existence",
+                "is_significant": planning_risk.is_significant_risk,
+            }
+            for record in phases
+            for planning_risk in risks_by_planning.get(record.planning_phase_id, [])
+            if (record.id, planning_risk.id) not in linked
+        ]
+        if vals_list:
+            coverage_model.create(vals_list)
 
     # === Actions ===
     def _ensure_statuses_green(self):
@@ -491,7 +553,7 @@ class QacoExecutionPhase(models.Model):
         )
         return {
             "type": "ir.actions.act_url",
-            "url": f"/web/content/qaco.execution.phase/{self.id}/phase_certificate",
+            "url": f"/qaco_execution/{self.id}/certificate",
             "target": "new",
         }
 
@@ -501,57 +563,327 @@ class QacoExecutionPhase(models.Model):
             raise UserError(_("Complete the execution phase before exporting."))
         return {
             "type": "ir.actions.act_url",
-            "url": f"/web/content/qaco.execution.phase/{self.id}/execution_archive",
+            "url": f"/qaco_execution/{self.id}/archive",
             "target": "new",
         }
 
+    def action_export_execution_changes(self):
+        self.ensure_one()
+        if not self.archive_exported_on:
+            return self.action_export_execution_file()
+        if not self.execution_complete:
+            raise UserError(_("Complete the execution phase before exporting."))
+        return {
+            "type": "ir.actions.act_url",
+            "url": f"/qaco_execution/{self.id}/archive?incremental=1",
+            "target": "new",
+        }
+
+    # === Engagement file export ===
+    def _render_phase_certificate(self):
+        """Self-contained HTML phase completion certificate."""
+        self.ensure_one()
+        rows = [
+            (_("Client"), self.client_id.name),
+            (_("Audit"), self.audit_id.display_name),
+            (_("Execution completed on"), self.execution_completed_on),
+            (_("Manager sign-off"), self.manager_signed_user_id.name),
+            (_("Manager signed on"), self.manager_signed_on),
+            (_("Partner sign-off"), self.partner_signed_user_id.name),
+            (_("Partner signed on"), self.partner_signed_on),
+            (_("Quality reviewer"), self.quality_reviewer_id.name),
+            (_("Risk coverage"), "%.2f%%" % self.risk_coverage_percent),
+            (_("Open significant risks"), self.open_critical_risk_count),
+        ]
+        body = "".join(
+            "<tr><th>%s</th><td>%s</td></tr>" % (html_escape(label), html_escape(value or "-"))
+            for label, value in rows
+        )
+        return (
+            "<!DOCTYPE html><html><head><meta charset='utf-8'/><title>%(title)s</title>"
+            "<style>body{font-family:sans-serif;margin:2em}th{text-align:left;"
+            "padding-right:2em}</style></head><body><h1>%(title)s</h1>"
+            "<p>%(statement)s</p><table>%(body)s</table></body></html>"
+        ) % {
+            "title": html_escape(_("Execution Phase Completion Certificate")),
+            "statement": html_escape(
+                _(
+                    "The execution phase of this engagement has been completed, "
+                    "reviewed and signed off in accordance with ISA 230 and ISA 330."
+                )
+            ),
+            "body": body,
+        }
+
+    def _attachment_entries(self, attachments, folder, since=None):
+        """Archive entries for attachments, streamed from the filestore."""
+        entries = []
+        for attachment in attachments.sudo():
+            if attachment.type == "url":
+                continue
+            if since and attachment.write_date <= since:
+                continue
+            name = archive.safe_name(attachment.name, default="attachment-%s" % attachment.id)
+            entry = archive.ArchiveEntry(
+                f"{folder}/{name}",
+                modified=attachment.write_date,
+                source=f"ir.attachment,{attachment.id}",
+            )
+            if attachment.store_fname:
+                entry = entry._replace(path=attachment._full_path(attachment.store_fname))
+            else:
+                entry = entry._replace(data=attachment.raw or b"")
+            entries.append(entry)
+        return entries
+
+    def _prepare_archive(self, incremental=False):
+        """Collect the engagement file as archive entries.
+
+        Everything read from the database is gathered here so the returned
+        entries only reference filestore paths and generated bytes; the ZIP
+        is then streamed after the request cursor is released. Registers
+        (control tests, sampling, workpapers, evidence) are always complete;
+        in incremental mode only attachments changed since the previous
+        export are added.
+
+        Nothing is written here: the incremental baseline only moves once
+        the download has completed, see :meth:`_record_archive_export`.
+
+        :return: ``(entries, manifest, filename)``
+        """
+        self.ensure_one()
+        since = self.archive_exported_on if incremental else None
+        started = fields.Datetime.now()
+        entries = []
+
+        if self.phase_completion_certificate:
+            entries.append(
+                archive.ArchiveEntry(
+                    "00 Certificate/phase_completion_certificate.html",
+                    data=self._render_phase_certificate(),
+                    modified=started,
+                    source=f"{self._name},{self.id}",
+                )
+            )
+
+        controls = self.control_test_ids
+        entries.append(
+            archive.ArchiveEntry(
+                "01 Controls/control_tests.csv",
+                data=archive.csv_bytes(
+                    [
+                        "ID", "Control", "Process", "Owner", "Frequency", "Linked Risk",
+                        "Assertion", "Design", "Operating Effectiveness",
+                        "Planned Reliance", "Sample Size", "Exceptions", "Conclusion",
+                        "Status",
+                    ],
+                    [
+                        [
+                            test.id,
+                            test.control_name,
+                            test.process_name,
+                            test.control_owner or "",
+                            test.frequency or "",
+                            (test.risk_line_id.risk_description or "")[:200],
+                            test.assertion_type or "",
+                            test.design_effectiveness or "",
+                            test.operating_effectiveness or "",
+                            test.planned_reliance_level or "",
+                            test.selected_sample_size,
+                            test.exception_count,
+                            test.conclusion or "",
+                            test.test_status or "",
+                        ]
+                        for test in controls
+                    ],
+                ),
+                modified=started,
+            )
+        )
+        for test in controls:
+            folder = "01 Controls/%s - %s" % (test.id, archive.safe_name(test.control_name))
+            entries += self._attachment_entries(
+                test.documentation_attachment_ids | test.walkthrough_attachment_ids,
+                folder,
+                since,
+            )
+
+        workpapers = self.workpaper_ids
+        entries.append(
+            archive.ArchiveEntry(
+                "02 Workpapers/workpapers.csv",
+                data=archive.csv_bytes(
+                    ["ID", "Workpaper", "Type", "Balance", "Preparer", "Reviewer",
+                     "Reviewed On", "Locked", "Files"],
+                    [
+                        [
+                            wp.id,
+                            wp.name,
+                            wp.workpaper_type,
+                            wp.balance_amount,
+                            wp.preparer_id.name or "",
+                            wp.reviewer_id.name or "",
+                            wp.reviewed_on or "",
+                            wp.locked,
+                            len(wp.attachment_ids),
+                        ]
+                        for wp in workpapers
+                    ],
+                ),
+                modified=started,
+            )
+        )
+        for wp in workpapers:
+            folder = "02 Workpapers/%s - %s" % (wp.id, archive.safe_name(wp.name))
+            entries += self._attachment_entries(wp.attachment_ids, folder, since)
+
+        evidence = self.evidence_item_ids
+        entries.append(
+            archive.ArchiveEntry(
+                "03 Evidence/evidence.csv",
+                data=archive.csv_bytes(
+                    ["ID", "Description", "Assertion", "Evidence Type", "Reliability",
+                     "Collected By", "Collected On", "ISA Reference", "Files"],
+                    [
+                        [
+                            item.id,
+                            item.description,
+                            item.assertion_type or "",
+                            item.evidence_type,
+                            item.reliability_score,
+                            item.collected_by.name or "",
+                            item.collected_on or "",
+                            item.isa_reference or "",
+                            len(item.attachment_ids),
+                        ]
+                        for item in evidence
+                    ],
+                ),
+                modified=started,
+            )
+        )
+        for item in evidence:
+            folder = "03 Evidence/%s - %s" % (item.id, archive.safe_name(item.description))
+            entries += self._attachment_entries(item.attachment_ids, folder, since)
+
+        requests = self.sampling_request_ids
+        entries.append(
+            archive.ArchiveEntry(
+                "04 Sampling/sampling_requests.csv",
+                data=archive.csv_bytes(
+                    ["ID", "Reference", "Population", "Method", "Risk", "Population Size",
+                     "Population Value", "Sample Size", "Items Selected", "Seed",
+                     "Population Hash", "Errors", "Projected Misstatement",
+                     "Upper Misstatement Limit", "Upper Deviation Rate %", "Conclusion",
+                     "State"],
+                    [
+                        [
+                            req.id,
+                            req.name,
+                            req.population_description,
+                            req.method or "",
+                            req.risk_level or "",
+                            req.population_size,
+                            req.population_amount,
+                            req.sample_size,
+                            req.selection_count,
+                            req.sample_seed or "",
+                            req.population_hash or "",
+                            req.errors_found,
+                            req.projected_misstatement,
+                            req.upper_misstatement_limit,
+                            req.upper_deviation_rate,
+                            req.evaluation_conclusion or "",
+                            req.state,
+                        ]
+                        for req in requests
+                    ],
+                ),
+                modified=started,
+            )
+        )
+        for req in requests:
+            folder = "04 Sampling/%s - %s" % (req.id, archive.safe_name(req.name))
+            if req.selection_parameters:
+                entries.append(
+                    archive.ArchiveEntry(
+                        f"{folder}/selection_parameters.json",
+                        data=req.selection_parameters,
+                        modified=req.selected_on,
+                        source=f"{req._name},{req.id}",
+                    )
+                )
+            entries += self._attachment_entries(req.sample_file_id, folder, since)
+
+        manifest = {
+            "engagement": self.name,
+            "client": self.client_id.name,
+            "audit": self.audit_id.display_name,
+            "execution_phase_id": self.id,
+            "mode": "incremental" if since else "full",
+            "changed_since": since,
+            "generated_on": started,
+            "generated_by": self.env.user.name,
+        }
+        filename = "%s - %s%s.zip" % (
+            archive.safe_name(self.name),
+            started.strftime("%Y%m%d-%H%M"),
+            " (changes)" if since else "",
+        )
+        return archive.unique_arcnames(entries), manifest, filename
+
+    def _record_archive_export(self, manifest, attachment_count):
+        """Move the incremental baseline after a completed export.
+
+        The baseline only moves forward, so a slower download finishing
+        after a newer one does not widen the next incremental export.
+        """
+        self.ensure_one()
+        started = manifest["generated_on"]
+        if not self.archive_exported_on or self.archive_exported_on < started:
+            self.archive_exported_on = started
+        self.message_post(
+            body=_("Engagement file exported (%s, %s attachments).")
+            % (manifest["mode"], attachment_count)
+        )
+
     def action_backfill_exception_amounts(self):
-        ir_model = self.env["ir.model"]
-        if not ir_model._get("qaco.finalisation.phase"):
+        """Pull revised misstatement amounts back into the exceptions.
+
+        Runs the finalisation two-way reconciliation for the linked
+        finalisation phases, which also registers new exceptions.
+        """
+        if "qaco.finalisation.phase" not in self.env:
             raise UserError(
                 "Install the finalisation phase module to backfill exceptions."
             )
-
-        finalisation_model = self.env["qaco.finalisation.phase"]
-        SubProcedure = self.env["qaco.exec.substantive.procedure"]
-        total_updates = 0
-        for record in self:
-            if not record.audit_id:
-                continue
-            finalisation = finalisation_model.search(
-                [("audit_id", "=", record.audit_id.id)], limit=1
+        finalisations = self.env["qaco.finalisation.phase"].search(
+            [("execution_phase_id", "in", self.ids)]
+        )
+        if not finalisations:
+            raise UserError(
+                "No finalisation phase is linked to this execution phase yet."
             )
-            if not finalisation:
-                continue
-            updates = 0
-            for misstatement in finalisation.misstatement_line_ids:
-                if (
-                    misstatement.source_model != "qaco.exec.substantive.procedure"
-                    or not misstatement.source_reference
-                ):
-                    continue
-                _, _, proc_id_str = misstatement.source_reference.partition(":")
-                if not proc_id_str:
-                    continue
-                try:
-                    proc = SubProcedure.browse(int(proc_id_str))
-                except ValueError:
-                    continue
-                if not proc.exists() or proc.execution_phase_id.id != record.id:
-                    continue
-                if proc.exception_amount != misstatement.amount:
-                    proc.write({"exception_amount": misstatement.amount})
-                    updates += 1
-            if updates:
+        stats = finalisations._reconcile_misstatements()
+        if stats["pulled"]:
+            for record in self:
                 record.message_post(
-                    body="Backfilled %s procedure(s) with quantified exceptions."
-                    % updates
+                    body="Backfilled %s exception(s) with revised misstatement amounts."
+                    % stats["pulled"]
                 )
-                total_updates += updates
-        if not total_updates:
-            raise UserError(
-                "No linked misstatements were found to backfill. Run the finalisation sync first."
-            )
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Exceptions Reconciled"),
+                "message": _(
+                    "%(pulled)s exception amounts backfilled, %(created)s misstatements "
+                    "registered, %(pushed)s updated, %(conflicts)s conflicts."
+                )
+                % stats,
+                "type": "warning" if stats["conflicts"] else "success",
+            },
+        }
 
 
 class ExecutionRiskCoverage(models.Model):
@@ -596,6 +928,7 @@ class ExecutionRiskCoverage(models.Model):
             tests = record.control_test_ids | record.substantive_procedure_ids
             record.coverage_percent = min(len(tests) * 50.0, 100.0) if tests else 0.0
 
+    @api.depends("control_test_ids.test_status", "substantive_procedure_ids.status")
     def _compute_is_fully_addressed(self):
         for record in self:
             has_control = bool(
@@ -763,6 +1096,18 @@ class ExecutionControlException(models.Model):
         required=True,
     )
     impact = fields.Text(string="Impact on Financial Statements", required=True)
+    company_currency_id = fields.Many2one(
+        "res.currency",
+        related="control_test_id.execution_phase_id.company_currency_id",
+        store=False,
+        readonly=True,
+    )
+    exception_amount = fields.Monetary(
+        string="Exception Amount",
+        currency_field="company_currency_id",
+        help="Monetary effect of the exception; quantified exceptions are carried "
+        "to the finalisation misstatement register",
+    )
     isa265_communicated = fields.Boolean(string="Communicated per ISA 265")
     communication_reference = fields.Char(string="Communication Reference")
     remediation_plan = fields.Text(string="Remediation / Compensating Procedure")
@@ -918,7 +1263,10 @@ class ExecutionSamplingRequest(models.Model):
     sample_size = fields.Integer(
         string="Sample Size", compute="_compute_sample_size", store=True
     )
-    sample_seed = fields.Char(string="Random Seed / Parameters")
+    sample_seed = fields.Char(
+        string="Random Seed",
+        help="Integer seed of the selection; generated on first selection when empty",
+    )
     sample_file_id = fields.Many2one("ir.attachment", string="Sample Selection File")
     memo = fields.Html(string="Sampling Rationale Memo")
     company_currency_id = fields.Many2one(
@@ -934,20 +1282,366 @@ class ExecutionSamplingRequest(models.Model):
         tracking=True,
     )
 
-    @api.depends("population_size", "tolerable_error", "expected_error", "risk_level")
+    # Population upload and selection
+    population_file = fields.Binary(string="Population File (CSV)")
+    population_filename = fields.Char(string="Population File Name")
+    amount_column = fields.Char(
+        string="Amount Column",
+        help="Header of the book value column; detected from common names when empty",
+    )
+    key_column = fields.Char(
+        string="Item Reference Column",
+        help="Header identifying each item (invoice no., voucher no.)",
+    )
+    strata_bounds = fields.Char(
+        string="Strata Boundaries",
+        help="Ascending absolute amounts separating value strata, e.g. 10,000; 100,000",
+    )
+    population_hash = fields.Char(string="Population Hash", readonly=True, copy=False)
+    selected_rows = fields.Binary(
+        string="Selected Rows", attachment=False, readonly=True, copy=False
+    )
+    selection_count = fields.Integer(string="Items Selected", readonly=True, copy=False)
+    sampling_interval = fields.Float(
+        string="Sampling Interval", digits=(16, 2), readonly=True, copy=False
+    )
+    selection_parameters = fields.Text(
+        string="Selection Parameters", readonly=True, copy=False
+    )
+    selected_on = fields.Datetime(string="Selected On", readonly=True, copy=False)
+
+    # Evaluation
+    results_file = fields.Binary(string="Sample Results (CSV)", copy=False)
+    results_filename = fields.Char(string="Results File Name", copy=False)
+    errors_found = fields.Integer(string="Errors / Deviations", readonly=True, copy=False)
+    sample_deviation_rate = fields.Float(
+        string="Sample Deviation Rate %", digits=(5, 2), readonly=True, copy=False
+    )
+    upper_deviation_rate = fields.Float(
+        string="Upper Deviation Rate %", digits=(5, 2), readonly=True, copy=False
+    )
+    projected_misstatement = fields.Monetary(
+        string="Projected Misstatement",
+        currency_field="company_currency_id",
+        readonly=True,
+        copy=False,
+    )
+    upper_misstatement_limit = fields.Monetary(
+        string="Upper Misstatement Limit",
+        currency_field="company_currency_id",
+        readonly=True,
+        copy=False,
+    )
+    evaluation_conclusion = fields.Selection(
+        [
+            ("accept", "Population Acceptable"),
+            ("reject", "Tolerable Error Exceeded"),
+        ],
+        string="Conclusion",
+        readonly=True,
+        copy=False,
+    )
+
+    @api.depends(
+        "method",
+        "population_size",
+        "population_amount",
+        "tolerable_error",
+        "expected_error",
+        "risk_level",
+    )
     def _compute_sample_size(self):
         for record in self:
-            if not record.population_size:
-                record.sample_size = 0
+            record.sample_size = sampling.sample_size(
+                record.method,
+                record.population_size,
+                record.population_amount,
+                record.tolerable_error,
+                record.expected_error,
+                record.risk_level,
+            )
+
+    @api.constrains(
+        "method", "population_amount", "tolerable_error", "expected_error", "risk_level"
+    )
+    def _check_error_rates(self):
+        for record in self:
+            tolerable, expected = record.tolerable_error, record.expected_error
+            if tolerable <= 0 or expected >= tolerable:
+                raise ValidationError(
+                    _("Expected error must be below a positive tolerable error (%s).")
+                    % record.name
+                )
+            if record.method in sampling.MONETARY_METHODS and record.population_amount:
                 continue
-            risk_multiplier = {"low": 0.5, "medium": 1, "high": 1.5}[record.risk_level]
-            base = max(
-                record.population_size
-                * (record.tolerable_error / 100.0)
-                * risk_multiplier,
-                1,
+            confidence = sampling.RISK_CONFIDENCE.get(record.risk_level or "medium", 0.90)
+            size = sampling.attribute_sample_size(
+                tolerable / 100.0, expected / 100.0, confidence
+            )
+            if size is None:
+                raise ValidationError(
+                    _(
+                        "Expected error is too close to the tolerable error for "
+                        "%(name)s: no sample of up to %(max)s items supports it. Lower "
+                        "the expected error or test the population in full."
+                    )
+                    % {"name": record.name, "max": sampling.MAX_ATTRIBUTE_SAMPLE}
+                )
+
+    def _check_draft(self):
+        if self.filtered(lambda r: r.state == "locked"):
+            raise UserError(_("Locked sampling requests cannot be changed."))
+
+    def _parse_strata_bounds(self):
+        parts = re.split(r"[;\s]+|,\s+", (self.strata_bounds or "").strip())
+        try:
+            bounds = sorted(float(part.replace(",", "")) for part in parts if part)
+        except ValueError as e:
+            raise UserError(
+                _("Strata boundaries must be amounts separated by '; ' (e.g. 10,000; 100,000).")
+            ) from e
+        return tuple(bounds)
+
+    def _binary_source(self, field_name):
+        """Filestore path of an uploaded file when available, so it is streamed."""
+        attachment = self.env["ir.attachment"].sudo().search(
+            [
+                ("res_model", "=", self._name),
+                ("res_id", "=", self.id),
+                ("res_field", "=", field_name),
+            ],
+            limit=1,
+        )
+        if attachment.store_fname:
+            return attachment._full_path(attachment.store_fname)
+        return base64.b64decode(self[field_name])
+
+    def _open_population(self, include_key=False):
+        source = self._binary_source("population_file")
+        return lambda: sampling.iter_population(
+            source, self.amount_column, self.key_column, include_key=include_key
+        )
+
+    def _run_selection(self, seed):
+        method = self.method
+        if method == "attribute":
+            method = "random"
+        strata_bounds = self._parse_strata_bounds() if method == "stratified" else ()
+        open_chunks = self._open_population()
+        try:
+            profile = sampling.profile_population(open_chunks(), strata_bounds)
+            size = sampling.sample_size(
+                self.method,
+                profile.rows,
+                profile.total,
+                self.tolerable_error,
+                self.expected_error,
+                self.risk_level,
+            )
+            selection = sampling.run_selection(
+                open_chunks, method, size, seed, strata_bounds, profile=profile
+            )
+        except (ValueError, RuntimeError) as e:
+            raise UserError(_("Population could not be sampled: %s") % e) from e
+        return selection, strata_bounds
+
+    def action_select_sample(self):
+        """Stream the population file and select the sample reproducibly."""
+        self.ensure_one()
+        self._check_draft()
+        if self.method == "haphazard":
+            raise UserError(_("Haphazard samples are selected and documented manually."))
+        if not self.population_file:
+            raise UserError(_("Upload the population as a CSV file first."))
+        if not (self.population_filename or "").lower().endswith(".csv"):
+            raise UserError(_("The population file must be a CSV export."))
+        if self.sample_seed and not self.sample_seed.strip().isdigit():
+            raise UserError(_("The random seed must be a whole number."))
+        seed = int(self.sample_seed) if self.sample_seed else secrets.randbelow(2**31)
+
+        selection, strata_bounds = self._run_selection(seed)
+        profile = selection.profile
+        rows = sampling.extract_rows(
+            self._open_population(include_key=True)(), selection.indices
+        )
+        rows["audited_amount"] = ""
+        rows["deviation"] = ""
+        filename = "%s - sample selection.csv" % self.name
+        self.sample_file_id.unlink()
+        attachment = self.env["ir.attachment"].create(
+            {
+                "name": filename,
+                "datas": base64.b64encode(rows.to_csv(index=False).encode()),
+                "mimetype": "text/csv",
+                "res_model": self._name,
+                "res_id": self.id,
+            }
+        )
+        parameters = {
+            "method": self.method,
+            "seed": seed,
+            "sample_size": len(selection.indices),
+            "population_rows": profile.rows,
+            "population_total": profile.total,
+            "amount_column": self.amount_column or "",
+            "key_column": self.key_column or "",
+            "strata_bounds": list(strata_bounds),
+            "strata_totals": profile.strata_totals.tolist(),
+            "interval": selection.interval,
+            "numpy": sampling.np.__version__,
+        }
+        self.write(
+            {
+                "sample_seed": str(seed),
+                "population_size": profile.rows,
+                "population_amount": profile.total,
+                "population_hash": profile.hash,
+                "selected_rows": base64.b64encode(sampling.pack_indices(selection.indices)),
+                "selection_count": len(selection.indices),
+                "sampling_interval": selection.interval,
+                "selection_parameters": json.dumps(parameters, indent=1),
+                "selected_on": fields.Datetime.now(),
+                "sample_file_id": attachment.id,
+            }
+        )
+        body = _(
+            "Sample '%(name)s': %(count)s of %(rows)s items selected by %(method)s "
+            "(seed %(seed)s, population hash %(hash)s)."
+        ) % {
+            "name": self.name,
+            "count": len(selection.indices),
+            "rows": profile.rows,
+            "method": dict(SAMPLING_METHODS)[self.method],
+            "seed": seed,
+            "hash": profile.hash[:12],
+        }
+        self.execution_phase_id.message_post(body=body)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Sample Selected"),
+                "message": body,
+                "type": "success",
+            },
+        }
+
+    def action_reperform_selection(self):
+        """Re-run the stored selection and confirm it reproduces exactly."""
+        self.ensure_one()
+        if not self.selected_rows:
+            raise UserError(_("No sample has been selected yet."))
+        if not self.population_file:
+            raise UserError(_("The population file is no longer attached."))
+        stored = sampling.unpack_indices(base64.b64decode(self.selected_rows))
+        selection, _bounds = self._run_selection(int(self.sample_seed))
+        if selection.profile.hash != self.population_hash:
+            raise UserError(
+                _("The population file has changed since the sample was selected.")
+            )
+        if not sampling.np.array_equal(stored, selection.indices):
+            raise UserError(
+                _("Re-performance selected different items; review the sampling parameters.")
             )
-            record.sample_size = int(round(base))
+        body = _("Sample '%s' re-performed: the same %s items were selected.") % (
+            self.name,
+            len(stored),
+        )
+        self.execution_phase_id.message_post(body=body)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Selection Re-performed"),
+                "message": body,
+                "type": "success",
+            },
+        }
+
+    def action_evaluate_results(self):
+        """Project sample errors from the filled-in selection file."""
+        self.ensure_one()
+        self._check_draft()
+        if not self.selected_rows:
+            raise UserError(_("Select the sample before evaluating results."))
+        if not self.results_file:
+            raise UserError(_("Upload the completed sample selection file first."))
+        indices = sampling.unpack_indices(base64.b64decode(self.selected_rows))
+        try:
+            frame = sampling.read_results(self._binary_source("results_file"), indices)
+        except (ValueError, RuntimeError) as e:
+            raise UserError(_("Results could not be read: %s") % e) from e
+
+        if len(frame) < self.selection_count:
+            raise UserError(
+                _("Results cover %s of the %s selected items; complete the file first.")
+                % (len(frame), self.selection_count)
+            )
+        parameters = json.loads(self.selection_parameters or "{}")
+        confidence = sampling.RISK_CONFIDENCE.get(self.risk_level or "medium", 0.90)
+        if self.method == "attribute":
+            if frame["deviation"].isna().any():
+                raise UserError(_("Record a deviation (yes/no) for every sampled item."))
+            result = sampling.evaluate_attribute(
+                len(frame), int(frame["deviation"].sum()), confidence
+            )
+            accept = result.upper_deviation_rate <= self.tolerable_error / 100.0
+        else:
+            if frame["amount"].isna().any() or frame["audited_amount"].isna().any():
+                raise UserError(_("Record an audited amount for every sampled item."))
+            book = frame["amount"].to_numpy()
+            audited = frame["audited_amount"].to_numpy()
+            if self.method == "mus":
+                result = sampling.evaluate_mus(book, audited, self.sampling_interval, confidence)
+            elif self.method == "stratified":
+                result = sampling.evaluate_ratio(
+                    book,
+                    audited,
+                    self.population_amount,
+                    sampling.assign_strata(book, parameters.get("strata_bounds", [])),
+                    parameters.get("strata_totals", []),
+                )
+            else:
+                result = sampling.evaluate_ratio(book, audited, self.population_amount)
+            tolerable = abs(self.population_amount) * self.tolerable_error / 100.0
+            accept = result.upper_misstatement_limit <= tolerable
+
+        self.write(
+            {
+                "errors_found": result.errors,
+                "sample_deviation_rate": result.sample_deviation_rate * 100.0,
+                "upper_deviation_rate": result.upper_deviation_rate * 100.0,
+                "projected_misstatement": result.projected_misstatement,
+                "upper_misstatement_limit": result.upper_misstatement_limit,
+                "evaluation_conclusion": "accept" if accept else "reject",
+            }
+        )
+        body = _(
+            "Sample '%(name)s' evaluated: %(errors)s errors in %(items)s items; "
+            "projected misstatement %(projected).2f, upper limit %(upper).2f, "
+            "upper deviation rate %(udr).2f%%. %(conclusion)s."
+        ) % {
+            "name": self.name,
+            "errors": result.errors,
+            "items": result.sample_items,
+            "projected": result.projected_misstatement,
+            "upper": result.upper_misstatement_limit,
+            "udr": result.upper_deviation_rate * 100.0,
+            "conclusion": dict(self._fields["evaluation_conclusion"].selection)[
+                self.evaluation_conclusion
+            ],
+        }
+        self.execution_phase_id.message_post(body=body)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Sample Evaluated"),
+                "message": body,
+                "type": "success" if accept else "warning",
+                "sticky": not accept,
+            },
+        }
 
     def action_lock_sampling(self):
         self.write({"state": "locked"})
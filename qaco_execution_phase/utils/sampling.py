@@ -0,0 +1,525 @@
+"""Statistical sampling engine for execution sampling requests (ISA 530).
+
+Covers sample sizing, reproducible selection and error evaluation:
+
+- sizing: attribute sampling from binomial risk, monetary-unit sampling
+  (MUS) from Poisson confidence factors with AICPA expansion factors
+- selection: random, systematic, MUS cell selection and stratified random
+  selection over a population streamed from CSV in chunks
+- evaluation: upper deviation rate for attribute samples, projected
+  misstatement and upper misstatement limit for MUS, ratio projection for
+  random, systematic and stratified samples
+
+Selections are seeded (NumPy ``PCG64``) and stored as packed row indices
+together with a hash of the parsed population, so a selection can be
+re-performed exactly and detected as stale when the population changes.
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks. NumPy and pandas are declared in the
+module manifest.
+"""
+
+import hashlib
+import io
+import math
+import zlib
+from collections import namedtuple
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    pd = None
+
+CHUNK_SIZE = 1000000
+
+# Confidence level required for each assessed risk level
+RISK_CONFIDENCE = {"low": 0.80, "medium": 0.90, "high": 0.95}
+
+# AICPA expansion factors for expected misstatement, by risk of incorrect acceptance
+EXPANSION_FACTORS = (
+    (0.05, 1.6), (0.10, 1.5), (0.15, 1.4), (0.20, 1.3), (0.25, 1.25),
+    (0.30, 1.2), (0.37, 1.15), (0.50, 1.0),
+)
+
+AMOUNT_COLUMNS = ("amount", "book value", "book_value", "balance", "value", "net amount")
+
+MONETARY_METHODS = ("mus", "stratified")
+
+# Largest attribute sample considered before the rates are deemed unworkable
+MAX_ATTRIBUTE_SAMPLE = 100000
+
+PopulationProfile = namedtuple(
+    "PopulationProfile", ["rows", "total", "abs_total", "hash", "strata_counts", "strata_totals"]
+)
+Selection = namedtuple("Selection", ["indices", "profile", "interval", "hits"])
+Evaluation = namedtuple(
+    "Evaluation",
+    [
+        "sample_items",
+        "errors",
+        "sample_deviation_rate",
+        "upper_deviation_rate",
+        "projected_misstatement",
+        "upper_misstatement_limit",
+    ],
+)
+
+
+def _require_pandas():
+    if pd is None:
+        raise RuntimeError("numpy and pandas are required for statistical sampling")
+
+
+# -----------------------------------------------------------------------------
+# Confidence factors and sample sizes
+# -----------------------------------------------------------------------------
+def poisson_cdf(k, lam):
+    """P(X <= k) for a Poisson variable with mean ``lam``."""
+    term = total = math.exp(-lam)
+    for i in range(1, int(k) + 1):
+        term *= lam / i
+        total += term
+    return total
+
+
+def poisson_factor(errors, confidence):
+    """Upper confidence limit factor for ``errors`` observed errors.
+
+    The smallest ``lam`` with ``P(X <= errors) <= 1 - confidence``; e.g.
+    3.00 for zero errors at 95% and 4.75 for one error.
+    """
+    risk = 1.0 - confidence
+    low, high = 0.0, max(10.0, 4.0 * (errors + 1))
+    for _i in range(100):
+        mid = (low + high) / 2.0
+        if poisson_cdf(errors, mid) > risk:
+            low = mid
+        else:
+            high = mid
+    return round(high, 4)
+
+
+def binomial_cdf(k, n, p):
+    """P(X <= k) for a binomial(n, p) variable."""
+    if p <= 0:
+        return 1.0
+    if p >= 1:
+        return 1.0 if k >= n else 0.0
+    log_odds = math.log(p) - math.log1p(-p)
+    # Log-space term recurrence: large n underflow the terms themselves
+    log_term = n * math.log1p(-p)
+    total = math.exp(log_term)
+    for i in range(0, min(int(k), n)):
+        log_term += math.log((n - i) / (i + 1.0)) + log_odds
+        total += math.exp(log_term)
+    return min(total, 1.0)
+
+
+def expansion_factor(confidence):
+    risk = 1.0 - confidence
+    for limit, factor in EXPANSION_FACTORS:
+        if risk <= limit + 1e-9:
+            return factor
+    return 1.0
+
+
+def _bisect(low, high, accept):
+    """Smallest value in ``[low, high]`` accepted by the monotone ``accept``."""
+    while low < high:
+        mid = (low + high) // 2
+        if accept(mid):
+            high = mid
+        else:
+            low = mid + 1
+    return low
+
+
+def attribute_sample_size(tolerable_rate, expected_rate, confidence, population_size=None):
+    """Smallest ``n`` whose binomial upper deviation limit is within tolerance.
+
+    Rates are fractions; a sample of ``n`` items allows ``ceil(n x expected)``
+    deviations. For a given number of allowed deviations ``k`` the tail
+    probability falls as ``n`` grows, so the smallest ``n`` per ``k`` and the
+    smallest ``k`` that admits such an ``n`` are both found by bisection:
+    a few hundred CDF evaluations at most, however large the sample.
+    Returns ``None`` when no sample up to ``MAX_ATTRIBUTE_SAMPLE`` items
+    supports the rates, i.e. the expected rate is not sufficiently below
+    the tolerable rate.
+    """
+    if tolerable_rate <= 0 or expected_rate >= tolerable_rate:
+        return None
+    risk = 1.0 - confidence
+
+    def smallest_n(k):
+        if binomial_cdf(k, MAX_ATTRIBUTE_SAMPLE, tolerable_rate) > risk:
+            return None
+        n = _bisect(
+            k + 1, MAX_ATTRIBUTE_SAMPLE, lambda n: binomial_cdf(k, n, tolerable_rate) <= risk
+        )
+        if k:
+            # Smallest sample that actually allows k deviations
+            n = max(n, math.floor((k - 1) / expected_rate) + 1)
+        return n if math.ceil(n * expected_rate) == k else None
+
+    max_k = math.ceil(MAX_ATTRIBUTE_SAMPLE * expected_rate)
+    if smallest_n(max_k) is None:
+        return None
+    n = smallest_n(_bisect(0, max_k, lambda k: smallest_n(k) is not None))
+    if population_size:
+        # Finite population correction
+        n = min(math.ceil(n / (1.0 + n / float(population_size))), population_size)
+    return n
+
+
+def mus_sample_size(book_value, tolerable, expected, confidence):
+    """MUS sample size ``BV x RF / (TM - EM x EF)``; ``None`` if not feasible."""
+    book_value = abs(book_value)
+    denominator = tolerable - expected * expansion_factor(confidence)
+    if book_value <= 0 or denominator <= 0:
+        return None
+    return max(1, math.ceil(book_value * poisson_factor(0, confidence) / denominator))
+
+
+def sample_size(method, population_size, population_amount, tolerable_pct, expected_pct, risk_level):
+    """Sample size for a sampling request; capped at the population size."""
+    if not population_size:
+        return 0
+    confidence = RISK_CONFIDENCE.get(risk_level or "medium", 0.90)
+    if method in MONETARY_METHODS and population_amount:
+        size = mus_sample_size(
+            population_amount,
+            abs(population_amount) * tolerable_pct / 100.0,
+            abs(population_amount) * expected_pct / 100.0,
+            confidence,
+        )
+        if size is None:
+            return population_size
+        return min(size, population_size)
+    size = attribute_sample_size(
+        tolerable_pct / 100.0, expected_pct / 100.0, confidence, population_size
+    )
+    return population_size if size is None else size
+
+
+# -----------------------------------------------------------------------------
+# Population streaming
+# -----------------------------------------------------------------------------
+def _open(source):
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def iter_population(source, amount_column=None, key_column=None, chunk_size=CHUNK_SIZE,
+                    include_key=True):
+    """Yield DataFrames with ``amount`` (float) and, optionally, ``key`` (str).
+
+    Only the amount and key columns are parsed; selection passes skip the
+    key (``include_key=False``) as string parsing dominates the read time.
+    Without an ``amount_column`` the first recognised amount header is used;
+    a population without amounts yields zero amounts (attribute sampling)
+    and always carries its key, falling back to the first column.
+    """
+    _require_pandas()
+    headers = list(pd.read_csv(_open(source), nrows=0).columns)
+    lookup = {str(h).strip().lower(): h for h in headers}
+    amount = lookup.get((amount_column or "").strip().lower())
+    if amount_column and amount is None:
+        raise ValueError(f"Amount column '{amount_column}' not found in the population file.")
+    if amount is None:
+        amount = next((lookup[name] for name in AMOUNT_COLUMNS if name in lookup), None)
+    key = lookup.get((key_column or "").strip().lower())
+    if key_column and key is None:
+        raise ValueError(f"Key column '{key_column}' not found in the population file.")
+    if amount is None:
+        key = key if key is not None else headers[0]
+    elif not include_key:
+        key = None
+    usecols = [c for c in (key, amount) if c is not None]
+    reader = pd.read_csv(
+        _open(source),
+        usecols=usecols,
+        dtype={key: str} if key is not None else None,
+        chunksize=chunk_size,
+    )
+    for chunk in reader:
+        out = pd.DataFrame(index=chunk.index)
+        if amount is not None:
+            values = chunk[amount]
+            if values.dtype == object:
+                values = pd.to_numeric(
+                    values.astype(str).str.replace(r"[,\s]", "", regex=True), errors="coerce"
+                )
+            out["amount"] = values.fillna(0.0).astype(float)
+        else:
+            out["amount"] = 0.0
+        if key is not None:
+            out["key"] = chunk[key].fillna("").astype(str)
+        elif include_key:
+            out["key"] = ""
+        yield out.reset_index(drop=True)
+
+
+def assign_strata(amounts, bounds):
+    """Stratum number of each absolute amount for ascending ``bounds``."""
+    return np.searchsorted(np.asarray(bounds, dtype=float), np.abs(amounts), side="right")
+
+
+def profile_population(chunks, strata_bounds=()):
+    """One pass: row count, totals, per-stratum counts and a content hash.
+
+    The hash covers the parsed amounts in file order, plus the item keys
+    when they are parsed (populations without amounts).
+    """
+    digest = hashlib.sha256()
+    rows, total, abs_total = 0, 0.0, 0.0
+    strata = len(strata_bounds) + 1
+    counts = np.zeros(strata, dtype=np.int64)
+    totals = np.zeros(strata, dtype=float)
+    for chunk in chunks:
+        amounts = chunk["amount"].to_numpy()
+        digest.update(amounts.astype("<f8").tobytes())
+        if "key" in chunk:
+            digest.update("\x1f".join(chunk["key"].tolist()).encode())
+        rows += len(chunk)
+        total += float(amounts.sum())
+        abs_total += float(np.abs(amounts).sum())
+        stratum = assign_strata(amounts, strata_bounds)
+        counts += np.bincount(stratum, minlength=strata)
+        totals += np.bincount(stratum, weights=np.abs(amounts), minlength=strata)
+    return PopulationProfile(rows, total, abs_total, digest.hexdigest(), counts, totals)
+
+
+# -----------------------------------------------------------------------------
+# Selection
+# -----------------------------------------------------------------------------
+def select_random(rows, size, seed):
+    rng = np.random.default_rng(seed)
+    size = min(size, rows)
+    return np.sort(rng.choice(rows, size=size, replace=False)).astype(np.int64)
+
+
+def select_systematic(rows, size, seed):
+    size = min(size, rows)
+    if not size:
+        return np.zeros(0, dtype=np.int64)
+    interval = rows / float(size)
+    start = np.random.default_rng(seed).uniform(0, interval)
+    return np.unique(np.floor(start + interval * np.arange(size)).astype(np.int64))
+
+
+def select_mus(chunks, abs_total, size, seed):
+    """Cell selection: one random monetary unit in each of ``size`` cells.
+
+    :return: ``(indices, hits, interval)``; items larger than the interval
+        can be hit by several cells and are counted in ``hits``.
+    """
+    if not size or abs_total <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), 0.0
+    interval = abs_total / float(size)
+    rng = np.random.default_rng(seed)
+    points = interval * (np.arange(size) + rng.uniform(0, 1, size))
+    selected = []
+    offset_value, offset_row = 0.0, 0
+    for chunk in chunks:
+        cumulative = offset_value + np.cumsum(np.abs(chunk["amount"].to_numpy()))
+        lo = np.searchsorted(points, offset_value, side="right")
+        hi = np.searchsorted(points, cumulative[-1] if len(cumulative) else offset_value, side="right")
+        if hi > lo:
+            selected.append(offset_row + np.searchsorted(cumulative, points[lo:hi], side="left"))
+        offset_value = cumulative[-1] if len(cumulative) else offset_value
+        offset_row += len(chunk)
+    if not selected:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), interval
+    indices, hits = np.unique(np.concatenate(selected).astype(np.int64), return_counts=True)
+    return indices, hits, interval
+
+
+def allocate_strata(size, strata_counts, strata_totals):
+    """Allocate ``size`` across strata in proportion to their value."""
+    counts = np.asarray(strata_counts, dtype=np.int64)
+    weights = np.asarray(strata_totals, dtype=float)
+    if weights.sum() <= 0:
+        weights = counts.astype(float)
+    if weights.sum() <= 0:
+        return np.zeros(len(counts), dtype=np.int64)
+    raw = size * weights / weights.sum()
+    allocation = np.minimum(np.floor(raw).astype(np.int64), counts)
+    # Hand out the remainder by largest fractional part, within capacity
+    for i in np.argsort(-(raw - np.floor(raw))):
+        if allocation.sum() >= size:
+            break
+        if allocation[i] < counts[i]:
+            allocation[i] += 1
+    return allocation
+
+
+def select_stratified(chunks, profile, strata_bounds, size, seed):
+    """Random selection within value strata; returns global row indices."""
+    allocation = allocate_strata(size, profile.strata_counts, profile.strata_totals)
+    rng = np.random.default_rng(seed)
+    picks = [
+        np.sort(rng.choice(int(count), size=int(take), replace=False)) if take else np.zeros(0, dtype=np.int64)
+        for count, take in zip(profile.strata_counts, allocation)
+    ]
+    seen = np.zeros(len(picks), dtype=np.int64)
+    selected = []
+    offset_row = 0
+    for chunk in chunks:
+        stratum = assign_strata(chunk["amount"].to_numpy(), strata_bounds)
+        for s, wanted in enumerate(picks):
+            rows = np.flatnonzero(stratum == s)
+            if not len(rows) or not len(wanted):
+                continue
+            ordinals = seen[s] + np.arange(len(rows))
+            hit = np.isin(ordinals, wanted, assume_unique=True)
+            selected.append(offset_row + rows[hit])
+            seen[s] += len(rows)
+        offset_row += len(chunk)
+    indices = np.sort(np.concatenate(selected)) if selected else np.zeros(0, dtype=np.int64)
+    return indices.astype(np.int64), allocation
+
+
+def run_selection(open_chunks, method, size, seed, strata_bounds=(), profile=None):
+    """Select ``size`` items with ``method``, profiling the population first.
+
+    :param open_chunks: callable returning a fresh chunk iterator; one pass
+        profiles the population (skipped when ``profile`` is given) and MUS
+        and stratified selection take a second pass
+    """
+    _require_pandas()
+    if profile is None:
+        profile = profile_population(open_chunks(), strata_bounds)
+    hits = None
+    interval = 0.0
+    if method == "mus":
+        indices, hits, interval = select_mus(open_chunks(), profile.abs_total, size, seed)
+    elif method == "stratified":
+        indices, _allocation = select_stratified(open_chunks(), profile, strata_bounds, size, seed)
+    elif method == "systematic":
+        indices = select_systematic(profile.rows, size, seed)
+        interval = profile.rows / float(size) if size else 0.0
+    else:
+        indices = select_random(profile.rows, size, seed)
+    return Selection(indices, profile, interval, hits)
+
+
+def extract_rows(chunks, indices):
+    """Return the selected rows (with their ``row`` index) in one pass."""
+    indices = np.asarray(indices, dtype=np.int64)
+    parts = []
+    offset_row = 0
+    for chunk in chunks:
+        lo = np.searchsorted(indices, offset_row)
+        hi = np.searchsorted(indices, offset_row + len(chunk))
+        if hi > lo:
+            local = indices[lo:hi] - offset_row
+            parts.append(chunk.iloc[local].assign(row=indices[lo:hi]))
+        offset_row += len(chunk)
+    if not parts:
+        return pd.DataFrame(columns=["row", "key", "amount"])
+    return pd.concat(parts, ignore_index=True)[["row", "key", "amount"]]
+
+
+def pack_indices(indices):
+    """Compact storage: zlib-compressed uint32 deltas of the sorted indices."""
+    indices = np.asarray(indices, dtype=np.int64)
+    deltas = np.diff(indices, prepend=0).astype("<u4")
+    return zlib.compress(deltas.tobytes(), 9)
+
+
+def unpack_indices(blob):
+    if not blob:
+        return np.zeros(0, dtype=np.int64)
+    deltas = np.frombuffer(zlib.decompress(blob), dtype="<u4").astype(np.int64)
+    return np.cumsum(deltas)
+
+
+# -----------------------------------------------------------------------------
+# Evaluation
+# -----------------------------------------------------------------------------
+def evaluate_attribute(sample_items, deviations, confidence):
+    """Sample and upper deviation rates (Poisson approximation)."""
+    if not sample_items:
+        return Evaluation(0, 0, 0.0, 0.0, 0.0, 0.0)
+    rate = deviations / float(sample_items)
+    upper = min(poisson_factor(deviations, confidence) / sample_items, 1.0)
+    return Evaluation(sample_items, deviations, rate, upper, 0.0, 0.0)
+
+
+def evaluate_mus(book, audited, interval, confidence):
+    """Projected misstatement and upper misstatement limit for a MUS sample.
+
+    Items at or above the sampling interval contribute their actual
+    misstatement; smaller items project their tainting over the interval.
+    The limit adds basic precision and the incremental allowance for the
+    ranked taintings.
+    """
+    book = np.asarray(book, dtype=float)
+    misstatement = book - np.asarray(audited, dtype=float)
+    errors = int(np.count_nonzero(misstatement))
+    top = np.abs(book) >= interval
+    top_misstatement = float(np.abs(misstatement[top]).sum())
+    small_book = np.abs(book[~top])
+    taintings = np.divide(
+        np.abs(misstatement[~top]), small_book, out=np.zeros_like(small_book), where=small_book > 0
+    )
+    taintings = np.sort(np.minimum(taintings[taintings > 0], 1.0))[::-1]
+    projected = float(taintings.sum() * interval) + top_misstatement
+    factors = np.array([poisson_factor(k, confidence) for k in range(len(taintings) + 1)])
+    basic_precision = factors[0] * interval
+    increments = np.diff(factors) - 1.0 if len(taintings) else np.zeros(0)
+    allowance = float((increments * taintings).sum() * interval)
+    upper = basic_precision + projected + allowance
+    return Evaluation(len(book), errors, 0.0, 0.0, projected, upper)
+
+
+def evaluate_ratio(book, audited, population_total, strata=None, strata_totals=None):
+    """Ratio projection of sample misstatement to the population value."""
+    book = np.asarray(book, dtype=float)
+    misstatement = book - np.asarray(audited, dtype=float)
+    errors = int(np.count_nonzero(misstatement))
+    if strata is None:
+        base = np.abs(book).sum()
+        projected = float(np.abs(misstatement).sum() / base * abs(population_total)) if base else 0.0
+    else:
+        projected = 0.0
+        for s, stratum_total in enumerate(strata_totals):
+            mask = strata == s
+            base = np.abs(book[mask]).sum()
+            if base:
+                projected += float(np.abs(misstatement[mask]).sum() / base * stratum_total)
+    return Evaluation(len(book), errors, 0.0, 0.0, projected, projected)
+
+
+DEVIATION_TRUE = ("1", "yes", "y", "true", "x")
+
+
+def read_results(source, indices):
+    """Parse a results CSV exported from the selection and filled in.
+
+    Expects the ``row`` column of the selection file plus ``audited_amount``
+    and/or ``deviation``; rows must belong to the stored selection. Returns
+    a frame with numeric ``amount``/``audited_amount`` (NaN when blank) and
+    ``deviation`` as 1.0/0.0 (NaN when blank).
+    """
+    _require_pandas()
+    frame = pd.read_csv(_open(source), dtype={"key": str})
+    frame.columns = [str(c).strip().lower() for c in frame.columns]
+    if "row" not in frame.columns:
+        raise ValueError("Results file needs the 'row' column from the sample selection file.")
+    unknown = ~frame["row"].isin(indices)
+    if unknown.any():
+        raise ValueError(
+            "Results contain rows that are not part of the selection: "
+            + ", ".join(str(r) for r in frame.loc[unknown, "row"].head(10))
+        )
+    if frame["row"].duplicated().any():
+        raise ValueError("Results contain the same selected row more than once.")
+    for column in ("amount", "audited_amount"):
+        values = frame[column] if column in frame.columns else pd.Series(np.nan, index=frame.index)
+        frame[column] = pd.to_numeric(values, errors="coerce")
+    raw = frame["deviation"] if "deviation" in frame.columns else pd.Series(np.nan, index=frame.index)
+    text = raw.astype(str).str.strip().str.lower()
+    frame["deviation"] = np.where(raw.isna(), np.nan, text.isin(DEVIATION_TRUE).astype(float))
+    return frame
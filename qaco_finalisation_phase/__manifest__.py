@@ -1,15 +1,20 @@
 {
     "name": "QACO Finalisation Phase",
     "summary": "Finalisation Phase",
-    "version": "17.0.1.0",
+    "version": "17.0.1.1",
     "author": "QACO",
     "license": "LGPL-3",
     "category": "Accounting/Auditing",
     "depends": ["qaco_audit", "qaco_execution_phase"],
+    "external_dependencies": {
+        "python": ["numpy"],
+    },
     "data": [
         "security/ir.model.access.csv",
         "views/finalisation_phase_actions.xml",
         "views/finalisation_phase_form.xml",
+        "views/regulatory_catalogue_views.xml",
+        "data/cron_regulatory_catalogue.xml",
         "views/audit_smart_button.xml",
     ],
     "installable": True,
@@ -0,0 +1,8 @@
+# Materialise the summary of adjusted differences for existing phases; it was
+# only rebuilt on register changes, so phases created before it stayed empty.
+from odoo import SUPERUSER_ID, api
+
+
+def migrate(cr, installed_version):
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env["qaco.finalisation.phase"].search([])._refresh_sad_schedule()
@@ -1,10 +1,25 @@
 # -*- coding: utf-8 -*-
 
+import json
+import logging
+import re
+import secrets
+from collections import Counter, defaultdict
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
-from odoo import _, api, fields, models
+from markupsafe import Markup
+
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import UserError, ValidationError  # type: ignore[attr-defined]
+from odoo.tools import html_escape
+from odoo.tools.sql import create_index
+
+from odoo.addons.qaco_planning_phase.utils import ratio_engine
+
+from ..utils import gc_simulation, misstatement_sync, regulatory_catalogue, sad
+
+_logger = logging.getLogger(__name__)
 
 SUBTAB_STATUS = [
     ("red", "❌ Incomplete"),
@@ -31,6 +46,60 @@ MISSTATEMENT_STATUS = [
     ("uncorrected", "Uncorrected"),
 ]
 
+MISSTATEMENT_AREAS = [
+    ("revenue", "Revenue"),
+    ("purchases", "Purchases"),
+    ("inventory", "Inventory"),
+    ("ppe", "Property, Plant & Equipment"),
+    ("cash", "Cash & Bank"),
+    ("investments", "Investments"),
+    ("payroll", "Payroll"),
+    ("taxation", "Taxation"),
+    ("financial_statement", "Financial Statements"),
+    ("other", "Other"),
+]
+
+MISSTATEMENT_PERIODS = [
+    ("current", "Current Period"),
+    ("prior", "Prior Period Turnaround"),
+]
+
+INCOME_EFFECTS = [
+    ("overstated", "Overstates Profit"),
+    ("understated", "Understates Profit"),
+]
+
+# Grouping of the summary of adjusted differences (one schedule row each)
+SAD_GROUPBY = (
+    "misstatement_type",
+    "area",
+    "account_caption",
+    "assertion",
+    "status",
+    "period",
+    "income_effect",
+)
+
+# Saved planning fields the materiality thresholds are computed from
+MATERIALITY_INPUTS = (
+    "materiality_benchmark",
+    "materiality_percentage",
+    "custom_benchmark_value",
+)
+
+EXCEPTION_SOURCES = [
+    ("procedure", "Substantive Procedure"),
+    ("control_exception", "Control Exception"),
+]
+
+EXCEPTION_SOURCE_MODELS = {
+    "procedure": "qaco.exec.substantive.procedure",
+    "control_exception": "qaco.exec.control.exception",
+}
+
+# Execution audit areas without a misstatement register equivalent
+EXECUTION_AREA_MAP = {"payables": "purchases", "provisions": "other"}
+
 EVENT_CLASSIFICATION = [
     ("adjusting", "Adjusting Event"),
     ("non_adjusting", "Non-Adjusting (Disclosure)"),
@@ -71,6 +140,23 @@ ALERT_SEVERITY = [
     ("critical", "Critical"),
 ]
 
+# Regulators of the audit firm itself, subscribed on every engagement
+FIRM_REGULATORS = ("icap", "aob")
+
+REGULATORY_FEED_LIMIT = 20
+
+COVENANT_METRICS = [
+    ("interest_cover", "Interest Cover (min)"),
+    ("debt_to_ebitda", "Debt / EBITDA (max)"),
+    ("current_ratio", "Current Ratio (min)"),
+    ("minimum_cash", "Minimum Cash (min)"),
+]
+
+# P-4 captions that split current assets and liabilities for the cash-flow model
+CASH_CAPTION = re.compile(r"cash|bank", re.IGNORECASE)
+RECEIVABLE_CAPTION = re.compile(r"receivable|debtor", re.IGNORECASE)
+BORROWING_CAPTION = re.compile(r"borrow|loan|overdraft|finance|running", re.IGNORECASE)
+
 
 class FinalisationPhase(models.Model):
     _name = "qaco.finalisation.phase"
@@ -158,6 +244,20 @@ class FinalisationPhase(models.Model):
         sanitize=False,
         copy=False,
     )
+    regulatory_subscription = fields.Char(
+        string="Subscribed Regulators",
+        compute="_compute_regulatory_subscription",
+        store=True,
+        readonly=False,
+        help="Comma-separated regulator codes whose catalogue alerts are shown "
+        "(icap, secp, aob, sbp, insurance, other)",
+    )
+    regulatory_period_end = fields.Date(
+        related="planning_phase_id.financial_year_end", string="Period End"
+    )
+    regulatory_entity_type = fields.Selection(
+        related="planning_phase_id.industry_type", string="Entity Type"
+    )
 
     overall_materiality_ref = fields.Monetary(
         string="Overall Materiality Ref",
@@ -173,6 +273,13 @@ class FinalisationPhase(models.Model):
         store=True,
         readonly=True,
     )
+    trivial_threshold_ref = fields.Monetary(
+        string="Clearly Trivial Threshold Ref",
+        currency_field="company_currency_id",
+        compute="_compute_materiality_refs",
+        store=True,
+        readonly=True,
+    )
     company_currency_id = fields.Many2one(
         "res.currency", default=lambda self: self.env.company.currency_id
     )
@@ -202,16 +309,52 @@ class FinalisationPhase(models.Model):
         "attachment_id",
         string="Management Correspondence",
     )
+    # Summary of adjusted differences, materialised by _refresh_sad_schedule()
+    sad_line_ids = fields.One2many(
+        "qaco.final.sad.line", "finalisation_phase_id", string="Summary of Adjusted Differences"
+    )
     uncorrected_total = fields.Monetary(
         string="Uncorrected Misstatements",
         currency_field="company_currency_id",
-        compute="_compute_misstatement_totals",
-        store=True,
+        readonly=True,
+        help="Current-period uncorrected misstatements above the clearly trivial threshold",
     )
     corrected_total = fields.Monetary(
         string="Corrected Misstatements",
         currency_field="company_currency_id",
-        compute="_compute_misstatement_totals",
+        readonly=True,
+    )
+    sad_factual_total = fields.Monetary(
+        string="Uncorrected Factual", currency_field="company_currency_id", readonly=True
+    )
+    sad_judgmental_total = fields.Monetary(
+        string="Uncorrected Judgmental", currency_field="company_currency_id", readonly=True
+    )
+    sad_projected_total = fields.Monetary(
+        string="Uncorrected Projected", currency_field="company_currency_id", readonly=True
+    )
+    sad_prior_turnaround = fields.Monetary(
+        string="Prior Period Turnaround",
+        currency_field="company_currency_id",
+        readonly=True,
+        help="Effect on current profit of prior-period uncorrected misstatements reversing",
+    )
+    sad_cumulative_effect = fields.Monetary(
+        string="Cumulative Profit Effect",
+        currency_field="company_currency_id",
+        readonly=True,
+        help="Net effect of current and prior-period uncorrected misstatements on profit "
+        "(positive = profit overstated)",
+    )
+    sad_trivial_count = fields.Integer(string="Clearly Trivial Items", readonly=True)
+    sad_trivial_total = fields.Monetary(
+        string="Clearly Trivial Total", currency_field="company_currency_id", readonly=True
+    )
+    sad_refreshed_on = fields.Datetime(string="Schedule Refreshed On", readonly=True, copy=False)
+    sad_level = fields.Selection(
+        sad.SAD_LEVELS,
+        string="Aggregate Materiality Level",
+        compute="_compute_threshold_breach",
         store=True,
     )
     misstatement_threshold_percent = fields.Float(
@@ -524,6 +667,7 @@ class FinalisationPhase(models.Model):
     @api.depends(
         "planning_phase_id.overall_materiality",
         "planning_phase_id.performance_materiality",
+        "planning_phase_id.clearly_trivial_threshold",
     )
     def _compute_materiality_refs(self):
         for record in self:
@@ -537,6 +681,11 @@ class FinalisationPhase(models.Model):
                 if record.planning_phase_id
                 else 0.0
             )
+            record.trivial_threshold_ref = (
+                record.planning_phase_id.clearly_trivial_threshold
+                if record.planning_phase_id
+                else 0.0
+            )
 
     def _determine_status(self, completed: bool, started: bool) -> str:
         if completed:
@@ -789,37 +938,132 @@ class FinalisationPhase(models.Model):
             record.analytics_status = analytics_status
             record.completion_status = completion_status
 
-    @api.depends("misstatement_line_ids.amount", "misstatement_line_ids.status")
-    def _compute_misstatement_totals(self):
-        for record in self:
-            corrected = sum(
-                line.amount
-                for line in record.misstatement_line_ids.filtered(
-                    lambda line: line.status == "corrected"
-                )
-            )
-            uncorrected = sum(
-                line.amount
-                for line in record.misstatement_line_ids.filtered(
-                    lambda line: line.status == "uncorrected"
-                )
-            )
-            record.corrected_total = corrected
-            record.uncorrected_total = uncorrected
-
     @api.depends(
-        "uncorrected_total", "overall_materiality_ref", "misstatement_threshold_percent"
+        "uncorrected_total",
+        "sad_cumulative_effect",
+        "trivial_threshold_ref",
+        "performance_materiality_ref",
+        "overall_materiality_ref",
+        "misstatement_threshold_percent",
     )
     def _compute_threshold_breach(self):
         for record in self:
-            threshold = (record.overall_materiality_ref or 0.0) * (
-                record.misstatement_threshold_percent / 100.0
+            record.sad_level, record.threshold_breached = sad.evaluate_thresholds(
+                record.uncorrected_total,
+                record.sad_cumulative_effect,
+                record.trivial_threshold_ref,
+                record.performance_materiality_ref,
+                record.overall_materiality_ref,
+                record.misstatement_threshold_percent,
             )
-            record.threshold_breached = bool(
-                threshold and record.uncorrected_total > threshold
+
+    def _refresh_sad_schedule(self):
+        """Rebuild the summary of adjusted differences from the register.
+
+        Misstatements are aggregated with one ``_read_group`` for all
+        records, split on their stored clearly trivial flag; the grouped
+        rows replace the schedule lines and the totals are written to the
+        phase, where the form, deliverables and quality review read them.
+        """
+        records = self.exists()
+        if not records:
+            return
+        groupby = SAD_GROUPBY + ("is_clearly_trivial",)
+        groups = defaultdict(list)
+        for phase, *values, line_count, amount in self.env[
+            "qaco.final.misstatement"
+        ]._read_group(
+            [("finalisation_phase_id", "in", records.ids)],
+            ["finalisation_phase_id", *groupby],
+            ["__count", "amount:sum"],
+        ):
+            group = dict(zip(groupby, values))
+            group.update(line_count=line_count, amount=amount or 0.0)
+            groups[phase.id].append(group)
+
+        # Schedule lines are read-only below manager level; only this rebuilds them
+        SadLine = self.env["qaco.final.sad.line"].sudo()
+        SadLine.search([("finalisation_phase_id", "in", records.ids)]).unlink()
+        SadLine.create(
+            [
+                dict(
+                    group,
+                    finalisation_phase_id=phase_id,
+                    account_caption=group["account_caption"] or False,
+                    profit_effect=sad.profit_effect(
+                        group["amount"], group["income_effect"], group["period"]
+                    ),
+                )
+                for phase_id, phase_groups in groups.items()
+                for group in phase_groups
+            ]
+        )
+        now = fields.Datetime.now()
+        for record in records:
+            totals = sad.summarise(groups[record.id])
+            record.write(
+                {
+                    "corrected_total": totals["corrected_total"],
+                    "uncorrected_total": totals["uncorrected_total"],
+                    "sad_factual_total": totals["factual_total"],
+                    "sad_judgmental_total": totals["judgmental_total"],
+                    "sad_projected_total": totals["projected_total"],
+                    "sad_prior_turnaround": totals["prior_turnaround"],
+                    "sad_cumulative_effect": totals["cumulative_effect"],
+                    "sad_trivial_count": totals["trivial_count"],
+                    "sad_trivial_total": totals["trivial_total"],
+                    "sad_refreshed_on": now,
+                }
             )
 
+    def _get_sad_summary(self):
+        """Materialised schedule totals for reports in other modules."""
+        self.ensure_one()
+        return {
+            "corrected_total": self.corrected_total,
+            "uncorrected_total": self.uncorrected_total,
+            "factual_total": self.sad_factual_total,
+            "judgmental_total": self.sad_judgmental_total,
+            "projected_total": self.sad_projected_total,
+            "prior_turnaround": self.sad_prior_turnaround,
+            "cumulative_effect": self.sad_cumulative_effect,
+            "trivial_count": self.sad_trivial_count,
+            "trivial_total": self.sad_trivial_total,
+            "level": self.sad_level,
+            "threshold_breached": self.threshold_breached,
+            "refreshed_on": self.sad_refreshed_on,
+        }
+
+    def action_refresh_sad_schedule(self):
+        self._refresh_sad_schedule()
+
+    def write(self, vals):
+        result = super().write(vals)
+        # A new engagement brings another planning phase and trivial threshold
+        if "audit_id" in vals:
+            self._refresh_sad_schedule()
+        return result
+
+    @api.depends("planning_phase_id.applicable_regulators.code")
+    def _compute_regulatory_subscription(self):
+        known = dict(REGULATOR_CHOICES)
+        for record in self:
+            codes = set(FIRM_REGULATORS)
+            for regulator in record.planning_phase_id.applicable_regulators:
+                code = (regulator.code or "").strip().lower()
+                if code in known:
+                    codes.add(code)
+            record.regulatory_subscription = ",".join(sorted(codes))
+
+    def _regulatory_regulators(self):
+        self.ensure_one()
+        codes = (self.regulatory_subscription or "").replace(" ", "").lower().split(",")
+        return tuple(sorted({code for code in codes if code}))
+
     @api.depends(
+        "regulatory_subscription",
+        "planning_phase_id.financial_year_end",
+        "planning_phase_id.industry_type",
         "regulatory_alert_ids.summary",
         "regulatory_alert_ids.reference_code",
         "regulatory_alert_ids.severity",
@@ -827,40 +1071,40 @@ class FinalisationPhase(models.Model):
         "regulatory_alert_ids.regulator",
     )
     def _compute_regulatory_feed(self):
-        color_map = {
-            "info": "#0d6efd",
-            "warning": "#ffc107",
-            "critical": "#dc3545",
-        }
+        """Shared catalogue fragment (cached) plus engagement-specific alerts."""
+        Catalogue = self.env["qaco.final.regulatory.catalogue"]
+        today = fields.Date.context_today(self)
         for record in self:
+            regulators = record._regulatory_regulators()
+            feed = (
+                Catalogue._render_feed(
+                    regulators,
+                    record.regulatory_period_end or today,
+                    record.regulatory_entity_type or False,
+                )
+                if regulators
+                else ""
+            )
             alerts = record.regulatory_alert_ids.sorted(
                 lambda a: a.create_date or fields.Datetime.now(), reverse=True
             )[:5]
-            if not alerts:
-                record.regulatory_news = _("<p>No regulator updates recorded.</p>")
-                continue
-            rows = []
-            for alert in alerts:
-                color = color_map.get(alert.severity or "info", "#0d6efd")
-                date_label = alert.effective_date or (
-                    alert.create_date.date() if alert.create_date else False
-                )
-                date_text = fields.Date.to_string(date_label) if date_label else ""
-                reference = f"{alert.reference_code}: " if alert.reference_code else ""
-                link = (
-                    f" <a href='{alert.link_url}' target='_blank'>{_('read')}</a>"
-                    if alert.link_url
-                    else ""
-                )
-                rows.append(
-                    f"<div class='o_qaco-reg-alert' style='margin-bottom:4px;'>"
-                    f"<span style='color:{color};font-weight:600'>{alert.regulator.upper()}</span> "
-                    f"<span>{reference}{alert.summary}</span>"
-                    f" <span style='color:#6c757d;'>({date_text})</span>"
-                    f"{link}"
-                    f"</div>"
+            if alerts:
+                feed += regulatory_catalogue.render_feed(
+                    [
+                        {
+                            "regulator": alert.regulator,
+                            "reference_code": alert.reference_code,
+                            "summary": alert.summary,
+                            "link_url": alert.link_url,
+                            "severity": alert.severity,
+                            "effective_date": alert.effective_date
+                            or (alert.create_date.date() if alert.create_date else None),
+                        }
+                        for alert in alerts
+                    ],
+                    _("read"),
                 )
-            record.regulatory_news = "".join(rows)
+            record.regulatory_news = feed or _("<p>No regulator updates recorded.</p>")
 
     @api.depends(
         "final_opinion",
@@ -1022,73 +1266,438 @@ class FinalisationPhase(models.Model):
             )
             record.message_post(body=_("Compliance scan completed with zero findings."))
 
-    def action_sync_misstatements(self):
+    def _collect_exception_states(self):
+        """Current execution exceptions keyed by ``(finalisation id, source, id)``."""
+        by_execution = defaultdict(list)
         for record in self:
-            if not record.execution_phase_id:
-                raise UserError(_("Link an execution phase to sync misstatements."))
-            procedures = record.execution_phase_id.substantive_area_ids.mapped(
-                "procedure_ids"
+            by_execution[record.execution_phase_id.id].append(record.id)
+        execution_ids = list(by_execution)
+        states = {}
+        procedures = self.env["qaco.exec.substantive.procedure"].search_fetch(
+            [
+                ("area_id.execution_phase_id", "in", execution_ids),
+                ("result", "=", "exception"),
+            ],
+            ["area_id", "assertion_type", "exception_amount", "exception_note"],
+        )
+        default_rationale = _("Exception noted in substantive procedure.")
+        for procedure in procedures:
+            area = procedure.area_id.area_code or "other"
+            state = misstatement_sync.ExceptionState(
+                procedure.exception_amount,
+                EXECUTION_AREA_MAP.get(area, area),
+                procedure.assertion_type or "existence",
+                procedure.exception_note or default_rationale,
             )
-            existing_lines = {
-                (line.source_reference, line.source_model): line
-                for line in record.misstatement_line_ids
-                if line.source_reference and line.source_model
-            }
-            created = 0
-            updated = 0
-            for procedure in procedures.filtered(lambda p: p.result == "exception"):
-                key = (f"procedure:{procedure.id}", "qaco.exec.substantive.procedure")
-                amount = procedure.exception_amount or 0.0
-                rationale = procedure.exception_note or _(
-                    "Exception noted in substantive procedure."
-                )
-                area_code = procedure.area_id.area_code
-                assertion = procedure.assertion_type or "existence"
-
-                line = existing_lines.get(key)
-                if line:
-                    vals = {}
-                    if line.amount != amount:
-                        vals["amount"] = amount
-                    if line.rationale != rationale:
-                        vals["rationale"] = rationale
-                    if line.area != area_code:
-                        vals["area"] = area_code
-                    if line.assertion != assertion:
-                        vals["assertion"] = assertion
-                    if vals:
-                        line.write(vals)
-                        updated += 1
-                    continue
-
-                self.env["qaco.final.misstatement"].create(
+            for finalisation_id in by_execution[procedure.area_id.execution_phase_id.id]:
+                states[(finalisation_id, "procedure", procedure.id)] = state
+        control_exceptions = self.env["qaco.exec.control.exception"].search_fetch(
+            [("control_test_id.execution_phase_id", "in", execution_ids)],
+            ["control_test_id", "description", "exception_amount"],
+        )
+        for exception in control_exceptions:
+            test = exception.control_test_id
+            state = misstatement_sync.ExceptionState(
+                exception.exception_amount,
+                "other",
+                test.assertion_type or "existence",
+                _("Control exception (%s): %s") % (test.control_name, exception.description),
+            )
+            for finalisation_id in by_execution[test.execution_phase_id.id]:
+                states[(finalisation_id, "control_exception", exception.id)] = state
+        return states
+
+    def _adopt_legacy_misstatements(self):
+        """Link register lines created by the former "model:id" reference sync."""
+        legacy = self.env["qaco.final.misstatement"].search_fetch(
+            [
+                ("finalisation_phase_id", "in", self.ids),
+                ("exception_link_ids", "=", False),
+                ("source_model", "in", list(EXCEPTION_SOURCE_MODELS.values())),
+                ("source_reference", "!=", False),
+            ],
+            ["finalisation_phase_id", "source_model", "source_reference", "amount"],
+        )
+        sources = {model: source for source, model in EXCEPTION_SOURCE_MODELS.items()}
+        candidates = []
+        for line in legacy:
+            _prefix, _sep, ref = line.source_reference.partition(":")
+            if ref.isdigit():
+                candidates.append((line, sources[line.source_model], int(ref)))
+        if not candidates:
+            return
+        existing = {
+            source: set(
+                self.env[model]
+                .browse([ref for _line, src, ref in candidates if src == source])
+                .exists()
+                .ids
+            )
+            for source, model in EXCEPTION_SOURCE_MODELS.items()
+        }
+        linked = set()
+        vals_list = []
+        for line, source, ref in candidates:
+            if ref not in existing[source] or (source, ref) in linked:
+                continue
+            linked.add((source, ref))
+            vals_list.append(
+                {
+                    "misstatement_id": line.id,
+                    "finalisation_phase_id": line.finalisation_phase_id.id,
+                    "source_type": source,
+                    "procedure_id": ref if source == "procedure" else False,
+                    "control_exception_id": ref if source == "control_exception" else False,
+                    "synced_amount": line.amount,
+                }
+            )
+        self.env["qaco.final.misstatement.link"].create(vals_list)
+
+    def _reconcile_misstatements(self):
+        """Two-way, batched reconciliation of exceptions and misstatements.
+
+        Exceptions, links and linked misstatements are each read in one
+        query for all records; new misstatements and links are created in
+        one batch, and changes are written through the ORM with one
+        ``write()`` per distinct set of values; the summary of adjusted
+        differences is rebuilt once at the end. Control exceptions without
+        an amount are deviations with no monetary effect and are not
+        reported. Conflicts are reported on each finalisation phase's
+        chatter.
+
+        :return: totals ``{"created", "pushed", "pulled", "conflicts"}``
+        """
+        records = self.filtered("execution_phase_id")
+        stats = {"created": 0, "pushed": 0, "pulled": 0, "conflicts": 0}
+        if not records:
+            return stats
+        Misstatement = self.env["qaco.final.misstatement"].with_context(
+            skip_sad_refresh=True
+        )
+        Link = self.env["qaco.final.misstatement.link"]
+        records._adopt_legacy_misstatements()
+
+        exceptions = records._collect_exception_states()
+        links = {}
+        orphans = []
+        for link in Link.search_fetch(
+            [("finalisation_phase_id", "in", records.ids)],
+            [
+                "finalisation_phase_id",
+                "misstatement_id",
+                "source_type",
+                "procedure_id",
+                "control_exception_id",
+                "synced_amount",
+            ],
+        ):
+            source_id = (link.procedure_id or link.control_exception_id).id
+            state = misstatement_sync.LinkState(
+                link.id, link.misstatement_id.id, link.synced_amount
+            )
+            if source_id:
+                links[(link.finalisation_phase_id.id, link.source_type, source_id)] = state
+            else:
+                orphans.append((link.finalisation_phase_id.id, link.source_type, 0, state))
+        linked_lines = Misstatement.browse(
+            [state.misstatement_id for state in links.values()]
+        )
+        linked_lines.fetch(["amount", "area", "assertion", "rationale"])
+        misstatements = {
+            line.id: misstatement_sync.MisstatementState(
+                line.amount, line.area, line.assertion, line.rationale
+            )
+            for line in linked_lines
+        }
+
+        plan = misstatement_sync.plan_reconciliation(
+            exceptions, links, misstatements, optional_sources=("control_exception",)
+        )
+        conflicts = list(plan.conflicts) + [
+            ((fid, source, source_id), state.misstatement_id, "exception_cleared")
+            for fid, source, source_id, state in orphans
+        ]
+
+        # New misstatements and their links, one batch each
+        if plan.create:
+            lines = Misstatement.create(
+                [
                     {
-                        "finalisation_phase_id": record.id,
-                        "area": area_code,
-                        "assertion": assertion,
+                        "finalisation_phase_id": key[0],
+                        "area": exceptions[key].area,
+                        "assertion": exceptions[key].assertion,
                         "misstatement_type": "factual",
                         "status": "uncorrected",
-                        "amount": amount,
-                        "rationale": rationale,
-                        "source_reference": key[0],
-                        "source_model": key[1],
+                        "amount": exceptions[key].amount,
+                        "rationale": exceptions[key].rationale,
+                        "source_reference": f"{key[1]}:{key[2]}",
+                        "source_model": EXCEPTION_SOURCE_MODELS[key[1]],
+                    }
+                    for key in plan.create
+                ]
+            )
+            Link.create(
+                [
+                    {
+                        "misstatement_id": line.id,
+                        "finalisation_phase_id": key[0],
+                        "source_type": key[1],
+                        "procedure_id": key[2] if key[1] == "procedure" else False,
+                        "control_exception_id": key[2]
+                        if key[1] == "control_exception"
+                        else False,
+                        "synced_amount": exceptions[key].amount,
                     }
+                    for key, line in zip(plan.create, lines)
+                ]
+            )
+
+        # One ORM write per distinct set of values on each side
+        pushed = defaultdict(dict)
+        for line_id, vals in plan.push_fields.items():
+            pushed[line_id].update(vals)
+        for line_id, amount in plan.push_amounts.items():
+            pushed[line_id]["amount"] = amount
+        for line_id, rationale in plan.push_rationale.items():
+            pushed[line_id]["rationale"] = rationale
+        for vals, ids in misstatement_sync.group_by_values(pushed).items():
+            Misstatement.browse(ids).write(dict(vals))
+        pulled = defaultdict(lambda: defaultdict(list))
+        for (_fid, source, source_id), amount in plan.pull_amounts.items():
+            pulled[source][amount].append(source_id)
+        for source, ids_by_amount in pulled.items():
+            model = self.env[EXCEPTION_SOURCE_MODELS[source]]
+            for amount, ids in ids_by_amount.items():
+                model.browse(ids).write({"exception_amount": amount})
+        synced = defaultdict(list)
+        for link_id, amount in plan.synced.items():
+            synced[amount].append(link_id)
+        for amount, ids in synced.items():
+            Link.browse(ids).write({"synced_amount": amount})
+        records._refresh_sad_schedule()
+
+        phase_of_line = {state.misstatement_id: key[0] for key, state in links.items()}
+        created_by_phase = Counter(key[0] for key in plan.create)
+        pushed_by_phase = Counter(phase_of_line[line_id] for line_id in pushed)
+        pulled_by_phase = Counter(key[0] for key in plan.pull_amounts)
+        conflicts_by_phase = defaultdict(list)
+        for key, misstatement_id, reason in conflicts:
+            conflicts_by_phase[key[0]].append((key, reason))
+        for record in records:
+            record._post_reconciliation_report(
+                created_by_phase[record.id],
+                pushed_by_phase[record.id],
+                pulled_by_phase[record.id],
+                conflicts_by_phase[record.id],
+            )
+        stats.update(
+            created=len(plan.create),
+            pushed=len(pushed),
+            pulled=len(plan.pull_amounts),
+            conflicts=len(conflicts),
+        )
+        return stats
+
+    def _post_reconciliation_report(self, created, pushed, pulled, conflicts):
+        self.ensure_one()
+        parts = []
+        if created:
+            parts.append(_("created %s") % created)
+        if pushed:
+            parts.append(_("updated %s") % pushed)
+        if pulled:
+            parts.append(_("%s exception amounts backfilled") % pulled)
+        if not parts and not conflicts:
+            self.message_post(body=_("No new execution exceptions found to sync."))
+            return
+        body = (
+            _("Misstatement register refreshed (%s).") % ", ".join(parts)
+            if parts
+            else _("Misstatement register unchanged.")
+        )
+        if conflicts:
+            labels = dict(EXCEPTION_SOURCES)
+            items = "".join(
+                "<li>%s #%s: %s</li>"
+                % (
+                    labels.get(source, source),
+                    source_id or "?",
+                    misstatement_sync.CONFLICT_REASONS[reason],
+                )
+                for (_fid, source, source_id), reason in conflicts[:50]
+            )
+            more = (
+                _("<p>... and %s more.</p>") % (len(conflicts) - 50)
+                if len(conflicts) > 50
+                else ""
+            )
+            body = Markup("<p>%s</p><p>%s</p><ul>%s</ul>%s") % (
+                body,
+                _("%s conflicts need review:") % len(conflicts),
+                Markup(items),
+                Markup(more),
+            )
+        self.message_post(body=body)
+
+    def action_sync_misstatements(self):
+        for record in self:
+            if not record.execution_phase_id:
+                raise UserError(_("Link an execution phase to sync misstatements."))
+        self._reconcile_misstatements()
+
+    def _gc_base_position(self):
+        """Annual P-4 figures the going-concern projection starts from."""
+        self.ensure_one()
+        p4 = self.env["qaco.planning.p4.analytics"].search(
+            [("audit_id", "=", self.audit_id.id)], limit=1
+        )
+        if not p4:
+            raise UserError(_("No P-4 analytical review found for this engagement."))
+        FSLine = self.env["qaco.planning.p4.fs.line"]
+        totals = {
+            category: abs(amount or 0.0)
+            for category, amount in FSLine._read_group(
+                [("p4_id", "=", p4.id)], ["fs_category"], ["current_year:sum"]
+            )
+        }
+        if not totals.get("revenue"):
+            raise UserError(_("The P-4 financial statement lines have no revenue to project."))
+        cash = receivables = short_borrowings = 0.0
+        for line in FSLine.search_fetch(
+            [
+                ("p4_id", "=", p4.id),
+                ("fs_category", "in", ("current_asset", "current_liability")),
+            ],
+            ["fs_caption", "fs_category", "current_year"],
+        ):
+            amount = abs(line.current_year)
+            if line.fs_category == "current_liability":
+                if BORROWING_CAPTION.search(line.fs_caption):
+                    short_borrowings += amount
+            elif CASH_CAPTION.search(line.fs_caption):
+                cash += amount
+            elif RECEIVABLE_CAPTION.search(line.fs_caption):
+                receivables += amount
+        return gc_simulation.Position(
+            revenue=totals["revenue"],
+            cost_of_sales=totals.get("cost_of_sales", 0.0),
+            operating_expense=totals.get("operating_expense", 0.0),
+            finance_cost=totals.get("finance_cost", 0.0),
+            opening_cash=cash,
+            receivables=receivables,
+            other_current_assets=max(totals.get("current_asset", 0.0) - cash - receivables, 0.0),
+            current_liabilities=totals.get("current_liability", 0.0),
+            borrowings=totals.get("non_current_liability", 0.0) + short_borrowings,
+        )
+
+    def _run_gc_simulation(self, scenarios):
+        """Simulate ``scenarios`` of this phase and summarise onto the rows.
+
+        Each covenant keeps the highest breach probability over the
+        scenarios run, with the scenario it arises under.
+        """
+        self.ensure_one()
+        position = self._gc_base_position()
+        covenants = self.going_concern_covenant_ids.filtered("metric")
+        specs = [
+            gc_simulation.Covenant(covenant.id, covenant.metric, covenant.ratio_required)
+            for covenant in covenants
+        ]
+        worst = {}
+        for scenario in scenarios:
+            result = scenario._simulate(position, specs)
+            for covenant in covenants:
+                probability = float(result.breach_cumulative[covenant.id][-1])
+                if covenant.id not in worst or probability > worst[covenant.id][0]:
+                    worst[covenant.id] = (probability, scenario, result)
+        for covenant in covenants:
+            probability, scenario, result = worst[covenant.id]
+            covenant.write(
+                {
+                    "breach_probability": probability * 100.0,
+                    "first_breach_month": gc_simulation.first_month_above(
+                        result.breach[covenant.id], 0.5
+                    ),
+                    "simulated_scenario_id": scenario.id,
+                }
+            )
+        failing = scenarios.filtered("indicates_failure")
+        self.message_post(
+            body=_("Going-concern simulation run for %(count)s scenarios; %(failing)s "
+                   "indicate failure.")
+            % {"count": len(scenarios), "failing": len(failing)}
+        )
+
+    def action_run_gc_simulation(self):
+        for record in self:
+            if not record.going_concern_scenario_ids:
+                raise UserError(_("Add at least one going-concern scenario to simulate."))
+            record._run_gc_simulation(record.going_concern_scenario_ids)
+
+    def action_recalculate_analytics_ratios(self):
+        """Re-perform planning ratios on the latest P-4 figures (ISA 520.6).
+
+        Ratios are seeded from the P-4 ratio lines on first use, keeping the
+        planning value as the expectation. Formulas are evaluated through the
+        P-4 ratio engine and all lines are updated in one statement.
+        """
+        FinalRatio = self.env["qaco.final.analytics.ratio"]
+        for record in self:
+            p4 = self.env["qaco.planning.p4.analytics"].search(
+                [("audit_id", "=", record.audit_id.id)], limit=1
+            )
+            if not p4:
+                raise UserError(_("No P-4 analytical review found for this engagement."))
+            if not record.analytics_ratio_ids:
+                FinalRatio.create(
+                    [
+                        {
+                            "finalisation_phase_id": record.id,
+                            "metric": line.ratio_name,
+                            "formula": line.formula,
+                            "current_value": line.current_year_value,
+                            "prior_value": line.prior_year_value,
+                            "expectation_value": line.current_year_value,
+                        }
+                        for line in p4.ratio_line_ids.filtered("formula")
+                    ]
+                )
+            ratios = record.analytics_ratio_ids.filtered("formula")
+            if not ratios:
+                raise UserError(_("No analytics ratios with formulas to recalculate."))
+
+            results, errors, missing = p4._evaluate_ratio_formulas(ratios.mapped("formula"))
+            rows = []
+            stored = {}
+            for ratio, (current, prior, _budget) in zip(ratios, results):
+                rows.append(
+                    (
+                        ratio.id,
+                        {
+                            "current_value": ratio_engine.to_value(current) or 0.0,
+                            "prior_value": ratio_engine.to_value(prior) or 0.0,
+                        },
+                    )
                 )
-                created += 1
-
-            if created or updated:
-                parts = []
-                if created:
-                    parts.append(_("created %s") % created)
-                if updated:
-                    parts.append(_("updated %s") % updated)
-                record.message_post(
-                    body=_("Misstatement register refreshed (%s).") % ", ".join(parts)
+                stored[ratio.id] = {
+                    "current_value": ratio.current_value,
+                    "prior_value": ratio.prior_value,
+                }
+            for ids, vals in ratio_engine.write_groups(rows, stored):
+                ratios.browse(ids).write(vals)
+
+            body = _("Final analytical ratios recalculated: %s evaluated.") % (
+                len(rows) - len(errors)
+            )
+            if errors:
+                body += " " + _("Unreadable formulas: %s.") % ", ".join(
+                    ratios[row].metric for row in sorted(errors)
                 )
-            else:
-                record.message_post(
-                    body=_("No new execution exceptions found to sync.")
+            if missing:
+                body += " " + _("Figures not found (taken as nil): %s.") % ", ".join(
+                    sorted(missing)
                 )
+            record.message_post(body=body)
 
     def action_run_readiness_check(self):
         for record in self:
@@ -1173,22 +1782,7 @@ class FinalMisstatement(models.Model):
         required=True,
         ondelete="cascade",
     )
-    area = fields.Selection(
-        [
-            ("revenue", "Revenue"),
-            ("purchases", "Purchases"),
-            ("inventory", "Inventory"),
-            ("ppe", "Property, Plant & Equipment"),
-            ("cash", "Cash & Bank"),
-            ("investments", "Investments"),
-            ("payroll", "Payroll"),
-            ("taxation", "Taxation"),
-            ("financial_statement", "Financial Statements"),
-            ("other", "Other"),
-        ],
-        string="Area",
-        required=True,
-    )
+    area = fields.Selection(MISSTATEMENT_AREAS, string="Area", required=True)
     assertion = fields.Selection(ASSERTION_TYPES, string="Assertion", required=True)
     misstatement_type = fields.Selection(
         MISSTATEMENT_TYPES, string="Type", required=True
@@ -1199,11 +1793,27 @@ class FinalMisstatement(models.Model):
     amount = fields.Monetary(
         string="Amount", currency_field="company_currency_id", required=True
     )
+    account_caption = fields.Char(
+        string="Account / FS Caption", help="Account or caption affected, as in the SAD"
+    )
+    period = fields.Selection(
+        MISSTATEMENT_PERIODS,
+        string="Period",
+        required=True,
+        default="current",
+        help="Prior-period uncorrected misstatements turn around through current profit",
+    )
+    income_effect = fields.Selection(
+        INCOME_EFFECTS, string="Profit Effect", required=True, default="overstated"
+    )
     rationale = fields.Text(
         string="Rationale / Non-correction Justification", required=True
     )
     source_reference = fields.Char(string="Source Reference")
     source_model = fields.Char(string="Source Model")
+    exception_link_ids = fields.One2many(
+        "qaco.final.misstatement.link", "misstatement_id", string="Execution Exception"
+    )
     impact_notes = fields.Text(string="Impact on FS / Disclosures")
     management_response = fields.Text(string="Management Response")
     is_significant = fields.Boolean(string="Significant Misstatement")
@@ -1214,10 +1824,23 @@ class FinalMisstatement(models.Model):
         "attachment_id",
         string="Supporting Attachments",
     )
+    is_clearly_trivial = fields.Boolean(
+        string="Clearly Trivial",
+        compute="_compute_is_clearly_trivial",
+        store=True,
+        help="At or below the clearly trivial threshold of the engagement",
+    )
     company_currency_id = fields.Many2one(
         "res.currency", default=lambda self: self.env.company.currency_id
     )
 
+    @api.depends("amount", "finalisation_phase_id.trivial_threshold_ref")
+    def _compute_is_clearly_trivial(self):
+        for record in self:
+            record.is_clearly_trivial = (
+                record.amount <= record.finalisation_phase_id.trivial_threshold_ref
+            )
+
     @api.constrains("amount")
     def _check_amount_positive(self):
         for record in self:
@@ -1226,6 +1849,125 @@ class FinalMisstatement(models.Model):
                     _("Misstatement amount must be greater than zero.")
                 )
 
+    # Batch writers pass skip_sad_refresh and rebuild the schedule once
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        if not self.env.context.get("skip_sad_refresh"):
+            records.finalisation_phase_id._refresh_sad_schedule()
+        return records
+
+    def write(self, vals):
+        phases = self.finalisation_phase_id
+        result = super().write(vals)
+        if not self.env.context.get("skip_sad_refresh") and set(vals) & set(
+            ("finalisation_phase_id", "amount") + SAD_GROUPBY
+        ):
+            (phases | self.finalisation_phase_id)._refresh_sad_schedule()
+        return result
+
+    def unlink(self):
+        phases = self.finalisation_phase_id
+        result = super().unlink()
+        if not self.env.context.get("skip_sad_refresh"):
+            phases._refresh_sad_schedule()
+        return result
+
+
+class FinalMisstatementLink(models.Model):
+    """Link between an execution exception and its misstatement register line."""
+
+    _name = "qaco.final.misstatement.link"
+    _description = "Execution Exception / Misstatement Link"
+
+    misstatement_id = fields.Many2one(
+        "qaco.final.misstatement",
+        string="Misstatement",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    finalisation_phase_id = fields.Many2one(
+        "qaco.finalisation.phase",
+        string="Finalisation Phase",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    source_type = fields.Selection(EXCEPTION_SOURCES, string="Source", required=True)
+    procedure_id = fields.Many2one(
+        "qaco.exec.substantive.procedure",
+        string="Substantive Procedure",
+        ondelete="set null",
+        index=True,
+    )
+    control_exception_id = fields.Many2one(
+        "qaco.exec.control.exception",
+        string="Control Exception",
+        ondelete="set null",
+        index=True,
+    )
+    synced_amount = fields.Float(
+        string="Agreed Amount",
+        digits=(16, 2),
+        help="Amount on both sides at the last reconciliation",
+    )
+
+    _sql_constraints = [
+        (
+            "misstatement_unique",
+            "unique(misstatement_id)",
+            "A misstatement can only be linked to one execution exception.",
+        ),
+        (
+            "procedure_unique",
+            "unique(finalisation_phase_id, procedure_id)",
+            "A substantive procedure can only be linked to one misstatement.",
+        ),
+        (
+            "control_exception_unique",
+            "unique(finalisation_phase_id, control_exception_id)",
+            "A control exception can only be linked to one misstatement.",
+        ),
+    ]
+
+
+class FinalSadLine(models.Model):
+    """One row of the summary of adjusted differences (ISA 450)."""
+
+    _name = "qaco.final.sad.line"
+    _description = "Summary of Adjusted Differences Line"
+    _order = "finalisation_phase_id, is_clearly_trivial, status desc, period, amount desc"
+
+    finalisation_phase_id = fields.Many2one(
+        "qaco.finalisation.phase",
+        string="Finalisation Phase",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    misstatement_type = fields.Selection(MISSTATEMENT_TYPES, string="Type", readonly=True)
+    area = fields.Selection(MISSTATEMENT_AREAS, string="Area", readonly=True)
+    account_caption = fields.Char(string="Account / FS Caption", readonly=True)
+    assertion = fields.Selection(ASSERTION_TYPES, string="Assertion", readonly=True)
+    status = fields.Selection(MISSTATEMENT_STATUS, string="Status", readonly=True)
+    period = fields.Selection(MISSTATEMENT_PERIODS, string="Period", readonly=True)
+    income_effect = fields.Selection(INCOME_EFFECTS, string="Profit Effect", readonly=True)
+    is_clearly_trivial = fields.Boolean(string="Clearly Trivial", readonly=True)
+    line_count = fields.Integer(string="Items", readonly=True)
+    amount = fields.Monetary(
+        string="Amount", currency_field="company_currency_id", readonly=True
+    )
+    profit_effect = fields.Monetary(
+        string="Effect on Profit",
+        currency_field="company_currency_id",
+        readonly=True,
+        help="Positive = current-period profit overstated",
+    )
+    company_currency_id = fields.Many2one(
+        related="finalisation_phase_id.company_currency_id", readonly=True
+    )
+
 
 class FinalSubsequentProcedure(models.Model):
     _name = "qaco.final.subsequent.procedure"
@@ -1287,10 +2029,162 @@ class FinalGoingConcernScenario(models.Model):
     revenue_growth = fields.Float(string="Revenue Growth %")
     gross_margin = fields.Float(string="Gross Margin %")
     interest_rate = fields.Float(string="Interest Rate %")
+    collection_rate = fields.Float(
+        string="Collection Rate %",
+        default=90.0,
+        help="Share of billed revenue and open receivables collected each month",
+    )
+    growth_volatility = fields.Float(string="Growth Volatility (pp)", default=5.0)
+    margin_volatility = fields.Float(string="Margin Volatility (pp)", default=2.0)
+    rate_volatility = fields.Float(string="Rate Volatility (pp)", default=1.0)
+    collection_volatility = fields.Float(string="Collection Volatility (pp)", default=5.0)
+    opening_cash = fields.Float(
+        string="Opening Cash",
+        digits=(16, 2),
+        help="Leave at zero to use the P-4 cash and bank lines",
+    )
+    minimum_cash = fields.Float(
+        string="Minimum Cash",
+        digits=(16, 2),
+        help="Cash below this level (e.g. minus undrawn facilities) is a liquidity shortfall",
+    )
+    monthly_debt_service = fields.Float(
+        string="Monthly Principal Repayments", digits=(16, 2)
+    )
+    horizon_months = fields.Integer(string="Horizon (Months)", default=12)
+    path_count = fields.Integer(string="Simulation Paths", default=100000)
+    random_seed = fields.Char(
+        string="Random Seed",
+        help="Integer seed of the simulation; generated on the first run when empty",
+    )
+    failure_threshold = fields.Float(
+        string="Failure Threshold %",
+        default=20.0,
+        help="Scenario indicates failure when the shortfall probability reaches this level",
+    )
     liquidity_buffer_months = fields.Float(string="Liquidity Buffer (Months)")
+    shortfall_probability = fields.Float(
+        string="Shortfall Probability %", digits=(5, 2), readonly=True
+    )
+    shortfall_month = fields.Integer(
+        string="Shortfall Month",
+        readonly=True,
+        help="First month in which the shortfall probability reaches the failure threshold",
+    )
+    closing_cash_p5 = fields.Float(string="Closing Cash (P5)", digits=(16, 2), readonly=True)
+    closing_cash_p50 = fields.Float(
+        string="Closing Cash (Median)", digits=(16, 2), readonly=True
+    )
+    simulation_profile = fields.Text(string="Monthly Profile", readonly=True, copy=False)
+    simulated_on = fields.Datetime(string="Simulated On", readonly=True, copy=False)
     outcome_summary = fields.Html(string="Outcome Summary")
     indicates_failure = fields.Boolean(string="Indicates Going Concern Failure")
 
+    @api.constrains("horizon_months", "path_count")
+    def _check_simulation_size(self):
+        for record in self:
+            if not gc_simulation.MIN_MONTHS <= record.horizon_months <= gc_simulation.MAX_MONTHS:
+                raise ValidationError(_("The projection horizon must be 12 to 18 months."))
+            if not 1000 <= record.path_count <= 1000000:
+                raise ValidationError(_("Simulate between 1,000 and 1,000,000 paths."))
+
+    def _simulate(self, position, covenants):
+        """Run this scenario and write its summary; returns the engine result."""
+        self.ensure_one()
+        if self.random_seed and not self.random_seed.strip().isdigit():
+            raise UserError(_("The random seed must be a whole number."))
+        seed = int(self.random_seed) if self.random_seed else secrets.randbelow(2**31)
+        if self.opening_cash:
+            position = position._replace(opening_cash=self.opening_cash)
+        assumptions = gc_simulation.Assumptions(
+            revenue_growth=self.revenue_growth / 100.0,
+            gross_margin=self.gross_margin / 100.0,
+            interest_rate=self.interest_rate / 100.0,
+            collection_rate=self.collection_rate / 100.0,
+            growth_volatility=self.growth_volatility / 100.0,
+            margin_volatility=self.margin_volatility / 100.0,
+            rate_volatility=self.rate_volatility / 100.0,
+            collection_volatility=self.collection_volatility / 100.0,
+            minimum_cash=self.minimum_cash,
+            monthly_debt_service=self.monthly_debt_service,
+        )
+        try:
+            result = gc_simulation.simulate(
+                position,
+                assumptions,
+                covenants,
+                months=self.horizon_months,
+                paths=self.path_count,
+                seed=seed,
+            )
+        except (ValueError, RuntimeError) as e:
+            raise UserError(_("Scenario '%s' could not be simulated: %s") % (self.name, e)) from e
+
+        probability = float(result.shortfall_cumulative[-1]) * 100.0
+        threshold = self.failure_threshold / 100.0
+        profile = {
+            "shortfall": result.shortfall.round(4).tolist(),
+            "shortfall_cumulative": result.shortfall_cumulative.round(4).tolist(),
+            "cash_p5": result.cash_p5.round(2).tolist(),
+            "cash_p50": result.cash_p50.round(2).tolist(),
+            "cash_p95": result.cash_p95.round(2).tolist(),
+            "breach_cumulative": {
+                str(key): values.round(4).tolist()
+                for key, values in result.breach_cumulative.items()
+            },
+        }
+        self.write(
+            {
+                "random_seed": str(seed),
+                "shortfall_probability": probability,
+                "shortfall_month": gc_simulation.first_month_above(
+                    result.shortfall_cumulative, threshold
+                ),
+                "closing_cash_p5": float(result.cash_p5[-1]),
+                "closing_cash_p50": float(result.cash_p50[-1]),
+                "simulation_profile": json.dumps(profile),
+                "simulated_on": fields.Datetime.now(),
+                "outcome_summary": self._render_outcome(result, covenants),
+                "indicates_failure": bool(threshold and probability / 100.0 >= threshold),
+            }
+        )
+        return result
+
+    def _render_outcome(self, result, covenants):
+        names = {
+            covenant.id: covenant.covenant_name
+            for covenant in self.env["qaco.final.gc.covenant"].browse(
+                [spec.key for spec in covenants]
+            )
+        }
+        header = "".join(f"<th>{month}</th>" for month in range(1, result.months + 1))
+
+        def row(label, values, percent=True):
+            cells = "".join(
+                f"<td>{value * 100:.1f}%</td>" if percent else f"<td>{value:,.0f}</td>"
+                for value in values
+            )
+            return f"<tr><th>{html_escape(label)}</th>{cells}</tr>"
+
+        rows = [
+            row(_("Shortfall (cumulative)"), result.shortfall_cumulative),
+            row(_("Cash P5"), result.cash_p5, percent=False),
+            row(_("Cash median"), result.cash_p50, percent=False),
+        ]
+        rows += [
+            row(_("Breach: %s") % names[key], values)
+            for key, values in result.breach_cumulative.items()
+        ]
+        return (
+            f"<p>{result.paths:,} paths, seed {result.seed}.</p>"
+            f"<table class='table table-sm'><tr><th>{_('Month')}</th>{header}</tr>"
+            f"{''.join(rows)}</table>"
+        )
+
+    def action_simulate(self):
+        for phase, scenarios in self.grouped("finalisation_phase_id").items():
+            phase._run_gc_simulation(scenarios)
+
 
 class FinalGoingConcernCovenant(models.Model):
     _name = "qaco.final.gc.covenant"
@@ -1300,8 +2194,27 @@ class FinalGoingConcernCovenant(models.Model):
         "qaco.finalisation.phase", required=True, ondelete="cascade"
     )
     covenant_name = fields.Char(string="Covenant", required=True)
+    metric = fields.Selection(
+        COVENANT_METRICS,
+        string="Metric",
+        help="Set to project the covenant through the going-concern simulation",
+    )
     ratio_required = fields.Float(string="Required Threshold")
     ratio_actual = fields.Float(string="Actual Ratio")
+    breach_probability = fields.Float(
+        string="Breach Probability %",
+        digits=(5, 2),
+        readonly=True,
+        help="Probability of breaching within the horizon under the worst simulated scenario",
+    )
+    first_breach_month = fields.Integer(
+        string="Likely Breach Month",
+        readonly=True,
+        help="First month in which more than half of the simulated paths are in breach",
+    )
+    simulated_scenario_id = fields.Many2one(
+        "qaco.final.gc.scenario", string="Worst Scenario", readonly=True, ondelete="set null"
+    )
     result = fields.Selection(
         [
             ("compliant", "Compliant"),
@@ -1313,17 +2226,17 @@ class FinalGoingConcernCovenant(models.Model):
     )
     breach_note = fields.Text(string="Breach Commentary")
 
-    @api.depends("ratio_required", "ratio_actual")
+    @api.depends("ratio_required", "ratio_actual", "metric")
     def _compute_result(self):
         for record in self:
             if not record.ratio_required:
                 record.result = False
                 continue
-            record.result = (
-                "compliant"
-                if record.ratio_actual >= record.ratio_required
-                else "breach"
-            )
+            if gc_simulation.COVENANT_METRICS.get(record.metric, True):
+                compliant = record.ratio_actual >= record.ratio_required
+            else:
+                compliant = record.ratio_actual <= record.ratio_required
+            record.result = "compliant" if compliant else "breach"
 
 
 class FinalRelatedPartyLine(models.Model):
@@ -1396,6 +2309,11 @@ class FinalAnalyticsRatio(models.Model):
         "qaco.finalisation.phase", required=True, ondelete="cascade"
     )
     metric = fields.Char(string="Metric", required=True)
+    formula = fields.Char(
+        string="Formula",
+        help="Ratio formula over FS captions, e.g. 'Current Assets / Current Liabilities'; "
+        "evaluated with the P-4 ratio engine",
+    )
     current_value = fields.Float(string="Current Period", required=True)
     prior_value = fields.Float(string="Prior Period")
     expectation_value = fields.Float(string="Planning Expectation")
@@ -1453,6 +2371,161 @@ class FinalReviewNote(models.Model):
     resolution_reference = fields.Char(string="Resolution Reference")
 
 
+class FinalRegulatoryCatalogue(models.Model):
+    """Firm-wide regulator circular, shared by every finalisation file.
+
+    Loaded from the JSON/CSV bundles in the directory set by the
+    ``qaco_finalisation.regulatory_bundle_dir`` system parameter.
+    """
+
+    _name = "qaco.final.regulatory.catalogue"
+    _description = "Regulatory Alert Catalogue"
+    _order = "effective_date desc, id desc"
+
+    regulator = fields.Selection(
+        REGULATOR_CHOICES, string="Regulator", required=True, index=True
+    )
+    reference_code = fields.Char(string="Reference / Circular #", required=True)
+    summary = fields.Char(string="Summary", required=True)
+    link_url = fields.Char(string="Reference URL")
+    severity = fields.Selection(ALERT_SEVERITY, string="Severity", default="info")
+    effective_date = fields.Date(string="Effective Date", index=True)
+    entity_types = fields.Char(
+        string="Entity Types",
+        help="Comma-separated industry sectors the circular applies to; empty for all",
+    )
+    bundle_name = fields.Char(string="Bundle", readonly=True)
+    fingerprint = fields.Char(readonly=True)
+    active = fields.Boolean(default=True)
+
+    _sql_constraints = [
+        (
+            "reference_unique",
+            "unique(regulator, reference_code)",
+            "A circular can only be catalogued once per regulator.",
+        ),
+    ]
+
+    def init(self):
+        create_index(
+            self._cr,
+            "qaco_final_regulatory_catalogue_feed_index",
+            self._table,
+            ["regulator", "effective_date DESC"],
+        )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
+
+    @api.model
+    @tools.ormcache("regulators", "period_end", "entity_type", "self.env.lang")
+    def _render_feed(self, regulators, period_end, entity_type):
+        """Feed fragment for one subscription, cached until the catalogue changes."""
+        alerts = self.sudo().search_fetch(
+            [
+                ("regulator", "in", list(regulators)),
+                "|",
+                ("effective_date", "=", False),
+                ("effective_date", ">=", regulatory_catalogue.feed_start(period_end)),
+            ],
+            list(regulatory_catalogue.FIELDS),
+        )
+        rows = [
+            {name: alert[name] for name in regulatory_catalogue.FIELDS}
+            for alert in alerts
+            if not alert.entity_types
+            or (entity_type and entity_type in alert.entity_types.split(","))
+        ]
+        return regulatory_catalogue.render_feed(rows[:REGULATORY_FEED_LIMIT], _("read"))
+
+    @api.model
+    def _load_bundles(self, directory=None):
+        """Synchronise the catalogue with the bundle directory.
+
+        Unchanged circulars are left alone; circulars dropped from every
+        bundle are archived. Returns the sync counts.
+        """
+        directory = directory or self.env["ir.config_parameter"].sudo().get_param(
+            "qaco_finalisation.regulatory_bundle_dir"
+        )
+        paths = regulatory_catalogue.bundle_paths(directory)
+        if not paths:
+            return {}
+        incoming, skipped = regulatory_catalogue.load_bundles(
+            paths, dict(REGULATOR_CHOICES)
+        )
+        Catalogue = self.sudo().with_context(active_test=False)
+        current = Catalogue.search_fetch(
+            [], ["regulator", "reference_code", "fingerprint", "bundle_name", "active"]
+        )
+        existing = {
+            # Archived circulars that reappear in a bundle are restored
+            (alert.regulator, alert.reference_code): (
+                alert.id,
+                alert.fingerprint if alert.active else None,
+            )
+            for alert in current
+        }
+        to_create, to_update, unchanged = regulatory_catalogue.plan_sync(existing, incoming)
+        if to_create:
+            Catalogue.create(to_create)
+        for alert_id, vals in to_update.items():
+            Catalogue.browse(alert_id).write(dict(vals, active=True))
+        retired = current.filtered(
+            lambda alert: alert.active
+            and alert.bundle_name
+            and (alert.regulator, alert.reference_code) not in incoming
+        )
+        retired.write({"active": False})
+        stats = {
+            "created": len(to_create),
+            "updated": len(to_update),
+            "unchanged": unchanged,
+            "archived": len(retired),
+            "skipped": skipped,
+        }
+        _logger.info("Regulatory catalogue loaded from %s: %s", directory, stats)
+        return stats
+
+    @api.model
+    def _cron_load_bundles(self):
+        self._load_bundles()
+
+    def action_reload_bundles(self):
+        stats = self._load_bundles()
+        if not stats:
+            raise UserError(
+                _("No regulatory bundles found. Set the bundle directory in the "
+                  "'qaco_finalisation.regulatory_bundle_dir' system parameter.")
+            )
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Regulatory Catalogue Reloaded"),
+                "message": _(
+                    "%(created)s added, %(updated)s updated, %(archived)s archived, "
+                    "%(skipped)s rows skipped."
+                )
+                % stats,
+                "type": "success",
+            },
+        }
+
+
 class FinalRegulatoryAlert(models.Model):
     _name = "qaco.final.regulatory.alert"
     _description = "Regulatory Update Hub"
@@ -1466,3 +2539,16 @@ class FinalRegulatoryAlert(models.Model):
     link_url = fields.Char(string="Reference URL")
     severity = fields.Selection(ALERT_SEVERITY, string="Severity", default="info")
     effective_date = fields.Date(string="Effective Date")
+
+
+class PlanningPhase(models.Model):
+    _inherit = "qaco.planning.phase"
+
+    def write(self, vals):
+        result = super().write(vals)
+        if set(vals) & set(MATERIALITY_INPUTS):
+            # The clearly trivial split of the summary of adjusted differences
+            self.env["qaco.finalisation.phase"].search(
+                [("planning_phase_id", "in", self.ids)]
+            )._refresh_sad_schedule()
+        return result
@@ -0,0 +1,41 @@
+from odoo.tests import common
+
+
+class SadScheduleTest(common.TransactionCase):
+    def setUp(self):
+        super().setUp()
+        audit = self.env["qaco.audit"].create(
+            {"client_id": self.env.ref("base.res_partner_1").id}
+        )
+        # 5% of the default benchmark: materiality 50,000, clearly trivial 2,500
+        self.planning = self.env["qaco.planning.phase"].create(
+            {"audit_id": audit.id, "materiality_percentage": 5.0}
+        )
+        self.phase = self.env["qaco.finalisation.phase"].create({"audit_id": audit.id})
+        self.env["qaco.final.misstatement"].create(
+            [
+                {
+                    "finalisation_phase_id": self.phase.id,
+                    "area": "revenue",
+                    "assertion": "existence",
+                    "misstatement_type": "factual",
+                    "status": "uncorrected",
+                    "amount": amount,
+                    "rationale": "Not corrected by management",
+                }
+                for amount in (1_000.0, 10_000.0)
+            ]
+        )
+
+    def test_materiality_change_resplits_the_schedule(self):
+        self.assertEqual(self.planning.clearly_trivial_threshold, 2_500.0)
+        self.assertEqual(self.phase.sad_trivial_count, 1)
+        self.assertEqual(self.phase.uncorrected_total, 10_000.0)
+
+        # 0.5%: materiality 5,000, clearly trivial 250
+        self.planning.write({"materiality_percentage": 0.5})
+
+        self.assertEqual(self.phase.trivial_threshold_ref, 250.0)
+        self.assertEqual(self.phase.sad_trivial_count, 0)
+        self.assertEqual(self.phase.uncorrected_total, 11_000.0)
+        self.assertFalse(any(self.phase.sad_line_ids.mapped("is_clearly_trivial")))
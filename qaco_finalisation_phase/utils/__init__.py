@@ -0,0 +1,3 @@
+"""Utility helpers for qaco_finalisation_phase.
+Keep utilities free of Odoo imports so they can be imported safely in tests and pre-commit hooks.
+"""
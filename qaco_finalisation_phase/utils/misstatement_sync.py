@@ -0,0 +1,124 @@
+"""Two-way reconciliation between execution exceptions and misstatements.
+
+Execution exceptions (substantive procedure exceptions and quantified
+control exceptions) are linked one-to-one to misstatement register lines.
+Each link remembers the amount agreed at the last sync, which tells which
+side changed since:
+
+- only the exception changed: its amount is pushed to the misstatement
+- only the misstatement changed (e.g. revised at finalisation): the amount
+  is pulled back into the exception
+- both changed to different amounts: reported as a conflict, nothing is
+  written
+
+Descriptive fields (area, assertion, rationale) always follow the
+exception. :func:`plan_reconciliation` only computes the plan from plain
+dicts; the caller applies it with batched writes.
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks.
+"""
+
+from collections import defaultdict, namedtuple
+
+ExceptionState = namedtuple("ExceptionState", ["amount", "area", "assertion", "rationale"])
+MisstatementState = namedtuple(
+    "MisstatementState", ["amount", "area", "assertion", "rationale"]
+)
+LinkState = namedtuple("LinkState", ["link_id", "misstatement_id", "synced_amount"])
+
+Plan = namedtuple(
+    "Plan",
+    [
+        "create",  # [key] exceptions needing a new misstatement and link
+        "push_amounts",  # {misstatement_id: amount}
+        "pull_amounts",  # {key: amount}
+        "push_fields",  # {misstatement_id: {field: value}} for area/assertion
+        "push_rationale",  # {misstatement_id: rationale}
+        "synced",  # {link_id: amount} agreed amount after this sync
+        "conflicts",  # [(key, misstatement_id, reason)]
+    ],
+)
+
+CONFLICT_REASONS = {
+    "unquantified": "Exception has no amount; quantify it before it can be registered.",
+    "both_changed": "Amount changed on both the exception and the misstatement since "
+    "the last sync.",
+    "zero_amount": "Exception amount was cleared but the misstatement still carries "
+    "an amount.",
+    "exception_cleared": "Exception no longer exists or is no longer an exception; "
+    "review the misstatement.",
+}
+
+
+def same_amount(a, b):
+    return round(a or 0.0, 2) == round(b or 0.0, 2)
+
+
+def plan_reconciliation(exceptions, links, misstatements, optional_sources=()):
+    """Diff exceptions against their linked misstatements.
+
+    :param exceptions: ``{key: ExceptionState}`` for the current exceptions,
+        keyed by ``(finalisation id, source, source id)``
+    :param links: ``{key: LinkState}`` for existing links
+    :param misstatements: ``{misstatement_id: MisstatementState}`` for the
+        linked misstatements
+    :param optional_sources: sources whose exceptions need not be quantified
+        (most control deviations have no monetary effect); unlinked ones
+        without an amount are skipped instead of reported
+    :rtype: Plan
+    """
+    plan = Plan([], {}, {}, {}, {}, {}, [])
+    for key, exc in exceptions.items():
+        link = links.get(key)
+        misstatement = misstatements.get(link.misstatement_id) if link else None
+        if misstatement is None:
+            if exc.amount and exc.amount > 0:
+                plan.create.append(key)
+            elif key[1] not in optional_sources:
+                plan.conflicts.append((key, None, "unquantified"))
+            continue
+
+        ms_id = link.misstatement_id
+        if same_amount(exc.amount, misstatement.amount):
+            amount = misstatement.amount
+        else:
+            exc_changed = not same_amount(exc.amount, link.synced_amount)
+            ms_changed = not same_amount(misstatement.amount, link.synced_amount)
+            if exc_changed and ms_changed:
+                plan.conflicts.append((key, ms_id, "both_changed"))
+                continue
+            if exc_changed:
+                if not exc.amount or exc.amount <= 0:
+                    plan.conflicts.append((key, ms_id, "zero_amount"))
+                    continue
+                plan.push_amounts[ms_id] = exc.amount
+                amount = exc.amount
+            else:
+                plan.pull_amounts[key] = misstatement.amount
+                amount = misstatement.amount
+        if not same_amount(amount, link.synced_amount):
+            plan.synced[link.link_id] = amount
+
+        fields = {
+            name: getattr(exc, name)
+            for name in ("area", "assertion")
+            if getattr(exc, name) != getattr(misstatement, name)
+        }
+        if fields:
+            plan.push_fields[ms_id] = fields
+        if exc.rationale != misstatement.rationale:
+            plan.push_rationale[ms_id] = exc.rationale
+
+    for key, link in links.items():
+        if key not in exceptions and link.misstatement_id in misstatements:
+            plan.conflicts.append((key, link.misstatement_id, "exception_cleared"))
+    return plan
+
+
+def group_by_values(values_by_id):
+    """``{id: vals}`` -> ``{frozenset(vals.items()): [ids]}`` for grouped writes."""
+    groups = defaultdict(list)
+    for record_id, vals in values_by_id.items():
+        groups[frozenset(vals.items())].append(record_id)
+    return groups
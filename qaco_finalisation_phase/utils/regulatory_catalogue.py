@@ -0,0 +1,186 @@
+"""Firm-wide regulatory alert catalogue: bundle loading and feed rendering.
+
+Regulator circulars are distributed as local bundles (JSON or CSV files in
+a directory). Bundles are read into normalised rows keyed by
+``(regulator, reference_code)``; a later bundle overrides an earlier one
+for the same key. Each row carries a fingerprint so a reload only writes
+rows whose content changed.
+
+The feed fragment shown on finalisation files is rendered here from plain
+dicts, so the model can cache it per subscription.
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks.
+"""
+
+import csv
+import hashlib
+import json
+import os
+from datetime import date, timedelta
+from html import escape
+
+BUNDLE_EXTENSIONS = (".csv", ".json")
+
+SEVERITIES = ("info", "warning", "critical")
+
+SEVERITY_COLORS = {
+    "info": "#0d6efd",
+    "warning": "#ffc107",
+    "critical": "#dc3545",
+}
+
+FIELDS = (
+    "regulator",
+    "reference_code",
+    "summary",
+    "link_url",
+    "severity",
+    "effective_date",
+    "entity_types",
+)
+
+# Circulars effective up to this long before the period end stay relevant
+LOOKBACK = timedelta(days=365)
+
+
+def bundle_paths(directory):
+    """Bundle files in ``directory``, in name order (later files win)."""
+    if not directory or not os.path.isdir(directory):
+        return []
+    return [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory))
+        if name.lower().endswith(BUNDLE_EXTENSIONS)
+    ]
+
+
+def _to_date(value):
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value).strip()[:10])
+    except ValueError:
+        return None
+
+
+def _entity_types(value):
+    if isinstance(value, (list, tuple)):
+        parts = value
+    else:
+        parts = str(value or "").replace(";", ",").split(",")
+    return ",".join(sorted({part.strip().lower() for part in parts if part and part.strip()}))
+
+
+def normalise(raw, regulators):
+    """Clean one bundle row; ``None`` when it cannot be catalogued.
+
+    :param regulators: accepted regulator codes
+    """
+    regulator = str(raw.get("regulator") or "").strip().lower()
+    reference = str(raw.get("reference_code") or raw.get("reference") or "").strip()
+    summary = str(raw.get("summary") or "").strip()
+    if regulator not in regulators or not reference or not summary:
+        return None
+    severity = str(raw.get("severity") or "info").strip().lower()
+    row = {
+        "regulator": regulator,
+        "reference_code": reference,
+        "summary": summary,
+        "link_url": str(raw.get("link_url") or raw.get("url") or "").strip(),
+        "severity": severity if severity in SEVERITIES else "info",
+        "effective_date": _to_date(raw.get("effective_date")),
+        "entity_types": _entity_types(raw.get("entity_types")),
+    }
+    row["fingerprint"] = fingerprint(row)
+    return row
+
+
+def fingerprint(row):
+    """Content hash of a normalised row."""
+    payload = "\x1f".join(str(row.get(name) or "") for name in FIELDS)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def read_bundle(path):
+    """Raw rows of one JSON (list or ``{"alerts": [...]}``) or CSV bundle."""
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        if isinstance(data, dict):
+            data = data.get("alerts", [])
+        return [row for row in data if isinstance(row, dict)]
+    with open(path, encoding="utf-8-sig", newline="") as handle:
+        return list(csv.DictReader(handle))
+
+
+def load_bundles(paths, regulators):
+    """Merge bundles into ``{(regulator, reference_code): row}``.
+
+    Returns ``(rows, skipped)`` where ``skipped`` counts rows that could not
+    be catalogued. Each row records its bundle file name.
+    """
+    rows = {}
+    skipped = 0
+    for path in paths:
+        bundle = os.path.basename(path)
+        for raw in read_bundle(path):
+            row = normalise(raw, regulators)
+            if row is None:
+                skipped += 1
+                continue
+            row["bundle_name"] = bundle
+            rows[(row["regulator"], row["reference_code"])] = row
+    return rows, skipped
+
+
+def plan_sync(existing, incoming):
+    """Split incoming rows against the catalogue.
+
+    :param existing: ``{key: (record_id, fingerprint)}``
+    :param incoming: ``{key: row}`` from :func:`load_bundles`
+    :returns: ``(to_create, to_update, unchanged)``; ``to_update`` maps
+        record ids to rows
+    """
+    to_create = []
+    to_update = {}
+    unchanged = 0
+    for key, row in incoming.items():
+        current = existing.get(key)
+        if current is None:
+            to_create.append(row)
+        elif current[1] != row["fingerprint"]:
+            to_update[current[0]] = row
+        else:
+            unchanged += 1
+    return to_create, to_update, unchanged
+
+
+def feed_start(period_end):
+    """First effective date shown on the feed for a period end."""
+    return period_end - LOOKBACK
+
+
+def render_feed(alerts, read_label="read"):
+    """HTML fragment for catalogue alerts (dicts with the :data:`FIELDS`)."""
+    rows = []
+    for alert in alerts:
+        color = SEVERITY_COLORS.get(alert.get("severity") or "info", SEVERITY_COLORS["info"])
+        effective = alert.get("effective_date")
+        date_text = effective.isoformat() if effective else ""
+        link = (
+            f" <a href='{escape(alert['link_url'])}' target='_blank'>{escape(read_label)}</a>"
+            if alert.get("link_url")
+            else ""
+        )
+        rows.append(
+            f"<div class='o_qaco-reg-alert' style='margin-bottom:4px;'>"
+            f"<span style='color:{color};font-weight:600'>{escape(alert['regulator'].upper())}</span> "
+            f"<span>{escape(alert['reference_code'])}: {escape(alert['summary'])}</span>"
+            f" <span style='color:#6c757d;'>({date_text})</span>"
+            f"{link}"
+            f"</div>"
+        )
+    return "".join(rows)
@@ -0,0 +1,109 @@
+"""Summary of adjusted differences (SAD) for the misstatement register.
+
+Takes misstatement totals already aggregated by the database (one row per
+type / area / account / assertion / status / period / effect group) and
+derives the ISA 450 schedule totals:
+
+- uncorrected misstatements by type (factual, judgmental, projected)
+- the turnaround of prior-period uncorrected misstatements, which reverse
+  through current-period profit
+- the cumulative effect on profit and the gross uncorrected amount
+- the materiality level reached against the clearly trivial, performance
+  and overall thresholds
+
+Misstatements below the clearly trivial threshold are counted but not
+accumulated (ISA 450.5, A2).
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks.
+"""
+
+MISSTATEMENT_TYPES = ("factual", "judgmental", "projected")
+
+SAD_LEVELS = [
+    ("none", "No Uncorrected Misstatements"),
+    ("trivial", "Below Clearly Trivial"),
+    ("below_performance", "Below Performance Materiality"),
+    ("below_overall", "Below Overall Materiality"),
+    ("material", "Exceeds Overall Materiality"),
+]
+
+
+def profit_effect(amount, income_effect, period):
+    """Signed effect on current-period profit (positive = overstated).
+
+    A prior-period misstatement turns around in the current period, so its
+    effect on current profit has the opposite sign.
+    """
+    sign = 1.0 if income_effect != "understated" else -1.0
+    if period == "prior":
+        sign = -sign
+    return sign * (amount or 0.0)
+
+
+def materiality_level(amount, trivial, performance, overall):
+    """Highest threshold that ``amount`` (absolute) reaches."""
+    amount = abs(amount or 0.0)
+    if not amount:
+        return "none"
+    if overall and amount > overall:
+        return "material"
+    if performance and amount > performance:
+        return "below_overall"
+    if trivial and amount <= trivial:
+        return "trivial"
+    return "below_performance"
+
+
+def evaluate_thresholds(uncorrected, cumulative_effect, trivial, performance, overall,
+                        threshold_pct=100.0):
+    """Materiality level of the accumulated misstatements and breach flag.
+
+    The aggregate is the larger of the gross uncorrected amount and the net
+    cumulative profit effect; the breach flag keeps the engagement's own
+    threshold (``threshold_pct`` of overall materiality) on the gross amount.
+    """
+    aggregate = max(abs(uncorrected or 0.0), abs(cumulative_effect or 0.0))
+    level = materiality_level(aggregate, trivial, performance, overall)
+    breach_threshold = (overall or 0.0) * (threshold_pct or 0.0) / 100.0
+    return level, bool(breach_threshold and (uncorrected or 0.0) > breach_threshold)
+
+
+def summarise(groups):
+    """Schedule totals from aggregated groups.
+
+    :param groups: iterable of dicts with ``misstatement_type``, ``status``,
+        ``period``, ``income_effect``, ``is_clearly_trivial``, ``amount``
+        (sum) and ``line_count``
+    """
+    totals = {
+        "corrected_total": 0.0,
+        "uncorrected_total": 0.0,
+        "trivial_count": 0,
+        "trivial_total": 0.0,
+        "prior_turnaround": 0.0,
+        "current_effect": 0.0,
+    }
+    totals.update({f"{kind}_total": 0.0 for kind in MISSTATEMENT_TYPES})
+    for group in groups:
+        amount = group["amount"] or 0.0
+        if group["is_clearly_trivial"]:
+            totals["trivial_count"] += group["line_count"]
+            totals["trivial_total"] += amount
+            continue
+        if group["period"] == "prior":
+            if group["status"] == "uncorrected":
+                totals["prior_turnaround"] += profit_effect(
+                    amount, group["income_effect"], "prior"
+                )
+            continue
+        if group["status"] == "corrected":
+            totals["corrected_total"] += amount
+            continue
+        totals["uncorrected_total"] += amount
+        kind = group["misstatement_type"]
+        if kind in MISSTATEMENT_TYPES:
+            totals[f"{kind}_total"] += amount
+        totals["current_effect"] += profit_effect(amount, group["income_effect"], "current")
+    totals["cumulative_effect"] = totals["current_effect"] + totals["prior_turnaround"]
+    return totals
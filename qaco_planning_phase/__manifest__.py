@@ -1,7 +1,7 @@
 {
     "name": "Audit Planning Phase - Pakistan Statutory Audit",
     "summary": "Zero-deficiency ISA-compliant planning workflow (P-1 to P-12) for statutory audits in Pakistan",
-    "version": "17.0.1.0.0",
+    "version": "17.0.1.0.1",
     "author": "QACO",
     "website": "https://alamaudit.thinkoptimise.com",
     "license": "LGPL-3",
@@ -12,6 +12,9 @@
         "web",
         "qaco_audit",
     ],
+    "external_dependencies": {
+        "python": ["numpy", "pandas"],
+    },
     "data": [
         # Security
         "security/planning_phase_security.xml",
@@ -22,6 +25,7 @@
         "views/planning_p4_views.xml",
         "views/planning_p4_views.xml",
         "views/planning_p5_views.xml",
+        "views/planning_p7_jet_views.xml",
         "views/planning_p10_views.xml",
         "views/planning_p11_views.xml",
         "views/planning_p10_related_parties_views.xml",
@@ -46,6 +50,7 @@
         "data/assertion_tags.xml",
         "data/materiality_defaults.xml",
         "data/checklist_data.xml",
+        "data/tb_mapping_rules.xml",
     ],
     "demo": [
         "demo/planning_phase_demo.xml",
@@ -0,0 +1,18 @@
+# Materiality thresholds are now stored computes; they were only set by an
+# onchange on read-only fields, so saved planning phases may hold stale zeros.
+from odoo import SUPERUSER_ID, api
+
+MATERIALITY_FIELDS = (
+    "overall_materiality",
+    "performance_materiality",
+    "clearly_trivial_threshold",
+)
+
+
+def migrate(cr, installed_version):
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    phases = env["qaco.planning.phase"].search([])
+    for name in MATERIALITY_FIELDS:
+        env.add_to_compute(phases._fields[name], phases)
+    phases.modified(MATERIALITY_FIELDS)
+    env.flush_all()
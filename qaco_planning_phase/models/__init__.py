@@ -13,9 +13,11 @@ from . import planning_p3_controls
 # If reintroducing P-1 is required, import it lazily or ensure dependency order prevents cycles.
 
 from . import planning_p4_analytics
+from . import planning_p4_tb_import
 from . import planning_p5_materiality
 from . import planning_p6_risk
 from . import planning_p7_fraud
+from . import planning_p7_jet
 from . import planning_p8_going_concern
 from . import planning_p9_laws
 from . import planning_p10_related_parties
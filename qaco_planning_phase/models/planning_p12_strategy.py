@@ -10,6 +10,9 @@ import logging
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools import html2plaintext
+
+from ..utils import risk_sync
 
 _logger = logging.getLogger(__name__)
 
@@ -862,57 +865,221 @@ class AuditSpecialistType(models.Model):
     # AUTO-POPULATION FROM PRIOR PHASES
     # ============================================================================
     def _auto_populate_risk_responses(self):
-        """Auto-populate risk-response mapping from P-6, P-7, P-8, P-9, P-10"""
+        """Auto-populate risk-response mapping from P-6, P-7, P-8, P-9, P-10.
+
+        Responses are keyed on the originating risk line: new risks are
+        added, changed descriptions/levels are refreshed and risks that no
+        longer exist are flagged as retired. Documented responses entered by
+        the engagement team are never overwritten or deleted.
+        """
         self.ensure_one()
 
-        RiskResponse = self.env["qaco.planning.p12.risk.response"]
+        desired = {}
+        desired.update(self._collect_responses_from_p6())
+        desired.update(self._collect_responses_from_p7())
+        desired.update(self._collect_responses_from_p8())
+        desired.update(self._collect_responses_from_p9())
+        desired.update(self._collect_responses_from_p10())
 
-        # Clear existing
-        self.risk_response_ids.unlink()
+        RiskResponse = self.env["qaco.planning.p12.risk.response"]
+        self._adopt_legacy_responses(desired)
+        existing = {
+            row["source_key"]: dict(row, active=not row["source_retired"])
+            for row in RiskResponse.search_read(
+                [("p12_id", "=", self.id), ("source_key", "!=", False)],
+                ["source_key", "source_fingerprint", "source_retired"],
+            )
+        }
+        plan = risk_sync.diff_risk_sources(
+            desired, existing, restore_vals={"source_retired": False}
+        )
 
-        # From P-6 (Risk Assessment)
-        p6 = self.env["qaco.planning.p6.risk"].search(
-            [
-                ("engagement_id", "=", self.engagement_id.id),
-                ("audit_year_id", "=", self.audit_year_id.id),
-            ],
-            limit=1,
+        if plan.creates:
+            RiskResponse.create([dict(vals, p12_id=self.id) for vals in plan.creates])
+        for ids, vals in plan.updates:
+            RiskResponse.browse(ids).write(vals)
+        if plan.retire_ids:
+            RiskResponse.browse(plan.retire_ids).write({"source_retired": True})
+
+        _logger.info(
+            "P-12 %s risk-response sync: %d created, %d update groups, %d retired, %d unchanged",
+            self.id,
+            len(plan.creates),
+            len(plan.updates),
+            len(plan.retire_ids),
+            plan.unchanged,
         )
+        return plan
 
-        if p6 and p6.risk_ids:
-            for risk in p6.risk_ids:
-                RiskResponse.create(
-                    {
-                        "p12_id": self.id,
-                        "source_phase": "p6",
-                        "risk_description": risk.risk_description,
-                        "fs_area": risk.fs_area,
-                        "assertion": risk.assertion,
-                        "risk_level": risk.risk_level,
-                    }
-                )
+    def _adopt_legacy_responses(self, desired):
+        """Stamp source keys on responses created before they were keyed.
 
-        # From P-7 (Fraud)
-        p7 = self.env["qaco.planning.p7.fraud"].search(
+        Legacy rows are matched to a source on phase, risk and assertion so
+        the sync updates them instead of adding a duplicate next to the
+        response the team already documented.
+        """
+        RiskResponse = self.env["qaco.planning.p12.risk.response"]
+        legacy = RiskResponse.search_read(
+            [("p12_id", "=", self.id), ("source_key", "=", False)],
+            ["source_phase", "risk_description", "assertion"],
+        )
+        if not legacy:
+            return
+        matched = risk_sync.match_legacy(
+            desired,
             [
-                ("engagement_id", "=", self.engagement_id.id),
-                ("audit_year_id", "=", self.audit_year_id.id),
+                (
+                    row["id"],
+                    row["source_phase"],
+                    html2plaintext(row["risk_description"] or ""),
+                    row["assertion"],
+                )
+                for row in legacy
             ],
-            limit=1,
         )
+        for response_id, key in matched.items():
+            RiskResponse.browse(response_id).write({"source_key": key})
 
-        if p7 and p7.fraud_risk_ids:
-            for fraud_risk in p7.fraud_risk_ids:
-                RiskResponse.create(
-                    {
-                        "p12_id": self.id,
-                        "source_phase": "p7",
-                        "risk_description": fraud_risk.fraud_risk_description,
-                        "risk_level": "significant",  # Fraud risks are always significant
-                    }
+    def action_sync_risk_responses(self):
+        """Re-sync the risk-response mapping with the current P-6 to P-10 registers."""
+        for rec in self:
+            if rec.locked:
+                raise UserError(_("Cannot re-sync risk responses on a locked P-12."))
+            plan = rec._auto_populate_risk_responses()
+            updated_count = sum(len(ids) for ids, _vals in plan.updates)
+            rec.message_post(
+                body=_(
+                    "Risk responses synchronised: %(created)s added, %(updated)s updated, "
+                    "%(retired)s flagged as retired."
                 )
+                % {
+                    "created": len(plan.creates),
+                    "updated": updated_count,
+                    "retired": len(plan.retire_ids),
+                }
+            )
+        return True
+
+    def _find_prior_phase(self, model_name, audit_field="audit_id"):
+        """Return the prior planning tab record for this engagement (if any)."""
+        self.ensure_one()
+        return self.env[model_name].search(
+            [(audit_field, "=", self.audit_id.id)], limit=1
+        )
 
-        # Similar logic for P-8, P-9, P-10 can be added
+    def _collect_responses_from_p6(self):
+        """Response values keyed by source for active P-6 risk lines."""
+        desired = {}
+        p6 = self._find_prior_phase("qaco.planning.p6.risk", "engagement_id")
+        for risk in p6.risk_line_ids:
+            key = risk_sync.source_key(risk._name, risk.id)
+            desired[key] = {
+                "source_phase": "p6",
+                "risk_description": risk.risk_description,
+                "fs_area": risk.account_cycle,
+                "assertion": risk.assertion_type,
+                "risk_level": (
+                    "significant"
+                    if risk.is_significant_risk
+                    else risk_sync.P6_RATING_LEVELS.get(risk.risk_rating, "moderate")
+                ),
+            }
+        return desired
+
+    def _collect_responses_from_p7(self):
+        """Response values keyed by source for P-7 fraud risk lines."""
+        desired = {}
+        p7 = self._find_prior_phase("qaco.planning.p7.fraud")
+        for fraud_risk in p7.fraud_risk_line_ids:
+            key = risk_sync.source_key(fraud_risk._name, fraud_risk.id)
+            desired[key] = {
+                "source_phase": "p7",
+                "risk_description": fraud_risk.risk_description,
+                "fs_area": fraud_risk.fs_area,
+                "assertion": fraud_risk.assertion,
+                "risk_level": "significant",  # Fraud risks are always significant
+            }
+        return desired
+
+    def _collect_responses_from_p8(self):
+        """Response values keyed by source for a P-8 going-concern doubt."""
+        p8 = self._find_prior_phase("qaco.planning.p8.going.concern")
+        if not p8 or not (
+            p8.material_uncertainty_identified
+            or p8.significant_doubt_exists
+            or p8.gc_risk_identified
+        ):
+            return {}
+        key = risk_sync.source_key(p8._name, p8.id)
+        return {
+            key: {
+                "source_phase": "p8",
+                "risk_description": _(
+                    "Going concern: material uncertainty or significant doubt identified in P-8."
+                ),
+                "fs_area": "fs_level",
+                "assertion": "presentation",
+                "risk_level": (
+                    "significant" if p8.material_uncertainty_identified else "high"
+                ),
+            }
+        }
+
+    def _collect_responses_from_p9(self):
+        """Response values keyed by source for P-9 non-compliance and at-risk laws."""
+        desired = {}
+        p9 = self._find_prior_phase("qaco.planning.p9.laws")
+        for item in p9.non_compliance_line_ids:
+            key = risk_sync.source_key(item._name, item.id)
+            desired[key] = {
+                "source_phase": "p9",
+                "risk_description": item.description or item.law_reference,
+                "assertion": "presentation",
+                "risk_level": (
+                    "significant" if item.materiality == "material" else "high"
+                ),
+            }
+        laws = p9.applicable_laws_ids.filtered(
+            lambda law: law.compliance_status in ("partial", "non_compliant")
+        )
+        for law in laws:
+            key = risk_sync.source_key(law._name, law.id)
+            desired[key] = {
+                "source_phase": "p9",
+                "risk_description": law.relevance or law.law_name,
+                "assertion": "presentation",
+                "risk_level": (
+                    "high" if law.compliance_status == "non_compliant" else "moderate"
+                ),
+            }
+        return desired
+
+    def _collect_responses_from_p10(self):
+        """Response values keyed by source for higher-risk related parties.
+
+        Parties rated medium or high, and parties with transactions or
+        balances not at arm's length.
+        """
+        desired = {}
+        p10 = self._find_prior_phase("qaco.planning.p10.related.parties")
+        # An unticked arm's-length box only matters for parties with transactions
+        parties = p10.related_party_line_ids.filtered(
+            lambda rp: rp.risk_level in ("medium", "high")
+            or (
+                not rp.arms_length
+                and (rp.transaction_volume or rp.outstanding_balances)
+            )
+        )
+        for party in parties:
+            key = risk_sync.source_key(party._name, party.id)
+            desired[key] = {
+                "source_phase": "p10",
+                "risk_description": _("Related party: %s") % party.name,
+                "fs_area": "related_parties",
+                "assertion": "presentation",
+                "risk_level": "high" if party.risk_level == "high" else "moderate",
+            }
+        return desired
 
     # ============================================================================
     # MANDATORY FIELD VALIDATION
@@ -1135,6 +1302,25 @@ class PlanningP12RiskResponse(models.Model):
     )
 
     risk_id = fields.Char(string="Risk ID", help="Reference to original risk ID")
+    source_key = fields.Char(
+        string="Source Key",
+        index=True,
+        copy=False,
+        readonly=True,
+        help="Originating risk line (model,id) in P-6 to P-10",
+    )
+    source_fingerprint = fields.Char(
+        string="Source Fingerprint",
+        copy=False,
+        readonly=True,
+        help="Hash of the risk details last taken from the source line",
+    )
+    source_retired = fields.Boolean(
+        string="Source Retired",
+        copy=False,
+        readonly=True,
+        help="The originating risk no longer exists; review whether this response is still needed",
+    )
     risk_description = fields.Html(string="Risk Description", required=True)
     fs_area = fields.Char(string="FS Area", help="Financial statement area affected")
     assertion = fields.Char(
@@ -1173,6 +1359,14 @@ class PlanningP12RiskResponse(models.Model):
 
     notes = fields.Text(string="Notes")
 
+    _sql_constraints = [
+        (
+            "source_key_unique",
+            "unique(p12_id, source_key)",
+            "A planning risk can only be mapped once per P-12 strategy.",
+        )
+    ]
+
 
 # ============================================================================
 # CHILD MODEL: FS AREA STRATEGY
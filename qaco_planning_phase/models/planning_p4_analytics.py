@@ -25,8 +25,42 @@ import logging
 from odoo import api, fields, models
 from odoo.exceptions import UserError
 
+from ..utils import ratio_engine, tb_import
+
 _logger = logging.getLogger(__name__)
 
+FS_CATEGORIES = [
+    ("revenue", "Revenue"),
+    ("cost_of_sales", "Cost of Sales"),
+    ("gross_profit", "Gross Profit"),
+    ("operating_expense", "Operating Expenses"),
+    ("other_income", "Other Income/Expense"),
+    ("finance_cost", "Finance Costs"),
+    ("pbt", "Profit Before Tax"),
+    ("taxation", "Taxation"),
+    ("net_profit", "Net Profit/Loss"),
+    ("current_asset", "Current Assets"),
+    ("non_current_asset", "Non-Current Assets"),
+    ("current_liability", "Current Liabilities"),
+    ("non_current_liability", "Non-Current Liabilities"),
+    ("equity", "Equity"),
+]
+
+# Standard ratio name -> Section C quick-reference field (current year)
+SUMMARY_RATIO_FIELDS = {
+    "Gross Margin": "gross_margin_cy",
+    "Net Margin": "net_margin_cy",
+    "Operating Margin": "operating_margin_cy",
+    "Current Ratio": "current_ratio_cy",
+    "Quick Ratio": "quick_ratio_cy",
+    "Cash Ratio": "cash_ratio_cy",
+    "Debt-to-Equity": "debt_to_equity_cy",
+    "Interest Coverage": "interest_coverage_cy",
+    "Inventory Turnover": "inventory_turnover_cy",
+    "Receivables Days": "receivables_days_cy",
+    "Payables Days": "payables_days_cy",
+}
+
 
 # =============================================================================
 # CHILD MODEL: FS Line Item Variance Analysis
@@ -50,22 +84,7 @@ class PlanningP4FSLine(models.Model):
         string="FS Caption", required=True, help="Financial statement line item caption"
     )
     fs_category = fields.Selection(
-        [
-            ("revenue", "Revenue"),
-            ("cost_of_sales", "Cost of Sales"),
-            ("gross_profit", "Gross Profit"),
-            ("operating_expense", "Operating Expenses"),
-            ("other_income", "Other Income/Expense"),
-            ("finance_cost", "Finance Costs"),
-            ("pbt", "Profit Before Tax"),
-            ("taxation", "Taxation"),
-            ("net_profit", "Net Profit/Loss"),
-            ("current_asset", "Current Assets"),
-            ("non_current_asset", "Non-Current Assets"),
-            ("current_liability", "Current Liabilities"),
-            ("non_current_liability", "Non-Current Liabilities"),
-            ("equity", "Equity"),
-        ],
+        FS_CATEGORIES,
         string="Category",
         required=True,
     )
@@ -102,27 +121,53 @@ class PlanningP4FSLine(models.Model):
         default="low",
     )
 
-    @api.depends("current_year", "prior_year")
+    account_count = fields.Integer(
+        string="Accounts",
+        readonly=True,
+        help="Number of trial-balance accounts aggregated into this line",
+    )
+    tb_imported = fields.Boolean(
+        string="From TB Import",
+        readonly=True,
+        copy=False,
+        help="Line was generated by the trial balance import",
+    )
+
+    @api.depends(
+        "current_year",
+        "prior_year",
+        "p4_id.materiality_benchmark",
+        "p4_id.variance_threshold_pct",
+    )
     def _compute_variance(self):
-        """Defensive: Safe even during module install."""
-        for rec in self:
+        """Defensive: Safe even during module install.
+
+        Lines are processed per P-4 record in one vectorised pass; the
+        threshold is the P-4 materiality benchmark or P-5 performance
+        materiality, falling back to the % threshold when neither is set.
+        """
+        for p4, lines in self.grouped("p4_id").items():
             try:
-                rec.variance = rec.current_year - rec.prior_year
-                if rec.prior_year and rec.prior_year != 0:
-                    rec.variance_pct = (rec.variance / abs(rec.prior_year)) * 100
-                else:
-                    rec.variance_pct = 0 if rec.current_year == 0 else 100
-                # Threshold: 10% or absolute variance > 5% of materiality (placeholder logic)
-                rec.exceeds_threshold = abs(rec.variance_pct) > 10
-                rec.explanation_required = rec.exceeds_threshold
+                amount_threshold, pct_threshold = p4._get_variance_thresholds()
+                variances, pcts, exceeds = tb_import.compute_variances(
+                    lines.mapped("current_year"),
+                    lines.mapped("prior_year"),
+                    amount_threshold,
+                    pct_threshold,
+                )
+                for rec, variance, pct, flag in zip(lines, variances, pcts, exceeds):
+                    rec.variance = float(variance)
+                    rec.variance_pct = float(pct)
+                    rec.exceeds_threshold = bool(flag)
+                    rec.explanation_required = bool(flag)
             except Exception as e:
                 _logger.warning(
-                    f"P-4 _compute_variance failed for record {rec.id}: {e}"
+                    f"P-4 _compute_variance failed for records {lines.ids}: {e}"
                 )
-                rec.variance = 0
-                rec.variance_pct = 0
-                rec.exceeds_threshold = False
-                rec.explanation_required = False
+                lines.variance = 0
+                lines.variance_pct = 0
+                lines.exceeds_threshold = False
+                lines.explanation_required = False
 
 
 # =============================================================================
@@ -157,6 +202,11 @@ class PlanningP4RatioLine(models.Model):
     formula = fields.Char(string="Formula", help="Calculation formula")
     current_year_value = fields.Float(string="Current Year", digits=(10, 2))
     prior_year_value = fields.Float(string="Prior Year", digits=(10, 2))
+    budget_value = fields.Float(
+        string="Budget",
+        digits=(10, 2),
+        help="Ratio evaluated over the Section D budget figures",
+    )
     industry_benchmark = fields.Float(string="Industry Benchmark", digits=(10, 2))
     movement = fields.Float(
         string="Movement", compute="_compute_movement", store=True, digits=(10, 2)
@@ -1375,6 +1425,138 @@ and the overall audit strategy.</strong></p>""",
                     f"P-5 auto-unlock triggered by P-4 approval for audit {self.audit_id.id}"
                 )
 
+    # =========================================================================
+    # TRIAL BALANCE IMPORT & VARIANCE THRESHOLDS
+    # =========================================================================
+    def _get_variance_thresholds(self):
+        """Return ``(amount_threshold, pct_threshold)`` for FS-line variances.
+
+        The absolute threshold is the materiality benchmark entered on P-4 or,
+        failing that, P-5 performance materiality for the same engagement.
+        """
+        self.ensure_one()
+        amount_threshold = self.materiality_benchmark
+        if not amount_threshold and self.audit_id:
+            p5 = self.env["qaco.planning.p5.materiality"].search(
+                [("audit_id", "=", self.audit_id.id)], limit=1
+            )
+            amount_threshold = p5.performance_materiality
+        pct_threshold = (
+            self.variance_threshold_pct or tb_import.DEFAULT_VARIANCE_PCT_THRESHOLD
+        )
+        return amount_threshold or 0.0, pct_threshold
+
+    def action_open_tb_import(self):
+        """Open the trial balance import wizard for this P-4."""
+        self.ensure_one()
+        if self.state in ("approved", "locked"):
+            raise UserError("Cannot import a trial balance into an approved or locked P-4.")
+        return {
+            "type": "ir.actions.act_window",
+            "name": "Import Trial Balance",
+            "res_model": "qaco.planning.p4.tb.import.wizard",
+            "view_mode": "form",
+            "target": "new",
+            "context": {"default_p4_id": self.id},
+        }
+
+    def action_refresh_variances(self):
+        """Re-evaluate variance flags, e.g. after P-5 materiality changed."""
+        FSLine = self.env["qaco.planning.p4.fs.line"]
+        lines = self.mapped("fs_line_ids")
+        for name in ("variance", "variance_pct", "exceeds_threshold", "explanation_required"):
+            self.env.add_to_compute(FSLine._fields[name], lines)
+        lines.flush_recordset()
+        return True
+
+    # =========================================================================
+    # RATIO ENGINE
+    # =========================================================================
+    def _get_ratio_aggregates(self):
+        """FS-line and budget aggregates the ratio formulas are evaluated over."""
+        self.ensure_one()
+        fs_lines = self.fs_line_ids.read(
+            ["fs_category", "fs_caption", "current_year", "prior_year"], load=None
+        )
+        budget = {}
+        for line in self.budget_line_ids:
+            budget[line.line_item] = budget.get(line.line_item, 0.0) + line.budget_amount
+        return ratio_engine.Aggregates(
+            [
+                (vals["fs_category"], vals["fs_caption"], vals["current_year"], vals["prior_year"])
+                for vals in fs_lines
+            ],
+            budget,
+        )
+
+    def _evaluate_ratio_formulas(self, formulas):
+        """Evaluate ``formulas`` over this P-4's figures.
+
+        Also used by finalisation analytics to re-perform planning ratios on
+        the final figures. Returns ``(results, errors, missing)`` as produced
+        by :func:`ratio_engine.evaluate_formulas` plus the unresolved names.
+        """
+        aggregates = self._get_ratio_aggregates()
+        results, errors = ratio_engine.evaluate_formulas(formulas, aggregates)
+        return results, errors, aggregates.missing
+
+    def _recalculate_ratios(self):
+        """Evaluate every ratio formula and store the CY, PY and budget values.
+
+        Lines sharing the same values are written together and unchanged
+        lines are skipped; the Section C quick-reference ratios are
+        refreshed alongside. Returns a chatter-ready summary, or ``False``
+        without formulas.
+        """
+        self.ensure_one()
+        lines = self.ratio_line_ids.filtered("formula")
+        if not lines:
+            return False
+
+        results, errors, missing = self._evaluate_ratio_formulas(lines.mapped("formula"))
+        columns = ["current_year_value", "prior_year_value", "budget_value"]
+        rows = []
+        stored = {}
+        summary = {}
+        for line, (cy, py, budget) in zip(lines, results):
+            cy, py, budget = (ratio_engine.to_value(value) or 0.0 for value in (cy, py, budget))
+            rows.append((line.id, dict(zip(columns, (cy, py, budget)))))
+            stored[line.id] = {column: line[column] for column in columns}
+            if line.ratio_name in SUMMARY_RATIO_FIELDS:
+                summary[SUMMARY_RATIO_FIELDS[line.ratio_name]] = cy
+
+        for ids, vals in ratio_engine.write_groups(rows, stored):
+            lines.browse(ids).write(vals)
+        if summary:
+            self.write(summary)
+
+        body = f"Ratio analysis recalculated: {len(rows) - len(errors)} ratios evaluated."
+        if errors:
+            failed = ", ".join(lines[row].ratio_name for row in sorted(errors))
+            body += f" Formulas that could not be read: {failed}."
+        if missing:
+            body += f" Figures not found on FS lines (taken as nil): {', '.join(sorted(missing))}."
+        return body
+
+    def action_recalculate_ratios(self):
+        """Recalculate Section C ratios from the FS lines and budget."""
+        self.ensure_one()
+        if self.state in ("approved", "locked"):
+            raise UserError("Cannot recalculate ratios on an approved or locked P-4.")
+        body = self._recalculate_ratios()
+        if not body:
+            raise UserError("No ratio lines with formulas. Populate standard ratios first.")
+        self.message_post(body=body)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": "Ratios Recalculated",
+                "message": body,
+                "type": "success" if body.endswith("evaluated.") else "warning",
+            },
+        }
+
     # =========================================================================
     # RISK LINKAGE ACTIONS
     # =========================================================================
@@ -1502,7 +1684,10 @@ and the overall audit strategy.</strong></p>""",
             )
 
         self.write({"ratio_line_ids": lines})
-        self.message_post(body="Standard ratio lines populated.")
+        body = "Standard ratio lines populated."
+        if self.fs_line_ids:
+            body += " " + self._recalculate_ratios()
+        self.message_post(body=body)
 
     def action_generate_analytical_memo(self):
         """Generate Preliminary Analytical Procedures Memorandum."""
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+P-4: Trial Balance Import
+Maps client trial-balance accounts to FS categories and aggregates them into
+P-4 Section B FS lines (ISA 520 comparative analysis).
+"""
+
+import base64
+import logging
+
+from odoo import api, fields, models
+from odoo.exceptions import UserError
+
+from ..utils import tb_import
+from .planning_p4_analytics import FS_CATEGORIES
+
+_logger = logging.getLogger(__name__)
+
+
+class PlanningP4TBMappingRule(models.Model):
+    """Firm-wide rule mapping trial-balance accounts to an FS category."""
+
+    _name = "qaco.planning.p4.tb.mapping.rule"
+    _description = "P-4: Trial Balance Mapping Rule"
+    _order = "sequence, id"
+
+    name = fields.Char(string="Rule", required=True)
+    sequence = fields.Integer(
+        string="Sequence", default=10, help="Rules are evaluated in order; first match wins"
+    )
+    active = fields.Boolean(string="Active", default=True)
+    match_on = fields.Selection(
+        [
+            ("code_prefix", "Account Code Starts With"),
+            ("name_contains", "Account Name Contains"),
+            ("name_regex", "Account Name Pattern (Regex)"),
+        ],
+        string="Match On",
+        required=True,
+        default="code_prefix",
+    )
+    pattern = fields.Char(string="Pattern", required=True)
+    fs_category = fields.Selection(FS_CATEGORIES, string="FS Category", required=True)
+    fs_caption = fields.Char(
+        string="FS Caption",
+        help="Caption of the aggregated FS line; defaults to the category label",
+    )
+
+    @api.model
+    def _get_rules(self):
+        """Active rules as plain tuples for the import engine."""
+        labels = dict(FS_CATEGORIES)
+        return [
+            tb_import.MappingRule(
+                rule.match_on,
+                rule.pattern,
+                rule.fs_category,
+                rule.fs_caption or labels[rule.fs_category],
+            )
+            for rule in self.search([])
+        ]
+
+
+class PlanningP4TBImportWizard(models.TransientModel):
+    """Import a client trial balance (CSV/XLSX) into P-4 FS lines."""
+
+    _name = "qaco.planning.p4.tb.import.wizard"
+    _description = "P-4: Import Trial Balance"
+
+    p4_id = fields.Many2one(
+        "qaco.planning.p4.analytics", string="P-4 Analytics", required=True
+    )
+    tb_file = fields.Binary(string="Trial Balance File", required=True)
+    tb_filename = fields.Char(string="File Name")
+    replace_existing = fields.Boolean(
+        string="Replace Previous Import",
+        default=True,
+        help="Remove FS lines created by an earlier trial balance import",
+    )
+    credit_negative = fields.Boolean(
+        string="Credits Are Negative",
+        default=True,
+        help="Balances use debit-positive / credit-negative signs; revenue, liabilities "
+        "and equity are shown as positive amounts on the FS lines",
+    )
+
+    def action_import(self):
+        self.ensure_one()
+        p4 = self.p4_id
+        if p4.state in ("approved", "locked"):
+            raise UserError("Cannot import a trial balance into an approved or locked P-4.")
+        if not (self.tb_filename or "").lower().endswith((".csv", ".xlsx", ".xlsm")):
+            raise UserError("Upload the trial balance as a CSV or XLSX file.")
+
+        rules = self.env["qaco.planning.p4.tb.mapping.rule"]._get_rules()
+        if not rules:
+            raise UserError(
+                "No trial balance mapping rules are configured. "
+                "Define them under Planning Configuration > TB Mapping Rules."
+            )
+
+        amount_threshold, pct_threshold = p4._get_variance_thresholds()
+        try:
+            vals_list, stats = tb_import.build_fs_line_values(
+                base64.b64decode(self.tb_file),
+                self.tb_filename,
+                rules,
+                amount_threshold=amount_threshold,
+                pct_threshold=pct_threshold,
+                credit_negative=self.credit_negative,
+            )
+        except (ValueError, RuntimeError) as e:
+            raise UserError(f"Trial balance could not be imported: {e}") from e
+        if not vals_list:
+            raise UserError("No trial balance accounts matched the mapping rules.")
+
+        FSLine = self.env["qaco.planning.p4.fs.line"]
+        if self.replace_existing:
+            FSLine.search([("p4_id", "=", p4.id), ("tb_imported", "=", True)]).unlink()
+        FSLine.create(
+            [dict(vals, p4_id=p4.id, tb_imported=True) for vals in vals_list]
+        )
+
+        unmapped = stats["unmapped"]
+        body = (
+            f"Trial balance '{self.tb_filename}' imported: {stats['accounts']} accounts "
+            f"aggregated into {stats['lines']} FS lines, {stats['exceeding']} exceeding "
+            f"the variance threshold."
+        )
+        if unmapped["count"]:
+            body += (
+                f" {unmapped['count']} unmapped accounts not imported "
+                f"(CY {unmapped['current_year']:,.2f} / PY {unmapped['prior_year']:,.2f})."
+            )
+        ratio_body = p4._recalculate_ratios()
+        if ratio_body:
+            body += " " + ratio_body
+        p4.message_post(body=body)
+        _logger.info("P-4 %s TB import: %s", p4.id, stats)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": "Trial Balance Imported",
+                "message": body,
+                "type": "warning" if unmapped["count"] else "success",
+                "sticky": bool(unmapped["count"]),
+                "next": {"type": "ir.actions.act_window_close"},
+            },
+        }
@@ -9,6 +9,8 @@ import logging
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
 
+from ..utils import risk_sync
+
 _logger = logging.getLogger(__name__)
 
 
@@ -280,39 +282,48 @@ class PlanningP6Risk(models.Model):
         """
         Session 6B: Auto-create P-6 risks from P-2, P-3, P-4 findings.
         Reduces manual data re-entry and ensures planning integration.
+
+        Generated lines are keyed on their source line, so re-running the
+        action only creates new risks, refreshes risks whose source changed
+        and archives risks whose source no longer qualifies.
         """
         self.ensure_one()
-        created_count = 0
 
         # Get planning phase records
         planning_main = self.planning_main_id
         if not planning_main:
             raise UserError("Planning phase not found for this audit.")
 
-        # Create risks from P-2 (Entity Understanding - Industry/Business Risks)
+        desired = {}
+        # Risks from P-2 (Entity Understanding - Industry/Business Risks)
         if planning_main.p2_entity_id:
-            created_count += self._create_risks_from_p2(planning_main.p2_entity_id)
-
-        # Create risks from P-3 (Control Deficiencies)
+            desired.update(self._collect_risks_from_p2(planning_main.p2_entity_id))
+        # Risks from P-3 (Control Deficiencies)
         if planning_main.p3_controls_id:
-            created_count += self._create_risks_from_p3(planning_main.p3_controls_id)
-
-        # Create risks from P-4 (Analytical Variances)
+            desired.update(self._collect_risks_from_p3(planning_main.p3_controls_id))
+        # Risks from P-4 (Analytical Variances)
         if planning_main.p4_analytics_id:
-            created_count += self._create_risks_from_p4(planning_main.p4_analytics_id)
+            desired.update(self._collect_risks_from_p4(planning_main.p4_analytics_id))
 
-        if created_count > 0:
+        plan = self._sync_generated_risk_lines(desired)
+        updated_count = sum(len(ids) for ids, _vals in plan.updates)
+        changed = len(plan.creates) + updated_count + len(plan.retire_ids)
+
+        if changed:
+            summary = (
+                f"{len(plan.creates)} created, {updated_count} updated, "
+                f"{len(plan.retire_ids)} retired"
+            )
             self.message_post(
-                body=f"Session 6B: Auto-created {created_count} risks from P-2/P-3/P-4 findings."
+                body=f"Session 6B: Risk register synchronised from P-2/P-3/P-4 findings ({summary})."
             )
             return {
                 "type": "ir.actions.client",
                 "tag": "display_notification",
                 "params": {
-                    "title": _("Risks Auto-Created"),
-                    "message": _(
-                        f"{created_count} risks have been created from planning phase findings."
-                    ),
+                    "title": _("Risks Synchronised"),
+                    "message": _("Risk register updated from planning phase findings: %s.")
+                    % summary,
                     "type": "success",
                     "sticky": False,
                 },
@@ -331,120 +342,117 @@ class PlanningP6Risk(models.Model):
                 },
             }
 
-    def _create_risks_from_p2(self, p2_record):
-        """Create risks from P-2 entity understanding (industry/business risks)."""
-        created = 0
-        # Check if P-2 has identified entity-level risks in fields like:
-        # - industry_specific_risks, regulatory_compliance_risks, etc.
-        if (
-            hasattr(p2_record, "entity_level_risk_factors")
-            and p2_record.entity_level_risk_factors
-        ):
-            # Create FS-level risk from entity understanding
-            self.env["qaco.planning.p6.risk.line"].create(
-                {
-                    "p6_risk_id": self.id,
-                    "account_cycle": "fs_level",
-                    "risk_description": f"Entity-level risk from P-2: {p2_record.entity_level_risk_factors[:200]}",
-                    "assertion_type": "presentation",
-                    "inherent_risk": "high",
-                    "control_risk": "medium",
-                    "fs_level_risk": True,
-                    "risk_factors": "Source: P-2 Entity Understanding",
-                }
+    def _sync_generated_risk_lines(self, desired):
+        """Apply the diff between ``desired`` sources and stored generated lines.
+
+        Creates go through a single ``create`` call, updates are grouped by
+        identical values and retirements archive the lines in one write.
+        Manually entered lines (no ``source_key``) are never touched.
+        """
+        self.ensure_one()
+        RiskLine = self.env["qaco.planning.p6.risk.line"].with_context(active_test=False)
+        existing = {
+            row["source_key"]: row
+            for row in RiskLine.search_read(
+                [("p6_risk_id", "=", self.id), ("source_key", "!=", False)],
+                ["source_key", "source_fingerprint", "active"],
+            )
+        }
+        plan = risk_sync.diff_risk_sources(desired, existing)
+
+        if plan.creates:
+            RiskLine.create([dict(vals, p6_risk_id=self.id) for vals in plan.creates])
+        for ids, vals in plan.updates:
+            RiskLine.browse(ids).write(vals)
+        if plan.retire_ids:
+            RiskLine.browse(plan.retire_ids).write({"active": False})
+
+        self._mark_sources_linked(desired)
+        _logger.info(
+            "P-6 %s risk sync: %d created, %d update groups, %d retired, %d unchanged",
+            self.id,
+            len(plan.creates),
+            len(plan.updates),
+            len(plan.retire_ids),
+            plan.unchanged,
+        )
+        return plan
+
+    def _mark_sources_linked(self, desired):
+        """Flag P-2/P-3 source lines as linked to P-6 with one write per model."""
+        ids_by_model = {}
+        for key in desired:
+            model_name, res_id = key.split(",")
+            ids_by_model.setdefault(model_name, []).append(int(res_id))
+        for model_name, ids in ids_by_model.items():
+            Model = self.env[model_name]
+            if "linked_to_p6" not in Model._fields:
+                continue
+            Model.browse(ids).filtered(lambda r: not r.linked_to_p6).write(
+                {"linked_to_p6": True}
             )
-            created += 1
-        return created
-
-    def _create_risks_from_p3(self, p3_record):
-        """Create risks from P-3 control deficiencies."""
-        created = 0
-        # Check for control deficiencies in P-3
-        if hasattr(p3_record, "deficiency_line_ids"):
-            for deficiency in p3_record.deficiency_line_ids:
-                if deficiency.severity in ["significant", "material_weakness"]:
-                    # Map deficiency to account cycle
-                    cycle = "other"
-                    if hasattr(deficiency, "cycle_id") and deficiency.cycle_id:
-                        cycle_map = {
-                            "revenue": "revenue",
-                            "purchases": "purchases",
-                            "payroll": "payroll",
-                            "inventory": "inventory",
-                        }
-                        cycle = cycle_map.get(deficiency.cycle_id.cycle_type, "other")
-
-                    # Create risk from control deficiency
-                    self.env["qaco.planning.p6.risk.line"].create(
-                        {
-                            "p6_risk_id": self.id,
-                            "account_cycle": cycle,
-                            "risk_description": f"Control deficiency from P-3: {deficiency.deficiency_description[:200]}",
-                            "assertion_type": "existence",  # Default; should be mapped from deficiency
-                            "inherent_risk": "medium",
-                            "control_risk": (
-                                "high"
-                                if deficiency.severity == "material_weakness"
-                                else "medium"
-                            ),
-                            "is_significant_risk": deficiency.severity
-                            == "material_weakness",
-                            "risk_factors": f"Source: P-3 Control Deficiency ({deficiency.severity})",
-                        }
-                    )
-                    created += 1
-        return created
-
-    def _create_risks_from_p4(self, p4_record):
-        """Create risks from P-4 analytical variances."""
-        created = 0
-        # Check for significant variances in P-4
-        if hasattr(p4_record, "fs_line_ids"):
-            for fs_line in p4_record.fs_line_ids:
-                # Create risk for significant variances (>threshold or risk indicator = high)
-                if fs_line.exceeds_threshold or (
-                    hasattr(fs_line, "risk_indicator")
-                    and fs_line.risk_indicator == "high"
-                ):
-                    # Map FS line to account cycle
-                    cycle_map = {
-                        "revenue": "revenue",
-                        "sales": "revenue",
-                        "receivables": "revenue",
-                        "purchases": "purchases",
-                        "payables": "purchases",
-                        "inventory": "inventory",
-                        "cogs": "inventory",
-                        "payroll": "payroll",
-                        "wages": "payroll",
-                    }
-                    cycle = "other"
-                    if fs_line.fs_caption:
-                        caption_lower = fs_line.fs_caption.lower()
-                        for keyword, mapped_cycle in cycle_map.items():
-                            if keyword in caption_lower:
-                                cycle = mapped_cycle
-                                break
-
-                    # Create risk from analytical variance
-                    variance_pct = (
-                        fs_line.variance_pct if hasattr(fs_line, "variance_pct") else 0
-                    )
-                    self.env["qaco.planning.p6.risk.line"].create(
-                        {
-                            "p6_risk_id": self.id,
-                            "account_cycle": cycle,
-                            "risk_description": f"Significant variance from P-4: {fs_line.fs_caption} ({variance_pct:.1f}% variance)",
-                            "assertion_type": "valuation",  # Variances typically affect valuation
-                            "inherent_risk": (
-                                "high" if abs(variance_pct) > 20 else "medium"
-                            ),
-                            "control_risk": "medium",
-                            "risk_factors": f'Source: P-4 Analytical Variance ({fs_line.auditor_explanation or "Unexplained"})',
-                        }
-                    )
-                    created += 1
-        return created
+
+    def _collect_risks_from_p2(self, p2_record):
+        """Risk line values keyed by source for P-2 business risks."""
+        desired = {}
+        for risk in p2_record.business_risk_ids:
+            key = risk_sync.source_key(risk._name, risk.id)
+            desired[key] = {
+                "account_cycle": risk_sync.P2_FS_AREA_CYCLES.get(risk.fs_area, "other"),
+                "risk_description": f"Business risk from P-2: {(risk.risk_description or '')[:200]}",
+                "assertion_type": "presentation",
+                "inherent_risk": risk.severity or "medium",
+                "control_risk": "medium",
+                "fs_level_risk": risk.fs_area in ("going_concern", "disclosure"),
+                "isa_540_estimate_risk": risk.fs_area == "estimates",
+                "isa_550_rp_risk": risk.fs_area == "related_parties",
+                "isa_570_gc_risk": risk.fs_area == "going_concern",
+                "risk_factors": "Source: P-2 Entity Understanding",
+            }
+        return desired
+
+    def _collect_risks_from_p3(self, p3_record):
+        """Risk line values keyed by source for significant P-3 deficiencies."""
+        desired = {}
+        deficiencies = p3_record.deficiency_ids.filtered(
+            lambda d: d.severity in ("significant", "material_weakness")
+        )
+        for deficiency in deficiencies:
+            key = risk_sync.source_key(deficiency._name, deficiency.id)
+            desired[key] = {
+                "account_cycle": risk_sync.P3_CYCLE_TYPES.get(
+                    deficiency.cycle_id.cycle_type, "other"
+                ),
+                "risk_description": f"Control deficiency from P-3: {(deficiency.deficiency_description or '')[:200]}",
+                "assertion_type": "existence",  # Default; should be mapped from deficiency
+                "inherent_risk": "medium",
+                "control_risk": (
+                    "high" if deficiency.severity == "material_weakness" else "medium"
+                ),
+                "is_significant_risk": deficiency.severity == "material_weakness",
+                "risk_factors": f"Source: P-3 Control Deficiency ({deficiency.severity})",
+            }
+        return desired
+
+    def _collect_risks_from_p4(self, p4_record):
+        """Risk line values keyed by source for significant P-4 variances."""
+        desired = {}
+        # Significant variances (>threshold or risk indicator = high)
+        fs_lines = p4_record.fs_line_ids.filtered(
+            lambda line: line.exceeds_threshold or line.risk_indicator == "high"
+        )
+        for fs_line in fs_lines:
+            key = risk_sync.source_key(fs_line._name, fs_line.id)
+            variance_pct = fs_line.variance_pct or 0.0
+            desired[key] = {
+                "account_cycle": risk_sync.caption_to_cycle(fs_line.fs_caption),
+                "risk_description": f"Significant variance from P-4: {fs_line.fs_caption} ({variance_pct:.1f}% variance)",
+                "assertion_type": "valuation",  # Variances typically affect valuation
+                "inherent_risk": "high" if abs(variance_pct) > 20 else "medium",
+                "control_risk": "medium",
+                "risk_factors": f'Source: P-4 Analytical Variance ({fs_line.auditor_explanation or "Unexplained"})',
+            }
+        return desired
 
     def _auto_unlock_p7(self):
         """Auto-unlock P-7 when P-6 is approved (similar to P-5 -> P-6 pattern)."""
@@ -545,6 +553,34 @@ class PlanningP6RiskLine(models.Model):
         ondelete="cascade",
     )
     sequence = fields.Integer(string="Sequence", default=10)
+    active = fields.Boolean(
+        string="Active",
+        default=True,
+        help="Cleared when the planning finding that generated this risk no longer applies",
+    )
+
+    # ===== Auto-Generation Source (Session 6B) =====
+    source_key = fields.Char(
+        string="Source Key",
+        index=True,
+        copy=False,
+        readonly=True,
+        help="Originating planning line (model,id) for auto-generated risks",
+    )
+    source_fingerprint = fields.Char(
+        string="Source Fingerprint",
+        copy=False,
+        readonly=True,
+        help="Hash of the values last derived from the source line",
+    )
+
+    _sql_constraints = [
+        (
+            "source_key_unique",
+            "unique(p6_risk_id, source_key)",
+            "A planning finding can only generate one risk per P-6 register.",
+        )
+    ]
 
     # ===== Risk Identification =====
     account_cycle = fields.Selection(
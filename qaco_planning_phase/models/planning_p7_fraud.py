@@ -511,6 +511,34 @@ class PlanningP7Fraud(models.Model):
         string="Journal Entry Testing Plan",
         help="Plan for testing journal entries per ISA 240.32",
     )
+    # Journal entry testing results (see planning_p7_jet.py)
+    jet_exception_ids = fields.One2many(
+        "qaco.planning.p7.jet.exception",
+        "p7_fraud_id",
+        string="JET Exceptions",
+    )
+    jet_run_date = fields.Datetime(string="JET Last Run", readonly=True, copy=False)
+    jet_line_count = fields.Integer(string="GL Lines Tested", readonly=True, copy=False)
+    jet_benford_mad = fields.Float(
+        string="Benford MAD",
+        digits=(6, 5),
+        readonly=True,
+        copy=False,
+        help="Mean absolute deviation of first-digit frequencies from Benford's law",
+    )
+    jet_benford_conformity = fields.Selection(
+        [
+            ("close", "Close Conformity"),
+            ("acceptable", "Acceptable Conformity"),
+            ("marginal", "Marginal Conformity"),
+            ("nonconformity", "Nonconformity"),
+            ("insufficient", "Insufficient Data"),
+        ],
+        string="Benford Conformity",
+        readonly=True,
+        copy=False,
+    )
+    jet_summary = fields.Text(string="JET Summary", readonly=True, copy=False)
     estimates_review = fields.Html(
         string="Accounting Estimates Review",
         help="Plan for reviewing accounting estimates for bias",
@@ -796,6 +824,32 @@ class PlanningP7Fraud(models.Model):
             )
             _logger.info(f"P-8 auto-created for engagement {self.engagement_id.name}")
 
+    def action_open_jet_wizard(self):
+        """Open the journal entry testing wizard (ISA 240.32(a))."""
+        self.ensure_one()
+        if self.state == "approved":
+            raise UserError("Cannot run journal entry testing on an approved P-7.")
+        return {
+            "type": "ir.actions.act_window",
+            "name": "Run Journal Entry Testing",
+            "res_model": "qaco.planning.p7.jet.wizard",
+            "view_mode": "form",
+            "target": "new",
+            "context": {"default_p7_fraud_id": self.id},
+        }
+
+    def action_open_jet_exceptions(self):
+        """Ranked JET exceptions, with escalation to fraud risk lines."""
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_window",
+            "name": "Journal Entry Testing Exceptions",
+            "res_model": "qaco.planning.p7.jet.exception",
+            "view_mode": "tree,form",
+            "domain": [("p7_fraud_id", "=", self.id)],
+            "context": {"default_p7_fraud_id": self.id},
+        }
+
     def action_send_back(self):
         for record in self:
             if record.state not in ["completed", "reviewed"]:
@@ -884,6 +938,7 @@ class PlanningP7FraudLine(models.Model):
             ("p6_risk_assessment", "P-6: RMM"),
             ("brainstorming", "Brainstorming"),
             ("inquiry", "Management/TCWG Inquiry"),
+            ("jet", "Journal Entry Testing"),
             ("other", "Other"),
         ],
         string="Source of Risk",
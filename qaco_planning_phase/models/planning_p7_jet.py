@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+P-7: Journal Entry Testing (ISA 240.32(a))
+Runs the JET engine over a client general-ledger export and keeps the
+ranked exceptions on P-7; selected exceptions are escalated into P-7
+fraud risk lines.
+"""
+
+import base64
+import logging
+import re
+
+from odoo import api, fields, models
+from odoo.exceptions import UserError
+
+from ..utils import jet_engine
+
+_logger = logging.getLogger(__name__)
+
+JET_TESTS = [
+    ("weekend", "Weekend Posting"),
+    ("holiday", "Public Holiday Posting"),
+    ("round", "Round Amount"),
+    ("below_limit", "Just Below Approval Limit"),
+    ("late_period", "Late-Period / Post-Closing Entry"),
+    ("rare_pair", "Unusual User/Account Pair"),
+    ("benford", "Benford First-Digit Deviation"),
+]
+
+
+class PlanningP7JetException(models.Model):
+    """Ranked journal entry flagged by one or more JET tests."""
+
+    _name = "qaco.planning.p7.jet.exception"
+    _description = "P-7: Journal Entry Testing Exception"
+    _order = "rank, id"
+
+    p7_fraud_id = fields.Many2one(
+        "qaco.planning.p7.fraud",
+        string="P-7 Fraud Assessment",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    rank = fields.Integer(string="Rank", readonly=True)
+    score = fields.Float(string="Score", digits=(10, 2), readonly=True)
+    tests = fields.Char(string="Tests Hit", readonly=True)
+    test_labels = fields.Char(string="Tests", compute="_compute_test_labels")
+    line_no = fields.Integer(string="GL Line", readonly=True, help="Line number in the GL export")
+    entry_ref = fields.Char(string="Journal No.", readonly=True)
+    posting_date = fields.Date(string="Posting Date", readonly=True)
+    entry_date = fields.Date(string="Entry Date", readonly=True)
+    account_code = fields.Char(string="Account", readonly=True)
+    account_name = fields.Char(string="Account Name", readonly=True)
+    user_name = fields.Char(string="Posted By", readonly=True)
+    description = fields.Char(string="Narration", readonly=True)
+    amount = fields.Float(string="Amount", digits=(16, 2), readonly=True)
+    state = fields.Selection(
+        [
+            ("open", "Open"),
+            ("cleared", "Cleared"),
+            ("escalated", "Escalated to P-7"),
+        ],
+        string="Status",
+        default="open",
+    )
+    auditor_comment = fields.Text(string="Auditor Comment")
+    fraud_line_id = fields.Many2one(
+        "qaco.planning.p7.fraud.line",
+        string="Fraud Risk Line",
+        readonly=True,
+        ondelete="set null",
+    )
+
+    @api.depends("tests")
+    def _compute_test_labels(self):
+        labels = dict(JET_TESTS)
+        for rec in self:
+            rec.test_labels = ", ".join(
+                labels.get(test, test) for test in (rec.tests or "").split(",") if test
+            )
+
+    def action_clear(self):
+        self.filtered(lambda e: e.state == "open").write({"state": "cleared"})
+
+    def action_escalate_to_p7(self):
+        """Create one P-7 fraud risk line per selected open exception."""
+        exceptions = self.filtered(lambda e: e.state != "escalated")
+        if not exceptions:
+            raise UserError("Selected exceptions are already escalated.")
+        if exceptions.p7_fraud_id.filtered(lambda p7: p7.state == "approved"):
+            raise UserError("Cannot escalate into an approved P-7.")
+
+        vals_list = []
+        for exc in exceptions:
+            vals_list.append(
+                {
+                    "p7_fraud_id": exc.p7_fraud_id.id,
+                    "risk_category": "opportunity",
+                    "risk_description": (
+                        f"Journal entry {exc.entry_ref or exc.line_no} "
+                        f"({exc.posting_date or ''}, account {exc.account_code}, "
+                        f"{exc.amount:,.2f}) flagged by JET: {exc.test_labels}."
+                    ),
+                    "fraud_scenario": "Management override of controls through "
+                    "inappropriate or unauthorised journal entries (ISA 240.32(a)).",
+                    "risk_level": "high" if exc.rank <= 10 else "medium",
+                    "source": "jet",
+                    "fraud_type": "fraudulent_reporting",
+                    "affected_area": exc.account_name or exc.account_code,
+                    "notes": exc.auditor_comment,
+                }
+            )
+        lines = self.env["qaco.planning.p7.fraud.line"].create(vals_list)
+        for exc, line in zip(exceptions, lines):
+            exc.write({"state": "escalated", "fraud_line_id": line.id})
+        for p7, escalated in exceptions.grouped("p7_fraud_id").items():
+            p7.message_post(
+                body=f"{len(escalated)} journal entry testing exceptions escalated "
+                f"to fraud risk lines."
+            )
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": "Escalated to P-7",
+                "message": f"{len(lines)} fraud risk lines created from JET exceptions.",
+                "type": "success",
+            },
+        }
+
+
+class PlanningP7JetWizard(models.TransientModel):
+    """Run journal entry testing over a GL export (CSV/XLSX)."""
+
+    _name = "qaco.planning.p7.jet.wizard"
+    _description = "P-7: Run Journal Entry Testing"
+
+    p7_fraud_id = fields.Many2one(
+        "qaco.planning.p7.fraud", string="P-7 Fraud Assessment", required=True
+    )
+    gl_file = fields.Binary(string="General Ledger Export", required=True)
+    gl_filename = fields.Char(string="File Name")
+    period_start = fields.Date(string="Period Start", required=True)
+    period_end = fields.Date(string="Period End", required=True)
+    approval_limits = fields.Char(
+        string="Approval Limits",
+        help="Authorisation limits separated by '; ' or ', ', e.g. 50,000; 100,000",
+    )
+    below_limit_pct = fields.Float(
+        string="Just Below Limit (%)",
+        default=5.0,
+        help="Amounts within this % under an approval limit are flagged",
+    )
+    round_multiple = fields.Float(
+        string="Round Amount Multiple",
+        default=1000.0,
+        help="Amounts that are exact multiples of this value are flagged",
+    )
+    late_days = fields.Integer(
+        string="Late-Period Days",
+        default=5,
+        help="Postings in the last N days of the period are flagged",
+    )
+    rare_pair_max = fields.Integer(
+        string="Unusual Pair Threshold",
+        default=2,
+        help="User/account pairs used this many times or fewer are flagged",
+    )
+    max_exceptions = fields.Integer(string="Exceptions to Keep", default=500)
+    use_public_holidays = fields.Boolean(
+        string="Test Public Holidays",
+        default=True,
+        help="Flag postings on approved public holidays",
+    )
+
+    def _parse_limits(self):
+        parts = re.split(r"[;\s]+|,\s+", (self.approval_limits or "").strip())
+        try:
+            return tuple(float(part.replace(",", "")) for part in parts if part)
+        except ValueError as e:
+            raise UserError(
+                "Approval limits must be amounts separated by '; ' or ', ' (e.g. 50,000; 100,000)."
+            ) from e
+
+    def _get_holidays(self):
+        if not self.use_public_holidays or "hr.public.holiday" not in self.env:
+            return frozenset()
+        holidays = self.env["hr.public.holiday"].search_read(
+            [
+                ("state", "=", "approved"),
+                ("date", ">=", self.period_start),
+                ("date", "<=", self.period_end),
+            ],
+            ["date"],
+        )
+        return frozenset(h["date"] for h in holidays)
+
+    def _gl_source(self):
+        """Filestore path of the upload when available, so it is streamed."""
+        attachment = self.env["ir.attachment"].sudo().search(
+            [
+                ("res_model", "=", self._name),
+                ("res_id", "=", self.id),
+                ("res_field", "=", "gl_file"),
+            ],
+            limit=1,
+        )
+        if attachment.store_fname:
+            return attachment._full_path(attachment.store_fname)
+        return base64.b64decode(self.gl_file)
+
+    def action_run(self):
+        self.ensure_one()
+        p7 = self.p7_fraud_id
+        if p7.state == "approved":
+            raise UserError("Cannot run journal entry testing on an approved P-7.")
+        if not (self.gl_filename or "").lower().endswith((".csv", ".xlsx", ".xlsm")):
+            raise UserError("Upload the general ledger as a CSV or XLSX file.")
+        if self.period_end < self.period_start:
+            raise UserError("Period end must be after period start.")
+
+        config = jet_engine.JetConfig(
+            period_start=self.period_start,
+            period_end=self.period_end,
+            holidays=self._get_holidays(),
+            approval_limits=self._parse_limits(),
+            below_limit_pct=self.below_limit_pct,
+            round_multiple=self.round_multiple,
+            late_days=self.late_days,
+            rare_pair_max=self.rare_pair_max,
+            max_exceptions=self.max_exceptions or 500,
+        )
+        try:
+            result = jet_engine.run_jet(
+                jet_engine.iter_general_ledger(self._gl_source(), self.gl_filename), config
+            )
+        except (ValueError, RuntimeError) as e:
+            raise UserError(f"General ledger could not be tested: {e}") from e
+
+        Exception_ = self.env["qaco.planning.p7.jet.exception"]
+        Exception_.search(
+            [("p7_fraud_id", "=", p7.id), ("state", "!=", "escalated")]
+        ).unlink()
+        Exception_.create(
+            [
+                {
+                    "p7_fraud_id": p7.id,
+                    "rank": int(row.rank),
+                    "score": float(row.score),
+                    "tests": row.tests,
+                    "line_no": int(row.line_no) + 2,  # 1-based, after the header row
+                    "entry_ref": row.entry_ref,
+                    "posting_date": jet_engine.to_date(row.posting_date) or False,
+                    "entry_date": jet_engine.to_date(row.entry_date) or False,
+                    "account_code": row.account_code,
+                    "account_name": row.account_name,
+                    "user_name": row.user,
+                    "description": row.description,
+                    "amount": float(row.amount),
+                }
+                for row in result.exceptions.itertuples(index=False)
+            ]
+        )
+
+        stats = result.stats
+        benford = result.benford
+        hits = ", ".join(
+            f"{label}: {stats[test]}" for test, label in JET_TESTS if stats.get(test)
+        )
+        summary = (
+            f"{stats['lines']:,} GL lines ({stats['entries']:,} entries, debits "
+            f"{stats['debits']:,.2f}) tested for {self.period_start} to {self.period_end}. "
+            f"Hits - {hits or 'none'}. Benford MAD {benford['mad']:.4f} ({benford['conformity']}). "
+            f"Top {len(result.exceptions)} exceptions retained."
+        )
+        if not stats["has_user"]:
+            summary += " No user column in the export: unusual user/account pairs not tested."
+        p7.write(
+            {
+                "jet_run_date": fields.Datetime.now(),
+                "jet_line_count": stats["lines"],
+                "jet_benford_mad": benford["mad"],
+                "jet_benford_conformity": benford["conformity"],
+                "jet_summary": summary,
+            }
+        )
+        p7.message_post(body=f"Journal entry testing run on '{self.gl_filename}': {summary}")
+        _logger.info("P-7 %s JET run: %s", p7.id, stats)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": "Journal Entry Testing Complete",
+                "message": summary,
+                "type": "success",
+                "sticky": True,
+                "next": {"type": "ir.actions.act_window_close"},
+            },
+        }
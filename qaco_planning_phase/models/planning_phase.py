@@ -199,16 +199,22 @@ class PlanningPhase(models.Model):
     overall_materiality = fields.Monetary(
         string="Overall Materiality",
         currency_field="company_currency_id",
+        compute="_compute_materiality_values",
+        store=True,
         readonly=True,
     )
     performance_materiality = fields.Monetary(
         string="Performance Materiality",
         currency_field="company_currency_id",
+        compute="_compute_materiality_values",
+        store=True,
         readonly=True,
     )
     clearly_trivial_threshold = fields.Monetary(
         string="Clearly Trivial Threshold",
         currency_field="company_currency_id",
+        compute="_compute_materiality_values",
+        store=True,
         readonly=True,
     )
     company_currency_id = fields.Many2one(
@@ -626,7 +632,7 @@ class PlanningPhase(models.Model):
             else:
                 record.missing_requirements_note = "<p style='color: green;'>✅ All planning requirements satisfied. Ready for finalization.</p>"
 
-    @api.onchange(
+    @api.depends(
         "materiality_benchmark", "materiality_percentage", "custom_benchmark_value"
     )
     def _compute_materiality_values(self):
@@ -642,8 +648,10 @@ class PlanningPhase(models.Model):
                 record.overall_materiality = benchmark_value * (
                     record.materiality_percentage / 100.0
                 )
-                record.performance_materiality = record.overall_materiality * 0.75
-                record.clearly_trivial_threshold = record.overall_materiality * 0.05
+            else:
+                record.overall_materiality = 0.0
+            record.performance_materiality = record.overall_materiality * 0.75
+            record.clearly_trivial_threshold = record.overall_materiality * 0.05
 
     @api.model
     def _get_default_currency(self):
@@ -0,0 +1,7 @@
+"""Utility helpers for qaco_planning_phase.
+Keep utilities free of Odoo imports so they can be imported safely in tests and pre-commit hooks.
+"""
+
+from .risk_sync import diff_risk_sources, source_fingerprint, source_key
+
+__all__ = ["diff_risk_sources", "source_fingerprint", "source_key"]
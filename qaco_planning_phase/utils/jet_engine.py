@@ -0,0 +1,361 @@
+"""Journal-entry testing (JET) engine for P-7 (ISA 240.32(a)).
+
+Reads a client general-ledger export (CSV or XLSX) in fixed-size chunks,
+keeping only the recognised columns, and runs vectorised tests on every
+chunk:
+
+- ``weekend`` / ``holiday``: posted on a weekend day or approved public holiday
+- ``round``: amount is a round multiple (e.g. of 1,000)
+- ``below_limit``: amount just below an approval limit
+- ``late_period``: posted in the last days of the period, or entered after
+  the period end with a posting date inside it
+- ``rare_pair``: user/account combination used only a handful of times
+- ``benford``: leading digit over-represented against Benford's law
+
+Memory stays bounded: only flagged candidate lines (trimmed to the highest
+scores after every chunk), first-digit counts, per user/account pair counts
+and the few lines of still-rare pairs are kept between chunks.
+
+This module is intentionally free of Odoo imports. NumPy and pandas are
+declared in the module manifest.
+"""
+
+import io
+import math
+from collections import namedtuple
+
+from .tb_import import _to_amount
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    pd = None
+
+CHUNK_SIZE = 200000
+
+COLUMN_ALIASES = {
+    "entry_ref": ("entry_ref", "journal", "journal no", "journal number", "entry", "entry no",
+                  "je number", "voucher", "voucher no", "document no", "document number"),
+    "posting_date": ("posting_date", "posting date", "date", "gl date", "effective date",
+                     "transaction date"),
+    "entry_date": ("entry_date", "entry date", "created", "created on", "creation date",
+                   "input date", "entered on"),
+    "account_code": ("account_code", "account code", "account", "gl account", "code"),
+    "account_name": ("account_name", "account name", "account description"),
+    "user": ("user", "posted by", "created by", "entered by", "preparer", "user id"),
+    "description": ("description", "narration", "memo", "line description"),
+    "amount": ("amount", "value", "net amount"),
+    "debit": ("debit", "dr"),
+    "credit": ("credit", "cr"),
+}
+
+TEST_WEIGHTS = {
+    "weekend": 1.0,
+    "holiday": 2.0,
+    "round": 1.0,
+    "below_limit": 3.0,
+    "late_period": 2.0,
+    "rare_pair": 2.0,
+    "benford": 1.0,
+}
+TESTS = tuple(TEST_WEIGHTS)
+
+# Benford first-digit probabilities for digits 1..9
+BENFORD_EXPECTED = [math.log10(1 + 1.0 / d) for d in range(1, 10)]
+
+# Nigrini mean-absolute-deviation bands for the first-digit test
+BENFORD_MAD_BANDS = ((0.006, "close"), (0.012, "acceptable"), (0.015, "marginal"))
+
+JetConfig = namedtuple(
+    "JetConfig",
+    [
+        "period_start",
+        "period_end",
+        "holidays",
+        "approval_limits",
+        "below_limit_pct",
+        "round_multiple",
+        "late_days",
+        "rare_pair_max",
+        "weekend_days",
+        "max_exceptions",
+    ],
+)
+JetConfig.__new__.__defaults__ = (
+    None, None, frozenset(), (), 5.0, 1000.0, 5, 2, (5, 6), 500,
+)
+
+JetResult = namedtuple("JetResult", ["exceptions", "stats", "benford"])
+
+_KEEP = ["line_no", "entry_ref", "posting_date", "entry_date", "account_code",
+         "account_name", "user", "description", "amount"]
+
+
+def _require_pandas():
+    if pd is None:
+        raise RuntimeError("numpy and pandas are required for journal entry testing")
+
+
+def _resolve_columns(headers):
+    lookup = {str(h).strip().lower(): h for h in headers if h is not None}
+    resolved = {}
+    for column, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lookup:
+                resolved[column] = lookup[alias]
+                break
+    if "posting_date" not in resolved or "account_code" not in resolved:
+        raise ValueError("General ledger needs posting date and account columns.")
+    if "amount" not in resolved and not {"debit", "credit"} <= set(resolved):
+        raise ValueError("General ledger needs an amount or debit/credit columns.")
+    return resolved
+
+
+def _to_dates(series):
+    text = series.astype(str).str.strip()
+    dates = pd.to_datetime(text, errors="coerce", format="ISO8601")
+    if dates.isna().mean() > 0.5:
+        dates = pd.to_datetime(text, errors="coerce", dayfirst=True, format="mixed")
+    return dates.dt.normalize()
+
+
+def _normalise(frame, resolved, offset):
+    out = pd.DataFrame(index=frame.index)
+    out["line_no"] = np.arange(offset, offset + len(frame), dtype=np.int64)
+    for column in ("entry_ref", "account_code", "account_name", "user", "description"):
+        source = resolved.get(column)
+        out[column] = frame[source].fillna("").astype(str).str.strip() if source else ""
+    out["posting_date"] = _to_dates(frame[resolved["posting_date"]])
+    if "entry_date" in resolved:
+        out["entry_date"] = _to_dates(frame[resolved["entry_date"]])
+    else:
+        out["entry_date"] = pd.NaT
+    if "amount" in resolved:
+        out["amount"] = _to_amount(frame[resolved["amount"]])
+    else:
+        out["amount"] = _to_amount(frame[resolved["debit"]]) - _to_amount(frame[resolved["credit"]])
+    return out.reset_index(drop=True)
+
+
+def iter_general_ledger(source, filename, chunk_size=CHUNK_SIZE):
+    """Yield ``(frame, has_user)`` chunks from a GL export path or bytes.
+
+    Only the recognised columns are parsed; ``line_no`` numbers the lines
+    across chunks so exceptions can be traced back to the export.
+    """
+    _require_pandas()
+    if (filename or "").lower().endswith((".xlsx", ".xlsm")):
+        yield from _iter_xlsx(source, chunk_size)
+        return
+
+    def _open():
+        return io.BytesIO(source) if isinstance(source, bytes) else source
+
+    headers = pd.read_csv(_open(), nrows=0).columns
+    resolved = _resolve_columns(headers)
+    reader = pd.read_csv(
+        _open(),
+        usecols=sorted(set(resolved.values())),
+        dtype=str,
+        chunksize=chunk_size,
+        skipinitialspace=True,
+    )
+    offset = 0
+    for chunk in reader:
+        yield _normalise(chunk, resolved, offset), "user" in resolved
+        offset += len(chunk)
+
+
+def _iter_xlsx(source, chunk_size):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(
+        io.BytesIO(source) if isinstance(source, bytes) else source, read_only=True, data_only=True
+    )
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = next(rows, None)
+        if not headers:
+            return
+        resolved = _resolve_columns(headers)
+        offset = 0
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                frame = pd.DataFrame(buffer, columns=headers, dtype=object)
+                yield _normalise(frame, resolved, offset), "user" in resolved
+                offset += len(buffer)
+                buffer = []
+        if buffer:
+            frame = pd.DataFrame(buffer, columns=headers, dtype=object)
+            yield _normalise(frame, resolved, offset), "user" in resolved
+    finally:
+        workbook.close()
+
+
+def to_date(value):
+    """``datetime.date`` for a parsed timestamp; ``None`` for missing dates."""
+    return None if pd.isna(value) else value.date()
+
+
+def first_digits(amounts):
+    """Leading digit (1-9) of each absolute amount; 0 where amount < 10."""
+    values = np.abs(np.asarray(amounts, dtype=float))
+    digits = np.zeros(len(values), dtype=np.int8)
+    eligible = values >= 10
+    if eligible.any():
+        scaled = values[eligible]
+        digits[eligible] = (scaled // 10 ** np.floor(np.log10(scaled))).astype(np.int8)
+    return digits
+
+
+def flag_chunk(frame, config):
+    """Return a boolean DataFrame with one column per row-level test."""
+    amount = frame["amount"].abs()
+    posting = frame["posting_date"]
+    flags = pd.DataFrame(index=frame.index)
+    flags["weekend"] = posting.dt.dayofweek.isin(list(config.weekend_days))
+    if config.holidays:
+        flags["holiday"] = posting.isin(pd.to_datetime(sorted(config.holidays)))
+    else:
+        flags["holiday"] = False
+    multiple = config.round_multiple or 0
+    flags["round"] = (amount >= multiple) & (np.fmod(amount, multiple) == 0) if multiple else False
+    below = np.zeros(len(frame), dtype=bool)
+    pct = (config.below_limit_pct or 0) / 100.0
+    for limit in config.approval_limits or ():
+        below |= ((amount >= limit * (1 - pct)) & (amount < limit)).to_numpy()
+    flags["below_limit"] = below
+    late = np.zeros(len(frame), dtype=bool)
+    if config.period_end:
+        period_end = pd.Timestamp(config.period_end)
+        window_start = period_end - pd.Timedelta(days=max((config.late_days or 0) - 1, 0))
+        in_period = posting <= period_end
+        if config.period_start:
+            in_period &= posting >= pd.Timestamp(config.period_start)
+        late = (((posting >= window_start) | (frame["entry_date"] > period_end)) & in_period).to_numpy()
+    flags["late_period"] = late
+    flags["rare_pair"] = False
+    flags["benford"] = False
+    return flags
+
+
+def score_flags(flags, amounts):
+    """Weighted test count scaled by order of magnitude of the amount."""
+    weights = pd.Series(TEST_WEIGHTS)[list(flags.columns)]
+    base = flags.astype(float).to_numpy() @ weights.to_numpy()
+    return base * np.log10(10.0 + np.abs(np.asarray(amounts, dtype=float)))
+
+
+def benford_summary(counts):
+    """Observed vs expected first-digit proportions, MAD and z-scores."""
+    counts = np.asarray(counts[1:10], dtype=float)
+    total = counts.sum()
+    expected = np.array(BENFORD_EXPECTED)
+    if not total:
+        return {"total": 0, "mad": 0.0, "conformity": "insufficient", "digits": [], "over": []}
+    observed = counts / total
+    mad = float(np.mean(np.abs(observed - expected)))
+    z = (np.abs(observed - expected) - 1.0 / (2 * total)) / np.sqrt(expected * (1 - expected) / total)
+    over = [int(d) for d in range(1, 10) if z[d - 1] > 1.96 and observed[d - 1] > expected[d - 1]]
+    conformity = "nonconformity"
+    for limit, label in BENFORD_MAD_BANDS:
+        if mad <= limit:
+            conformity = label
+            break
+    if total < 1000:
+        conformity = "insufficient"
+    return {
+        "total": int(total),
+        "mad": round(mad, 5),
+        "conformity": conformity,
+        "digits": [
+            {"digit": d, "observed": float(observed[d - 1]), "expected": float(expected[d - 1]),
+             "z": float(z[d - 1])}
+            for d in range(1, 10)
+        ],
+        "over": over,
+    }
+
+
+def run_jet(chunks, config, candidate_limit=None):
+    """Run all tests over ``chunks`` of ``(frame, has_user)``.
+
+    :return: :class:`JetResult` with the ranked ``exceptions`` DataFrame
+        (``rank``, ``score``, ``tests`` and the GL columns), population
+        ``stats`` and the ``benford`` summary. Entries are counted as runs of
+        consecutive lines sharing a journal number, as GL exports list them.
+    """
+    _require_pandas()
+    candidate_limit = candidate_limit or max(config.max_exceptions * 10, 5000)
+    stats = {"lines": 0, "entries": 0, "debits": 0.0, "has_user": False}
+    stats.update({test: 0 for test in TESTS})
+    digit_counts = np.zeros(10, dtype=np.int64)
+    pair_counts = pd.Series(dtype=np.int64)
+    rare_pool = None
+    candidates = []
+    last_ref = None
+
+    for frame, has_user in chunks:
+        stats["lines"] += len(frame)
+        stats["debits"] += float(frame["amount"].clip(lower=0).sum())
+        stats["has_user"] = stats["has_user"] or has_user
+        refs = frame["entry_ref"]
+        changes = refs.ne(refs.shift())
+        if len(refs) and refs.iloc[0] == last_ref:
+            changes.iloc[0] = False
+        stats["entries"] += int(changes.sum())
+        last_ref = refs.iloc[-1] if len(refs) else last_ref
+        digit_counts += np.bincount(first_digits(frame["amount"]), minlength=10)
+
+        flags = flag_chunk(frame, config)
+        for test in ("weekend", "holiday", "round", "below_limit", "late_period"):
+            stats[test] += int(flags[test].sum())
+        flagged = flags.any(axis=1)
+        if flagged.any():
+            chunk_candidates = frame.loc[flagged, _KEEP].join(flags[flagged])
+            candidates.append(chunk_candidates)
+            if sum(len(c) for c in candidates) > candidate_limit:
+                merged = pd.concat(candidates, ignore_index=True)
+                merged["score"] = score_flags(merged[list(TESTS)], merged["amount"])
+                candidates = [merged.nlargest(candidate_limit, "score").drop(columns="score")]
+
+        if has_user:
+            named = frame[frame["user"] != ""]
+            pair = named["user"] + "\x1f" + named["account_code"]
+            pair_counts = pair_counts.add(pair.value_counts(), fill_value=0)
+            still_rare = pair.map(pair_counts) <= config.rare_pair_max
+            fresh = named.loc[still_rare, _KEEP].assign(pair=pair[still_rare])
+            rare_pool = fresh if rare_pool is None else pd.concat([rare_pool, fresh], ignore_index=True)
+            rare_pool = rare_pool[rare_pool["pair"].map(pair_counts) <= config.rare_pair_max]
+
+    benford = benford_summary(digit_counts)
+    columns = _KEEP + list(TESTS)
+    result = pd.concat(candidates, ignore_index=True) if candidates else pd.DataFrame(columns=columns)
+    if rare_pool is not None and len(rare_pool):
+        rare_flags = flag_chunk(rare_pool, config)
+        rare_flags["rare_pair"] = True
+        rare = rare_pool[_KEEP].join(rare_flags)
+        result = pd.concat([result, rare], ignore_index=True)
+        result = result.groupby("line_no", as_index=False, sort=False).agg(
+            {**{c: "first" for c in _KEEP if c != "line_no"}, **{t: "max" for t in TESTS}}
+        )
+        stats["rare_pair"] = int(len(rare_pool))
+    if len(result) and benford["over"]:
+        result["benford"] = first_digits(result["amount"]).astype(int)
+        result["benford"] = result["benford"].isin(benford["over"])
+        stats["benford"] = int(result["benford"].sum())
+
+    if len(result):
+        result[list(TESTS)] = result[list(TESTS)].astype(bool)
+        result["score"] = score_flags(result[list(TESTS)], result["amount"]).round(4)
+        result = result.sort_values(["score", "line_no"], ascending=[False, True]).head(config.max_exceptions)
+        result["tests"] = result[list(TESTS)].apply(
+            lambda row: ",".join(t for t in TESTS if row[t]), axis=1
+        )
+        result = result.reset_index(drop=True)
+        result.insert(0, "rank", np.arange(1, len(result) + 1))
+    return JetResult(result, stats, benford)
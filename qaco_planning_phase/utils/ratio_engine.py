@@ -0,0 +1,308 @@
+"""Formula-driven ratio engine for P-4 and finalisation analytics.
+
+Ratio formulas are the plain-text expressions shown on ratio lines, e.g.
+``"(Current Assets - Inventory) / Current Liabilities"`` or
+``"Gross Profit / Revenue × 100"``. Each formula is tokenised and compiled
+once into a closure (cached per formula text) that evaluates over NumPy
+vectors holding the current-year, prior-year and budget figures together, so
+a full ratio set is computed in a single pass over the FS-line aggregates.
+
+Identifiers are multi-word names (a hyphen inside a word, as in
+``Non-Current Assets``, is part of the name; subtraction needs spaces) and
+are matched case-insensitively against FS categories, FS
+captions and a small set of derived totals (gross profit, EBIT, total debt,
+...). ``Average X`` is the mean of ``X`` and its opening (prior-year)
+balance. Division by zero and missing budget figures yield ``NaN`` which the
+callers store as empty values.
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Column order of every value vector
+COLUMNS = ("current_year", "prior_year", "budget")
+
+CompiledFormula = namedtuple("CompiledFormula", ["formula", "variables", "evaluate"])
+
+_WORD = r"[A-Za-z][A-Za-z0-9_&'.]*(?:-[A-Za-z][A-Za-z0-9_&'.]*)*"
+_TOKEN_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<number>\d+(?:\.\d+)?)"
+    r"|(?P<op>[-+*/×÷()])"
+    rf"|(?P<name>{_WORD}(?:\s+{_WORD})*)"
+    r")"
+)
+
+_OPERATORS = {"×": "*", "÷": "/"}
+
+# Category keys of the P-4 FS lines, addressable by their labels as well
+CATEGORY_NAMES = {
+    "revenue": ("revenue", "sales", "turnover"),
+    "cost_of_sales": ("cost of sales", "cost of goods sold", "cogs"),
+    "gross_profit": ("gross profit",),
+    "operating_expense": ("operating expenses", "operating expense", "opex"),
+    "other_income": ("other income", "other income/expense"),
+    "finance_cost": ("finance costs", "finance cost", "interest expense"),
+    "pbt": ("profit before tax", "pbt"),
+    "taxation": ("taxation", "tax"),
+    "net_profit": ("net profit", "net profit/loss", "profit after tax"),
+    "current_asset": ("current assets",),
+    "non_current_asset": ("non-current assets", "non current assets"),
+    "current_liability": ("current liabilities",),
+    "non_current_liability": ("non-current liabilities", "non current liabilities"),
+    "equity": ("equity", "total equity", "shareholders equity"),
+}
+
+# Caption keywords for balances that live inside a category (e.g. inventory
+# within current assets); matched when no caption equals the name exactly
+CAPTION_KEYWORDS = {
+    "inventory": ("inventor", "stock"),
+    "cash": ("cash", "bank"),
+    "trade receivables": ("receivable", "debtors"),
+    "trade payables": ("payable", "creditors"),
+}
+
+# Derived totals, resolved only when no FS line or budget line supplies them
+DERIVED = (
+    ("gross profit", (("revenue", 1), ("cost of sales", -1))),
+    ("operating profit", (("gross profit", 1), ("operating expenses", -1), ("other income", 1))),
+    ("ebit", (("operating profit", 1),)),
+    ("profit before tax", (("operating profit", 1), ("finance costs", -1))),
+    ("net profit", (("profit before tax", 1), ("taxation", -1))),
+    ("total assets", (("current assets", 1), ("non-current assets", 1))),
+    ("total liabilities", (("current liabilities", 1), ("non-current liabilities", 1))),
+    ("total debt", (("total liabilities", 1),)),
+)
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("numpy is required for ratio evaluation")
+
+
+def normalise_name(name):
+    """Lower-case an identifier, spell out ``&`` and collapse whitespace."""
+    text = (name or "").lower().replace("&", " and ")
+    return " ".join(text.replace("'", "").split())
+
+
+def tokenize(formula):
+    """Split a formula into ``(kind, value)`` tokens; raises ValueError on junk."""
+    tokens = []
+    text = (formula or "").strip()
+    pos = 0
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Unexpected character {text[pos]!r} in formula {formula!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "op":
+            value = _OPERATORS.get(value, value)
+        elif kind == "number":
+            value = float(value)
+        else:
+            value = normalise_name(value)
+        tokens.append((kind, value))
+    if not tokens:
+        raise ValueError("Formula is empty")
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing nested evaluation closures."""
+
+    def __init__(self, tokens, formula):
+        self.tokens = tokens
+        self.formula = formula
+        self.pos = 0
+        self.variables = []
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _take(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self._expression()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected {self._peek()[1]!r} in formula {self.formula!r}")
+        return node
+
+    def _expression(self):
+        node = self._term()
+        while self._peek() in (("op", "+"), ("op", "-")):
+            op = self._take()[1]
+            left, right = node, self._term()
+            if op == "+":
+                node = lambda env, l=left, r=right: l(env) + r(env)  # noqa: E731
+            else:
+                node = lambda env, l=left, r=right: l(env) - r(env)  # noqa: E731
+        return node
+
+    def _term(self):
+        node = self._factor()
+        while self._peek() in (("op", "*"), ("op", "/")):
+            op = self._take()[1]
+            left, right = node, self._factor()
+            if op == "*":
+                node = lambda env, l=left, r=right: l(env) * r(env)  # noqa: E731
+            else:
+                node = lambda env, l=left, r=right: _divide(l(env), r(env))  # noqa: E731
+        return node
+
+    def _factor(self):
+        kind, value = self._take()
+        if kind == "number":
+            return lambda env, v=value: v
+        if kind == "name":
+            if value not in self.variables:
+                self.variables.append(value)
+            return lambda env, v=value: env[v]
+        if (kind, value) == ("op", "-"):
+            operand = self._factor()
+            return lambda env, o=operand: -o(env)
+        if (kind, value) == ("op", "("):
+            node = self._expression()
+            if self._take() != ("op", ")"):
+                raise ValueError(f"Missing ')' in formula {self.formula!r}")
+            return node
+        raise ValueError(f"Unexpected {value!r} in formula {self.formula!r}")
+
+
+def _divide(numerator, denominator):
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator != 0, numerator / np.where(denominator != 0, denominator, 1.0), np.nan)
+
+
+@lru_cache(maxsize=512)
+def compile_formula(formula):
+    """Compile ``formula`` once; the result is cached per formula text."""
+    parser = _Parser(tokenize(formula), formula)
+    node = parser.parse()
+    return CompiledFormula(formula, tuple(parser.variables), node)
+
+
+class Aggregates:
+    """Name -> ``[current_year, prior_year, budget]`` vectors for one engagement.
+
+    Built from FS lines ``(fs_category, fs_caption, current_year, prior_year)``
+    and optional budget amounts keyed by line item. Lookups resolve FS
+    captions first, then categories, caption keywords, derived totals and
+    finally ``average`` prefixes; unknown names evaluate to zero and are
+    reported through :attr:`missing`.
+    """
+
+    def __init__(self, fs_lines, budget=None):
+        _require_numpy()
+        self.values = {}
+        self.missing = set()
+        self._categories = {}
+        self._captions = {}
+        self._budget = {normalise_name(k): v for k, v in (budget or {}).items()}
+        for fs_category, fs_caption, current_year, prior_year in fs_lines:
+            pair = np.array([current_year or 0.0, prior_year or 0.0])
+            for key in {fs_category, *CATEGORY_NAMES.get(fs_category, ())}:
+                self._accumulate(self._categories, normalise_name(key), pair)
+            if fs_caption:
+                self._accumulate(self._captions, normalise_name(fs_caption), pair)
+
+    @staticmethod
+    def _accumulate(target, key, pair):
+        target[key] = target[key] + pair if key in target else pair.copy()
+
+    def __getitem__(self, name):
+        if name not in self.values:
+            self.values[name] = self._resolve(name)
+        return self.values[name]
+
+    def _with_budget(self, name, pair):
+        return np.append(pair, self._budget.get(name, np.nan))
+
+    def _resolve(self, name):
+        for source in (self._captions, self._categories):
+            if name in source:
+                return self._with_budget(name, source[name])
+        keywords = CAPTION_KEYWORDS.get(name)
+        if keywords:
+            pairs = [
+                pair
+                for caption, pair in self._captions.items()
+                if any(word in caption for word in keywords)
+            ]
+            if pairs:
+                return self._with_budget(name, np.sum(pairs, axis=0))
+        parts = dict(DERIVED).get(name)
+        if parts:
+            total = sum(self[part] * sign for part, sign in parts)
+            if name in self._budget:
+                total = np.array([total[0], total[1], self._budget[name]])
+            return total
+        if name.startswith("average "):
+            closing = self[name[len("average "):]]
+            opening = np.full(len(COLUMNS), closing[1])
+            return (closing + opening) / 2.0
+        if not any(name in names for names in CATEGORY_NAMES.values()):
+            self.missing.add(name)
+        return self._with_budget(name, np.zeros(2))
+
+
+def evaluate_formulas(formulas, aggregates):
+    """Evaluate ``formulas`` against ``aggregates`` in one pass.
+
+    :return: ``(results, errors)`` where ``results`` is an ``(n, 3)`` array of
+        current-year, prior-year and budget values (``NaN`` where undefined)
+        and ``errors`` maps the row index of unparsable formulas to a message.
+    """
+    _require_numpy()
+    results = np.full((len(formulas), len(COLUMNS)), np.nan)
+    errors = {}
+    for row, formula in enumerate(formulas):
+        if not formula:
+            continue
+        try:
+            compiled = compile_formula(formula)
+        except ValueError as e:
+            errors[row] = str(e)
+            continue
+        results[row] = np.broadcast_to(compiled.evaluate(aggregates), len(COLUMNS))
+    return results, errors
+
+
+def to_value(number):
+    """Round a result for storage; ``None`` for undefined (NaN/inf) results."""
+    number = float(number)
+    if number != number or number in (float("inf"), float("-inf")):
+        return None
+    return round(number, 4)
+
+
+def write_groups(rows, stored=None):
+    """Group ``(id, vals)`` rows that share identical values, for ORM writes.
+
+    :param stored: optional ``{id: vals}`` of the values currently stored;
+        rows that would not change anything are left out
+    :return: ``[(ids, vals)]``, one ``write()`` per distinct value set
+    """
+    stored = stored or {}
+    groups = {}
+    for res_id, vals in rows:
+        if stored.get(res_id) == vals:
+            continue
+        groups.setdefault(tuple(sorted(vals.items())), (vals, []))[1].append(res_id)
+    return [(ids, vals) for vals, ids in groups.values()]
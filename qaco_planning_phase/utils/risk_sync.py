@@ -0,0 +1,159 @@
+"""Risk register synchronisation helpers for P-6 and P-12.
+
+P-6 risk lines generated from P-2/P-3/P-4 findings (and P-12 risk
+responses generated from P-6 to P-10) carry a deterministic
+source key ("<model>,<id>", the same notation Odoo uses for Reference
+fields) and a fingerprint of the values derived from that source. Diffing
+the desired set of sources against the stored keys lets a re-run of the
+auto-create action touch only what actually changed.
+
+This module is intentionally free of Odoo imports.
+"""
+
+import hashlib
+import json
+import re
+from collections import namedtuple
+
+# P-2 business risk ``fs_area`` -> P-6 ``account_cycle``
+P2_FS_AREA_CYCLES = {
+    "revenue": "revenue",
+    "receivables": "revenue",
+    "inventory": "inventory",
+    "payables": "purchases",
+    "fixed_assets": "fixed_assets",
+    "intangibles": "fixed_assets",
+    "investments": "investments",
+    "borrowings": "equity",
+    "provisions": "provisions",
+    "going_concern": "fs_level",
+    "disclosure": "fs_level",
+}
+
+# P-3 transaction cycle ``cycle_type`` -> P-6 ``account_cycle``
+P3_CYCLE_TYPES = {
+    "revenue": "revenue",
+    "purchases": "purchases",
+    "payroll": "payroll",
+    "inventory": "inventory",
+    "fixed_assets": "fixed_assets",
+    "cash_bank": "cash",
+    "borrowings": "equity",
+    "equity": "equity",
+}
+
+# P-4 FS caption keyword -> P-6 ``account_cycle`` (first match wins)
+P4_CAPTION_KEYWORDS = (
+    ("revenue", "revenue"),
+    ("sales", "revenue"),
+    ("receivables", "revenue"),
+    ("purchases", "purchases"),
+    ("payables", "purchases"),
+    ("inventory", "inventory"),
+    ("cogs", "inventory"),
+    ("payroll", "payroll"),
+    ("wages", "payroll"),
+)
+
+# P-6 combined RMM -> P-12 response ``risk_level``
+P6_RATING_LEVELS = {
+    "low": "low",
+    "medium": "moderate",
+    "high": "high",
+}
+
+RiskSyncPlan = namedtuple("RiskSyncPlan", ["creates", "updates", "retire_ids", "unchanged"])
+
+
+def source_key(model_name, res_id):
+    """Return the deterministic key identifying one source line."""
+    return "%s,%s" % (model_name, res_id)
+
+
+def source_fingerprint(vals):
+    """Return a stable hash of the values derived from a source line."""
+    payload = json.dumps(vals, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def caption_to_cycle(caption):
+    """Map a P-4 FS caption to a P-6 account cycle by keyword."""
+    caption_lower = (caption or "").lower()
+    for keyword, cycle in P4_CAPTION_KEYWORDS:
+        if keyword in caption_lower:
+            return cycle
+    return "other"
+
+
+def diff_risk_sources(desired, existing, restore_vals=None):
+    """Compute the create/update/retire plan for generated risk lines.
+
+    :param desired: ``{source_key: vals}`` for every source that should
+        currently produce a risk line.
+    :param existing: ``{source_key: {"id", "source_fingerprint", "active"}}``
+        for every generated line already stored (retired ones included).
+    :param restore_vals: values that un-retire a line whose source is back
+        or changed; defaults to ``{"active": True}``.
+    :return: ``RiskSyncPlan`` where ``creates`` is a vals list for a single
+        ``create`` call, ``updates`` is a list of ``(ids, vals)`` with lines
+        sharing identical values grouped into one write, ``retire_ids`` are
+        lines whose source disappeared and ``unchanged`` counts no-op keys.
+    """
+    if restore_vals is None:
+        restore_vals = {"active": True}
+    creates = []
+    grouped = {}
+    unchanged = 0
+
+    for key, vals in desired.items():
+        fingerprint = source_fingerprint(vals)
+        current = existing.get(key)
+        if current is None:
+            creates.append(dict(vals, source_key=key, source_fingerprint=fingerprint))
+            continue
+        if current["source_fingerprint"] == fingerprint:
+            if current["active"]:
+                unchanged += 1
+                continue
+            # Source reappeared unchanged: restore without touching auditor edits.
+            new_vals = dict(restore_vals)
+        else:
+            new_vals = dict(vals, source_fingerprint=fingerprint, **restore_vals)
+        group = json.dumps(new_vals, sort_keys=True, default=str)
+        grouped.setdefault(group, (new_vals, []))[1].append(current["id"])
+
+    updates = [(sorted(ids), vals) for vals, ids in grouped.values()]
+    retire_ids = sorted(
+        rec["id"] for key, rec in existing.items() if key not in desired and rec["active"]
+    )
+    return RiskSyncPlan(creates, updates, retire_ids, unchanged)
+
+
+def _match_text(text):
+    return re.sub(r"\s+", " ", text or "").strip().lower()
+
+
+def match_legacy(desired, legacy):
+    """Pair unkeyed lines from before source keys with the desired sources.
+
+    :param desired: ``{source_key: vals}`` as passed to ``diff_risk_sources``
+    :param legacy: ``[(id, source_phase, risk_text, assertion)]`` for stored
+        lines without a source key, ``risk_text`` as plain text
+    :return: ``{id: source_key}``; each source and each line is matched at
+        most once, on phase, risk text and assertion (whitespace and case
+        insensitive)
+    """
+    available = {}
+    for key, vals in desired.items():
+        match = (
+            vals.get("source_phase"),
+            _match_text(vals.get("risk_description")),
+            _match_text(vals.get("assertion")),
+        )
+        available.setdefault(match, []).append(key)
+    matched = {}
+    for line_id, phase, text, assertion in legacy:
+        keys = available.get((phase, _match_text(text), _match_text(assertion)))
+        if keys:
+            matched[line_id] = keys.pop(0)
+    return matched
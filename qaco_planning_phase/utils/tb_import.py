@@ -0,0 +1,233 @@
+"""Trial-balance import and variance engine for P-4 analytics.
+
+Streams a client trial balance (CSV or XLSX) in fixed-size chunks, maps each
+account to a P-4 ``fs_category`` through ordered matching rules, aggregates
+the mapped balances into FS lines and computes variance, % change and the
+threshold flag for every line in one vectorised pass.
+
+This module is intentionally free of Odoo imports. NumPy and pandas are
+declared in the module manifest; the guarded import only keeps the helpers
+importable by tests and pre-commit hooks on machines without them.
+"""
+
+import io
+from collections import namedtuple
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    pd = None
+
+DEFAULT_VARIANCE_PCT_THRESHOLD = 10.0
+CHUNK_SIZE = 50000
+
+# Normalised column -> accepted header spellings (compared lower-case, trimmed)
+COLUMN_ALIASES = {
+    "account_code": ("account_code", "account code", "account", "code", "gl code", "account no", "account number"),
+    "account_name": ("account_name", "account name", "name", "description", "account description", "title"),
+    "current_year": ("current_year", "current year", "cy", "balance", "closing balance", "current"),
+    "prior_year": ("prior_year", "prior year", "py", "comparative", "prior", "opening balance"),
+    "debit": ("debit", "dr"),
+    "credit": ("credit", "cr"),
+}
+
+# Categories whose natural balance is a credit; shown positive on FS lines
+CREDIT_CATEGORIES = frozenset(
+    ("revenue", "other_income", "current_liability", "non_current_liability", "equity")
+)
+
+MappingRule = namedtuple("MappingRule", ["match_on", "pattern", "fs_category", "fs_caption"])
+
+
+def _require_pandas():
+    if pd is None:
+        raise RuntimeError("numpy and pandas are required for trial balance import")
+
+
+def compute_variances(current, prior, amount_threshold=0.0, pct_threshold=DEFAULT_VARIANCE_PCT_THRESHOLD):
+    """Return ``(variance, variance_pct, exceeds)`` arrays for paired balances.
+
+    When ``amount_threshold`` (performance materiality or an explicit
+    benchmark) is set, a line exceeds the threshold if its absolute variance
+    is above it; otherwise the % change is compared to ``pct_threshold``.
+    """
+    _require_pandas()
+    current = np.asarray(current, dtype=float)
+    prior = np.asarray(prior, dtype=float)
+    variance = current - prior
+    abs_prior = np.abs(prior)
+    safe_prior = np.where(abs_prior > 0, abs_prior, 1.0)
+    variance_pct = np.where(
+        abs_prior > 0, variance / safe_prior * 100.0, np.where(current == 0, 0.0, 100.0)
+    )
+    if amount_threshold and amount_threshold > 0:
+        exceeds = np.abs(variance) > amount_threshold
+    else:
+        exceeds = np.abs(variance_pct) > (pct_threshold or DEFAULT_VARIANCE_PCT_THRESHOLD)
+    return variance, variance_pct, exceeds
+
+
+def _to_amount(series):
+    """Parse accounting-formatted amounts: thousands separators and (negatives)."""
+    text = series.astype(str).str.strip()
+    negative = text.str.startswith("(") & text.str.endswith(")")
+    cleaned = text.str.replace(r"[,\s()]", "", regex=True)
+    values = pd.to_numeric(cleaned, errors="coerce").fillna(0.0)
+    return values.where(~negative, -values)
+
+
+def _resolve_columns(headers):
+    """Map raw headers to normalised column names; raises on missing essentials."""
+    lookup = {str(h).strip().lower(): h for h in headers if h is not None}
+    resolved = {}
+    for column, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lookup:
+                resolved[column] = lookup[alias]
+                break
+    if "account_code" not in resolved and "account_name" not in resolved:
+        raise ValueError("Trial balance needs an account code or account name column.")
+    if "current_year" not in resolved and not {"debit", "credit"} <= set(resolved):
+        raise ValueError("Trial balance needs a current-year balance or debit/credit columns.")
+    return resolved
+
+
+def _normalise(frame, resolved):
+    """Return a frame with account_code, account_name, current_year, prior_year."""
+    out = pd.DataFrame(index=frame.index)
+    for column in ("account_code", "account_name"):
+        source = resolved.get(column)
+        out[column] = frame[source].fillna("").astype(str).str.strip() if source else ""
+    if "current_year" in resolved:
+        out["current_year"] = _to_amount(frame[resolved["current_year"]])
+    else:
+        out["current_year"] = _to_amount(frame[resolved["debit"]]) - _to_amount(frame[resolved["credit"]])
+    if "prior_year" in resolved:
+        out["prior_year"] = _to_amount(frame[resolved["prior_year"]])
+    else:
+        out["prior_year"] = 0.0
+    return out
+
+
+def iter_trial_balance(content, filename, chunk_size=CHUNK_SIZE):
+    """Yield normalised DataFrame chunks from CSV or XLSX trial balance bytes."""
+    _require_pandas()
+    if (filename or "").lower().endswith((".xlsx", ".xlsm")):
+        yield from _iter_xlsx(content, chunk_size)
+        return
+    reader = pd.read_csv(
+        io.BytesIO(content), chunksize=chunk_size, dtype=str, skipinitialspace=True
+    )
+    resolved = None
+    for chunk in reader:
+        if resolved is None:
+            resolved = _resolve_columns(chunk.columns)
+        yield _normalise(chunk, resolved)
+
+
+def _iter_xlsx(content, chunk_size):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = next(rows, None)
+        if not headers:
+            return
+        resolved = _resolve_columns(headers)
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                yield _normalise(pd.DataFrame(buffer, columns=headers, dtype=object), resolved)
+                buffer = []
+        if buffer:
+            yield _normalise(pd.DataFrame(buffer, columns=headers, dtype=object), resolved)
+    finally:
+        workbook.close()
+
+
+def map_accounts(frame, rules):
+    """Return ``(fs_category, fs_caption)`` Series; the first matching rule wins."""
+    category = pd.Series(None, index=frame.index, dtype=object)
+    caption = pd.Series(None, index=frame.index, dtype=object)
+    codes = frame["account_code"]
+    names = frame["account_name"]
+    for rule in rules:
+        pending = category.isna()
+        if not pending.any():
+            break
+        if rule.match_on == "code_prefix":
+            matched = codes.str.startswith(rule.pattern)
+        elif rule.match_on == "name_regex":
+            matched = names.str.contains(rule.pattern, case=False, regex=True, na=False)
+        else:
+            matched = names.str.contains(rule.pattern, case=False, regex=False, na=False)
+        hit = pending & matched
+        category[hit] = rule.fs_category
+        caption[hit] = rule.fs_caption or rule.fs_category
+    return category, caption
+
+
+def aggregate_trial_balance(chunks, rules, credit_negative=True):
+    """Aggregate mapped balances per FS line across all chunks.
+
+    :return: ``(lines, unmapped)`` where ``lines`` is a DataFrame indexed by
+        ``(fs_category, fs_caption)`` with current_year, prior_year and
+        account_count, and ``unmapped`` a dict with count and balance totals.
+    """
+    _require_pandas()
+    partials = []
+    unmapped = {"count": 0, "current_year": 0.0, "prior_year": 0.0}
+    for chunk in chunks:
+        category, caption = map_accounts(chunk, rules)
+        mapped = category.notna()
+        missing = chunk[~mapped]
+        unmapped["count"] += int(len(missing))
+        unmapped["current_year"] += float(missing["current_year"].sum())
+        unmapped["prior_year"] += float(missing["prior_year"].sum())
+        data = chunk.loc[mapped, ["current_year", "prior_year"]].assign(
+            fs_category=category[mapped], fs_caption=caption[mapped], account_count=1
+        )
+        partials.append(data.groupby(["fs_category", "fs_caption"], sort=False).sum())
+    if not partials:
+        empty = pd.DataFrame(columns=["current_year", "prior_year", "account_count"])
+        return empty, unmapped
+    lines = pd.concat(partials).groupby(level=[0, 1], sort=False).sum()
+    if credit_negative:
+        credit = lines.index.get_level_values(0).isin(list(CREDIT_CATEGORIES))
+        lines.loc[credit, ["current_year", "prior_year"]] *= -1
+    return lines, unmapped
+
+
+def build_fs_line_values(content, filename, rules, amount_threshold=0.0,
+                         pct_threshold=DEFAULT_VARIANCE_PCT_THRESHOLD,
+                         credit_negative=True, chunk_size=CHUNK_SIZE):
+    """Run the full pipeline and return ``(vals_list, stats)`` for FS-line creation."""
+    lines, unmapped = aggregate_trial_balance(
+        iter_trial_balance(content, filename, chunk_size), rules, credit_negative
+    )
+    _variance, _pct, exceeds = compute_variances(
+        lines["current_year"].to_numpy(), lines["prior_year"].to_numpy(), amount_threshold, pct_threshold
+    )
+    vals_list = []
+    for seq, ((fs_category, fs_caption), row) in enumerate(lines.iterrows(), start=1):
+        vals_list.append(
+            {
+                "sequence": seq * 10,
+                "fs_category": fs_category,
+                "fs_caption": fs_caption,
+                "current_year": float(row["current_year"]),
+                "prior_year": float(row["prior_year"]),
+                "account_count": int(row["account_count"]),
+            }
+        )
+    stats = {
+        "accounts": int(lines["account_count"].sum()) + unmapped["count"] if len(lines) else unmapped["count"],
+        "lines": len(vals_list),
+        "exceeding": int(exceeds.sum()),
+        "unmapped": unmapped,
+    }
+    return vals_list, stats
@@ -5,10 +5,15 @@
     "author": "QACO",
     "license": "LGPL-3",
     "category": "Accounting/Auditing",
-    "depends": ["qaco_audit", "qaco_deliverables"],
+    "depends": ["qaco_audit", "qaco_client_onboarding", "qaco_deliverables"],
+    "external_dependencies": {
+        "python": ["numpy"],
+    },
     "data": [
         "security/ir.model.access.csv",
+        "data/eqr_trigger_rules.xml",
         "views/quality_review_form.xml",
+        "views/eqr_trigger_rule_views.xml",
         "views/audit_smart_button.xml",
     ],
     "assets": {
@@ -5,9 +5,11 @@
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import UserError, ValidationError  # type: ignore[attr-defined]
 
+from ..utils import eqr_triggers, planning_metrics
+
 SUBTAB_STATUS = [
     ("red", "❌ Incomplete"),
     ("amber", "🟡 In Progress"),
@@ -602,121 +604,90 @@ class QualityReview(models.Model):
     # ------------------------------------------------------------------
     # Session 7E: Planning Phase Integration Compute Methods
     # ------------------------------------------------------------------
-    @api.depends("audit_id")
-    def _compute_planning_metrics(self):
-        """Pull planning phase metrics for EQCR review."""
-        for record in self:
-            planning = self.env["qaco.planning.main"].search(
-                [("audit_id", "=", record.audit_id.id)], limit=1
-            )
+    def _planning_snapshot(self):
+        """Planning metric values per review id, read for the whole recordset.
+
+        One planning query, one state read per tab model and one grouped
+        P-6 risk count, whatever the number of reviews.
+        """
+        Planning = self.env["qaco.planning.main"]
+        plannings = Planning.search_fetch(
+            [("audit_id", "in", self.audit_id.ids)],
+            ["audit_id", "is_planning_locked", *planning_metrics.PLANNING_TABS],
+            order="id",
+        )
+        by_audit = {}
+        for planning in plannings:
+            by_audit.setdefault(planning.audit_id.id, planning)
+
+        tab_states = {}
+        for tab in planning_metrics.PLANNING_TABS:
+            tabs = plannings[tab]
+            if tabs:
+                tabs.fetch(["state"])
+                tab_states[tab] = {record.id: record.state for record in tabs}
+
+        risk_counts = {}
+        significant_counts = {}
+        for risk, significant, count in self.env[
+            "qaco.planning.p6.risk.line"
+        ]._read_group(
+            [("p6_risk_id", "in", plannings.p6_risk_id.ids)],
+            ["p6_risk_id", "is_significant_risk"],
+            ["__count"],
+        ):
+            risk_counts[risk.id] = risk_counts.get(risk.id, 0) + count
+            if significant:
+                significant_counts[risk.id] = count
 
+        snapshot = {}
+        for record in self:
+            planning = by_audit.get(record.audit_id.id)
             if not planning:
-                record.planning_phase_id = False
-                record.planning_completion_pct = 0.0
-                record.planning_locked = False
-                record.planning_p6_risk_count = 0
-                record.planning_significant_risk_count = 0
-                record.planning_missing_approvals = ""
+                snapshot[record.id] = planning_metrics.metrics(False, False, {})
                 continue
-
-            record.planning_phase_id = planning.id
-            record.planning_locked = planning.is_planning_locked
-
-            # Calculate completion percentage (count approved tabs)
-            approved_tabs = 0
-            total_tabs = 12
-            missing_tabs = []
-
-            for tab_field in [
-                "p2_entity_id",
-                "p3_controls_id",
-                "p4_analytics_id",
-                "p5_materiality_id",
-                "p6_risk_id",
-                "p7_fraud_id",
-                "p8_going_concern_id",
-                "p9_laws_id",
-                "p10_related_parties_id",
-                "p11_group_audit_id",
-                "p12_strategy_id",
-                "p13_approval_id",
-            ]:
-                tab_record = planning[tab_field]
-                if tab_record and getattr(tab_record, 'state', None) == "approved":
-                    approved_tabs += 1
-                elif tab_record:
-                    tab_name = tab_field.replace("_id", "").replace("_", "-").upper()
-                    missing_tabs.append(tab_name)
-
-            record.planning_completion_pct = round(
-                (approved_tabs / total_tabs) * 100, 1
-            )
-            record.planning_missing_approvals = (
-                ", ".join(missing_tabs) if missing_tabs else ""
+            states = {
+                tab: tab_states[tab][planning[tab].id]
+                for tab in planning_metrics.PLANNING_TABS
+                if planning[tab]
+            }
+            snapshot[record.id] = planning_metrics.metrics(
+                planning.id,
+                planning.is_planning_locked,
+                states,
+                risk_counts.get(planning.p6_risk_id.id, 0),
+                significant_counts.get(planning.p6_risk_id.id, 0),
             )
+        return snapshot
 
-            # Count P-6 risks
-            if planning.p6_risk_id:
-                risk_lines = self.env["qaco.planning.p6.risk.line"].search(
-                    [("p6_risk_id", "=", planning.p6_risk_id.id)]
-                )
-                record.planning_p6_risk_count = len(risk_lines)
-                record.planning_significant_risk_count = len(
-                    risk_lines.filtered(lambda r: r.is_significant_risk)
-                )
-            else:
-                record.planning_p6_risk_count = 0
-                record.planning_significant_risk_count = 0
+    @api.depends("audit_id")
+    def _compute_planning_metrics(self):
+        """Pull planning phase metrics for EQCR review."""
+        snapshot = self._planning_snapshot()
+        for record in self:
+            record.update(snapshot[record.id])
 
     @api.depends(
         "planning_phase_id",
         "planning_completion_pct",
         "planning_locked",
         "planning_missing_approvals",
+        "planning_p6_risk_count",
+        "planning_significant_risk_count",
     )
     def _compute_planning_red_flags(self):
         """Generate HTML red flags for planning phase issues."""
         for record in self:
-            if not record.planning_phase_id:
-                record.planning_red_flags = '<p style="color: grey;">⚠️ No planning phase found for this audit.</p>'
-                continue
-
-            flags = []
-
-            # Red Flag: Planning not locked
-            if not record.planning_locked:
-                flags.append(
-                    "🔓 <strong>Planning phase not locked</strong> - ISA 300 requires planning completion before execution."
-                )
-
-            # Red Flag: Low completion percentage
-            if record.planning_completion_pct < 100:
-                flags.append(
-                    f"📊 <strong>Planning only {record.planning_completion_pct}% complete</strong> - Missing approvals: {record.planning_missing_approvals}"
-                )
-
-            # Red Flag: No risks identified
-            if record.planning_p6_risk_count == 0:
-                flags.append(
-                    "⚠️ <strong>No risks identified in P-6 Risk Assessment</strong> - ISA 315 requires documented risk assessment."
-                )
-
-            # Red Flag: No significant risks (unusual)
-            if (
-                record.planning_p6_risk_count > 0
-                and record.planning_significant_risk_count == 0
-            ):
-                flags.append(
-                    f"🟡 <strong>No significant risks flagged</strong> - Consider if {record.planning_p6_risk_count} identified risks include any significant risks per ISA 315."
-                )
-
-            if not flags:
-                record.planning_red_flags = '<p style="color: green;">✅ Planning phase complete with no red flags.</p>'
-            else:
-                formatted_flags = (
-                    "<ul>" + "".join(f"<li>{flag}</li>" for flag in flags) + "</ul>"
-                )
-                record.planning_red_flags = f'<div style="background: #fff3cd; padding: 10px; border-left: 4px solid #ffc107;">{formatted_flags}</div>'
+            values = {fname: record[fname] for fname in planning_metrics.METRIC_FIELDS}
+            record.planning_red_flags = planning_metrics.render_red_flags(values)
+
+    def action_refresh_planning_metrics(self):
+        """Recompute the stored planning metrics of the selected reviews."""
+        reviews = self or self.search([])
+        for fname in planning_metrics.METRIC_FIELDS:
+            self.env.add_to_compute(self._fields[fname], reviews)
+        reviews.flush_recordset()
+        return True
 
     @api.model_create_multi
     def create(self, vals_list: List[Dict[str, Any]]):
@@ -789,59 +760,169 @@ class QualityReview(models.Model):
     # Trigger engine logic
     # ------------------------------------------------------------------
     def action_run_trigger_engine(self):
-        for record in self:
-            required, reasons = record._evaluate_trigger_rules()
-            if record.eqr_override_option == "force_on":
-                required = True
-                reasons.append(_("Partner override applied: forced ON."))
-            elif record.eqr_override_option == "force_off":
-                required = False
-                reasons.append(_("Partner override applied: forced OFF."))
-                if not record.eqr_override_reason:
-                    raise UserError(
-                        _("Provide an override reason when forcing the EQR off.")
-                    )
+        self._apply_trigger_engine()
+        return True
 
-            record.write(
+    @api.model
+    def action_reevaluate_eqr_portfolio(self):
+        """Re-run the trigger rules over every open review after a policy change."""
+        reviews = self.search([("file_lock_date", "=", False)])
+        triggered, cleared, skipped = reviews._apply_trigger_engine(strict=False)
+        message = _(
+            "%(count)s reviews evaluated: %(triggered)s newly require an EQR, "
+            "%(cleared)s no longer do."
+        ) % {
+            "count": len(reviews),
+            "triggered": len(triggered),
+            "cleared": len(cleared),
+        }
+        if skipped:
+            message += " " + _(
+                "%s forced off without a rationale were left unchanged."
+            ) % len(skipped)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("EQR Portfolio Re-evaluated"),
+                "message": message,
+                "type": "info",
+                "sticky": False,
+            },
+        }
+
+    def _trigger_rows(self) -> List[Dict[str, Any]]:
+        """Trigger columns per review, read for the whole recordset at once."""
+        self.fetch(
+            [
+                "audit_id",
+                "planning_phase_id",
+                "planning_p6_risk_count",
+                "planning_significant_risk_count",
+            ]
+        )
+        audits = self.audit_id
+        audits.fetch(
+            [
+                "engagement_type",
+                "share_capital",
+                "turnover",
+                "priority",
+                "repeat",
+                "qaco_audit_partner",
+                "qaco_assigning_partner",
+            ]
+        )
+        onboardings = {}
+        for onboarding in self.env["qaco.client.onboarding"].search_fetch(
+            [("audit_id", "in", audits.ids)],
+            ["audit_id", "entity_type", "proposed_audit_fee", "fee_dependency_percent"],
+            order="id desc",
+        ):
+            onboardings.setdefault(onboarding.audit_id.id, onboarding)
+        plannings = self.planning_phase_id
+        plannings.fetch(["p8_going_concern_id"])
+        going_concern = plannings.p8_going_concern_id
+        going_concern.fetch(
+            ["significant_doubt_exists", "material_uncertainty_identified"]
+        )
+        doubtful = set(
+            going_concern.filtered(
+                lambda gc: gc.significant_doubt_exists
+                or gc.material_uncertainty_identified
+            ).ids
+        )
+
+        rows = []
+        for record in self:
+            audit = record.audit_id
+            onboarding = onboardings.get(audit.id)
+            rows.append(
                 {
-                    "eqr_required": required,
-                    "eqr_engine_reason": (
-                        "\n".join(reasons)
-                        if reasons
-                        else _("No trigger breached. EQR optional.")
+                    "engagement_type": audit.engagement_type,
+                    "entity_type": onboarding.entity_type if onboarding else "",
+                    "share_capital": audit.share_capital,
+                    "turnover": audit.turnover,
+                    "audit_fee": onboarding.proposed_audit_fee if onboarding else 0.0,
+                    "fee_dependency_pct": (
+                        onboarding.fee_dependency_percent if onboarding else 0.0
                     ),
+                    "risk_count": record.planning_p6_risk_count,
+                    "significant_risk_count": record.planning_significant_risk_count,
+                    "going_concern_doubt": (
+                        record.planning_phase_id.p8_going_concern_id.id in doubtful
+                    ),
+                    "same_partner": bool(
+                        audit.qaco_audit_partner
+                        and audit.qaco_audit_partner == audit.qaco_assigning_partner
+                    ),
+                    "priority": audit.priority,
+                    "new_client": audit.repeat == "New Client",
                 }
             )
+        return rows
 
-            if required:
-                record._seed_default_scope()
+    def _apply_trigger_engine(self, strict=True):
+        """Evaluate the trigger rules for the recordset in one pass.
 
-        return True
+        Only reviews whose outcome or notes changed are written, grouped by
+        identical values. With ``strict=False`` a review forced off without
+        a rationale is left as it is instead of raising.
+
+        :returns: (newly triggered, cleared, skipped) reviews
+        """
+        compiled = self.env["qaco.quality.eqr.trigger.rule"]._compiled_rules()
+        hits = eqr_triggers.evaluate(
+            compiled, eqr_triggers.columns(self._trigger_rows())
+        )
+        engine_reasons = eqr_triggers.all_reasons(compiled, hits)
+        no_trigger = _("No trigger breached. EQR optional.")
+        previous, required = [], []
+        updates: Dict[Tuple[bool, str], List[int]] = {}
+        skipped = self.browse()
+        for record, rule_reasons in zip(self, engine_reasons):
+            reasons = list(rule_reasons)
+            value = bool(reasons)
+            if record.eqr_override_option == "force_on":
+                value = True
+                reasons.append(_("Partner override applied: forced ON."))
+            elif record.eqr_override_option == "force_off":
+                if not record.eqr_override_reason:
+                    if strict:
+                        raise UserError(
+                            _("Provide an override reason when forcing the EQR off.")
+                        )
+                    skipped |= record
+                    previous.append(record.eqr_required)
+                    required.append(record.eqr_required)
+                    continue
+                value = False
+                reasons.append(_("Partner override applied: forced OFF."))
+            previous.append(record.eqr_required)
+            required.append(value)
+            note = "\n".join(reasons) if reasons else no_trigger
+            if value != record.eqr_required or note != record.eqr_engine_reason:
+                updates.setdefault((value, note), []).append(record.id)
+
+        for (value, note), ids in updates.items():
+            self.browse(ids).write({"eqr_required": value, "eqr_engine_reason": note})
+        self.filtered("eqr_required")._seed_default_scope()
+        newly, cleared = eqr_triggers.diff(previous, required)
+        return (
+            self.browse([self.ids[index] for index in newly]),
+            self.browse([self.ids[index] for index in cleared]),
+            skipped,
+        )
 
     def _evaluate_trigger_rules(self) -> Tuple[bool, List[str]]:
         self.ensure_one()
-        reasons: List[str] = []
-        audit = self.audit_id
-        if not audit:
+        if not self.audit_id:
             return False, [_("No audit linked; unable to evaluate triggers.")]
-
-        if audit.legal_entity in ("Public Company", "Govt Organisation"):
-            reasons.append(_("Entity classified as public interest."))
-        if audit.share_capital and audit.share_capital > 1_000_000_000:
-            reasons.append(_("Share capital exceeds PKR 1bn threshold."))
-        if audit.turnover and audit.turnover > 5_000_000_000:
-            reasons.append(_("Turnover exceeds PKR 5bn threshold."))
-        if (
-            audit.qaco_audit_partner
-            and audit.qaco_assigning_partner
-            and audit.qaco_audit_partner == audit.qaco_assigning_partner
-        ):
-            reasons.append(_("Engagement and assigning partner are the same person."))
-        if audit.priority == "3":
-            reasons.append(_("Audit flagged as High priority."))
-        if audit.repeat == "New Client":
-            reasons.append(_("First-year engagement requires heightened oversight."))
-
+        compiled = self.env["qaco.quality.eqr.trigger.rule"]._compiled_rules()
+        hits = eqr_triggers.evaluate(
+            compiled, eqr_triggers.columns(self._trigger_rows())
+        )
+        reasons = eqr_triggers.reasons(compiled, hits, 0)
         return bool(reasons), reasons
 
     # ------------------------------------------------------------------
@@ -1150,3 +1231,94 @@ class QualityFindingAction(models.Model):
     responsible_id = fields.Many2one("res.users", string="Responsible")
     due_date = fields.Date()
     status = fields.Selection(ACTION_STATUS, default="planned")
+
+
+class QualityEqrTriggerRule(models.Model):
+    """Firm EQR trigger policy: one ``column operator value`` condition per rule.
+
+    The active rules are compiled once and cached until a rule changes; a
+    review requires an EQR when any rule hits.
+    """
+
+    _name = "qaco.quality.eqr.trigger.rule"
+    _description = "EQR Trigger Rule"
+    _order = "sequence, id"
+
+    sequence = fields.Integer(default=10)
+    name = fields.Char(
+        string="Trigger Reason",
+        required=True,
+        help="Note recorded on the review when the rule hits",
+    )
+    column = fields.Selection(
+        eqr_triggers.COLUMN_LABELS, string="Condition On", required=True
+    )
+    operator = fields.Selection(
+        eqr_triggers.OPERATORS, string="Operator", required=True, default="="
+    )
+    value = fields.Char(
+        string="Value",
+        required=True,
+        help="Number, selection key or 1/0 for yes/no conditions; "
+        "comma-separated for 'in'",
+    )
+    active = fields.Boolean(default=True)
+
+    def _as_rule(self):
+        return eqr_triggers.Rule(
+            str(self.id), self.column, self.operator, self.value, self.name
+        )
+
+    @api.constrains("column", "operator", "value")
+    def _check_rule(self):
+        for rule in self:
+            try:
+                eqr_triggers.compile_rule(rule._as_rule())
+            except ValueError as e:
+                raise ValidationError(str(e)) from e
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
+
+    @api.model
+    @tools.ormcache()
+    def _compiled_rules(self):
+        """Active rules compiled for evaluation, cached until the policy changes."""
+        rules = self.sudo().search_fetch([], ["column", "operator", "value", "name"])
+        return eqr_triggers.compile_rules(rule._as_rule() for rule in rules)
+
+    def action_view_matching_reviews(self):
+        self.ensure_one()
+        compiled = eqr_triggers.compile_rule(self._as_rule())
+        if not compiled.domain:
+            raise UserError(
+                _(
+                    "This condition is derived from onboarding or planning data; "
+                    "re-evaluate the portfolio to apply it."
+                )
+            )
+        return {
+            "type": "ir.actions.act_window",
+            "name": self.name,
+            "res_model": "qaco.quality.review",
+            "view_mode": "tree,form",
+            "domain": compiled.domain,
+        }
+
+    @api.model
+    def action_reevaluate_portfolio(self):
+        return self.env["qaco.quality.review"].action_reevaluate_eqr_portfolio()
+
@@ -0,0 +1,3 @@
+"""Utility helpers for qaco_quality_review.
+Keep utilities free of Odoo imports so they can be imported safely in tests and pre-commit hooks.
+"""
@@ -0,0 +1,200 @@
+"""EQR trigger rules compiled into domains and vectorised predicates.
+
+Firm policy is a list of rules of the form ``column operator value`` (for
+example ``turnover > 5000000000`` or ``engagement_type = listed``). A rule
+set is compiled once:
+
+- each rule's value is coerced to its column type and bound to a NumPy
+  predicate that tests a whole column at once
+- rules over stored fields also get an Odoo domain on the quality review,
+  so the reviews a rule hits can be listed without evaluating the rest
+
+The portfolio is evaluated as one table of columns (one array per column,
+one row per review), giving a ``rules x reviews`` hit matrix in a single
+pass. :func:`diff` compares the result with the stored flags so only the
+reviews whose outcome changed need to be written.
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks. NumPy is declared in the module
+manifest.
+"""
+
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+NUMBER, FLAG, TEXT = "number", "flag", "text"
+
+# Portfolio column -> (type, field path on qaco.quality.review or None)
+COLUMNS = {
+    "engagement_type": (TEXT, "audit_id.engagement_type"),
+    "entity_type": (TEXT, None),
+    "share_capital": (NUMBER, "audit_id.share_capital"),
+    "turnover": (NUMBER, "audit_id.turnover"),
+    "audit_fee": (NUMBER, None),
+    "fee_dependency_pct": (NUMBER, None),
+    "risk_count": (NUMBER, "planning_p6_risk_count"),
+    "significant_risk_count": (NUMBER, "planning_significant_risk_count"),
+    "going_concern_doubt": (FLAG, None),
+    "same_partner": (FLAG, None),
+    "priority": (TEXT, "audit_id.priority"),
+    "new_client": (FLAG, None),
+}
+
+COLUMN_LABELS = [
+    ("engagement_type", "Engagement Type"),
+    ("entity_type", "Entity Type (Onboarding)"),
+    ("share_capital", "Paid-up Share Capital"),
+    ("turnover", "Turnover"),
+    ("audit_fee", "Proposed Audit Fee"),
+    ("fee_dependency_pct", "Fee Dependency (%)"),
+    ("risk_count", "Identified Risks (P-6)"),
+    ("significant_risk_count", "Significant Risks (P-6)"),
+    ("going_concern_doubt", "Going-Concern Doubt (P-8)"),
+    ("same_partner", "Engagement = Assigning Partner"),
+    ("priority", "Audit Priority"),
+    ("new_client", "First-Year Engagement"),
+]
+
+OPERATORS = [
+    ("=", "="),
+    ("!=", "!="),
+    (">", ">"),
+    (">=", ">="),
+    ("<", "<"),
+    ("<=", "<="),
+    ("in", "in"),
+]
+
+_ORDERING = (">", ">=", "<", "<=")
+
+Rule = namedtuple("Rule", ["key", "column", "operator", "value", "message"])
+Rule.__doc__ = """One trigger rule; ``value`` is text as entered (comma-separated for ``in``)."""
+
+CompiledRule = namedtuple("CompiledRule", ["rule", "value", "domain"])
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("NumPy is required for the EQR trigger engine.")
+
+
+def _coerce(kind, text):
+    text = str(text if text is not None else "").strip()
+    if kind == NUMBER:
+        return float(text.replace(",", ""))
+    if kind == FLAG:
+        if text.lower() in ("1", "true", "yes", "y"):
+            return True
+        if text.lower() in ("0", "false", "no", "n", ""):
+            return False
+        raise ValueError(f"'{text}' is not a yes/no value.")
+    return text
+
+
+def compile_rule(rule):
+    """Validate ``rule`` and return a :class:`CompiledRule` (``ValueError`` if invalid)."""
+    if rule.column not in COLUMNS:
+        raise ValueError(f"Unknown trigger column '{rule.column}'.")
+    if rule.operator not in dict(OPERATORS):
+        raise ValueError(f"Unknown trigger operator '{rule.operator}'.")
+    kind, path = COLUMNS[rule.column]
+    if rule.operator in _ORDERING and kind != NUMBER:
+        raise ValueError(f"'{rule.operator}' only applies to numeric columns.")
+    try:
+        if rule.operator == "in":
+            value = tuple(_coerce(kind, part) for part in str(rule.value).split(","))
+        else:
+            value = _coerce(kind, rule.value)
+    except ValueError as e:
+        raise ValueError(f"Invalid value for rule '{rule.key}': {e}") from e
+    domain = None
+    if path:
+        domain = [(path, rule.operator, list(value) if rule.operator == "in" else value)]
+    return CompiledRule(rule, value, domain)
+
+
+def compile_rules(rules):
+    """Compile a rule set once; the result is reused for every evaluation."""
+    return tuple(compile_rule(rule) for rule in rules)
+
+
+def _predicate(compiled, column):
+    operator, value = compiled.rule.operator, compiled.value
+    if operator == "in":
+        return np.isin(column, np.asarray(value, dtype=column.dtype))
+    if operator == "=":
+        return column == value
+    if operator == "!=":
+        return column != value
+    if operator == ">":
+        return column > value
+    if operator == ">=":
+        return column >= value
+    if operator == "<":
+        return column < value
+    return column <= value
+
+
+def columns(rows):
+    """Column arrays from row dicts (missing values become 0 / False / "")."""
+    _require_numpy()
+    table = {}
+    for name, (kind, _path) in COLUMNS.items():
+        values = [row.get(name) for row in rows]
+        if kind == NUMBER:
+            table[name] = np.array([value or 0.0 for value in values], dtype=float)
+        elif kind == FLAG:
+            table[name] = np.array([bool(value) for value in values], dtype=bool)
+        else:
+            table[name] = np.array([value or "" for value in values], dtype=object)
+    return table
+
+
+def evaluate(compiled_rules, table):
+    """Hit matrix of shape ``(rules, reviews)`` for a column table."""
+    _require_numpy()
+    size = len(next(iter(table.values()))) if table else 0
+    hits = np.zeros((len(compiled_rules), size), dtype=bool)
+    for position, compiled in enumerate(compiled_rules):
+        hits[position] = _predicate(compiled, table[compiled.rule.column])
+    return hits
+
+
+def reasons(compiled_rules, hits, index):
+    """Messages of the rules hit by review ``index``."""
+    return [compiled_rules[hit].rule.message for hit in np.flatnonzero(hits[:, index])]
+
+
+def all_reasons(compiled_rules, hits):
+    """Messages per review (as tuples) for the whole hit matrix.
+
+    Reviews are grouped by their pattern of hits, encoded as one integer
+    per review, so each distinct tuple of messages is built once however
+    large the portfolio.
+    """
+    count, size = hits.shape
+    if not count:
+        return [()] * size
+    if count < 63:
+        codes = (np.int64(1) << np.arange(count, dtype=np.int64)) @ hits.astype(np.int64)
+        patterns, inverse = np.unique(codes, return_inverse=True)
+        rows = [[(int(code) >> bit) & 1 for bit in range(count)] for code in patterns]
+    else:
+        patterns, inverse = np.unique(hits.T, axis=0, return_inverse=True)
+        rows = patterns
+    messages = [
+        tuple(compiled_rules[hit].rule.message for hit in np.flatnonzero(row))
+        for row in rows
+    ]
+    return [messages[code] for code in inverse.ravel().tolist()]
+
+
+def diff(previous, required):
+    """Row indices newly triggered and cleared, comparing boolean arrays."""
+    previous = np.asarray(previous, dtype=bool)
+    required = np.asarray(required, dtype=bool)
+    return np.flatnonzero(required & ~previous), np.flatnonzero(previous & ~required)
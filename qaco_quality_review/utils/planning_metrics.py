@@ -0,0 +1,136 @@
+"""Planning-phase metrics and red flags for the EQR review.
+
+The model reads one snapshot per review from the database in a fixed
+number of queries (planning records, one state read per tab model, one
+grouped risk count); everything else happens here on plain values:
+
+- :func:`metrics` turns the snapshot into the stored metric fields
+- :data:`RED_FLAG_RULES` declares the red flags as (predicate, message)
+  pairs over those metrics, evaluated by :func:`red_flags`
+
+This module is intentionally free of Odoo imports so it can be imported
+safely in tests and pre-commit hooks.
+"""
+
+from collections import namedtuple
+
+# Planning tab fields on qaco.planning.main counted towards completion
+PLANNING_TABS = (
+    "p2_entity_id",
+    "p3_controls_id",
+    "p4_analytics_id",
+    "p5_materiality_id",
+    "p6_risk_id",
+    "p7_fraud_id",
+    "p8_going_concern_id",
+    "p9_laws_id",
+    "p10_related_parties_id",
+    "p11_group_audit_id",
+    "p12_strategy_id",
+    "p13_approval_id",
+)
+
+APPROVED = "approved"
+
+# Stored metric fields on qaco.quality.review, as returned by metrics()
+METRIC_FIELDS = (
+    "planning_phase_id",
+    "planning_completion_pct",
+    "planning_locked",
+    "planning_p6_risk_count",
+    "planning_significant_risk_count",
+    "planning_missing_approvals",
+)
+
+RedFlag = namedtuple("RedFlag", ["key", "applies", "message"])
+RedFlag.__doc__ = """One red-flag rule.
+
+``applies`` is a predicate over the metrics dict returned by :func:`metrics`;
+``message`` is an HTML template formatted with the same dict.
+"""
+
+RED_FLAG_RULES = (
+    RedFlag(
+        "not_locked",
+        lambda m: not m["planning_locked"],
+        "🔓 <strong>Planning phase not locked</strong> - ISA 300 requires planning "
+        "completion before execution.",
+    ),
+    RedFlag(
+        "incomplete",
+        lambda m: m["planning_completion_pct"] < 100,
+        "📊 <strong>Planning only {planning_completion_pct}% complete</strong> - "
+        "Missing approvals: {planning_missing_approvals}",
+    ),
+    RedFlag(
+        "no_risks",
+        lambda m: m["planning_p6_risk_count"] == 0,
+        "⚠️ <strong>No risks identified in P-6 Risk Assessment</strong> - ISA 315 "
+        "requires documented risk assessment.",
+    ),
+    RedFlag(
+        "no_significant_risks",
+        lambda m: m["planning_p6_risk_count"] > 0 and m["planning_significant_risk_count"] == 0,
+        "🟡 <strong>No significant risks flagged</strong> - Consider if "
+        "{planning_p6_risk_count} identified risks include any significant risks per "
+        "ISA 315.",
+    ),
+)
+
+NO_PLANNING_HTML = '<p style="color: grey;">⚠️ No planning phase found for this audit.</p>'
+NO_FLAGS_HTML = '<p style="color: green;">✅ Planning phase complete with no red flags.</p>'
+FLAGS_HTML = (
+    '<div style="background: #fff3cd; padding: 10px; border-left: 4px solid #ffc107;">'
+    "<ul>{items}</ul></div>"
+)
+
+
+def tab_label(field_name):
+    """Short label of a tab field (``p10_related_parties_id`` -> ``P10-RELATED-PARTIES``)."""
+    return field_name.replace("_id", "").replace("_", "-").upper()
+
+
+def metrics(planning_id, locked, tab_states, risk_count=0, significant_count=0):
+    """Metric field values for one review.
+
+    :param planning_id: planning record id, or ``False`` when the audit has none
+    :param tab_states: ``{tab field: state}`` for the tabs that exist
+    """
+    if not planning_id:
+        return {
+            "planning_phase_id": False,
+            "planning_completion_pct": 0.0,
+            "planning_locked": False,
+            "planning_p6_risk_count": 0,
+            "planning_significant_risk_count": 0,
+            "planning_missing_approvals": "",
+        }
+    approved = sum(1 for tab in PLANNING_TABS if tab_states.get(tab) == APPROVED)
+    missing = [
+        tab_label(tab)
+        for tab in PLANNING_TABS
+        if tab in tab_states and tab_states[tab] != APPROVED
+    ]
+    return {
+        "planning_phase_id": planning_id,
+        "planning_completion_pct": round(approved / len(PLANNING_TABS) * 100, 1),
+        "planning_locked": bool(locked),
+        "planning_p6_risk_count": risk_count,
+        "planning_significant_risk_count": significant_count,
+        "planning_missing_approvals": ", ".join(missing),
+    }
+
+
+def red_flags(values, rules=RED_FLAG_RULES):
+    """Messages of the rules that apply to ``values`` (a :func:`metrics` dict)."""
+    return [rule.message.format(**values) for rule in rules if rule.applies(values)]
+
+
+def render_red_flags(values, rules=RED_FLAG_RULES):
+    """Red-flag HTML for a review."""
+    if not values.get("planning_phase_id"):
+        return NO_PLANNING_HTML
+    flags = red_flags(values, rules)
+    if not flags:
+        return NO_FLAGS_HTML
+    return FLAGS_HTML.format(items="".join(f"<li>{flag}</li>" for flag in flags))
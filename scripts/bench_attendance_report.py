@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark the daily attendance report at office scale.
+
+Builds the report for a synthetic office (30 days of check-ins, some
+employees on leave) from check-ins grouped by employee, then writes the
+CSV and XLSX attachments. For comparison it times the previous approach of
+scanning the whole attendance list once per employee on a sample of
+employees and extrapolates it to the full office.
+
+Usage: python scripts/bench_attendance_report.py [employees]
+"""
+import importlib.util
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_spec = importlib.util.spec_from_file_location(
+    "qaco_attendance_report", ROOT / "qaco_employees" / "utils" / "attendance_report.py"
+)
+attendance_report = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(attendance_report)
+
+TODAY = date(2024, 1, 15)
+SAMPLE = 200
+
+
+def office(count):
+    rng = random.Random(5)
+    employees = [
+        attendance_report.Employee(
+            number,
+            f"Employee {number}",
+            rng.choice([False, "Client A", "Client B", "Client C"]),
+            rng.choice(["Audit", "Tax", "Advisory"]),
+            f"Manager {number % 40}",
+        )
+        for number in range(1, count + 1)
+    ]
+    attendance = []
+    for employee in employees:
+        for day in range(31):
+            if rng.random() < 0.75:
+                check_in = datetime.combine(TODAY - timedelta(days=day), datetime.min.time())
+                attendance.append(
+                    (employee.id, check_in + timedelta(minutes=rng.randrange(480, 660)))
+                )
+    on_leave = {employee.id for employee in employees if rng.random() < 0.05}
+    balances = {
+        employee.id: attendance_report.Balance(130.0, 10.0, 120.0) for employee in employees
+    }
+    return employees, attendance, on_leave, balances
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    employees, attendance, on_leave, balances = office(count)
+
+    start = time.perf_counter()
+    checkins = defaultdict(list)
+    for employee_id, check_in in attendance:
+        checkins[employee_id].append(check_in)
+    report = attendance_report.build(TODAY, employees, checkins, on_leave, balances)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    csv_size = len(attendance_report.to_csv(report))
+    csv_time = time.perf_counter() - start
+    xlsx = ""
+    if attendance_report.xlsxwriter is not None:
+        start = time.perf_counter()
+        xlsx_size = len(attendance_report.to_xlsx(report))
+        xlsx = f", XLSX {xlsx_size / 1e3:.0f} kB in {(time.perf_counter() - start) * 1000:.0f} ms"
+
+    # Previous approach: filter the whole attendance list for every employee
+    start = time.perf_counter()
+    for employee in employees[:SAMPLE]:
+        [check_in for employee_id, check_in in attendance if employee_id == employee.id]
+    scan_time = (time.perf_counter() - start) * count / SAMPLE
+
+    print(
+        f"{count:,} employees, {len(attendance):,} check-ins: grouped build "
+        f"{build_time * 1000:.0f} ms (per-employee scan ~{scan_time:.1f} s est.)"
+    )
+    print(f"CSV {csv_size / 1e3:.0f} kB in {csv_time * 1000:.0f} ms{xlsx}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark the merged deliverables pack builder.
+
+Writes a set of scan-sized PDFs (5 pages of 2 MB each per document), builds
+the pack and reports the time and the peak memory allocated during the
+build, which should stay flat as the document count grows.
+
+Usage: python scripts/bench_deliverables_pack.py [documents]
+"""
+import importlib.util
+import os
+import secrets
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_spec = importlib.util.spec_from_file_location(
+    "qaco_pack_builder", ROOT / "qaco_deliverables" / "utils" / "pack_builder.py"
+)
+pack_builder = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pack_builder)
+
+
+def write_scans(directory, count):
+    from pypdf import PdfWriter
+    from pypdf.generic import DecodedStreamObject, NameObject
+
+    for number in range(count):
+        writer = PdfWriter()
+        for _page in range(5):
+            page = writer.add_blank_page(595, 842)
+            stream = DecodedStreamObject()
+            stream.set_data(b"% " + secrets.token_hex(1_000_000).encode() + b"\n")
+            page[NameObject("/Contents")] = writer._add_object(stream)
+        writer.write(os.path.join(directory, f"scan-{number:03d}.pdf"))
+
+
+def build(directory):
+    paths = sorted(Path(directory).glob("scan-*.pdf"))
+    sections = [key for key, _label in pack_builder.SECTIONS]
+    sources = [
+        pack_builder.PackSource(
+            sections[number % len(sections)], path.name, path=str(path), checksum=path.name
+        )
+        for number, path in enumerate(paths)
+    ]
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = pack_builder.build_pack(sources, os.path.join(directory, "pack.pdf"), "Benchmark")
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    size = sum(path.stat().st_size for path in paths)
+    print(
+        f"{len(paths)} documents ({size / 1e6:.0f} MB) -> {result.page_count} pages "
+        f"in {elapsed:.2f}s; peak memory {peak / 1e6:.1f} MB"
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    with tempfile.TemporaryDirectory() as directory:
+        write_scans(directory, count)
+        build(directory)
+
+
+if __name__ == "__main__":
+    main()
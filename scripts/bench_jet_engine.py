@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark the P-7 journal-entry testing engine on a synthetic ledger.
+
+Writes a general-ledger CSV with the requested number of lines to a
+temporary file, then streams it through the JET engine and reports the
+elapsed time, the peak resident memory and the per-test hit counts.
+
+Usage: python scripts/bench_jet_engine.py [line_count] [chunk_size]
+"""
+import importlib
+import os
+import resource
+import sys
+import tempfile
+import time
+import types
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Load the utils package without the Odoo addon __init__
+_pkg = types.ModuleType("_planning_utils")
+_pkg.__path__ = [str(ROOT / "qaco_planning_phase" / "utils")]
+sys.modules["_planning_utils"] = _pkg
+jet_engine = importlib.import_module("_planning_utils.jet_engine")
+
+
+def write_ledger(path, lines, block=500000, seed=42):
+    rng = np.random.default_rng(seed)
+    users = np.array(["user%02d" % i for i in range(40)])
+    accounts = np.array(["%04d" % code for code in range(1000, 1600)])
+    days = pd.date_range("2024-01-01", "2024-06-30").strftime("%Y-%m-%d").to_numpy()
+    header = True
+    for start in range(0, lines, block):
+        size = min(block, lines - start)
+        amounts = np.round(10 ** rng.uniform(1, 6, size), 2)
+        frame = pd.DataFrame(
+            {
+                "Journal No": np.char.add("J", (np.arange(start, start + size) // 4).astype(str)),
+                "Posting Date": rng.choice(days, size),
+                "Account": rng.choice(accounts, size),
+                "Posted By": rng.choice(users, size),
+                "Narration": "synthetic",
+                "Amount": amounts,
+            }
+        )
+        frame.to_csv(path, mode="a", header=header, index=False)
+        header = False
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else jet_engine.CHUNK_SIZE
+    config = jet_engine.JetConfig(
+        period_start=date(2024, 1, 1),
+        period_end=date(2024, 6, 30),
+        holidays=frozenset([date(2024, 3, 23), date(2024, 5, 1)]),
+        approval_limits=(50000.0, 100000.0),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "gl.csv")
+        start = time.perf_counter()
+        write_ledger(path, lines)
+        print("generated %d lines in %.1f s (%.0f MB)" % (
+            lines, time.perf_counter() - start, os.path.getsize(path) / 2**20))
+
+        start = time.perf_counter()
+        result = jet_engine.run_jet(jet_engine.iter_general_ledger(path, "gl.csv", chunk_size), config)
+        elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    print("JET over %d lines: %.1f s, peak RSS %.0f MB, %d exceptions kept" % (
+        result.stats["lines"], elapsed, peak_mb, len(result.exceptions)))
+    print("hits: " + ", ".join("%s=%d" % (test, result.stats[test]) for test in jet_engine.TESTS))
+    print("benford MAD %.5f (%s)" % (result.benford["mad"], result.benford["conformity"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark back-dating a leave adjustment across the leave ledger.
+
+Builds 36 months of leave summaries (one monthly summary and one leave
+event per month) for each employee, settles the ledger, then inserts an
+adjustment 24 months back for every employee and times the single pass
+that finds the summaries whose balances moved.
+
+The statement counts compare the SQL issued for the same change: the old
+cascade re-ran its allowance, approved-leave and absence queries and one
+UPDATE for every later summary (and committed every 50), while the ledger
+reads summaries and allowances once and writes the changed rows in one
+UPDATE.
+
+Usage: python scripts/bench_leave_ledger.py [employees]
+"""
+import importlib.util
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_spec = importlib.util.spec_from_file_location(
+    "qaco_leave_ledger", ROOT / "qaco_employees" / "utils" / "leave_ledger.py"
+)
+leave_ledger = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(leave_ledger)
+
+MONTHS = 36
+BACKDATE = 24
+# Old cascade, per later summary: allowance search + UPDATE, plus three
+# approved-leave and three absence queries for monthly summaries.
+OLD_EVENT_STATEMENTS = 2
+OLD_MONTHLY_STATEMENTS = 8
+
+
+def settled(entries, allowed):
+    return [
+        entry._replace(
+            opening=b.opening, allowed=b.allowed, closing=b.closing, remaining=b.remaining
+        )
+        for entry, b in zip(entries, leave_ledger.chain(entries, allowed))
+    ]
+
+
+def portfolio(employees):
+    rng = random.Random(7)
+    ledgers, allowed, next_id = {}, {}, 1
+    for employee in range(employees):
+        entries = []
+        for _month in range(MONTHS):
+            entries.append(leave_ledger.Entry(next_id, 0.0, rng.choice((0, 1, 2, 3)), 0.0,
+                                              0, 0, 0, 0))
+            entries.append(leave_ledger.Entry(next_id + 1, 0.0, 0.0, rng.choice((0, 0, 1)),
+                                              0, 0, 0, 0))
+            next_id += 2
+        allowed[employee] = 130.0
+        ledgers[employee] = settled(entries, 130.0)
+    return ledgers, allowed, next_id
+
+
+def main():
+    employees = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    ledgers, allowed, next_id = portfolio(employees)
+    position = 2 * (MONTHS - BACKDATE)
+    for employee, entries in ledgers.items():
+        adjustment = leave_ledger.Entry(next_id, 2.0, 0.0, 0.0, 0, 0, 0, 0)
+        entries.insert(position, adjustment)
+        next_id += 1
+
+    start = time.perf_counter()
+    changed = leave_ledger.ledger_changes(ledgers, allowed)
+    elapsed = time.perf_counter() - start
+
+    later = sum(len(entries) - position - 1 for entries in ledgers.values())
+    old = employees * (1 + BACKDATE * (OLD_EVENT_STATEMENTS + OLD_MONTHLY_STATEMENTS))
+    rows = sum(len(entries) for entries in ledgers.values())
+    print(
+        f"{employees} employees, {rows:,} summaries, adjustment back-dated {BACKDATE} months: "
+        f"{len(changed):,} summaries changed in {elapsed * 1000:.1f} ms"
+    )
+    print(
+        f"SQL statements: ledger 3 (2 reads, 1 UPDATE); old cascade ~{old:,} "
+        f"with {employees * ((later // employees) // 50 + 1):,} intermediate commits"
+    )
+
+
+if __name__ == "__main__":
+    main()
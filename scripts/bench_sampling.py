@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark the ISA 530 sampling engine on a synthetic population.
+
+Writes a population CSV with the requested number of items to a temporary
+file, then times the profile/selection pass for each sampling method, the
+extraction of the selected rows and the packed size of each selection.
+
+Usage: python scripts/bench_sampling.py [row_count] [sample_size]
+"""
+import importlib.util
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_spec = importlib.util.spec_from_file_location(
+    "qaco_exec_sampling", ROOT / "qaco_execution_phase" / "utils" / "sampling.py"
+)
+sampling = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sampling)
+
+STRATA_BOUNDS = (1000.0, 10000.0, 100000.0)
+
+
+def write_population(path, rows, chunk=1_000_000):
+    rng = np.random.default_rng(2024)
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        frame = pd.DataFrame(
+            {
+                "Reference": np.char.add("INV", np.arange(start, start + n).astype(str)),
+                "Amount": np.round(rng.lognormal(7, 1.6, n), 2),
+            }
+        )
+        frame.to_csv(path, mode="a", header=start == 0, index=False)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "population.csv")
+        started = time.perf_counter()
+        write_population(path, rows)
+        print(f"generated {rows:,} items in {time.perf_counter() - started:.1f} s")
+
+        def open_chunks():
+            return sampling.iter_population(path, "Amount", "Reference", include_key=False)
+
+        selection = None
+        for method in ("random", "systematic", "mus", "stratified"):
+            started = time.perf_counter()
+            selection = sampling.run_selection(open_chunks, method, size, 42, STRATA_BOUNDS)
+            elapsed = time.perf_counter() - started
+            packed = len(sampling.pack_indices(selection.indices))
+            print(
+                f"{method:<11} {len(selection.indices):>5} items  {elapsed:6.2f} s  "
+                f"{packed:>5} bytes packed"
+            )
+
+        started = time.perf_counter()
+        extracted = sampling.extract_rows(
+            sampling.iter_population(path, "Amount", "Reference"), selection.indices
+        )
+        print(f"extract     {len(extracted):>5} rows   {time.perf_counter() - started:6.2f} s")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"peak RSS {peak:,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
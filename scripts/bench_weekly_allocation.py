@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Benchmark the column-wise weekly allocation report.
+
+Builds the allocation frame and the client groups for a synthetic
+workforce spread over a few hundred clients and reports the time taken.
+
+Usage: python scripts/bench_weekly_allocation.py [employees]
+"""
+import importlib.util
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_spec = importlib.util.spec_from_file_location(
+    "qaco_weekly_allocation", ROOT / "qaco_employees" / "utils" / "weekly_allocation.py"
+)
+weekly_allocation = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(weekly_allocation)
+
+
+def columns(count):
+    rng = random.Random(1)
+    departments = list(weekly_allocation.DEPARTMENT_ORDER) + [None]
+    clients = [f"Client {number}" for number in range(300)] + [None, "LEAVE"]
+    joined = [date(2010, 1, 1) + timedelta(days=rng.randrange(5000)) for _ in range(count)]
+    return {
+        "name": [f"Employee {number}" for number in range(count)],
+        "manager": [rng.choice(["Manager A", "Manager B", None]) for _ in range(count)],
+        "department": [rng.choice(departments) for _ in range(count)],
+        "joined": [day if rng.random() > 0.2 else None for day in joined],
+        "articles": joined,
+        "client": [rng.choice(clients) for _ in range(count)],
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    data = columns(count)
+    start = time.perf_counter()
+    df = weekly_allocation.frame(data, date(2024, 1, 15))
+    groups = weekly_allocation.groups(df)
+    elapsed = time.perf_counter() - start
+    print(f"{count} employees, {len(groups)} clients in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
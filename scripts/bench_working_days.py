@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Benchmark a month of leave/absence accounting on working-day bitmaps.
+
+For each employee, counts approved leave days and absences (working days
+with neither attendance nor leave) for one month, first with the cached
+year bitmaps and window masks, then with the date sets the leave summary
+used to rebuild per record. Both must agree.
+
+Usage: python scripts/bench_working_days.py [employees]
+"""
+import importlib.util
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_spec = importlib.util.spec_from_file_location(
+    "qaco_working_days", ROOT / "qaco_employees" / "utils" / "working_days.py"
+)
+working_days = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(working_days)
+
+MONTH_START, MONTH_END = date(2024, 3, 1), date(2024, 3, 31)
+HOLIDAYS = [date(2024, 3, 23), date(2024, 3, 11)]
+
+
+def employees(count):
+    rng = random.Random(3)
+    days = [MONTH_START + timedelta(days=n) for n in range(31)]
+    result = []
+    for _employee in range(count):
+        attended = {day for day in days if rng.random() < 0.8}
+        leaves = []
+        for _leave in range(rng.choice((0, 0, 1, 2))):
+            first = MONTH_START + timedelta(days=rng.randrange(-5, 31))
+            leaves.append((first, first + timedelta(days=rng.randrange(0, 6))))
+        result.append((attended, leaves))
+    return result
+
+
+def with_bitmaps(rows):
+    bitmaps = {}
+
+    def bitmap_for_year(year):
+        if year not in bitmaps:
+            bitmaps[year] = working_days.year_bitmap(year, HOLIDAYS)
+        return bitmaps[year]
+
+    window = working_days.Window(MONTH_START, MONTH_END, bitmap_for_year)
+    result = []
+    for attended, leaves in rows:
+        on_leave = 0
+        for first, last in leaves:
+            on_leave |= window.span(first, last)
+        absent = window.working & ~window.days(attended) & ~on_leave
+        result.append(
+            (working_days.count(on_leave & window.working), working_days.count(absent))
+        )
+    return result
+
+
+def with_date_sets(rows):
+    result = []
+    for attended, leaves in rows:
+        # Per record: rebuild the Mon-Fri set and drop the holidays
+        holidays = set(HOLIDAYS)
+        workdays = {
+            MONTH_START + timedelta(days=n)
+            for n in range((MONTH_END - MONTH_START).days + 1)
+            if (MONTH_START + timedelta(days=n)).weekday() < 5
+            and MONTH_START + timedelta(days=n) not in holidays
+        }
+        leave_days = set()
+        for first, last in leaves:
+            first, last = max(first, MONTH_START), min(last, MONTH_END)
+            leave_days |= {first + timedelta(days=n) for n in range((last - first).days + 1)}
+        result.append((len(leave_days & workdays), len(workdays - attended - leave_days)))
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rows = employees(count)
+    start = time.perf_counter()
+    fast = with_bitmaps(rows)
+    bitmap_time = time.perf_counter() - start
+    start = time.perf_counter()
+    slow = with_date_sets(rows)
+    set_time = time.perf_counter() - start
+    assert fast == slow
+    print(
+        f"{count:,} employees, one month: bitmaps {bitmap_time * 1000:.1f} ms "
+        f"(date sets {set_time * 1000:.1f} ms)"
+    )
+
+
+if __name__ == "__main__":
+    main()
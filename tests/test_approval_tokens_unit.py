@@ -0,0 +1,36 @@
+import importlib.util
+import pathlib
+
+spec = importlib.util.spec_from_file_location(
+    "approval_tokens",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_employees"
+    / "utils"
+    / "approval_tokens.py",
+)
+approval_tokens = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(approval_tokens)
+
+Claims = approval_tokens.Claims
+CLAIMS = Claims("leave.adjustment.approval", 42, 7, "approve", 1_700_000_000, "1b9d6bcd")
+
+
+def test_signed_token_round_trips_until_expiry():
+    token = approval_tokens.sign("secret", CLAIMS)
+
+    assert approval_tokens.verify("secret", token, CLAIMS.expires - 1) == CLAIMS
+    assert approval_tokens.verify("secret", token, CLAIMS.expires + 1) is None
+    assert "/" not in token and "+" not in token
+    assert approval_tokens.fingerprint(token) == approval_tokens.fingerprint(token)
+
+
+def test_tampered_or_foreign_tokens_are_rejected():
+    token = approval_tokens.sign("secret", CLAIMS)
+    forged = approval_tokens.sign("secret", CLAIMS._replace(res_id=43))
+    spliced = forged.split(".")[0] + "." + token.split(".")[1]
+    now = CLAIMS.expires - 1
+
+    assert approval_tokens.verify("other secret", token, now) is None
+    assert approval_tokens.verify("secret", spliced, now) is None
+    for junk in ("", "abc", "a.b.c", "!!!.???", None):
+        assert approval_tokens.verify("secret", junk, now) is None
@@ -0,0 +1,74 @@
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import pathlib
+import zipfile
+from datetime import datetime
+
+_PATH = (
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_execution_phase"
+    / "utils"
+    / "archive.py"
+)
+_spec = importlib.util.spec_from_file_location("qaco_exec_archive", _PATH)
+archive = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(archive)
+
+
+def test_stream_zip_streams_files_in_blocks_with_manifest(tmp_path):
+    payload = os.urandom(300_000)
+    big = tmp_path / "ledger.pdf"
+    big.write_bytes(payload)
+    entries = archive.unique_arcnames(
+        [
+            archive.ArchiveEntry("02 Workpapers/ledger.pdf", path=str(big), source="ir.attachment,7"),
+            archive.ArchiveEntry("02 Workpapers/ledger.pdf", data=b"second", modified=datetime(2024, 6, 30)),
+            archive.ArchiveEntry("01 Controls/control_tests.csv", data=archive.csv_bytes(["ID"], [[1]])),
+        ]
+    )
+    chunks = list(archive.stream_zip(entries, {"mode": "full"}, block_size=64_000))
+
+    # The file is never emitted as one piece: every chunk stays near one block
+    assert len(chunks) > 5
+    assert max(len(chunk) for chunk in chunks) < 70_000
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == [
+            "02 Workpapers/ledger.pdf",
+            "02 Workpapers/ledger (2).pdf",
+            "01 Controls/control_tests.csv",
+            "manifest.json",
+        ]
+        assert zf.getinfo("02 Workpapers/ledger.pdf").compress_type == zipfile.ZIP_STORED
+        assert zf.read("02 Workpapers/ledger.pdf") == payload
+        manifest = json.loads(zf.read("manifest.json"))
+    assert manifest["mode"] == "full"
+    first, second = manifest["files"][:2]
+    assert first["sha256"] == hashlib.sha256(payload).hexdigest()
+    assert first["source"] == "ir.attachment,7"
+    assert second["size"] == 6 and second["modified"].startswith("2024-06-30")
+
+
+def test_safe_name_strips_path_separators():
+    assert archive.safe_name("../etc/passwd") == "etc_passwd"
+    assert archive.safe_name("Bank recon: June/2024.xlsx") == "Bank recon_ June_2024.xlsx"
+    assert archive.safe_name("", default="attachment-3") == "attachment-3"
+
+
+def test_stream_zip_reports_completion_only_when_fully_consumed(tmp_path):
+    entries = [archive.ArchiveEntry("a.bin", data=os.urandom(200_000))]
+    completed = []
+
+    chunks = archive.stream_zip(entries, block_size=50_000, on_complete=lambda: completed.append(1))
+    next(chunks)
+    chunks.close()  # client disconnected mid-download
+    assert completed == []
+
+    chunks = archive.stream_zip(entries, block_size=50_000, on_complete=lambda: completed.append(1))
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+        assert zf.namelist() == ["a.bin", "manifest.json"]
+    assert completed == [1]
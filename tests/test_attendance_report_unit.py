@@ -0,0 +1,77 @@
+import csv
+import importlib.util
+import io
+import pathlib
+from datetime import date, datetime
+
+import pytest
+
+spec = importlib.util.spec_from_file_location(
+    "attendance_report",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_employees"
+    / "utils"
+    / "attendance_report.py",
+)
+attendance_report = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(attendance_report)
+
+Employee = attendance_report.Employee
+TODAY = date(2024, 1, 15)
+
+
+def report():
+    employees = [
+        Employee(1, "Ali", "Client A", "Audit", "Manager X"),
+        Employee(2, "Sara", False, "Audit", "Manager X"),
+        Employee(3, "Omar", "Client B", False, False),
+        Employee(4, "Hina", False, "Tax", "Manager X"),
+    ]
+    checkins = {
+        1: [datetime(2024, 1, 15, 10, 30), datetime(2024, 1, 12, 9, 0)],
+        2: [datetime(2024, 1, 15, 8, 45), datetime(2024, 1, 12, 10, 0)],
+        3: [datetime(2024, 1, 12, 9, 30)],
+    }
+    balances = {1: attendance_report.Balance(20.0, 5.0, 15.0)}
+    return attendance_report.build(TODAY, employees, checkins, {3}, balances)
+
+
+def test_build_groups_rows_by_manager_and_counts_statuses():
+    result = report()
+
+    assert [manager for manager, _rows in result.groups] == ["Manager X", "N/A"]
+    manager_rows = result.groups[0][1]
+    # Later average check-in first, numbered across groups
+    assert [row.name for row in manager_rows] == ["Sara", "Ali", "Hina"]
+    assert [row.number for _m, rows in result.groups for row in rows] == [1, 2, 3, 4]
+    ali = manager_rows[1]
+    assert (ali.today_checkin, ali.late, ali.avg_checkin) == ("10:30 AM", True, "09:00 AM")
+    assert (ali.allowed_leaves, ali.remaining_leaves) == (20.0, 15.0)
+    assert manager_rows[0].client == "UNALLOCATED"
+    assert manager_rows[2].today_checkin == attendance_report.UNAUTHORIZED_LEAVE
+    assert result.groups[1][1][0].today_checkin == attendance_report.APPROVED_LEAVE
+    assert (
+        result.total_employees,
+        result.present_employees,
+        result.approved_leaves,
+        result.unauthorized_leaves,
+        result.late_checkins,
+    ) == (4, 2, 1, 1, 1)
+    assert result.managers == [
+        attendance_report.ManagerSummary("Manager X", 1, 0, 1, 3),
+        attendance_report.ManagerSummary("N/A", 0, 1, 0, 1),
+    ]
+
+
+def test_exports_carry_every_row():
+    result = report()
+
+    rows = list(csv.reader(io.StringIO(attendance_report.to_csv(result).decode())))
+    assert rows[0][:3] == ["S.No", "Employee Name", "Client"]
+    assert [row[1] for row in rows[1:]] == ["Sara", "Ali", "Hina", "Omar"]
+
+    openpyxl = pytest.importorskip("openpyxl")
+    pytest.importorskip("xlsxwriter")
+    workbook = openpyxl.load_workbook(io.BytesIO(attendance_report.to_xlsx(result)))
+    assert workbook.sheetnames == ["Daily Attendance", "Managers"]
+    assert workbook["Daily Attendance"].max_row == 5
@@ -0,0 +1,61 @@
+import importlib.util
+import pathlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+spec = importlib.util.spec_from_file_location(
+    "eqr_triggers",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_quality_review"
+    / "utils"
+    / "eqr_triggers.py",
+)
+eqr_triggers = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(eqr_triggers)
+
+RULES = [
+    eqr_triggers.Rule("listed", "engagement_type", "in", "listed,pie", "Listed or PIE."),
+    eqr_triggers.Rule("turnover", "turnover", ">", "5,000,000,000", "Turnover over 5bn."),
+    eqr_triggers.Rule("gc", "going_concern_doubt", "=", "yes", "Going-concern doubt."),
+]
+
+
+def test_portfolio_evaluated_in_one_pass_with_diff():
+    compiled = eqr_triggers.compile_rules(RULES)
+    table = eqr_triggers.columns(
+        [
+            {"engagement_type": "pie", "turnover": 6e9},
+            {"engagement_type": "statutory", "turnover": 1e9},
+            {"going_concern_doubt": True},
+            {},
+        ]
+    )
+    hits = eqr_triggers.evaluate(compiled, table)
+
+    assert hits.shape == (3, 4)
+    assert eqr_triggers.reasons(compiled, hits, 0) == ["Listed or PIE.", "Turnover over 5bn."]
+    assert eqr_triggers.reasons(compiled, hits, 2) == ["Going-concern doubt."]
+    assert eqr_triggers.all_reasons(compiled, hits) == [
+        ("Listed or PIE.", "Turnover over 5bn."),
+        (),
+        ("Going-concern doubt.",),
+        (),
+    ]
+    newly, cleared = eqr_triggers.diff([False, True, True, False], hits.any(axis=0))
+    assert list(newly) == [0] and list(cleared) == [1]
+
+
+def test_rules_compile_to_domains_and_reject_bad_values():
+    listed, turnover, gc = eqr_triggers.compile_rules(RULES)
+
+    assert listed.domain == [("audit_id.engagement_type", "in", ["listed", "pie"])]
+    assert turnover.domain == [("audit_id.turnover", ">", 5e9)]
+    assert gc.domain is None
+    with pytest.raises(ValueError):
+        eqr_triggers.compile_rule(RULES[1]._replace(value="five billion"))
+    with pytest.raises(ValueError):
+        eqr_triggers.compile_rule(RULES[0]._replace(operator=">"))
+    with pytest.raises(ValueError):
+        eqr_triggers.compile_rule(RULES[0]._replace(column="legal_entity"))
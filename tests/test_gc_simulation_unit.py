@@ -0,0 +1,79 @@
+import importlib.util
+import pathlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+spec = importlib.util.spec_from_file_location(
+    "gc_simulation",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_finalisation_phase"
+    / "utils"
+    / "gc_simulation.py",
+)
+gc_simulation = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(gc_simulation)
+
+POSITION = gc_simulation.Position(
+    revenue=12e6,
+    cost_of_sales=8e6,
+    operating_expense=3e6,
+    finance_cost=0.6e6,
+    opening_cash=0.5e6,
+    receivables=2e6,
+    other_current_assets=3e6,
+    current_liabilities=4e6,
+    borrowings=6e6,
+)
+ASSUMPTIONS = gc_simulation.Assumptions(
+    revenue_growth=-0.05,
+    gross_margin=0.30,
+    interest_rate=0.12,
+    collection_rate=0.85,
+    growth_volatility=0.08,
+    margin_volatility=0.04,
+    rate_volatility=0.01,
+    collection_volatility=0.05,
+    minimum_cash=0.0,
+    monthly_debt_service=150000.0,
+)
+COVENANTS = [
+    gc_simulation.Covenant(1, "interest_cover", 1.5),
+    gc_simulation.Covenant(2, "debt_to_ebitda", 8.0),
+]
+
+
+def test_simulation_is_reproducible_from_the_seed():
+    first = gc_simulation.simulate(POSITION, ASSUMPTIONS, COVENANTS, 18, 5000, seed=7)
+    again = gc_simulation.simulate(POSITION, ASSUMPTIONS, COVENANTS, 18, 5000, seed=7)
+    other = gc_simulation.simulate(POSITION, ASSUMPTIONS, COVENANTS, 18, 5000, seed=8)
+    assert np.array_equal(first.cash_p5, again.cash_p5)
+    assert np.array_equal(first.breach_cumulative[1], again.breach_cumulative[1])
+    assert not np.array_equal(first.cash_p5, other.cash_p5)
+    assert len(first.shortfall) == 18
+
+
+def test_cumulative_probabilities_are_monotonic_and_bound_monthly_ones():
+    result = gc_simulation.simulate(POSITION, ASSUMPTIONS, COVENANTS, 12, 20000, seed=3)
+    for monthly, cumulative in (
+        (result.shortfall, result.shortfall_cumulative),
+        (result.breach[1], result.breach_cumulative[1]),
+    ):
+        assert np.all(np.diff(cumulative) >= 0)
+        assert np.all(cumulative >= monthly)
+    assert 0.0 < result.shortfall_cumulative[-1] < 1.0
+    assert np.all(result.cash_p5 <= result.cash_p50)
+    assert gc_simulation.first_month_above(result.shortfall_cumulative, 0.05) in range(1, 13)
+    assert gc_simulation.first_month_above(result.shortfall_cumulative, 1.1) == 0
+
+
+def test_invalid_inputs_are_rejected():
+    with pytest.raises(ValueError):
+        gc_simulation.simulate(POSITION, ASSUMPTIONS, months=24)
+    with pytest.raises(ValueError):
+        gc_simulation.simulate(
+            POSITION, ASSUMPTIONS, [gc_simulation.Covenant(1, "gearing", 1.0)]
+        )
+    with pytest.raises(ValueError):
+        gc_simulation.cholesky(np.full((4, 4), 2.0))
@@ -0,0 +1,48 @@
+import importlib.util
+import pathlib
+
+spec = importlib.util.spec_from_file_location(
+    "geofence_sync",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_employees"
+    / "utils"
+    / "geofence_sync.py",
+)
+geofence_sync = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(geofence_sync)
+
+
+def test_plan_only_lists_changed_geofences():
+    current = {"Client A": {1, 2}, "Client B": {3}, "Head Office": {9}}
+    wanted = {"Client A": {1, 2}, "Client B": {4, 5}, "Client C": {6}}
+
+    result = geofence_sync.plan(current, wanted)
+
+    assert result.create == {"Client C": [6]}
+    assert result.add == {"Client B": [4, 5]}
+    assert result.remove == {"Client B": [3]}
+    # Unchanged and unrelated geofences are not touched
+    assert "Client A" not in result.add and "Head Office" not in result.remove
+
+    # Client geofences nobody is deputed to any more are emptied, offices are not
+    current["Client D"] = {7, 8}
+    result = geofence_sync.plan(current, wanted, clients={"Client A", "Client D", "Client E"})
+    assert result.remove == {"Client B": [3], "Client D": [7, 8]}
+    assert "Client E" not in result.create
+
+
+def test_summary_counts_changes():
+    result = geofence_sync.plan({"A": {1, 2}, "B": {3}}, {"A": {2, 7}, "B": {3}, "C": {4, 5}})
+
+    assert geofence_sync.summary(result) == {
+        "created": 1,
+        "updated": 1,
+        "added": 1,
+        "removed": 1,
+    }
+    assert geofence_sync.summary(geofence_sync.plan({"A": {1}}, {"A": {1}})) == {
+        "created": 0,
+        "updated": 0,
+        "added": 0,
+        "removed": 0,
+    }
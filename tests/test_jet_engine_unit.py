@@ -0,0 +1,96 @@
+import importlib
+import pathlib
+import sys
+import types
+from datetime import date
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+# Load the utils package without the Odoo addon __init__
+_UTILS = pathlib.Path(__file__).resolve().parents[1] / "qaco_planning_phase" / "utils"
+_pkg = types.ModuleType("_planning_utils")
+_pkg.__path__ = [str(_UTILS)]
+sys.modules.setdefault("_planning_utils", _pkg)
+jet_engine = importlib.import_module("_planning_utils.jet_engine")
+
+CSV = b"""Journal No,Posting Date,Entry Date,Account,Account Name,Posted By,Narration,Amount
+J1,2024-06-03,2024-06-03,4000,Sales,alice,Invoice,1234.56
+J2,2024-06-08,2024-06-08,4000,Sales,alice,Weekend sale,2345.10
+J3,2024-06-05,2024-06-05,5000,Purchases,alice,Round,50000
+J4,2024-06-05,2024-06-05,5000,Purchases,alice,Near limit,99000
+J5,2024-06-29,2024-06-29,4000,Sales,alice,Late,3456.78
+J6,2024-06-10,2024-07-04,4000,Sales,alice,Backdated,1111.11
+J7,2024-06-11,2024-06-11,1000,Cash,mallory,Odd pair,777.70
+J8,2024-06-12,2024-06-12,4000,Sales,alice,Plain,4567.89
+J9,2024-06-12,2024-06-12,4000,Sales,alice,Plain,5678.90
+J10,2024-06-14,2024-06-14,4000,Sales,alice,Holiday,6789.01
+"""
+
+CONFIG = jet_engine.JetConfig(
+    period_start=date(2024, 1, 1),
+    period_end=date(2024, 6, 30),
+    holidays=frozenset([date(2024, 6, 14)]),
+    approval_limits=(100000.0,),
+    rare_pair_max=1,
+)
+
+
+def _run(content=CSV, config=CONFIG, chunk_size=3):
+    chunks = jet_engine.iter_general_ledger(content, "gl.csv", chunk_size)
+    return jet_engine.run_jet(chunks, config)
+
+
+def test_row_level_tests_flag_expected_entries():
+    result = _run()
+    tests = dict(zip(result.exceptions["entry_ref"], result.exceptions["tests"]))
+    assert tests["J2"] == "weekend"
+    assert tests["J3"] == "round"
+    assert "below_limit" in tests["J4"]
+    assert tests["J5"] == "weekend,late_period"  # 29 June 2024 is a Saturday
+    assert tests["J6"] == "late_period"
+    assert tests["J7"] == "rare_pair"
+    assert tests["J10"] == "holiday"
+    assert "J1" not in tests and "J8" not in tests
+    assert result.stats["lines"] == 10 and result.stats["entries"] == 10
+
+
+def test_ranking_puts_highest_score_first():
+    result = _run()
+    ranked = result.exceptions
+    assert list(ranked["rank"]) == list(range(1, len(ranked) + 1))
+    assert ranked["score"].is_monotonic_decreasing
+    assert ranked.iloc[0]["entry_ref"] == "J4"
+
+
+def test_chunk_size_does_not_change_results():
+    small = _run(chunk_size=2).exceptions
+    large = _run(chunk_size=1000).exceptions
+    pd.testing.assert_frame_equal(small.reset_index(drop=True), large.reset_index(drop=True))
+
+
+def test_max_exceptions_bounds_output():
+    result = _run(config=CONFIG._replace(max_exceptions=3))
+    assert len(result.exceptions) == 3
+
+
+def test_debit_credit_columns_and_missing_columns():
+    content = b"date,account,debit,credit\n2024-06-03,4000,0,1000\n"
+    result = _run(content=content)
+    assert result.exceptions.iloc[0]["amount"] == -1000.0
+    with pytest.raises(ValueError):
+        list(jet_engine.iter_general_ledger(b"date,amount\n2024-01-01,1\n", "gl.csv"))
+
+
+def test_benford_detects_manipulated_population():
+    rng = np.random.default_rng(7)
+    conforming = 10 ** rng.uniform(1, 6, 20000)
+    summary = jet_engine.benford_summary(np.bincount(jet_engine.first_digits(conforming), minlength=10))
+    assert summary["conformity"] in ("close", "acceptable")
+
+    skewed = np.concatenate([conforming, rng.uniform(9000, 9999, 3000)])
+    summary = jet_engine.benford_summary(np.bincount(jet_engine.first_digits(skewed), minlength=10))
+    assert 9 in summary["over"]
+    assert summary["conformity"] == "nonconformity"
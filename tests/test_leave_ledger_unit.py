@@ -0,0 +1,53 @@
+import importlib.util
+import pathlib
+
+spec = importlib.util.spec_from_file_location(
+    "leave_ledger",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_employees"
+    / "utils"
+    / "leave_ledger.py",
+)
+leave_ledger = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(leave_ledger)
+
+Entry = leave_ledger.Entry
+
+
+def test_chain_carries_closing_into_next_opening():
+    entries = [
+        Entry(1, 0.0, 0.0, 2.0, 0, 0, 0, 0),
+        Entry(2, 1.5, 0.0, 0.0, 0, 0, 0, 0),
+        Entry(3, 0.0, 3.0, 1.0, 0, 0, 0, 0),
+    ]
+
+    balances = list(leave_ledger.chain(entries, 20.0))
+
+    assert [(b.opening, b.closing, b.remaining) for b in balances] == [
+        (0.0, 2.0, 18.0),
+        (2.0, 3.5, 16.5),
+        (3.5, 7.5, 12.5),
+    ]
+    assert {b.allowed for b in balances} == {20.0}
+
+
+def settled(movements, allowed):
+    """Entries storing the balances the ledger computes for ``movements``."""
+    entries = [Entry(id_, adj, 0.0, absent, 0, 0, 0, 0) for id_, adj, absent in movements]
+    return [
+        entry._replace(opening=b.opening, allowed=b.allowed, closing=b.closing,
+                       remaining=b.remaining)
+        for entry, b in zip(entries, leave_ledger.chain(entries, allowed))
+    ]
+
+
+def test_changes_only_yield_rows_whose_balances_moved():
+    stored = settled([(1, 0.0, 1.0), (2, 0.0, 2.0), (3, 0.0, 0.0)], 10.0)
+    assert list(leave_ledger.changes(stored, 10.0)) == []
+
+    # Back-dated adjustment on the second row moves it and every later row
+    backdated = [stored[0], stored[1]._replace(adjustment=1.0), stored[2]]
+    assert [b.id for b in leave_ledger.changes(backdated, 10.0)] == [2, 3]
+    # A new allowance moves every row's remaining balance
+    changed = leave_ledger.ledger_changes({7: stored, 8: []}, {7: 12.0})
+    assert [(b.id, b.remaining) for b in changed] == [(1, 11.0), (2, 9.0), (3, 9.0)]
@@ -0,0 +1,84 @@
+import importlib.util
+import pathlib
+
+spec = importlib.util.spec_from_file_location(
+    "misstatement_sync",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_finalisation_phase"
+    / "utils"
+    / "misstatement_sync.py",
+)
+misstatement_sync = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(misstatement_sync)
+
+Exc = misstatement_sync.ExceptionState
+Ms = misstatement_sync.MisstatementState
+Link = misstatement_sync.LinkState
+
+
+def test_new_exceptions_are_created_and_unquantified_reported():
+    plan = misstatement_sync.plan_reconciliation(
+        {
+            (1, "procedure", 10): Exc(500.0, "revenue", "existence", "Cut-off"),
+            (1, "procedure", 11): Exc(0.0, "revenue", "existence", "Pending"),
+        },
+        {},
+        {},
+    )
+    assert plan.create == [(1, "procedure", 10)]
+    assert plan.conflicts == [((1, "procedure", 11), None, "unquantified")]
+
+
+def test_unquantified_control_exceptions_are_not_conflicts():
+    plan = misstatement_sync.plan_reconciliation(
+        {
+            (1, "control_exception", 5): Exc(0.0, "other", "existence", "No approval"),
+            (1, "control_exception", 6): Exc(80.0, "other", "existence", "Overpaid"),
+        },
+        {},
+        {},
+        optional_sources=("control_exception",),
+    )
+    assert plan.create == [(1, "control_exception", 6)]
+    assert plan.conflicts == []
+
+
+def test_amount_direction_follows_the_changed_side():
+    exceptions = {
+        ("p", 1): Exc(150.0, "cash", "existence", "r"),  # exception revised
+        ("p", 2): Exc(200.0, "cash", "existence", "r"),  # misstatement revised
+        ("p", 3): Exc(300.0, "cash", "existence", "r"),  # both revised
+        ("p", 4): Exc(400.0, "cash", "valuation", "new"),  # fields only
+    }
+    links = {
+        ("p", 1): Link(91, 1, 100.0),
+        ("p", 2): Link(92, 2, 200.0),
+        ("p", 3): Link(93, 3, 100.0),
+        ("p", 4): Link(94, 4, 400.0),
+        ("p", 5): Link(95, 5, 500.0),  # exception cleared since
+    }
+    misstatements = {
+        1: Ms(100.0, "cash", "existence", "r"),
+        2: Ms(250.0, "cash", "existence", "r"),
+        3: Ms(350.0, "cash", "existence", "r"),
+        4: Ms(400.0, "cash", "existence", "old"),
+        5: Ms(500.0, "cash", "existence", "r"),
+    }
+    plan = misstatement_sync.plan_reconciliation(exceptions, links, misstatements)
+    assert plan.push_amounts == {1: 150.0}
+    assert plan.pull_amounts == {("p", 2): 250.0}
+    assert plan.synced == {91: 150.0, 92: 250.0}
+    assert plan.push_fields == {4: {"assertion": "valuation"}}
+    assert plan.push_rationale == {4: "new"}
+    assert sorted(reason for _key, _ms, reason in plan.conflicts) == [
+        "both_changed",
+        "exception_cleared",
+    ]
+    assert not plan.create
+
+
+def test_group_by_values_batches_identical_writes():
+    groups = misstatement_sync.group_by_values(
+        {1: {"area": "cash"}, 2: {"area": "cash"}, 3: {"area": "revenue"}}
+    )
+    assert sorted(groups.values()) == [[1, 2], [3]]
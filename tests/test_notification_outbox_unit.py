@@ -0,0 +1,50 @@
+import importlib.util
+import pathlib
+from datetime import datetime, timedelta
+
+spec = importlib.util.spec_from_file_location(
+    "notification_outbox",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_employees"
+    / "utils"
+    / "notification_outbox.py",
+)
+notification_outbox = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(notification_outbox)
+
+Notification = notification_outbox.Notification
+
+
+def test_digests_coalesce_per_kind_and_recipient():
+    notifications = [
+        Notification(1, "transfer_approved", "hr@example.com"),
+        Notification(2, "transfer_approved", "ali@example.com"),
+        Notification(3, "transfer_approved", "HR@example.com "),
+        Notification(4, "deputation_expired", "hr@example.com"),
+        Notification(5, "transfer_approved", "hr@example.com"),
+    ]
+
+    digests = notification_outbox.digests(notifications)
+
+    assert [(d.kind, d.email_to, d.ids) for d in digests] == [
+        ("transfer_approved", "hr@example.com", [1, 3, 5]),
+        ("transfer_approved", "ali@example.com", [2]),
+        ("deputation_expired", "hr@example.com", [4]),
+    ]
+
+
+def test_retry_backs_off_then_gives_up():
+    now = datetime(2024, 3, 4, 9, 0)
+
+    delays = [
+        notification_outbox.retry_at(now, attempts) - now
+        for attempts in range(1, notification_outbox.MAX_ATTEMPTS)
+    ]
+
+    assert delays == [
+        timedelta(minutes=5),
+        timedelta(minutes=10),
+        timedelta(minutes=20),
+        timedelta(minutes=40),
+    ]
+    assert notification_outbox.retry_at(now, notification_outbox.MAX_ATTEMPTS) is None
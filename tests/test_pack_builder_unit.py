@@ -0,0 +1,105 @@
+import importlib.util
+import os
+import pathlib
+
+import pytest
+
+pypdf = pytest.importorskip("pypdf")
+pytest.importorskip("reportlab")
+
+spec = importlib.util.spec_from_file_location(
+    "pack_builder",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_deliverables"
+    / "utils"
+    / "pack_builder.py",
+)
+pack_builder = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(pack_builder)
+
+
+def scan(path, pages, payload=b""):
+    """PDF of blank pages, each carrying ``payload`` in its content stream."""
+    writer = pypdf.PdfWriter()
+    for _page in range(pages):
+        page = writer.add_blank_page(595, 842)
+        stream = pypdf.generic.DecodedStreamObject()
+        stream.set_data(b"% " + payload + b"\n")
+        page[pypdf.generic.NameObject("/Contents")] = writer._add_object(stream)
+    writer.write(str(path))
+    return str(path)
+
+
+def test_pack_orders_sections_and_bookmarks_documents(tmp_path):
+    payload = os.urandom(100_000).hex().encode()
+    rendered = []
+
+    def kam_pages():
+        rendered.append(True)
+        return pack_builder.render_text_pages("KAMs", [("Revenue", "<p>Cut-off</p>")])
+
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    sources = [
+        pack_builder.PackSource("dispatch", "Courier slip", path=scan(tmp_path / "d.pdf", 1)),
+        pack_builder.PackSource("kam_eom", "KAMs", data=kam_pages, checksum="k1"),
+        pack_builder.PackSource("report", "Signed report", path=scan(tmp_path / "r.pdf", 3, payload)),
+        pack_builder.PackSource("tcwg", "Minutes", path=str(broken)),
+    ]
+    output = tmp_path / "pack.pdf"
+    result = pack_builder.build_pack(sources, str(output), "Deliverables - Client")
+
+    assert rendered == [True]
+    assert [source.title for source, _reason in result.skipped] == ["Minutes"]
+    assert [name for _section, name, _page in result.index] == [
+        "Signed report",
+        "KAMs",
+        "Courier slip",
+    ]
+    assert result.index[0][2] == 2
+    assert not list(tmp_path.glob("*.part"))
+
+    reader = pypdf.PdfReader(str(output))
+    assert len(reader.pages) == result.page_count == 1 + 3 + 1 + 1
+    # Spooled scan streams are written back unchanged
+    assert payload in reader.pages[1].get_contents().get_data()
+    outline = reader.outline
+    assert [item.title for item in outline if not isinstance(item, list)] == [
+        "Index",
+        "Signed Auditor's Report",
+        "Key Audit Matters / Emphasis of Matter",
+        "Dispatch Records",
+    ]
+
+
+def test_pack_key_follows_source_checksums():
+    first = [
+        pack_builder.PackSource("report", "Report", path="/r.pdf", checksum="a"),
+        pack_builder.PackSource("kam_eom", "KAMs", data=bytes, checksum="k"),
+    ]
+    same = [source._replace(path="/moved.pdf") for source in first]
+    changed = [first[0]._replace(checksum="b"), first[1]]
+
+    assert pack_builder.pack_key(first, "Pack") == pack_builder.pack_key(same, "Pack")
+    assert pack_builder.pack_key(first, "Pack") != pack_builder.pack_key(changed, "Pack")
+    assert pack_builder.pack_key(first, "Pack") != pack_builder.pack_key(first, "Other")
+    with pytest.raises(ValueError):
+        pack_builder.pack_key([first[1]._replace(checksum="")])
+
+
+def test_non_pdf_sources_are_listed_as_skipped(tmp_path):
+    sources = [
+        pack_builder.PackSource("report", "Signed report", path=scan(tmp_path / "r.pdf", 1)),
+        pack_builder.PackSource(
+            "management_letter", "Letter.docx", checksum="m1", skip_reason="not a PDF"
+        ),
+    ]
+    result = pack_builder.build_pack(sources, str(tmp_path / "pack.pdf"), "Pack")
+
+    assert [name for _section, name, _page in result.index] == ["Signed report"]
+    assert pack_builder.skipped_note(result.skipped) == "Letter.docx: not a PDF"
+    # Adding or replacing a skipped attachment invalidates the cached pack
+    assert pack_builder.pack_key(sources) != pack_builder.pack_key(sources[:1])
+    assert pack_builder.pack_key(sources) != pack_builder.pack_key(
+        [sources[0], sources[1]._replace(checksum="m2")]
+    )
@@ -0,0 +1,41 @@
+import importlib.util
+import pathlib
+
+spec = importlib.util.spec_from_file_location(
+    "planning_metrics",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_quality_review"
+    / "utils"
+    / "planning_metrics.py",
+)
+planning_metrics = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(planning_metrics)
+
+
+def test_metrics_count_approved_tabs_and_list_missing_ones():
+    states = {tab: "approved" for tab in planning_metrics.PLANNING_TABS[:8]}
+    states["p10_related_parties_id"] = "draft"
+    states["p13_approval_id"] = "reviewed"
+
+    values = planning_metrics.metrics(7, True, states, risk_count=4, significant_count=1)
+
+    assert values["planning_phase_id"] == 7
+    assert values["planning_completion_pct"] == 66.7
+    assert values["planning_missing_approvals"] == "P10-RELATED-PARTIES, P13-APPROVAL"
+    assert sorted(values) == sorted(planning_metrics.METRIC_FIELDS)
+    assert planning_metrics.metrics(False, True, states)["planning_completion_pct"] == 0.0
+
+
+def test_red_flag_rules_over_metrics():
+    complete = {tab: "approved" for tab in planning_metrics.PLANNING_TABS}
+    clean = planning_metrics.metrics(1, True, complete, risk_count=3, significant_count=1)
+    unlocked = planning_metrics.metrics(1, False, complete, risk_count=3, significant_count=0)
+
+    assert planning_metrics.red_flags(clean) == []
+    assert planning_metrics.render_red_flags(clean) == planning_metrics.NO_FLAGS_HTML
+    flags = planning_metrics.red_flags(unlocked)
+    assert len(flags) == 2
+    assert "not locked" in flags[0] and "3 identified risks" in flags[1]
+    assert planning_metrics.render_red_flags(
+        planning_metrics.metrics(False, False, {})
+    ) == planning_metrics.NO_PLANNING_HTML
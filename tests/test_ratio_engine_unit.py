@@ -0,0 +1,99 @@
+import importlib.util
+import pathlib
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+spec = importlib.util.spec_from_file_location(
+    "ratio_engine",
+    pathlib.Path(__file__).resolve().parents[1] / "qaco_planning_phase" / "utils" / "ratio_engine.py",
+)
+ratio_engine = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ratio_engine)
+
+FS_LINES = [
+    ("revenue", "Revenue", 1000.0, 800.0),
+    ("cost_of_sales", "Cost of Sales", 600.0, 500.0),
+    ("operating_expense", "Administrative Expenses", 100.0, 90.0),
+    ("finance_cost", "Finance Costs", 20.0, 10.0),
+    ("current_asset", "Inventory", 150.0, 130.0),
+    ("current_asset", "Cash & Bank", 50.0, 40.0),
+    ("current_asset", "Trade Receivables", 200.0, 160.0),
+    ("current_liability", "Trade Payables", 120.0, 100.0),
+    ("non_current_liability", "Long-term Loan", 200.0, 200.0),
+    ("equity", "Share Capital", 300.0, 300.0),
+]
+
+
+def _evaluate(formulas, budget=None):
+    return ratio_engine.evaluate_formulas(formulas, ratio_engine.Aggregates(FS_LINES, budget))
+
+
+def test_standard_ratios_over_cy_py_and_budget():
+    results, errors = _evaluate(
+        [
+            "Gross Profit / Revenue × 100",
+            "(Current Assets - Inventory) / Current Liabilities",
+            "Cash / Current Liabilities",
+            "Total Debt / Total Equity",
+            "EBIT / Interest Expense",
+            "Cost of Sales / Average Inventory",
+            "(Trade Receivables / Revenue) × 365",
+        ],
+        budget={"Revenue": 1100.0, "Cost of Sales": 650.0},
+    )
+    assert not errors
+    assert results[0] == pytest.approx([40.0, 37.5, 450.0 / 1100.0 * 100])
+    assert results[1][:2] == pytest.approx([250.0 / 120.0, 200.0 / 100.0])
+    assert results[2][:2] == pytest.approx([50.0 / 120.0, 0.4])
+    assert results[3][:2] == pytest.approx([320.0 / 300.0, 1.0])
+    assert results[4][:2] == pytest.approx([15.0, 21.0])
+    assert results[5][:2] == pytest.approx([600.0 / 140.0, 500.0 / 130.0])
+    assert results[6][:2] == pytest.approx([73.0, 73.0])
+    # budget only exists for revenue/cost of sales
+    assert np.isnan(results[1][2])
+
+
+def test_division_by_zero_and_unknown_names():
+    aggregates = ratio_engine.Aggregates(FS_LINES)
+    results, errors = ratio_engine.evaluate_formulas(["Goodwill / Revenue", "Revenue / Taxation"], aggregates)
+    assert not errors
+    assert results[0][:2] == pytest.approx([0.0, 0.0])
+    assert np.isnan(results[1][0])
+    assert aggregates.missing == {"goodwill"}
+    assert ratio_engine.to_value(results[1][0]) is None
+
+
+def test_bad_formulas_are_reported_per_row():
+    results, errors = _evaluate(["Revenue / (Cost of Sales", "Revenue % 2", "Revenue * 2"])
+    assert set(errors) == {0, 1}
+    assert results[2][0] == 2000.0
+
+
+def test_formula_compiled_once():
+    ratio_engine.compile_formula.cache_clear()
+    for _i in range(10):
+        ratio_engine.compile_formula("Net Profit / Revenue × 100")
+    assert ratio_engine.compile_formula.cache_info().misses == 1
+
+
+def test_hyphenated_names_and_unary_minus():
+    results, _errors = _evaluate(["Non-Current Liabilities / -Total Equity"])
+    assert results[0][0] == pytest.approx(-200.0 / 300.0)
+
+
+def test_fifty_ratios_in_milliseconds():
+    formulas = ["Gross Profit / Revenue × 100", "Current Assets / Current Liabilities"] * 25
+    lines = FS_LINES * 50
+    start = time.perf_counter()
+    results, _errors = ratio_engine.evaluate_formulas(formulas, ratio_engine.Aggregates(lines))
+    assert (time.perf_counter() - start) < 0.5
+    assert results.shape == (50, 3)
+
+
+def test_write_groups_skip_unchanged_rows():
+    rows = [(1, {"value": 2.0}), (2, {"value": 2.0}), (3, {"value": 5.0}), (4, {"value": 1.0})]
+    groups = ratio_engine.write_groups(rows, stored={4: {"value": 1.0}, 3: {"value": 0.0}})
+    assert groups == [([1, 2], {"value": 2.0}), ([3], {"value": 5.0})]
@@ -0,0 +1,84 @@
+import importlib.util
+import json
+import pathlib
+from datetime import date
+
+spec = importlib.util.spec_from_file_location(
+    "regulatory_catalogue",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_finalisation_phase"
+    / "utils"
+    / "regulatory_catalogue.py",
+)
+regulatory_catalogue = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(regulatory_catalogue)
+
+REGULATORS = {"icap", "secp", "sbp"}
+
+
+def test_bundles_merge_in_name_order_and_skip_bad_rows(tmp_path):
+    (tmp_path / "01_base.json").write_text(
+        json.dumps(
+            {
+                "alerts": [
+                    {"regulator": "SECP", "reference_code": "C-1", "summary": "Old",
+                     "effective_date": "2026-01-15", "entity_types": "Insurance; sme"},
+                    {"regulator": "xyz", "reference_code": "X", "summary": "Unknown"},
+                ]
+            }
+        )
+    )
+    (tmp_path / "02_update.csv").write_text(
+        "regulator,reference_code,summary,severity\n"
+        "secp,C-1,Revised,critical\n"
+        "icap,ATR-9,,info\n"
+    )
+    (tmp_path / "notes.txt").write_text("ignored")
+    paths = regulatory_catalogue.bundle_paths(str(tmp_path))
+    rows, skipped = regulatory_catalogue.load_bundles(paths, REGULATORS)
+    assert skipped == 2
+    row = rows[("secp", "C-1")]
+    assert (row["summary"], row["severity"], row["bundle_name"]) == (
+        "Revised",
+        "critical",
+        "02_update.csv",
+    )
+
+    first, _ = regulatory_catalogue.load_bundles(paths[:1], REGULATORS)
+    assert first[("secp", "C-1")]["effective_date"] == date(2026, 1, 15)
+    assert first[("secp", "C-1")]["entity_types"] == "insurance,sme"
+
+
+def test_sync_plan_only_touches_changed_rows():
+    row = regulatory_catalogue.normalise(
+        {"regulator": "sbp", "reference_code": "BPRD-3", "summary": "Provisioning"},
+        REGULATORS,
+    )
+    new = regulatory_catalogue.normalise(
+        {"regulator": "icap", "reference_code": "ATR-1", "summary": "Guidance"},
+        REGULATORS,
+    )
+    incoming = {("sbp", "BPRD-3"): row, ("icap", "ATR-1"): new}
+    assert regulatory_catalogue.plan_sync(
+        {("sbp", "BPRD-3"): (7, row["fingerprint"])}, incoming
+    ) == ([new], {}, 1)
+    assert regulatory_catalogue.plan_sync({("sbp", "BPRD-3"): (7, "stale")}, incoming)[1] == {
+        7: row
+    }
+
+
+def test_feed_escapes_bundle_content():
+    html = regulatory_catalogue.render_feed(
+        [
+            {
+                "regulator": "secp",
+                "reference_code": "S<1>",
+                "summary": "Filing & fees",
+                "link_url": "https://example.org/?a=1&b=2",
+                "severity": "warning",
+                "effective_date": date(2026, 3, 1),
+            }
+        ]
+    )
+    assert "S&lt;1&gt;: Filing &amp; fees" in html
+    assert "(2026-03-01)" in html and "#ffc107" in html
@@ -0,0 +1,111 @@
+import importlib.util
+import pathlib
+
+spec = importlib.util.spec_from_file_location(
+    "risk_sync",
+    pathlib.Path(__file__).resolve().parents[1] / "qaco_planning_phase" / "utils" / "risk_sync.py",
+)
+risk_sync = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(risk_sync)
+
+
+def _vals(description, inherent="medium"):
+    return {
+        "account_cycle": "revenue",
+        "risk_description": description,
+        "assertion_type": "valuation",
+        "inherent_risk": inherent,
+        "control_risk": "medium",
+    }
+
+
+def _stored(desired, start_id=1):
+    """Simulate what the first sync stores for ``desired``."""
+    plan = risk_sync.diff_risk_sources(desired, {})
+    return {
+        vals["source_key"]: {
+            "id": start_id + i,
+            "source_fingerprint": vals["source_fingerprint"],
+            "active": True,
+        }
+        for i, vals in enumerate(plan.creates)
+    }
+
+
+def test_source_key_is_deterministic():
+    assert risk_sync.source_key("qaco.planning.p4.fs.line", 7) == "qaco.planning.p4.fs.line,7"
+    assert risk_sync.source_fingerprint({"a": 1, "b": 2}) == risk_sync.source_fingerprint({"b": 2, "a": 1})
+
+
+def test_first_run_creates_everything():
+    desired = {risk_sync.source_key("m", i): _vals("risk %d" % i) for i in range(5)}
+    plan = risk_sync.diff_risk_sources(desired, {})
+    assert len(plan.creates) == 5
+    assert not plan.updates and not plan.retire_ids
+    assert all(vals["source_key"] in desired for vals in plan.creates)
+
+
+def test_rerun_is_noop():
+    desired = {risk_sync.source_key("m", i): _vals("risk %d" % i) for i in range(1000)}
+    plan = risk_sync.diff_risk_sources(desired, _stored(desired))
+    assert plan.creates == [] and plan.updates == [] and plan.retire_ids == []
+    assert plan.unchanged == 1000
+
+
+def test_changed_sources_are_updated_and_missing_retired():
+    desired = {risk_sync.source_key("m", i): _vals("risk %d" % i) for i in range(4)}
+    existing = _stored(desired)
+    desired["m,0"] = _vals("risk 0", inherent="high")
+    del desired["m,3"]
+    desired["m,9"] = _vals("new risk")
+
+    plan = risk_sync.diff_risk_sources(desired, existing)
+    assert [vals["source_key"] for vals in plan.creates] == ["m,9"]
+    assert len(plan.updates) == 1
+    ids, vals = plan.updates[0]
+    assert ids == [existing["m,0"]["id"]]
+    assert vals["inherent_risk"] == "high" and vals["active"] is True
+    assert plan.retire_ids == [existing["m,3"]["id"]]
+
+
+def test_reappearing_source_is_reactivated_in_one_group():
+    desired = {risk_sync.source_key("m", i): _vals("risk %d" % i) for i in range(3)}
+    existing = _stored(desired)
+    for rec in existing.values():
+        rec["active"] = False
+
+    plan = risk_sync.diff_risk_sources(desired, existing)
+    assert plan.updates == [([1, 2, 3], {"active": True})]
+
+
+def test_caption_to_cycle():
+    assert risk_sync.caption_to_cycle("Trade Receivables") == "revenue"
+    assert risk_sync.caption_to_cycle("Staff wages") == "payroll"
+    assert risk_sync.caption_to_cycle("Goodwill") == "other"
+    assert risk_sync.caption_to_cycle(False) == "other"
+
+
+def test_custom_restore_vals_for_flagged_retirement():
+    desired = {"m,1": _vals("risk 1")}
+    existing = _stored(desired)
+    existing["m,1"]["active"] = False
+    desired["m,1"] = _vals("risk 1 revised")
+
+    plan = risk_sync.diff_risk_sources(desired, existing, restore_vals={"source_retired": False})
+    ids, vals = plan.updates[0]
+    assert vals["source_retired"] is False and "active" not in vals
+    assert vals["risk_description"] == "risk 1 revised"
+
+
+def test_legacy_lines_are_matched_on_risk_and_assertion():
+    desired = {
+        "p6,1": {"source_phase": "p6", "risk_description": "Revenue  cut-off", "assertion": "cutoff"},
+        "p6,2": {"source_phase": "p6", "risk_description": "Revenue cut-off", "assertion": "occurrence"},
+        "p7,1": {"source_phase": "p7", "risk_description": "Revenue cut-off", "assertion": False},
+    }
+    legacy = [
+        (10, "p6", "revenue cut-off ", "cutoff"),
+        (11, "p6", "Revenue cut-off", "cutoff"),
+        (12, "p7", "Revenue cut-off", ""),
+    ]
+    assert risk_sync.match_legacy(desired, legacy) == {10: "p6,1", 12: "p7,1"}
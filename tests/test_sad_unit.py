@@ -0,0 +1,62 @@
+import importlib.util
+import pathlib
+
+spec = importlib.util.spec_from_file_location(
+    "sad",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_finalisation_phase"
+    / "utils"
+    / "sad.py",
+)
+sad = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(sad)
+
+
+def group(amount, kind="factual", status="uncorrected", period="current",
+          effect="overstated", trivial=False, count=1):
+    return {
+        "misstatement_type": kind,
+        "status": status,
+        "period": period,
+        "income_effect": effect,
+        "is_clearly_trivial": trivial,
+        "amount": amount,
+        "line_count": count,
+    }
+
+
+def test_summary_splits_types_trivial_items_and_prior_turnaround():
+    totals = sad.summarise(
+        [
+            group(600.0),
+            group(300.0, kind="projected", effect="understated"),
+            group(250.0, status="corrected"),
+            group(40.0, trivial=True, count=3),
+            group(200.0, period="prior"),
+        ]
+    )
+    assert totals["uncorrected_total"] == 900.0
+    assert totals["factual_total"] == 600.0
+    assert totals["projected_total"] == 300.0
+    assert totals["corrected_total"] == 250.0
+    assert (totals["trivial_count"], totals["trivial_total"]) == (3, 40.0)
+    # Prior-year overstatement reverses, understating current profit
+    assert totals["prior_turnaround"] == -200.0
+    assert totals["cumulative_effect"] == 600.0 - 300.0 - 200.0
+
+
+def test_thresholds_evaluated_on_gross_and_net_aggregate():
+    assert sad.evaluate_thresholds(0.0, 0.0, 50.0, 700.0, 1000.0, 70.0) == ("none", False)
+    assert sad.evaluate_thresholds(30.0, 30.0, 50.0, 700.0, 1000.0, 70.0) == (
+        "trivial",
+        False,
+    )
+    assert sad.evaluate_thresholds(750.0, 100.0, 50.0, 700.0, 1000.0, 70.0) == (
+        "below_overall",
+        True,
+    )
+    # Net prior-period turnaround can push the aggregate over materiality
+    assert sad.evaluate_thresholds(400.0, 1200.0, 50.0, 700.0, 1000.0, 70.0) == (
+        "material",
+        False,
+    )
@@ -0,0 +1,109 @@
+import importlib.util
+import pathlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+_PATH = (
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_execution_phase"
+    / "utils"
+    / "sampling.py"
+)
+_spec = importlib.util.spec_from_file_location("qaco_exec_sampling", _PATH)
+sampling = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sampling)
+
+
+def _population(rows=5000):
+    rng = np.random.default_rng(7)
+    amounts = np.round(rng.lognormal(7, 1.5, rows), 2)
+    frame = pd.DataFrame({"Invoice": [f"INV{i:05d}" for i in range(rows)], "Amount": amounts})
+    return frame.to_csv(index=False).encode(), amounts
+
+
+def _open(data, **kwargs):
+    return lambda: sampling.iter_population(data, "Amount", "Invoice", chunk_size=700, **kwargs)
+
+
+def test_attribute_sizes_match_published_tables():
+    # AICPA attribute tables: 5% tolerable, 0% expected -> 59 (95%), 45 (90%)
+    assert sampling.attribute_sample_size(0.05, 0.0, 0.95) == 59
+    assert sampling.attribute_sample_size(0.05, 0.0, 0.90) == 45
+    assert sampling.attribute_sample_size(0.05, 0.01, 0.95) == 93
+    # Small populations are corrected rather than sampled in full
+    assert sampling.attribute_sample_size(0.05, 0.0, 0.95, population_size=100) < 59
+    # Near-equal rates are sized by bisection, not by stepping through every n
+    assert sampling.attribute_sample_size(0.01, 0.009, 0.95) == 27222
+    assert sampling.attribute_sample_size(0.01, 0.0097, 0.95) is None
+    assert sampling.sample_size("random", 500, 0, 1.0, 1.0, "high") == 500
+    assert sampling.poisson_factor(0, 0.95) == pytest.approx(2.9957, abs=1e-3)
+    assert sampling.poisson_factor(1, 0.95) == pytest.approx(4.7439, abs=1e-3)
+
+
+def test_sample_size_no_longer_scales_with_population():
+    small = sampling.sample_size("random", 10_000, 0, 5.0, 0.0, "medium")
+    large = sampling.sample_size("random", 10_000_000, 0, 5.0, 0.0, "medium")
+    assert small == large == 45
+    mus = sampling.sample_size("mus", 10_000_000, 50_000_000.0, 5.0, 0.0, "high")
+    assert mus == 60
+
+
+def test_selection_is_reproducible_and_profile_hashes_content():
+    data, amounts = _population()
+    for method in ("random", "systematic", "mus", "stratified"):
+        first = sampling.run_selection(_open(data, include_key=False), method, 60, 42, (1000, 10000))
+        second = sampling.run_selection(_open(data, include_key=False), method, 60, 42, (1000, 10000))
+        assert np.array_equal(first.indices, second.indices)
+        assert first.profile.hash == second.profile.hash
+        assert 0 < len(first.indices) <= 60
+        assert np.all(np.diff(first.indices) > 0)
+    assert first.profile.rows == len(amounts)
+    assert first.profile.total == pytest.approx(amounts.sum())
+
+    changed = data.replace(b"INV00003,", b"INV00003,1")
+    profile = sampling.profile_population(
+        sampling.iter_population(changed, "Amount", include_key=False)
+    )
+    assert profile.hash != first.profile.hash
+
+
+def test_mus_selects_every_item_above_the_interval():
+    data, amounts = _population()
+    selection = sampling.run_selection(_open(data, include_key=False), "mus", 50, 3)
+    large = np.flatnonzero(np.abs(amounts) >= selection.interval)
+    assert set(large) <= set(selection.indices)
+
+
+def test_pack_and_extract_rows():
+    data, amounts = _population()
+    selection = sampling.run_selection(_open(data, include_key=False), "random", 80, 11)
+    assert np.array_equal(
+        sampling.unpack_indices(sampling.pack_indices(selection.indices)), selection.indices
+    )
+    rows = sampling.extract_rows(_open(data)(), selection.indices)
+    assert list(rows["row"]) == list(selection.indices)
+    assert rows["key"].iloc[0] == f"INV{selection.indices[0]:05d}"
+    assert np.allclose(rows["amount"], amounts[selection.indices])
+
+
+def test_evaluation_and_results_validation():
+    clean = sampling.evaluate_mus([100.0, 200.0], [100.0, 200.0], 1000.0, 0.95)
+    assert clean.projected_misstatement == 0
+    assert clean.upper_misstatement_limit == pytest.approx(2995.7, abs=1)
+    tainted = sampling.evaluate_mus([100.0, 5000.0], [50.0, 4000.0], 1000.0, 0.95)
+    # 50% tainting projects 500 over the interval; the top item adds its actual 1,000
+    assert tainted.projected_misstatement == pytest.approx(1500.0)
+    assert tainted.upper_misstatement_limit > clean.upper_misstatement_limit + 1500.0
+
+    attribute = sampling.evaluate_attribute(59, 0, 0.95)
+    assert attribute.upper_deviation_rate == pytest.approx(0.0508, abs=1e-3)
+
+    results = b"row,key,amount,audited_amount,deviation\n3,A,100,90,yes\n8,B,200,200,\n"
+    frame = sampling.read_results(results, np.array([3, 8]))
+    assert list(frame["deviation"].fillna(-1)) == [1.0, -1]
+    assert list(frame["audited_amount"]) == [90.0, 200.0]
+    with pytest.raises(ValueError):
+        sampling.read_results(results, np.array([3, 9]))
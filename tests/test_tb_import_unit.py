@@ -0,0 +1,92 @@
+import importlib.util
+import io
+import pathlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+spec = importlib.util.spec_from_file_location(
+    "tb_import",
+    pathlib.Path(__file__).resolve().parents[1] / "qaco_planning_phase" / "utils" / "tb_import.py",
+)
+tb_import = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(tb_import)
+
+RULES = [
+    tb_import.MappingRule("code_prefix", "4", "revenue", "Revenue"),
+    tb_import.MappingRule("name_contains", "receivable", "current_asset", "Trade Receivables"),
+    tb_import.MappingRule("name_regex", r"^cash|bank", "current_asset", "Cash & Bank"),
+    tb_import.MappingRule("code_prefix", "2", "current_liability", "Trade Payables"),
+]
+
+CSV = b"""Account Code,Account Name,Current Year,Prior Year
+4000,Sales - Local,"(1,000,000)","(800,000)"
+4100,Sales - Export,(250000),(200000)
+1100,Trade Receivables,300000,310000
+1010,Cash in hand,5000,4000
+1020,Bank - HBL,45000,46000
+2000,Trade Payables,-120000,-60000
+9999,Suspense,700,0
+"""
+
+
+def test_compute_variances_pct_fallback_and_materiality():
+    variance, pct, exceeds = tb_import.compute_variances([110, 0, 50, 105], [100, 0, 0, 100])
+    assert list(variance) == [10, 0, 50, 5]
+    assert list(pct) == [10.0, 0.0, 100.0, 5.0]
+    assert list(exceeds) == [False, False, True, False]
+
+    _v, _p, exceeds = tb_import.compute_variances([110, 5000], [100, 1000], amount_threshold=1000)
+    assert list(exceeds) == [False, True]
+
+
+def test_csv_pipeline_aggregates_and_maps():
+    vals_list, stats = tb_import.build_fs_line_values(CSV, "tb.csv", RULES, chunk_size=2)
+    by_caption = {vals["fs_caption"]: vals for vals in vals_list}
+
+    assert by_caption["Revenue"]["current_year"] == 1250000.0
+    assert by_caption["Revenue"]["prior_year"] == 1000000.0
+    assert by_caption["Revenue"]["account_count"] == 2
+    assert by_caption["Cash & Bank"]["current_year"] == 50000.0
+    assert by_caption["Trade Payables"]["current_year"] == 120000.0
+    assert by_caption["Trade Payables"]["fs_category"] == "current_liability"
+    assert stats["unmapped"]["count"] == 1
+    assert stats["accounts"] == 7
+    assert stats["lines"] == 4
+
+
+def test_debit_credit_columns():
+    content = b"code,name,debit,credit\n4000,Sales,0,500\n4001,Sales returns,50,0\n"
+    vals_list, _stats = tb_import.build_fs_line_values(content, "tb.csv", RULES)
+    assert vals_list[0]["current_year"] == 450.0
+
+
+def test_missing_balance_column_rejected():
+    with pytest.raises(ValueError):
+        list(tb_import.iter_trial_balance(b"code,name\n1,a\n", "tb.csv"))
+
+
+def test_xlsx_streaming():
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Account", "Account Name", "CY", "PY"])
+    for i in range(25):
+        sheet.append(["4%03d" % i, "Sales %d" % i, -100, -90])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    vals_list, stats = tb_import.build_fs_line_values(buffer.getvalue(), "tb.xlsx", RULES, chunk_size=10)
+    assert vals_list == [
+        {
+            "sequence": 10,
+            "fs_category": "revenue",
+            "fs_caption": "Revenue",
+            "current_year": 2500.0,
+            "prior_year": 2250.0,
+            "account_count": 25,
+        }
+    ]
+    assert stats["unmapped"]["count"] == 0
@@ -0,0 +1,63 @@
+import importlib.util
+import pathlib
+from datetime import date
+
+import pytest
+
+pytest.importorskip("pandas")
+
+spec = importlib.util.spec_from_file_location(
+    "weekly_allocation",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_employees"
+    / "utils"
+    / "weekly_allocation.py",
+)
+weekly_allocation = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(weekly_allocation)
+
+TODAY = date(2024, 1, 15)
+
+
+def columns():
+    return {
+        "name": ["Ali", "Sara", "Omar", "Hina", "Zara", "Bilal"],
+        "manager": ["Manager X", None, False, "Manager X", False, "Manager Y"],
+        "department": ["Partners", "Audit", False, "Audit", "Tax", "Audit"],
+        "joined": [date(2014, 1, 15), None, None, date(2023, 1, 15), None, None],
+        "articles": [None, date(2022, 1, 15), None, None, None, None],
+        "client": ["Client B", "Client A", None, "Client B", "LEAVE", "Client A"],
+    }
+
+
+def test_frame_orders_clients_and_departments():
+    df = weekly_allocation.frame(columns(), TODAY)
+    groups = weekly_allocation.groups(df)
+    assert [(number, client, staff) for number, client, staff, _rows in groups] == [
+        (1, "Client A", 2),
+        (2, "Client B", 2),
+        (3, "UNALLOCATED", 1),
+        (4, "LEAVE", 1),
+    ]
+    # Audit before Partners within a client; numbering runs across clients
+    assert [(row["number"], row["name"]) for row in groups[1][3]] == [
+        (3, "Hina"),
+        (4, "Ali"),
+    ]
+    unallocated = groups[2][3][0]
+    assert (unallocated["manager"], unallocated["department"]) == ("N/A", "Other")
+
+
+def test_experience_and_totals():
+    df = weekly_allocation.frame(columns(), TODAY)
+    experience = dict(zip(df["name"], df["experience"]))
+    assert experience["Ali"] == 10.0
+    assert experience["Sara"] == 2.0
+    assert experience["Omar"] == 0
+    assert weekly_allocation.totals(df) == {
+        "staff_count": 6,
+        "client_count": 4,
+        "unallocated_count": 1,
+    }
+    empty = weekly_allocation.frame({name: [] for name in weekly_allocation.COLUMNS}, TODAY)
+    assert weekly_allocation.groups(empty) == []
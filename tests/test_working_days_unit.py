@@ -0,0 +1,51 @@
+import importlib.util
+import pathlib
+from datetime import date
+
+import pytest
+
+spec = importlib.util.spec_from_file_location(
+    "working_days",
+    pathlib.Path(__file__).resolve().parents[1]
+    / "qaco_employees"
+    / "utils"
+    / "working_days.py",
+)
+working_days = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(working_days)
+
+
+def calendar_window(start, end, holidays=()):
+    return working_days.Window(
+        start, end, lambda year: working_days.year_bitmap(year, holidays)
+    )
+
+
+def test_window_spans_years_and_drops_weekends_and_holidays():
+    # Fri 29 Dec 2023 - Tue 2 Jan 2024, with 1 January a holiday
+    window = calendar_window(date(2023, 12, 29), date(2024, 1, 2), [date(2024, 1, 1)])
+
+    assert window.dates(window.working) == [date(2023, 12, 29), date(2024, 1, 2)]
+    assert working_days.count(working_days.year_bitmap(2024)) == 262
+    with pytest.raises(ValueError):
+        calendar_window(date(2024, 1, 2), date(2024, 1, 1))
+
+
+def test_masks_replace_date_sets():
+    # March 2024: 21 weekdays, 23 March (Saturday) is ignored as a holiday
+    window = calendar_window(date(2024, 3, 1), date(2024, 3, 31), [date(2024, 3, 23)])
+    leave = window.span(date(2024, 2, 26), date(2024, 3, 5))  # clipped to 1-5 March
+    attended = window.days([date(2024, 3, 6), date(2024, 3, 7), date(2024, 4, 1)])
+
+    assert working_days.count(window.working) == 21
+    assert working_days.count(leave & window.working) == 3
+    assert working_days.count(window.working & ~attended & ~leave) == 16
+    # Three working days from Friday 8 March: 8, 11 and 12 March
+    assert window.dates(window.first_working(date(2024, 3, 8), 3)) == [
+        date(2024, 3, 8),
+        date(2024, 3, 11),
+        date(2024, 3, 12),
+    ]
+    assert window.first_working(date(2024, 3, 29), 5) == window.span(
+        date(2024, 3, 29), date(2024, 3, 29)
+    )
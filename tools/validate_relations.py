@@ -27,7 +27,7 @@ def main():
         'res.country', 'res.country.state', 'res.currency',
         'account.move', 'account.move.line', 'uom.uom',
         'hr.department', 'account.account', 'mail.message',
-        'mail.activity', 'mail.thread', 'mail.activity.mixin'
+        'mail.activity', 'mail.thread', 'mail.activity.mixin', 'mail.mail'
     }
 
     # Collect declared models